@@ -1,5 +1,11 @@
 from fast_agent.core.fastagent import FastAgent
+from answer_cache import AnswerCacheMixin, answer_cache
+from config.settings import AGENT_CACHE_ENABLED, AGENT_HOST, AGENT_PORT, AGENT_SERVER_MODE
+from listing_cache import CachedListingMixin, install_list_changed_hook
+from parallel_agent import ParallelToolAgent
+from stream_server import create_stream_app
 import asyncio
+import uvicorn
 
 fast = FastAgent('mock-agent')
 
@@ -70,6 +76,15 @@ RULE 3: WEATHER QUERIES
 For weather, forecasts, or atmospheric conditions:
 → Use open_weather_map tool
 
+═══════════════════════════════════════════════════════════════
+RULE 4: QUESTIONS WITH SEVERAL INDEPENDENT PARTS
+═══════════════════════════════════════════════════════════════
+If a question needs tools that do not depend on each other's results
+(e.g. weather AND a balance lookup), request those tool calls together
+in the same turn. They are executed concurrently.
+Calls that need a previous result (oracle_query after milvus_search)
+must still wait for that result.
+
 ═══════════════════════════════════════════════════════════════
 RESPONSE STYLE
 ═══════════════════════════════════════════════════════════════
@@ -78,9 +93,23 @@ Hide technical implementation details from the user.
 """
 
 
+AGENT_NAME = "Master_Agent"
+
+
+class MasterAgent(AnswerCacheMixin, CachedListingMixin, ParallelToolAgent):
+    """
+    의미 기반 답변 캐시(AnswerCacheMixin) + MCP 목록 캐시/재연결(CachedListingMixin)
+    + 같은 턴 도구 병렬 실행(ParallelToolAgent)
+    """
+
+
+# list_changed 알림으로 목록 캐시를 무효화합니다.
+install_list_changed_hook()
+
 # Define the agent
-@fast.agent(
-    name="Master_Agent",
+@fast.custom(
+    MasterAgent,
+    name=AGENT_NAME,
     instruction=default_instruction, # 문자열을 직접 지정하거나 md 파일을 참조 가능
     #model="gemini-2.5-flash",
     servers=["mcp-mock-server", "duckduckgo"],
@@ -103,11 +132,22 @@ Hide technical implementation details from the user.
 
 async def main():
     # use the --model command line switch or agent arguments to change model
+    if AGENT_CACHE_ENABLED:
+        # 첫 질문에서 임베딩 모델 로딩 지연이 생기지 않도록 미리 로드합니다.
+        await asyncio.to_thread(answer_cache.load)
+
+    if AGENT_SERVER_MODE == "stream":
+        # 도구 진행 상황과 답변을 SSE로 스트리밍 (POST /chat/stream)
+        async with fast.run() as agent_app:
+            app = create_stream_app(agent_app, AGENT_NAME)
+            await uvicorn.Server(uvicorn.Config(app, host=AGENT_HOST, port=AGENT_PORT)).serve()
+        return
+
     # Start as a server programmatically
     await fast.start_server(
         transport="http",
-        host="0.0.0.0",
-        port=9090,
+        host=AGENT_HOST,
+        port=AGENT_PORT,
         server_name="Mock-Agent-Server",
         server_description="Provides API access to my mock agent"
     )
@@ -0,0 +1,300 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import (
+    AGENT_CACHE_ENABLED,
+    AGENT_CACHE_MAX_ENTRIES,
+    AGENT_CACHE_THRESHOLD,
+    AGENT_CACHE_TTL_FINANCIAL,
+    AGENT_CACHE_TTL_GENERAL,
+    AGENT_CACHE_TTL_WEATHER,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_SOCKET,
+    EMBEDDING_TIMEOUT,
+)
+import asyncio
+import json
+import re
+import time
+import numpy as np
+
+"""
+==================================================
+모듈: 의미 기반 답변 캐시 (SemanticAnswerCache)
+==================================================
+이 파일은 에이전트 앞단에서 반복되는 질문의 답변을 재사용하는 캐시를 정의합니다.
+(예: "Kim 대출 금액 얼마야?", "서울 날씨 어때?")
+
+동작:
+1. 질문을 milvus_search와 같은 임베딩 모델(EMBEDDING_MODEL_NAME)로 임베딩합니다.
+   EMBEDDING_BACKEND=sidecar이면 모델을 로드하지 않고 MCP 서버의 임베딩 사이드카에 요청합니다.
+2. 저장된 질문 중 코사인 유사도가 AGENT_CACHE_THRESHOLD 이상인 가장 가까운 질문을 찾습니다.
+3. 두 질문의 핵심 단어(이름, 지역, 숫자 등)가 다르면 적중으로 보지 않습니다.
+   임베딩만으로는 "Kim 대출 금액"과 "Lee 대출 금액"이 거의 같은 벡터가 되기 때문입니다.
+4. 적중하면 LLM/도구 호출 없이 저장된 답변을 반환합니다.
+
+카테고리별 TTL (답변 생성 중 호출한 도구로 결정):
+- financial (oracle_query) : AGENT_CACHE_TTL_FINANCIAL (기본값 0: 저장하지 않음). 에이전트가 쓰기 쿼리를 실행하거나
+                             POST /cache/invalidate(stream 모드)가 호출되면 즉시 무효화됩니다.
+- weather (open_weather_map): AGENT_CACHE_TTL_WEATHER (짧게)
+- general (검색 도구)       : AGENT_CACHE_TTL_GENERAL
+- 도구를 호출하지 않았거나 도구 오류가 있었던 답변은 저장하지 않습니다.
+"""
+
+CATEGORY_TOOLS = [
+    # 우선순위 순서 (여러 도구를 사용한 경우 TTL이 가장 엄격한 카테고리)
+    ("financial", {"oracle_query", "milvus_search"}),
+    ("weather", {"open_weather_map"}),
+    ("general", {"google_search", "duckduckgo_search", "web_content_fetch", "search", "fetch_content"}),
+]
+
+CATEGORY_TTL = {
+    "financial": AGENT_CACHE_TTL_FINANCIAL,
+    "weather": AGENT_CACHE_TTL_WEATHER,
+    "general": AGENT_CACHE_TTL_GENERAL,
+}
+
+# 핵심 단어 비교에서 제외할 표현 (질문 형태만 다른 경우)
+FILLER_WORDS = {
+    "알려줘", "알려주세요", "얼마야", "얼마", "얼마인가요", "어때", "어때요", "어떤가요", "뭐야", "무엇인가요",
+    "좀", "지금", "현재", "오늘", "please", "what", "what's", "is", "the", "how", "tell", "me", "about",
+}
+PARTICLES = ("에서", "의", "은", "는", "이", "가", "을", "를", "에", "도")
+
+# 요청별 도구 사용 기록 [(도구 이름, 인자, 오류 여부)]
+tool_usage: ContextVar[Optional[List[Tuple[str, Dict[str, Any], bool]]]] = ContextVar("tool_usage", default=None)
+
+
+def key_terms(question: str) -> frozenset:
+    terms = set()
+    for token in re.findall(r"[\w']+", question.lower()):
+        if token in FILLER_WORDS:
+            continue
+        for particle in PARTICLES:
+            if len(token) > len(particle) + 1 and token.endswith(particle):
+                token = token[: -len(particle)]
+                break
+        if token not in FILLER_WORDS:
+            terms.add(token)
+    return frozenset(terms)
+
+
+def categorize(usage: List[Tuple[str, Dict[str, Any], bool]]) -> Optional[str]:
+    if not usage or any(is_error for _, _, is_error in usage):
+        return None
+    names = {name for name, _, _ in usage}
+    for category, tools in CATEGORY_TOOLS:
+        if names & tools:
+            return category
+    return None
+
+
+def is_write_query(name: str, arguments: Dict[str, Any]) -> bool:
+    if name != "oracle_query":
+        return False
+    inputs = arguments.get("inputs", arguments)
+    sql = str(inputs.get("sql_template", "")).lstrip().upper()
+    return bool(sql) and not sql.startswith(("SELECT", "WITH"))
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    terms: frozenset
+    answer: str
+    category: str
+    latency_s: float
+    expires_at: float
+    hits: int = 0
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    expired: int = 0
+    invalidated: int = 0
+    saved_latency_s: float = 0.0
+    by_category: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+class SemanticAnswerCache:
+    """
+    질문 임베딩 유사도로 이전 답변을 찾는 캐시입니다.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, threshold: float = AGENT_CACHE_THRESHOLD,
+                 max_entries: int = AGENT_CACHE_MAX_ENTRIES, backend: str = EMBEDDING_BACKEND):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.backend = backend
+        self.model = None
+        self.entries: List[CachedAnswer] = []
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.stats = CacheStats()
+
+    def load(self):
+        if self.backend == "sidecar":
+            # 임베딩 사이드카를 공유하므로 이 프로세스에는 모델을 로드하지 않습니다.
+            return
+        from sentence_transformers import SentenceTransformer
+
+        print(f"[AnswerCache] 임베딩 모델 로딩: {self.model_name}")
+        self.model = SentenceTransformer(self.model_name)
+
+    async def _sidecar_encode(self, question: str) -> np.ndarray:
+        # utils/embedding_sidecar.py 프로토콜: 요청 한 줄 {"texts": [...]} → 응답 한 줄 {"vectors": [...]}
+        reader, writer = await asyncio.open_unix_connection(EMBEDDING_SOCKET)
+        try:
+            writer.write((json.dumps({"texts": [question]}, ensure_ascii=False) + "\n").encode("utf-8"))
+            await writer.drain()
+            response = json.loads(await asyncio.wait_for(reader.readline(), EMBEDDING_TIMEOUT) or b"{}")
+        finally:
+            writer.close()
+        if "vectors" not in response:
+            raise RuntimeError(f"임베딩 사이드카 오류: {response.get('error', 'no response')}")
+        vector = np.asarray(response["vectors"][0], dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    async def embed(self, question: str) -> np.ndarray:
+        if self.backend == "sidecar":
+            return await self._sidecar_encode(question)
+        if self.model is None:
+            await asyncio.to_thread(self.load)
+        # 모델 추론은 CPU 작업이므로 이벤트 루프 밖에서 실행합니다.
+        vector = await asyncio.to_thread(self.model.encode, question, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def _category_stats(self, category: str) -> Dict[str, float]:
+        return self.stats.by_category.setdefault(category, {"hits": 0, "stores": 0, "saved_latency_s": 0.0})
+
+    def _remove(self, indexes: List[int]):
+        removed = set(indexes)
+        keep = [i for i in range(len(self.entries)) if i not in removed]
+        self.entries = [self.entries[i] for i in keep]
+        self.vectors = self.vectors[keep] if keep else np.zeros((0, 0), dtype=np.float32)
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        expired = [i for i, entry in enumerate(self.entries) if entry.expires_at <= now]
+        if expired:
+            self.stats.expired += len(expired)
+            self._remove(expired)
+
+    def lookup(self, question: str, vector: np.ndarray) -> Optional[CachedAnswer]:
+        self._purge_expired()
+        if not self.entries:
+            self.stats.misses += 1
+            return None
+
+        scores = self.vectors @ vector
+        terms = key_terms(question)
+        # 유사도 순으로 후보를 확인하고, 핵심 단어가 같은 첫 후보를 사용합니다.
+        for index in np.argsort(-scores):
+            if scores[index] < self.threshold:
+                break
+            entry = self.entries[index]
+            if entry.terms == terms:
+                entry.hits += 1
+                self.stats.hits += 1
+                self.stats.saved_latency_s += entry.latency_s
+                category_stats = self._category_stats(entry.category)
+                category_stats["hits"] += 1
+                category_stats["saved_latency_s"] += entry.latency_s
+                return entry
+
+        self.stats.misses += 1
+        return None
+
+    def store(self, question: str, vector: np.ndarray, answer: str, category: str, latency_s: float):
+        ttl = CATEGORY_TTL.get(category, 0)
+        if ttl <= 0:
+            return
+        if len(self.entries) >= self.max_entries:
+            # 가장 오래된 항목부터 제거
+            self._remove([0])
+
+        self.entries.append(CachedAnswer(
+            question=question,
+            terms=key_terms(question),
+            answer=answer,
+            category=category,
+            latency_s=latency_s,
+            expires_at=time.monotonic() + ttl,
+        ))
+        row = vector.reshape(1, -1)
+        self.vectors = row if self.vectors.size == 0 else np.vstack([self.vectors, row])
+        self.stats.stores += 1
+        self._category_stats(category)["stores"] += 1
+
+    def invalidate(self, category: Optional[str] = None) -> int:
+        indexes = [i for i, entry in enumerate(self.entries) if category is None or entry.category == category]
+        self._remove(indexes)
+        self.stats.invalidated += len(indexes)
+        return len(indexes)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "entries": len(self.entries),
+            "threshold": self.threshold,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_rate": round(self.stats.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stats.stores,
+            "expired": self.stats.expired,
+            "invalidated": self.stats.invalidated,
+            "saved_latency_s": round(self.stats.saved_latency_s, 3),
+            "by_category": {
+                category: {**values, "saved_latency_s": round(values["saved_latency_s"], 3)}
+                for category, values in self.stats.by_category.items()
+            },
+        }
+
+
+answer_cache = SemanticAnswerCache()
+
+
+class AnswerCacheMixin:
+    """
+    에이전트 send() 앞단에 답변 캐시를, call_tool()에 도구 사용 기록을 적용합니다.
+    """
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any] = None, *args, **kwargs):
+        result = await super().call_tool(name, arguments, *args, **kwargs)
+        usage = tool_usage.get()
+        if usage is not None:
+            usage.append((name, arguments or {}, bool(getattr(result, "isError", False))))
+        if not getattr(result, "isError", False) and is_write_query(name, arguments or {}):
+            # 에이전트가 데이터를 변경한 경우 Oracle 기반 답변은 더 이상 유효하지 않습니다.
+            print("[AnswerCache] 쓰기 쿼리 실행 - financial 캐시 무효화")
+            answer_cache.invalidate("financial")
+        return result
+
+    async def send(self, message, *args, **kwargs):
+        if not AGENT_CACHE_ENABLED or not isinstance(message, str):
+            return await super().send(message, *args, **kwargs)
+
+        vector = await answer_cache.embed(message)
+        cached = answer_cache.lookup(message, vector)
+        if cached is not None:
+            print(f"[AnswerCache] 적중 ({cached.category}): '{message}' ≈ '{cached.question}'")
+            return cached.answer
+
+        usage: List[Tuple[str, Dict[str, Any], bool]] = []
+        token = tool_usage.set(usage)
+        start = time.perf_counter()
+        try:
+            answer = await super().send(message, *args, **kwargs)
+        finally:
+            tool_usage.reset(token)
+
+        category = categorize(usage)
+        if category and any(is_write_query(name, arguments) for name, arguments, _ in usage):
+            category = None
+        if category:
+            answer_cache.store(message, vector, answer, category, time.perf_counter() - start)
+        return answer
@@ -0,0 +1,59 @@
+from dotenv import load_dotenv
+from pathlib import Path
+import os
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+ENV_PATH = ROOT_DIR / ".env"
+
+load_dotenv('.env.local')
+
+# [Agent] 도구 실행
+# - AGENT_PARALLEL_TOOLS: 한 턴에서 LLM이 요청한 독립적인 도구 호출들을 동시에 실행합니다. (false: 순차 실행)
+# - AGENT_TOOL_CONCURRENCY: 한 턴에서 동시에 실행할 최대 도구 호출 수
+# - AGENT_TOOL_TIMEOUT: 도구 호출 1건의 타임아웃(초). 초과하면 오류 결과를 LLM에 전달합니다.
+# - AGENT_TURN_TIMEOUT: 한 턴의 전체 도구 실행 타임아웃(초)
+AGENT_PARALLEL_TOOLS = os.getenv('AGENT_PARALLEL_TOOLS', 'true').lower() == 'true'
+AGENT_TOOL_CONCURRENCY = int(os.getenv('AGENT_TOOL_CONCURRENCY', '4'))
+AGENT_TOOL_TIMEOUT = float(os.getenv('AGENT_TOOL_TIMEOUT', '30'))
+AGENT_TURN_TIMEOUT = float(os.getenv('AGENT_TURN_TIMEOUT', '60'))
+
+# [Agent] MCP 세션
+# - AGENT_LIST_CACHE_TTL: 도구/프롬프트/리소스 목록 캐시 유지 시간(초). list_changed 알림을 받으면 즉시 무효화합니다. (0: 캐시 안 함)
+# - AGENT_TOOL_RECONNECT_RETRIES: MCP 연결이 끊긴 경우 도구 호출 재시도 횟수
+# - AGENT_RETRY_TOOLS: 연결이 끊긴 뒤 다시 호출해도 안전한 읽기 전용 도구 (쉼표 구분)
+#   그 외 도구(oracle_query 등)는 서버에 연결하지 못한 경우(요청이 전달되지 않은 경우)에만 재시도합니다.
+AGENT_LIST_CACHE_TTL = float(os.getenv('AGENT_LIST_CACHE_TTL', '600'))
+AGENT_TOOL_RECONNECT_RETRIES = int(os.getenv('AGENT_TOOL_RECONNECT_RETRIES', '1'))
+AGENT_RETRY_TOOLS = {
+    name.strip()
+    for name in os.getenv(
+        'AGENT_RETRY_TOOLS',
+        'google_search,open_weather_map,milvus_search,duckduckgo_search,search,fetch_content,job_status',
+    ).split(',')
+    if name.strip()
+}
+
+# [Agent] 의미 기반 답변 캐시 (기본값: 사용 안 함)
+# - AGENT_CACHE_THRESHOLD: 캐시 적중으로 볼 최소 코사인 유사도 (핵심 단어도 같아야 적중)
+# - AGENT_CACHE_TTL_*: 카테고리별 유지 시간(초). 0이면 해당 카테고리는 저장하지 않습니다.
+#   AGENT_CACHE_TTL_FINANCIAL(Oracle 기반 답변)은 기본값 0입니다. 에이전트 밖에서 데이터가 바뀌면
+#   POST /cache/invalidate(stream 모드)로 무효화할 수 있는 경우에만 설정하세요.
+# - EMBEDDING_MODEL_NAME: milvus_search와 같은 임베딩 모델을 사용합니다.
+# - EMBEDDING_BACKEND=sidecar: 모델을 로드하지 않고 MCP 서버와 같은 임베딩 사이드카(EMBEDDING_SOCKET)를 사용합니다.
+AGENT_CACHE_ENABLED = os.getenv('AGENT_CACHE_ENABLED', 'false').lower() == 'true'
+AGENT_CACHE_THRESHOLD = float(os.getenv('AGENT_CACHE_THRESHOLD', '0.9'))
+AGENT_CACHE_MAX_ENTRIES = int(os.getenv('AGENT_CACHE_MAX_ENTRIES', '1000'))
+AGENT_CACHE_TTL_FINANCIAL = float(os.getenv('AGENT_CACHE_TTL_FINANCIAL', '0'))
+AGENT_CACHE_TTL_WEATHER = float(os.getenv('AGENT_CACHE_TTL_WEATHER', '600'))
+AGENT_CACHE_TTL_GENERAL = float(os.getenv('AGENT_CACHE_TTL_GENERAL', '86400'))
+EMBEDDING_MODEL_NAME = os.getenv('EMBEDDING_MODEL_NAME', 'sentence-transformers/all-MiniLM-L6-v2')
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'local').lower()
+EMBEDDING_SOCKET = os.getenv('EMBEDDING_SOCKET', '/tmp/mcp-embedding.sock')
+EMBEDDING_TIMEOUT = float(os.getenv('EMBEDDING_TIMEOUT', '5'))
+
+# [Agent] 서버 실행 방식
+# - mcp: FastAgent MCP 서버 (기존 방식, 최종 답변만 반환)
+# - stream: HTTP SSE 서버 (POST /chat/stream, 도구 진행 상황과 답변을 스트리밍)
+AGENT_SERVER_MODE = os.getenv('AGENT_SERVER_MODE', 'mcp')
+AGENT_HOST = os.getenv('AGENT_HOST', '0.0.0.0')
+AGENT_PORT = int(os.getenv('AGENT_PORT', '9090'))
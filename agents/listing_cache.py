@@ -0,0 +1,168 @@
+from typing import Any, Dict, Tuple
+from mcp import types
+from mcp.client.session import ClientSession
+from config.settings import AGENT_LIST_CACHE_TTL, AGENT_RETRY_TOOLS, AGENT_TOOL_RECONNECT_RETRIES
+import anyio
+import functools
+import inspect
+import httpx
+import time
+
+"""
+==================================================
+모듈: MCP 목록 캐시 및 연결 복구 (CachedListingMixin)
+==================================================
+이 파일은 에이전트가 MCP 서버의 도구/프롬프트/리소스 목록을 매 대화마다 다시 조회하지 않도록
+목록을 캐시하고, 끊긴 MCP 세션에서 도구 호출을 재시도하는 기능을 정의합니다.
+
+1. 목록 캐시
+   - list_tools / list_prompts / list_resources 결과를 프로세스 전역으로 캐시합니다.
+   - 서버가 notifications/{tools,prompts,resources}/list_changed를 보내면 해당 목록을 무효화합니다.
+     (ClientSession의 공개 훅인 message_handler로 알림을 받습니다)
+   - AGENT_LIST_CACHE_TTL(초)은 알림을 보내지 않는 서버를 위한 안전장치입니다. (0이면 캐시하지 않음)
+2. 안정적인 프롬프트 접두사
+   - 도구 목록을 이름순으로 정렬하여 반환합니다. 시스템 프롬프트 + 도구 스키마가 대화마다
+     같은 바이트열이 되므로 LLM 제공자의 프롬프트 캐시(prefix caching)가 적중합니다.
+3. 연결 복구
+   - 도구 호출 중 전송 오류(연결 끊김, 세션 종료)가 나면 목록을 무효화하고
+     AGENT_TOOL_RECONNECT_RETRIES회까지 다시 호출합니다. (FastAgent가 끊긴 연결을 새로 맺습니다)
+   - 요청이 서버에 도착했는지 알 수 없는 오류는 읽기 전용 도구(AGENT_RETRY_TOOLS)만 재시도합니다.
+     oracle_query의 쓰기 쿼리가 두 번 실행되지 않도록, 그 외 도구는 연결 자체를 맺지 못한 경우에만 재시도합니다.
+"""
+
+LIST_CHANGED = {
+    types.ToolListChangedNotification: "list_tools",
+    types.PromptListChangedNotification: "list_prompts",
+    types.ResourceListChangedNotification: "list_resources",
+}
+
+RECONNECT_ERRORS = (httpx.TransportError, anyio.ClosedResourceError, anyio.BrokenResourceError, ConnectionError)
+# 요청을 보내기 전에 실패한 오류 (모든 도구를 재시도해도 안전)
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, ConnectionRefusedError)
+
+
+class ListingCache:
+    """
+    (목록 종류, 인자)별 조회 결과를 TTL과 함께 저장합니다.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key: Tuple):
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, key: Tuple, value: Any):
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, kind: str = None):
+        # kind를 지정하지 않으면 전체 무효화
+        for key in [key for key in self._entries if kind is None or key[0] == kind]:
+            del self._entries[key]
+        self.stats["invalidations"] += 1
+
+
+listing_cache = ListingCache(AGENT_LIST_CACHE_TTL)
+
+
+async def list_changed_handler(message) -> None:
+    """
+    ClientSession message_handler: list_changed 알림을 받으면 해당 목록 캐시를 무효화합니다.
+    """
+
+    if isinstance(message, types.ServerNotification):
+        kind = LIST_CHANGED.get(type(message.root))
+        if kind:
+            print(f"[Agent] {kind} 변경 알림 수신 - 캐시 무효화")
+            listing_cache.invalidate(kind)
+
+
+def install_list_changed_hook():
+    """
+    이후 생성되는 MCP 클라이언트 세션의 message_handler에 list_changed_handler를 연결합니다.
+    FastAgent가 message_handler를 지정한 경우 그 핸들러도 그대로 호출합니다. (한 번만 적용)
+    """
+
+    init = ClientSession.__init__
+    if getattr(init, "_listing_cache_hook", False):
+        return
+
+    signature = inspect.signature(init)
+
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        inner = bound.arguments.get("message_handler")
+
+        async def message_handler(message):
+            await list_changed_handler(message)
+            if inner is not None:
+                await inner(message)
+            else:
+                await anyio.lowlevel.checkpoint()
+
+        bound.arguments["message_handler"] = message_handler
+        init(*bound.args, **bound.kwargs)
+
+    __init__._listing_cache_hook = True
+    ClientSession.__init__ = __init__
+
+
+def sort_tools(result: types.ListToolsResult) -> types.ListToolsResult:
+    # 프롬프트 접두사 고정: 서버 응답 순서와 관계없이 항상 같은 순서로 도구 스키마를 전달합니다.
+    result.tools.sort(key=lambda tool: tool.name)
+    return result
+
+
+# 목록 종류별 캐시 저장 전 처리
+PREPARE = {"list_tools": sort_tools}
+
+
+def can_retry(name: str, error: Exception) -> bool:
+    return name in AGENT_RETRY_TOOLS or isinstance(error, NOT_SENT_ERRORS)
+
+
+class CachedListingMixin:
+    """
+    McpAgent의 목록 조회에 캐시를, 도구 호출에 재연결 재시도를 적용합니다.
+    (McpAgent 하위 클래스의 MRO 앞쪽에 둡니다)
+    """
+
+    async def _cached(self, kind: str, *args, **kwargs):
+        key = (kind, args, tuple(sorted(kwargs.items())))
+        cached = listing_cache.get(key)
+        if cached is not None:
+            return cached
+        result = await getattr(super(), kind)(*args, **kwargs)
+        if kind in PREPARE:
+            result = PREPARE[kind](result)
+        listing_cache.put(key, result)
+        return result
+
+    async def list_tools(self, *args, **kwargs) -> types.ListToolsResult:
+        return await self._cached("list_tools", *args, **kwargs)
+
+    async def list_prompts(self, *args, **kwargs):
+        return await self._cached("list_prompts", *args, **kwargs)
+
+    async def list_resources(self, *args, **kwargs):
+        return await self._cached("list_resources", *args, **kwargs)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any] = None, *args, **kwargs) -> types.CallToolResult:
+        for attempt in range(AGENT_TOOL_RECONNECT_RETRIES + 1):
+            try:
+                return await super().call_tool(name, arguments, *args, **kwargs)
+            except RECONNECT_ERRORS as e:
+                listing_cache.invalidate()
+                if attempt == AGENT_TOOL_RECONNECT_RETRIES or not can_retry(name, e):
+                    # 요청이 서버에 도착했을 수 있는 쓰기 도구는 재시도하지 않습니다. (중복 실행 방지)
+                    raise
+                print(f"[Agent] [{name}] MCP 연결 오류, 재연결 후 재시도: {e!r}")
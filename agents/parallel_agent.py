@@ -0,0 +1,86 @@
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from fast_agent.agents.mcp_agent import McpAgent
+from fast_agent.types import PromptMessageExtended
+from mcp.types import CallToolResult, TextContent
+from config.settings import AGENT_PARALLEL_TOOLS, AGENT_TOOL_CONCURRENCY, AGENT_TOOL_TIMEOUT, AGENT_TURN_TIMEOUT
+import asyncio
+import time
+
+"""
+==================================================
+모듈: 병렬 도구 실행 에이전트 (ParallelToolAgent)
+==================================================
+이 파일은 한 턴에서 LLM이 요청한 여러 도구 호출을 동시에 실행하는 에이전트를 정의합니다.
+
+- 기본 McpAgent는 도구 호출을 하나씩 순서대로 실행합니다.
+  (예: "서울 날씨와 내 잔액 알려줘" → open_weather_map 완료 후 milvus_search 실행)
+- 같은 턴의 도구 호출은 LLM이 서로의 결과 없이 만든 것이므로 독립적입니다.
+  이 에이전트는 이를 AGENT_TOOL_CONCURRENCY 한도 안에서 동시에 실행합니다.
+- 도구별 AGENT_TOOL_TIMEOUT, 턴 전체 AGENT_TURN_TIMEOUT을 넘으면 오류 결과(isError)를 LLM에 전달합니다.
+- 진행 이벤트(tool_start / tool_end)는 progress_events에 등록된 큐로 전달됩니다. (stream_server.py에서 사용)
+"""
+
+# 요청별 진행 이벤트 큐 (스트리밍 요청에서만 설정)
+progress_events: ContextVar[Optional[asyncio.Queue]] = ContextVar("progress_events", default=None)
+
+
+def emit_progress(event: Dict[str, Any]):
+    queue = progress_events.get()
+    if queue is not None:
+        queue.put_nowait(event)
+
+
+def error_result(message: str) -> CallToolResult:
+    return CallToolResult(content=[TextContent(type="text", text=message)], isError=True)
+
+
+class ParallelToolAgent(McpAgent):
+    """
+    같은 턴의 도구 호출을 동시에 실행하는 McpAgent 입니다.
+    """
+
+    async def _run_tool(self, semaphore: asyncio.Semaphore, tool_name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        async with semaphore:
+            emit_progress({"type": "tool_start", "tool": tool_name})
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self.call_tool(tool_name, arguments), AGENT_TOOL_TIMEOUT)
+            except asyncio.TimeoutError:
+                result = error_result(f"{tool_name} timed out after {AGENT_TOOL_TIMEOUT:g}s")
+            except Exception as e:
+                result = error_result(f"{tool_name} failed: {e}")
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+
+            print(f"[Agent] [{tool_name}] {elapsed_ms}ms (error={bool(result.isError)})")
+            emit_progress({"type": "tool_end", "tool": tool_name, "elapsed_ms": elapsed_ms, "is_error": bool(result.isError)})
+            return result
+
+    async def run_tools(self, request: PromptMessageExtended) -> PromptMessageExtended:
+        tool_calls = request.tool_calls or {}
+        if not AGENT_PARALLEL_TOOLS or len(tool_calls) <= 1:
+            # 병렬 실행을 끄거나 도구 호출이 하나뿐이면 기본 동작(표시/검증 포함)을 그대로 사용합니다.
+            return await super().run_tools(request)
+
+        semaphore = asyncio.Semaphore(AGENT_TOOL_CONCURRENCY)
+        tasks = {
+            correlation_id: asyncio.ensure_future(
+                self._run_tool(semaphore, call.params.name, call.params.arguments or {})
+            )
+            for correlation_id, call in tool_calls.items()
+        }
+
+        done, pending = await asyncio.wait(tasks.values(), timeout=AGENT_TURN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+
+        tool_results: Dict[str, CallToolResult] = {}
+        for correlation_id, task in tasks.items():
+            if task in done:
+                tool_results[correlation_id] = task.result()
+            else:
+                tool_name = tool_calls[correlation_id].params.name
+                emit_progress({"type": "tool_end", "tool": tool_name, "is_error": True})
+                tool_results[correlation_id] = error_result(f"{tool_name} cancelled: turn timed out after {AGENT_TURN_TIMEOUT:g}s")
+
+        return PromptMessageExtended(role="user", tool_results=tool_results)
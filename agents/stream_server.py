@@ -0,0 +1,101 @@
+from typing import Optional
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from answer_cache import answer_cache
+from listing_cache import listing_cache
+from parallel_agent import progress_events
+import asyncio
+import contextvars
+import json
+
+"""
+==================================================
+모듈: 에이전트 스트리밍 HTTP 서버 (AGENT_SERVER_MODE=stream)
+==================================================
+이 파일은 에이전트 응답을 Server-Sent Events로 스트리밍하는 HTTP 엔드포인트를 정의합니다.
+MCP 서버 모드는 최종 답변이 나올 때까지 아무것도 반환하지 않지만,
+이 엔드포인트는 도구 실행 진행 상황을 먼저 보내고 최종 답변을 이어서 보냅니다.
+
+POST /chat/stream  {"message": "서울 날씨와 Alice 잔액 알려줘"}
+
+data: {"type": "tool_start", "tool": "open_weather_map"}
+data: {"type": "tool_start", "tool": "milvus_search"}
+data: {"type": "tool_end", "tool": "open_weather_map", "elapsed_ms": 210.3, "is_error": false}
+...
+data: {"type": "message", "content": "서울은 맑고 ... Alice님의 잔액은 1,000원입니다."}
+data: {"type": "done"}
+
+GET  /debug/listing_cache : MCP 목록 캐시 적중/무효화 횟수
+GET  /debug/answer_cache  : 답변 캐시 적중률, 절약한 응답 시간(카테고리별)
+POST /cache/invalidate    : 답변 캐시 무효화 ({"category": "financial"}, 생략 시 전체)
+                            Oracle 데이터를 에이전트 밖에서 변경한 경우 호출합니다.
+"""
+
+class ChatRequest(BaseModel):
+    message: str
+
+
+class InvalidateRequest(BaseModel):
+    category: Optional[str] = None
+
+
+def sse(event: dict) -> str:
+    return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def create_stream_app(agent_app, agent_name: str) -> FastAPI:
+    """
+    실행 중인 FastAgent 앱(fast.run())으로 스트리밍 서버를 생성합니다.
+    """
+
+    app = FastAPI(title="Mock-Agent-Stream-Server")
+    # 에이전트는 대화 기록을 공유하므로 요청을 하나씩 처리합니다.
+    lock = asyncio.Lock()
+
+    @app.post("/chat/stream")
+    async def chat_stream(request: ChatRequest):
+        async def events():
+            async with lock:
+                queue: asyncio.Queue = asyncio.Queue()
+                # 에이전트 실행 태스크에만 진행 이벤트 큐를 연결합니다.
+                context = contextvars.copy_context()
+                context.run(progress_events.set, queue)
+                task = asyncio.create_task(agent_app[agent_name].send(request.message), context=context)
+
+                try:
+                    while not task.done():
+                        getter = asyncio.ensure_future(queue.get())
+                        await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                        if getter.done():
+                            yield sse(getter.result())
+                        else:
+                            getter.cancel()
+                    while not queue.empty():
+                        yield sse(queue.get_nowait())
+
+                    if task.exception() is not None:
+                        yield sse({"type": "error", "message": str(task.exception())})
+                    else:
+                        yield sse({"type": "message", "content": task.result()})
+                    yield sse({"type": "done"})
+                finally:
+                    # 클라이언트 연결이 끊긴 경우 에이전트 실행도 중단합니다.
+                    if not task.done():
+                        task.cancel()
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/debug/listing_cache")
+    async def listing_cache_stats():
+        return {"ttl_s": listing_cache.ttl, **listing_cache.stats}
+
+    @app.get("/debug/answer_cache")
+    async def answer_cache_stats():
+        return answer_cache.snapshot()
+
+    @app.post("/cache/invalidate")
+    async def invalidate_answer_cache(request: InvalidateRequest):
+        return {"invalidated": answer_cache.invalidate(request.category)}
+
+    return app
@@ -0,0 +1,232 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+import argparse
+import json
+import time
+
+import numpy as np
+from pymilvus import DataType, MilvusClient
+
+from benchmarks.load_test import RESULTS_DIR, git_commit, summarize
+from utils.ann_index import build_params, search_params
+
+"""
+==================================================
+벤치마크 모듈: ANN 인덱스 recall / 지연 시간 / QPS (ann_bench)
+==================================================
+이 파일은 템플릿 카탈로그 크기별로 Milvus 벡터 인덱스 유형과 검색 파라미터를 비교합니다.
+(MILVUS_INDEX_TYPE, MILVUS_HNSW_EF, MILVUS_IVF_NPROBE 등을 정하기 위한 데이터)
+
+주요 역할:
+1. 합성 카탈로그 생성: 의도 설명 임베딩과 비슷하게 군집(cluster)을 이루는 단위 벡터를 만듭니다.
+   (배치 단위로 재생성하므로 1M개도 전체를 메모리에 올리지 않습니다)
+2. 정답(ground truth): 전수 비교(brute force) top-k
+3. 인덱스 유형(FLAT / HNSW / IVF_FLAT / IVF_SQ8 / AUTOINDEX)별로 인덱스를 만들고
+   검색 파라미터(ef, nprobe)를 바꿔가며 recall@k, 지연 시간(p50/p99), QPS를 측정합니다.
+
+실행 예 (docker-compose의 Milvus 필요):
+    python -m benchmarks.ann_bench --sizes 1000,10000,100000 --indexes FLAT,HNSW,IVF_FLAT
+    python -m benchmarks.ann_bench --sizes 1000000 --indexes HNSW --ef 32,64,128,256 --threads 16
+"""
+
+BATCH_SIZE = 10_000
+
+
+def catalog_batches(size: int, dim: int, clusters: int, seed: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    (시작 id, 벡터 배치)를 생성합니다. 같은 인자로 호출하면 항상 같은 벡터를 생성합니다.
+    """
+
+    centers = np.random.default_rng(seed).standard_normal((clusters, dim)).astype(np.float32)
+    for start in range(0, size, BATCH_SIZE):
+        rng = np.random.default_rng(seed + 1 + start // BATCH_SIZE)
+        count = min(BATCH_SIZE, size - start)
+        vectors = centers[rng.integers(0, clusters, count)] + 0.35 * rng.standard_normal((count, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        yield start, vectors
+
+
+def make_queries(count: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    # 카탈로그와 같은 군집에서 뽑되 카탈로그에 없는 벡터 (실제 질문 임베딩과 비슷한 조건)
+    centers = np.random.default_rng(seed).standard_normal((clusters, dim)).astype(np.float32)
+    rng = np.random.default_rng(seed - 1)
+    queries = centers[rng.integers(0, clusters, count)] + 0.45 * rng.standard_normal((count, dim)).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def brute_force_top_k(queries: np.ndarray, size: int, dim: int, clusters: int, seed: int, top_k: int) -> np.ndarray:
+    """
+    전수 비교로 쿼리별 정답 top-k id를 계산합니다. (배치별 top-k를 병합)
+    """
+
+    best_scores = np.full((len(queries), top_k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), top_k), dtype=np.int64)
+    for start, vectors in catalog_batches(size, dim, clusters, seed):
+        scores = queries @ vectors.T
+        ids = np.broadcast_to(np.arange(start, start + len(vectors)), scores.shape)
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, ids], axis=1)
+        order = np.argpartition(-merged_scores, top_k - 1, axis=1)[:, :top_k]
+        best_scores = np.take_along_axis(merged_scores, order, axis=1)
+        best_ids = np.take_along_axis(merged_ids, order, axis=1)
+    return best_ids
+
+
+def load_catalog(client: MilvusClient, collection: str, size: int, dim: int, clusters: int, seed: int):
+    if client.has_collection(collection):
+        client.drop_collection(collection)
+    schema = MilvusClient.create_schema(auto_id=False)
+    schema.add_field("id", DataType.INT64, is_primary=True)
+    schema.add_field("vector", DataType.FLOAT_VECTOR, dim=dim)
+    client.create_collection(collection_name=collection, schema=schema)
+
+    start_time = time.perf_counter()
+    for start, vectors in catalog_batches(size, dim, clusters, seed):
+        client.insert(
+            collection_name=collection,
+            data=[{"id": start + i, "vector": vector.tolist()} for i, vector in enumerate(vectors)],
+        )
+    client.flush(collection_name=collection)
+    return time.perf_counter() - start_time
+
+
+def build_index(client: MilvusClient, collection: str, index: Dict) -> float:
+    """
+    기존 인덱스를 지우고 새 인덱스를 만든 뒤 로드합니다. 소요 시간(초)을 반환합니다.
+    """
+
+    client.release_collection(collection_name=collection)
+    if "vector" in client.list_indexes(collection_name=collection):
+        client.drop_index(collection_name=collection, index_name="vector")
+
+    start_time = time.perf_counter()
+    index_params = client.prepare_index_params()
+    index_params.add_index(field_name="vector", index_name="vector", **index)
+    client.create_index(collection_name=collection, index_params=index_params, sync=True)
+    client.load_collection(collection_name=collection)
+    return time.perf_counter() - start_time
+
+
+def run_searches(client: MilvusClient, collection: str, queries: np.ndarray, truth: np.ndarray, top_k: int, params: Dict, threads: int) -> Dict:
+    """
+    쿼리를 한 건씩(도구 호출과 같은 조건) threads개 스레드로 검색하여 recall@k, 지연 시간, QPS를 측정합니다.
+    """
+
+    def search_one(index: int) -> Tuple[float, float]:
+        start = time.perf_counter()
+        hits = client.search(
+            collection_name=collection,
+            data=[queries[index].tolist()],
+            anns_field="vector",
+            limit=top_k,
+            search_params=params,
+        )[0]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        found = {hit["id"] for hit in hits}
+        return elapsed_ms, len(found & set(truth[index].tolist())) / top_k
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        outcomes = list(executor.map(search_one, range(len(queries))))
+    wall = time.perf_counter() - start_time
+
+    latencies = [latency for latency, _ in outcomes]
+    return {
+        "search_params": params["params"],
+        f"recall@{top_k}": round(sum(recall for _, recall in outcomes) / len(outcomes), 4),
+        "qps": round(len(outcomes) / wall, 1),
+        "latency_ms": summarize(latencies),
+    }
+
+
+def sweep(index_type: str, args) -> List[Dict]:
+    # 인덱스 유형별 검색 파라미터 후보
+    if index_type == "HNSW":
+        return [search_params(index_type, top_k=args.top_k, hnsw_ef=ef) for ef in args.ef]
+    if index_type.startswith("IVF"):
+        return [search_params(index_type, ivf_nprobe=nprobe, ivf_nlist=args.nlist) for nprobe in args.nprobe]
+    return [search_params(index_type)]
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Milvus ANN 인덱스 recall/지연 시간/QPS 벤치마크")
+    parser.add_argument("--uri", default="http://localhost:19530", help="Milvus URI")
+    parser.add_argument("--sizes", type=parse_ints, default=parse_ints("1000,10000,100000"), help="카탈로그 크기 목록")
+    parser.add_argument("--indexes", default="FLAT,HNSW,IVF_FLAT", help="비교할 인덱스 유형 (쉼표 구분)")
+    parser.add_argument("--dim", type=int, default=384, help="벡터 차원 (MiniLM: 384)")
+    parser.add_argument("--clusters", type=int, default=200, help="합성 카탈로그 군집 수")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=8, help="동시 검색 스레드 수")
+    parser.add_argument("--hnsw-m", type=int, default=16)
+    parser.add_argument("--hnsw-ef-construction", type=int, default=200)
+    parser.add_argument("--ef", type=parse_ints, default=parse_ints("16,32,64,128,256"), help="HNSW ef 후보")
+    parser.add_argument("--nlist", type=int, default=128, help="IVF nlist")
+    parser.add_argument("--nprobe", type=parse_ints, default=parse_ints("1,4,16,64"), help="IVF nprobe 후보")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="측정 후 벤치마크 컬렉션을 삭제하지 않음")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/ann_<commit>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    client = MilvusClient(uri=args.uri)
+    queries = make_queries(args.queries, args.dim, args.clusters, args.seed)
+    results = []
+
+    for size in args.sizes:
+        collection = f"ann_bench_{size}"
+        truth = brute_force_top_k(queries, size, args.dim, args.clusters, args.seed, args.top_k)
+        load_s = load_catalog(client, collection, size, args.dim, args.clusters, args.seed)
+        print(f"[ann_bench] size={size}: 입력 {load_s:.1f}s")
+
+        for index_type in [item.strip().upper() for item in args.indexes.split(",") if item.strip()]:
+            index = build_params(
+                index_type,
+                hnsw_m=args.hnsw_m,
+                hnsw_ef_construction=args.hnsw_ef_construction,
+                ivf_nlist=args.nlist,
+            )
+            build_s = build_index(client, collection, index)
+            for params in sweep(index_type, args):
+                measured = run_searches(client, collection, queries, truth, args.top_k, params, args.threads)
+                results.append({"size": size, "index_type": index_type, "build_params": index["params"],
+                                "build_s": round(build_s, 2), **measured})
+                print(f"  {index_type:<10} {json.dumps(params['params']):<18} recall@{args.top_k} "
+                      f"{measured[f'recall@{args.top_k}']:<7} qps {measured['qps']:>8}  "
+                      f"p50 {measured['latency_ms']['p50']:>7} ms  p99 {measured['latency_ms']['p99']:>7} ms  "
+                      f"(build {build_s:.1f}s)")
+
+        if not args.keep:
+            client.drop_collection(collection)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "uri": args.uri,
+            "dim": args.dim,
+            "clusters": args.clusters,
+            "queries": args.queries,
+            "top_k": args.top_k,
+            "threads": args.threads,
+        },
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"ann_{commit}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[ann_bench] {len(results)}개 측정 → {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
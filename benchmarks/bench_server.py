@@ -0,0 +1,223 @@
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from benchmarks.fakes import FakeOracleManager, HashEmbedder, build_vector_store
+from benchmarks.faults import Fault, parse_fault
+from benchmarks.stubs import UpstreamStub
+
+"""
+==================================================
+벤치마크 모듈: 벤치마크용 MCP 서버 (bench_server)
+==================================================
+이 파일은 `mcp_server.create_server()`로 실제 도구/미들웨어를 그대로 등록하되,
+외부 의존성을 로컬 대체 리소스로 교체한 MCP 서버를 HTTP 전송으로 실행합니다.
+
+주요 역할:
+1. UpstreamStub을 띄우고 Google/OpenWeatherMap/DuckDuckGo URL을 스텁으로 지정합니다.
+2. FakeOracleManager, InMemoryVectorStore, HashEmbedder로 lifespan을 구성합니다.
+3. 이벤트 루프 지연(lag)을 주기적으로 측정하고, 도구 호출 구간과 겹치는 지연을 도구별로 집계합니다.
+   결과는 `GET /bench/stats` 로 조회하고 `POST /bench/reset` 으로 초기화합니다.
+4. `--fault` 또는 `POST /bench/faults`로 스텁(google/weather/duckduckgo)과
+   가짜 리소스(oracle/milvus)에 장애를 주입합니다.
+
+실행:
+    python -m benchmarks.bench_server --port 9192
+    python -m benchmarks.bench_server --fault weather:error_rate=1 --fault milvus:stall_rate=0.05,stall_seconds=10
+"""
+
+LAG_INTERVAL = 0.01
+
+
+class LoopLagProbe:
+    """
+    이벤트 루프 지연 샘플과 도구 호출 구간을 기록하여 도구별 루프 지연을 계산합니다.
+    """
+
+    def __init__(self, interval: float = LAG_INTERVAL):
+        self.interval = interval
+        self.samples = []   # (window_start, window_end, lag_seconds)
+        self.calls = []     # (tool_name, start, end)
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            end = time.perf_counter()
+            self.samples.append((start, end, max(0.0, end - start - self.interval)))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    def reset(self):
+        self.samples.clear()
+        self.calls.clear()
+
+    def record_call(self, tool_name: str, start: float, end: float):
+        self.calls.append((tool_name, start, end))
+
+    def stats(self) -> dict:
+        starts = [sample[0] for sample in self.samples]
+        per_tool = {}
+        for tool_name, call_start, call_end in self.calls:
+            # 호출 구간 [call_start, call_end]와 겹치는 지연 샘플 중 최댓값
+            index = max(0, bisect_left(starts, call_start) - 1)
+            worst = 0.0
+            while index < len(self.samples) and self.samples[index][0] <= call_end:
+                if self.samples[index][1] >= call_start:
+                    worst = max(worst, self.samples[index][2])
+                index += 1
+            per_tool.setdefault(tool_name, []).append(worst * 1000)
+
+        return {
+            "loop_lag_ms": _summary([sample[2] * 1000 for sample in self.samples]),
+            "tools": {name: {"loop_lag_ms": _summary(values)} for name, values in per_tool.items()},
+        }
+
+
+def _summary(values: list) -> dict:
+    if not values:
+        return {"count": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50": round(ordered[int(0.50 * (len(ordered) - 1))], 3),
+        "p99": round(ordered[int(0.99 * (len(ordered) - 1))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def build_bench_server(args):
+    """
+    스텁/가짜 리소스로 구성된 MCP 서버를 생성합니다.
+    settings 모듈이 환경 변수를 읽기 전에 스텁 URL을 지정해야 하므로 mcp_server는 여기서 import 합니다.
+    """
+
+    faults = {}
+    for spec in args.fault:
+        faults.update(parse_fault(spec))
+
+    stub = UpstreamStub(
+        latency={
+            "google": args.google_latency,
+            "weather": args.weather_latency,
+            "duckduckgo": args.duckduckgo_latency,
+        },
+        faults={name: fault for name, fault in faults.items() if name in ("google", "weather", "duckduckgo")},
+    ).start()
+    os.environ["GOOGLE_WEB_SEARCH_URL"] = f"{stub.base_url}/google"
+    os.environ["GOOGLE_WEB_SEARCH_API_KEY"] = "bench"
+    os.environ["OPEN_WEATHER_MAP_URL"] = f"{stub.base_url}/weather"
+    os.environ["OPEN_WEATHER_MAP_API_KEY"] = "bench"
+    os.environ["DUCKDUCKGO_BASE_URL"] = f"{stub.base_url}/duckduckgo"
+    os.environ["TEMPLATE_CACHE_SIZE"] = str(args.template_cache_size)
+
+    from fastmcp.server.middleware import Middleware
+    from starlette.responses import JSONResponse
+    from mcp_server import create_server
+    from mcp_servers.tools.query.milvus_search import COLLECTION_NAME
+    from mcp_servers.types import AppContext
+
+    probe = LoopLagProbe()
+    resources = {}  # 장애 주입 대상 가짜 리소스 (lifespan에서 등록)
+
+    @asynccontextmanager
+    async def bench_lifespan(server):
+        oracle = FakeOracleManager(
+            max=args.pool_max,
+            query_latency=args.oracle_latency,
+            rows_per_query=args.rows_per_query,
+            fault=faults.get("oracle"),
+        )
+        await oracle.connect()
+        embedder = HashEmbedder(cpu_cost=args.embed_cpu_cost)
+        milvus = build_vector_store(embedder, COLLECTION_NAME)
+        milvus.fault = faults.get("milvus", Fault())
+        resources["oracle"] = oracle.pool
+        resources["milvus"] = milvus
+        probe.start()
+        try:
+            yield AppContext(oracle=oracle, milvus=milvus, embedder=embedder)
+        finally:
+            await probe.stop()
+            await oracle.disconnect()
+            stub.stop()
+
+    class ToolTimingMiddleware(Middleware):
+        # 도구 호출 구간을 기록합니다. (루프 지연 샘플과 매칭하기 위함)
+        async def on_call_tool(self, context, call_next):
+            start = time.perf_counter()
+            try:
+                return await call_next(context)
+            finally:
+                probe.record_call(context.message.name, start, time.perf_counter())
+
+    mcp = create_server(server_lifespan=bench_lifespan)
+    mcp.add_middleware(ToolTimingMiddleware())
+
+    async def bench_stats(request):
+        stats = probe.stats()
+        stats["upstream_requests"] = dict(stub.requests)
+        stats["injected_errors"] = dict(stub.injected_errors)
+        return JSONResponse(stats)
+
+    async def bench_faults(request):
+        # 예: {"weather": {"error_rate": 1.0}, "milvus": {"stall_rate": 0.1, "stall_seconds": 10}}
+        #     빈 객체({"weather": {}})를 보내면 해당 대상의 장애 설정을 해제합니다.
+        body = await request.json()
+        for name, options in body.items():
+            fault = Fault(**options)
+            if name in stub.faults:
+                stub.faults[name] = fault
+            elif name in resources:
+                resources[name].fault = fault
+            else:
+                return JSONResponse({"error": f"unknown fault target: {name}"}, status_code=400)
+        return JSONResponse({"updated": list(body)})
+
+    async def bench_reset(request):
+        probe.reset()
+        return JSONResponse({"reset": True})
+
+    mcp.custom_route("/bench/stats", methods=["GET"])(bench_stats)
+    mcp.custom_route("/bench/reset", methods=["POST"])(bench_reset)
+    mcp.custom_route("/bench/faults", methods=["POST"])(bench_faults)
+    return mcp
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MCP 서버 벤치마크용 서버 (로컬 스텁/가짜 리소스)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9192)
+    parser.add_argument("--google-latency", type=float, default=0.05, help="Google 스텁 응답 지연(초)")
+    parser.add_argument("--weather-latency", type=float, default=0.03, help="날씨 스텁 응답 지연(초)")
+    parser.add_argument("--duckduckgo-latency", type=float, default=0.08, help="DuckDuckGo 스텁 응답 지연(초)")
+    parser.add_argument("--oracle-latency", type=float, default=0.005, help="가짜 Oracle 쿼리 지연(초)")
+    parser.add_argument("--pool-max", type=int, default=10, help="가짜 Oracle 풀 최대 연결 수")
+    parser.add_argument("--rows-per-query", type=int, default=1, help="가짜 Oracle 쿼리 결과 행 수")
+    parser.add_argument("--embed-cpu-cost", type=int, default=200, help="HashEmbedder CPU 부하 반복 횟수")
+    parser.add_argument("--template-cache-size", type=int, default=0,
+                        help="milvus_search 결과 캐시 크기 (기본 0: 매 요청 임베딩/검색 경로를 측정)")
+    parser.add_argument("--fault", action="append", default=[],
+                        help="장애 주입 (예: weather:error_rate=0.5,stall_rate=0.1,stall_seconds=5). 여러 번 지정 가능")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mcp = build_bench_server(args)
+    print(f"[bench_server] http://{args.host}:{args.port}/mcp", file=sys.stderr)
+    mcp.run(transport="http", host=args.host, port=args.port, show_banner=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import subprocess
+import time
+
+from mcp_servers.cpu_tasks import available_duckduckgo_parsers, parse_duckduckgo_results
+
+"""
+==================================================
+벤치마크 모듈: DuckDuckGo 결과 HTML 파서별 처리 시간 (ddg_parse_bench)
+==================================================
+이 파일은 저장된 DuckDuckGo 검색 결과 HTML(benchmarks/fixtures/duckduckgo/*.html)을
+설치된 파서(selectolax, lxml, html.parser)별로 파싱하여 처리 시간을 비교합니다.
+
+- max_results별로 측정합니다. (유효한 결과가 모이면 나머지 결과는 처리하지 않음)
+- 모든 파서의 결과가 html.parser 결과와 같은지 함께 확인합니다. (다르면 종료 코드 1)
+
+실행 예:
+    python -m benchmarks.ddg_parse_bench
+    python -m benchmarks.ddg_parse_bench --max-results 1,5,0 --repeat 50
+"""
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "duckduckgo"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+REFERENCE_PARSER = "html.parser"
+
+
+def measure_parse(html: str, parser: str, max_results: Optional[int], repeat: int) -> Dict:
+    timings = []
+    results: List[Dict[str, str]] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = parse_duckduckgo_results(html, max_results, parser=parser)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"parse_ms": round(min(timings), 3), "results": len(results), "output": results}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="DuckDuckGo 결과 HTML 파서별 처리 시간 벤치마크")
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR), help="HTML fixture 디렉토리")
+    parser.add_argument("--max-results", default="1,5,0", help="max_results 목록 (쉼표 구분, 0이면 전체)")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수 (최솟값 기록)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/ddg_parse_<commit>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    parsers = available_duckduckgo_parsers()
+    fixtures = sorted(Path(args.fixtures).glob("*.html"))
+    if not fixtures:
+        print(f"[ddg_parse_bench] fixture가 없습니다: {args.fixtures}")
+        return 1
+    print(f"[ddg_parse_bench] parsers: {', '.join(parsers)}")
+
+    results = []
+    mismatches = 0
+    for fixture in fixtures:
+        html = fixture.read_text(encoding="utf-8")
+        for max_results in [int(item) or None for item in args.max_results.split(",") if item.strip()]:
+            reference = None
+            for parser in [REFERENCE_PARSER] + [name for name in parsers if name != REFERENCE_PARSER]:
+                measured = measure_parse(html, parser, max_results, args.repeat)
+                output = measured.pop("output")
+                if reference is None:
+                    reference = output
+                measured.update({
+                    "fixture": fixture.name,
+                    "bytes": len(html.encode("utf-8")),
+                    "max_results": max_results,
+                    "parser": parser,
+                    "matches_reference": output == reference,
+                })
+                mismatches += not measured["matches_reference"]
+                results.append(measured)
+                print(f"  {fixture.name:<24} max {str(max_results):>4}  {parser:<11} "
+                      f"parse {measured['parse_ms']:>8} ms  results {measured['results']:>3}"
+                      f"{'' if measured['matches_reference'] else '  (결과 불일치)'}")
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "parsers": parsers,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"ddg_parse_{commit}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[ddg_parse_bench] 결과 저장 → {output}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,332 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from types import SimpleNamespace
+import asyncio
+import hashlib
+import math
+import numpy as np
+import oracledb
+
+from benchmarks.faults import Fault
+from db.templates import TEMPLATES
+from utils.oracle_pool import acquire, call_timeout_ms
+
+"""
+==================================================
+벤치마크 모듈: 로컬 대체 리소스 (Fake Oracle / Vector Store / Embedder)
+==================================================
+이 파일은 실제 Oracle DB, Milvus, SentenceTransformer 없이 MCP 서버를 구동하기 위한
+가짜 리소스를 정의합니다. 벤치마크 서버(bench_server.py)의 lifespan에서 사용됩니다.
+
+주요 역할:
+1. FakeOraclePool/FakeOracleManager: `oracle_query`가 사용하는 async pool/connection/cursor 인터페이스를 흉내 내며,
+   실제 풀과 같이 최대 연결 수를 제한하여 풀 대기 시간을 재현합니다.
+2. InMemoryVectorStore: `MilvusClient.search`와 같은 형식으로 코사인 유사도 검색 결과를 반환합니다. (query/query_iterator로 템플릿 전체 조회)
+3. HashEmbedder: 텍스트를 해시 기반으로 384차원 벡터로 변환하는 결정적(deterministic) 임베더입니다.
+4. 각 리소스의 `fault` 속성(Fault)으로 연결 오류, 지연 증가, 응답 정지를 주입할 수 있습니다.
+"""
+
+EMBEDDING_DIM = 384
+
+
+class HashEmbedder:
+    """
+    모델 로딩 없이 `encode()` 인터페이스를 제공하는 임베더입니다.
+    `cpu_cost` 만큼 연산을 반복하여 실제 모델의 CPU 사용량을 흉내 낼 수 있습니다.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, cpu_cost: int = 0):
+        self.dim = dim
+        self.cpu_cost = cpu_cost
+
+    def encode(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().split():
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dim
+            vector[index] += 1.0 if digest[4] % 2 == 0 else -1.0
+
+        # CPU 부하 재현 (이벤트 루프를 점유하는 동기 연산)
+        for _ in range(self.cpu_cost):
+            vector = np.tanh(vector + 1e-6)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class InMemoryVectorStore:
+    """
+    `MilvusClient.search()`와 동일한 반환 형식을 가진 메모리 벡터 저장소입니다.
+    """
+
+    def __init__(self):
+        self.collections: Dict[str, List[Dict[str, Any]]] = {}
+        self.fault = Fault()
+
+    def insert(self, collection_name: str, data: List[Dict[str, Any]]):
+        rows = self.collections.setdefault(collection_name, [])
+        for item in data:
+            # Milvus 템플릿 컬렉션과 같이 template_key를 기본 키(id)로 사용합니다.
+            rows.append({"id": item.get("template_key", len(rows) + 1), **item})
+
+    def query(
+        self,
+        collection_name: str,
+        filter: str = "",
+        output_fields: Optional[List[str]] = None,
+        limit: int = 16384,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        # 필터 식은 해석하지 않고 전체 행을 반환합니다. (템플릿 전체 조회 용도)
+        rows = self.collections.get(collection_name, [])[:limit]
+        return [{field: row.get(field) for field in (output_fields or [])} for row in rows]
+
+    def query_iterator(
+        self,
+        collection_name: str,
+        batch_size: int = 1000,
+        filter: str = "",
+        output_fields: Optional[List[str]] = None,
+        **kwargs,
+    ) -> "_QueryIterator":
+        # MilvusClient.query_iterator와 같이 batch_size 행씩 next()로 반환합니다. (빈 목록이면 끝)
+        rows = self.query(collection_name, filter, output_fields, limit=len(self.collections.get(collection_name, [])))
+        return _QueryIterator(rows, batch_size)
+
+    def search(
+        self,
+        collection_name: str,
+        data: List[List[float]],
+        anns_field: str = "vector",
+        limit: int = 10,
+        search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None,
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        if self.fault.apply():
+            raise ConnectionError("injected milvus fault")
+        rows = [row for row in self.collections.get(collection_name, []) if _matches(row, kwargs.get("filter_params"))]
+        results = []
+        for query in data:
+            scored = []
+            for row in rows:
+                score = _cosine(query, row[anns_field])
+                entity = {field: row.get(field) for field in (output_fields or [])}
+                scored.append({"id": row["id"], "distance": score, "entity": entity})
+            scored.sort(key=lambda hit: hit["distance"], reverse=True)
+            results.append(scored[:limit])
+        return results
+
+    def close(self):
+        pass
+
+
+class _QueryIterator:
+    def __init__(self, rows: List[Dict[str, Any]], batch_size: int):
+        self.rows = rows
+        self.batch_size = batch_size
+        self.offset = 0
+
+    def next(self) -> List[Dict[str, Any]]:
+        batch = self.rows[self.offset:self.offset + self.batch_size]
+        self.offset += len(batch)
+        return batch
+
+    def close(self):
+        self.rows = []
+
+
+def _matches(row: Dict[str, Any], params: Optional[Dict[str, Any]]) -> bool:
+    # 범위 필터(mcp_servers/tenancy.py)의 filter_params만 해석합니다. 목록 값은 교집합, 그 외는 일치 여부
+    for field, value in (params or {}).items():
+        if isinstance(value, list):
+            if not set(row.get(field) or ()) & set(value):
+                return False
+        elif row.get(field) != value:
+            return False
+    return True
+
+
+def _cosine(a, b) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class FakeConnectionLost(oracledb.OperationalError):
+    # 연결 끊김(DPY-4011)을 흉내 내는 주입 오류. oracledb 오류와 같이 args[0]에 오류 정보를 담습니다.
+
+    def __init__(self):
+        super().__init__(SimpleNamespace(
+            full_code="DPY-4011",
+            isrecoverable=True,
+            message="DPY-4011: injected fault - the database or network closed the connection",
+        ))
+
+    def __str__(self):
+        return self.args[0].message
+
+
+class FakeCursor:
+    # oracledb AsyncCursor 인터페이스 중 oracle_query가 사용하는 부분만 구현합니다.
+
+    def __init__(self, pool: "FakeOraclePool"):
+        self.pool = pool
+        self.description = None
+        self._rows: List[tuple] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self, statement: str, parameters=None):
+        await asyncio.sleep(self.pool.query_latency)
+        if await self.pool.fault.apply_async():
+            raise FakeConnectionLost()
+
+        # 테이블 이름에 따라 고정된 결과를 반환합니다.
+        lowered = statement.lower()
+        if "loan" in lowered:
+            self.description = [("MONEY",)]
+            self._rows = [(100000,)] * self.pool.rows_per_query
+        else:
+            self.description = [("BALANCE",)]
+            self._rows = [(1000,)] * self.pool.rows_per_query
+
+    async def fetchall(self) -> List[tuple]:
+        return list(self._rows)
+
+    async def fetchmany(self, size: int = 1) -> List[tuple]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, pool: "FakeOraclePool"):
+        self.pool = pool
+        # DB 왕복 1회당 타임아웃(ms, 0은 제한 없음). AsyncOraclePool.connection()이 설정하고 반납 전에 되돌립니다.
+        self.call_timeout = 0
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self.pool)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.pool.release(self)
+        return False
+
+
+class _Acquire:
+    # `await pool.acquire()` 와 `async with pool.acquire()` 를 모두 지원합니다.
+
+    def __init__(self, pool: "FakeOraclePool"):
+        self.pool = pool
+        self.connection = None
+
+    def __await__(self):
+        return self.pool._acquire().__await__()
+
+    async def __aenter__(self):
+        self.connection = await self.pool._acquire()
+        return self.connection
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.pool.release(self.connection)
+        return False
+
+
+class FakeOraclePool:
+    """
+    최대 연결 수(`max`)를 가진 가짜 Oracle 연결 풀입니다.
+    """
+
+    def __init__(self, max: int = 10, query_latency: float = 0.005, rows_per_query: int = 1, fault: Optional[Fault] = None):
+        self.max = max
+        self.fault = fault or Fault()
+        self.query_latency = query_latency
+        self.rows_per_query = rows_per_query
+        self._semaphore = asyncio.Semaphore(max)
+        self.busy = 0
+
+    def acquire(self) -> _Acquire:
+        return _Acquire(self)
+
+    async def _acquire(self) -> FakeConnection:
+        await self._semaphore.acquire()
+        self.busy += 1
+        return FakeConnection(self)
+
+    async def release(self, connection: FakeConnection):
+        self.busy -= 1
+        self._semaphore.release()
+
+    async def close(self):
+        pass
+
+
+class FakeOracleManager:
+    """
+    OracleManager와 같은 connect/disconnect/get_pool/connection 인터페이스를 제공합니다.
+    """
+
+    def __init__(self, **pool_options):
+        self.pool_options = pool_options
+        self.pool = None
+
+    async def connect(self):
+        self.pool = FakeOraclePool(**self.pool_options)
+        return self
+
+    async def disconnect(self):
+        if self.pool:
+            await self.pool.close()
+
+    async def get_pool(self):
+        if not self.pool:
+            await self.connect()
+        return self.pool
+
+    @asynccontextmanager
+    async def connection(self, call_timeout: Optional[float] = None) -> AsyncIterator[FakeConnection]:
+        # AsyncOraclePool.connection()과 같이 요청 기한까지만 연결을 기다리고, call_timeout을 설정했다가 반납 전에 되돌립니다.
+        pool = await self.get_pool()
+        connection = await acquire(pool)
+        previous = connection.call_timeout
+        try:
+            connection.call_timeout = call_timeout_ms(call_timeout)
+            yield connection
+        finally:
+            connection.call_timeout = previous
+            await pool.release(connection)
+
+
+def build_vector_store(embedder: HashEmbedder, collection_name: str) -> InMemoryVectorStore:
+    """
+    템플릿 카탈로그(db/templates.py)를 임베딩하여 InMemoryVectorStore를 생성합니다.
+    """
+
+    store = InMemoryVectorStore()
+    store.insert(
+        collection_name,
+        [
+            {"template_key": item["key"], "vector": embedder.encode(item["intent_description"]).tolist(), **item}
+            for item in TEMPLATES
+        ],
+    )
+    return store
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import Dict
+import asyncio
+import random
+import time
+
+"""
+==================================================
+벤치마크 모듈: 장애 주입 (Fault)
+==================================================
+이 파일은 로컬 스텁(UpstreamStub)과 가짜 리소스(FakeOraclePool, InMemoryVectorStore)에
+오류 응답, 지연 증가, 응답 정지(stall)를 주입하기 위한 설정 객체를 정의합니다.
+회로 차단기, 재시도, 헤징 동작을 외부 의존성 없이 재현하는 데 사용합니다.
+
+설정 형식 (bench_server --fault / POST /bench/faults):
+    google:error_rate=0.5,stall_rate=0.1,stall_seconds=5,extra_latency=0.2
+"""
+
+@dataclass
+class Fault:
+    error_rate: float = 0.0     # 오류를 반환할 확률
+    stall_rate: float = 0.0     # stall_seconds 동안 응답하지 않을 확률
+    stall_seconds: float = 30.0
+    extra_latency: float = 0.0  # 모든 요청에 추가할 지연(초)
+
+    def delay(self) -> float:
+        if self.stall_rate and random.random() < self.stall_rate:
+            return self.extra_latency + self.stall_seconds
+        return self.extra_latency
+
+    def should_fail(self) -> bool:
+        return bool(self.error_rate) and random.random() < self.error_rate
+
+    def apply(self) -> bool:
+        """
+        동기 방식(스텁 서버 스레드)으로 지연을 적용하고, 오류를 반환해야 하는지 여부를 반환합니다.
+        """
+
+        delay = self.delay()
+        if delay:
+            time.sleep(delay)
+        return self.should_fail()
+
+    async def apply_async(self) -> bool:
+        delay = self.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self.should_fail()
+
+
+def parse_fault(spec: str) -> Dict[str, Fault]:
+    """
+    "google:error_rate=0.5,stall_rate=0.1" 형식의 문자열을 {대상: Fault}로 변환합니다.
+    """
+
+    target, _, options = spec.partition(":")
+    values = {}
+    for item in options.split(","):
+        key, _, value = item.partition("=")
+        if key.strip():
+            values[key.strip()] = float(value)
+    return {target.strip(): Fault(**values)}
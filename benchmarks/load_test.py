@@ -0,0 +1,313 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import random
+import shlex
+import subprocess
+import sys
+import time
+
+import httpx
+from fastmcp import Client
+
+"""
+==================================================
+벤치마크 모듈: MCP 서버 부하 테스트 (load_test)
+==================================================
+이 파일은 MCP 서버를 HTTP 전송으로 호출하여 처리량과 지연 시간을 측정합니다.
+
+주요 역할:
+1. 벤치마크 서버(bench_server.py)를 하위 프로세스로 실행하거나, `--url`로 지정한 서버에 연결합니다.
+2. 설정한 동시성(concurrency)과 도구 비율(mix)로 도구 호출을 반복합니다.
+3. 도구별 처리량, 지연 시간 백분위수(p50/p90/p99), 이벤트 루프 지연을 JSON으로 저장합니다.
+4. 기준(baseline) 결과와 비교하여 처리량이 임계값 이상 떨어지면 종료 코드 1을 반환합니다.
+
+실행 예:
+    python -m benchmarks.load_test --concurrency 16 --duration 20 --save-baseline
+    python -m benchmarks.load_test --concurrency 16 --duration 20 --baseline benchmarks/results/baseline.json
+"""
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_MIX = "google_search=1,open_weather_map=1,milvus_search=2,oracle_query=2"
+CITIES = ["Seoul", "Busan", "Incheon", "Daegu", "Daejeon", "Gwangju"]
+INTENTS = ["Kim 대출 금액 얼마야?", "Alice 계좌 잔액 알려줘", "Park 대출금 조회", "Bob 예금 잔액"]
+
+
+def tool_arguments(tool_name: str, index: int) -> dict:
+    """
+    도구별 호출 인자를 생성합니다.
+    """
+
+    if tool_name == "google_search":
+        return {"inputs": {"query": f"benchmark query {index % 50}"}}
+    if tool_name == "open_weather_map":
+        return {"city": CITIES[index % len(CITIES)]}
+    if tool_name == "milvus_search":
+        return {"intent": INTENTS[index % len(INTENTS)]}
+    if tool_name == "oracle_query":
+        return {
+            "inputs": {
+                "sql_template": "SELECT money FROM loan WHERE borrower = :borrower",
+                "params": {"borrower": "Kim"},
+            }
+        }
+    if tool_name == "duckduckgo_search":
+        return {"query": f"benchmark query {index % 50}", "max_results": 3}
+    raise ValueError(f"Unknown tool in mix: {tool_name}")
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def summarize(values: list) -> dict:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[int(q * (len(ordered) - 1))], 3)
+
+    return {
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+    }
+
+
+async def run_worker(worker_id: int, url: str, weights: dict, deadline: float, records: list, seed: int):
+    """
+    하나의 MCP 세션으로 deadline까지 도구 호출을 반복합니다.
+    """
+
+    rng = random.Random(seed + worker_id)
+    names = list(weights)
+    population = [weights[name] for name in names]
+    index = 0
+
+    async with Client(url) as client:
+        while time.perf_counter() < deadline:
+            tool_name = rng.choices(names, population)[0]
+            start = time.perf_counter()
+            ok = True
+            shed = False
+            try:
+                result = await client.call_tool(tool_name, tool_arguments(tool_name, index))
+                # 입장 제어(AdmissionMiddleware)로 거절된 요청
+                shed = bool((getattr(result, "meta", None) or {}).get("overloaded"))
+            except Exception:
+                ok = False
+            records.append((tool_name, (time.perf_counter() - start) * 1000, ok, shed))
+            index += 1
+
+
+async def run_load(url: str, concurrency: int, duration: float, warmup: float, weights: dict, seed: int) -> dict:
+    base_url = url.rsplit("/mcp", 1)[0]
+
+    # 1. 워밍업 (모델/커넥션 초기화 비용 제외)
+    if warmup > 0:
+        await asyncio.gather(*[
+            run_worker(i, url, weights, time.perf_counter() + warmup, [], seed)
+            for i in range(concurrency)
+        ])
+
+    async with httpx.AsyncClient() as http:
+        await _try_request(http, "POST", f"{base_url}/bench/reset")
+
+        # 2. 본 측정
+        records = []
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            run_worker(i, url, weights, started + duration, records, seed)
+            for i in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+        # 3. 서버 측 이벤트 루프 지연 통계
+        server_stats = await _try_request(http, "GET", f"{base_url}/bench/stats") or {}
+
+    return build_report(records, elapsed, server_stats)
+
+
+async def _try_request(http: httpx.AsyncClient, method: str, url: str):
+    try:
+        response = await http.request(method, url, timeout=10.0)
+        if response.status_code == 200:
+            return response.json()
+    except httpx.HTTPError:
+        pass
+    return None
+
+
+def build_report(records: list, elapsed: float, server_stats: dict) -> dict:
+    tools = {}
+    for tool_name, latency_ms, ok, shed in records:
+        entry = tools.setdefault(tool_name, {"latencies": [], "errors": 0, "shed": 0})
+        entry["latencies"].append(latency_ms)
+        if not ok:
+            entry["errors"] += 1
+        if shed:
+            entry["shed"] += 1
+
+    server_tools = server_stats.get("tools", {})
+    report_tools = {}
+    for tool_name, entry in sorted(tools.items()):
+        report_tools[tool_name] = {
+            "requests": len(entry["latencies"]),
+            "errors": entry["errors"],
+            "shed": entry["shed"],
+            "throughput_rps": round(len(entry["latencies"]) / elapsed, 2),
+            "latency_ms": summarize(entry["latencies"]),
+            "loop_lag_ms": server_tools.get(tool_name, {}).get("loop_lag_ms", {}),
+        }
+
+    all_latencies = [latency for _, latency, _, _ in records]
+    return {
+        "overall": {
+            "requests": len(records),
+            "errors": sum(1 for _, _, ok, _ in records if not ok),
+            "shed": sum(1 for *_, shed in records if shed),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(records) / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": summarize(all_latencies),
+            "loop_lag_ms": server_stats.get("loop_lag_ms", {}),
+        },
+        "tools": report_tools,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """
+    기준 결과 대비 처리량 하락률이 threshold를 넘는 항목을 반환합니다.
+    """
+
+    regressions = []
+    pairs = [("overall", report["overall"], baseline.get("overall", {}))]
+    pairs += [
+        (name, stats, baseline.get("tools", {}).get(name, {}))
+        for name, stats in report["tools"].items()
+    ]
+
+    for name, current, previous in pairs:
+        before = previous.get("throughput_rps")
+        if not before:
+            continue
+        change = (current["throughput_rps"] - before) / before
+        print(f"  {name:<20} {before:>10.2f} → {current['throughput_rps']:>10.2f} rps ({change:+.1%})")
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def start_bench_server(port: int, server_args: str) -> subprocess.Popen:
+    command = [sys.executable, "-m", "benchmarks.bench_server", "--port", str(port)]
+    command += shlex.split(server_args)
+    return subprocess.Popen(command)
+
+
+def wait_until_ready(base_url: str, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/bench/stats", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"벤치마크 서버가 {timeout}초 내에 준비되지 않았습니다: {base_url}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MCP 서버 HTTP 부하 테스트")
+    parser.add_argument("--url", help="이미 실행 중인 MCP 서버 URL (예: http://127.0.0.1:9092/mcp)")
+    parser.add_argument("--port", type=int, default=9192, help="벤치마크 서버 포트 (--url 미지정 시)")
+    parser.add_argument("--server-args", default="", help="bench_server에 전달할 추가 인자")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="워밍업 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="도구별 호출 비율 (예: milvus_search=2,oracle_query=1)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/<commit>.json)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 benchmarks/results/baseline.json 으로도 저장")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="허용 처리량 하락률 (기본값 10%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    weights = parse_mix(args.mix)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = start_bench_server(args.port, args.server_args)
+        url = f"http://127.0.0.1:{args.port}/mcp"
+
+    try:
+        if server is not None:
+            wait_until_ready(url.rsplit("/mcp", 1)[0])
+        report = asyncio.run(
+            run_load(url, args.concurrency, args.duration, args.warmup, weights, args.seed)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    commit = git_commit()
+    report["meta"] = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "url": url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "mix": weights,
+        "server_args": args.server_args,
+    }
+
+    # 결과 저장
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.save_baseline:
+        (RESULTS_DIR / "baseline.json").write_text(
+            json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+
+    overall = report["overall"]
+    print(f"[load_test] {overall['requests']} requests, {overall['errors']} errors, {overall['shed']} shed, "
+          f"{overall['throughput_rps']} rps, p99 {overall['latency_ms']['p99']} ms → {output}")
+    for name, stats in report["tools"].items():
+        print(f"  {name:<20} {stats['throughput_rps']:>8} rps  p50 {stats['latency_ms']['p50']:>8} ms  "
+              f"p99 {stats['latency_ms']['p99']:>8} ms  loop lag max {stats['loop_lag_ms'].get('max', 0)} ms")
+
+    # 기준 결과 비교
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print(f"[load_test] baseline {baseline.get('meta', {}).get('commit')} 대비 처리량:")
+        regressions = compare(report, baseline, args.max_regression)
+        if regressions:
+            print(f"[load_test] ❌ 처리량 하락 감지: {', '.join(regressions)}")
+            return 1
+        print("[load_test] ✅ 처리량 하락 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
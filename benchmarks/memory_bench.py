@@ -0,0 +1,243 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils.admission import parse_limits
+from utils.embedding_sidecar import SidecarEmbedder
+
+"""
+==================================================
+벤치마크 모듈: 프로세스별 최대 RSS 회귀 확인 (memory_bench)
+==================================================
+이 파일은 MCP 서버 워커 한 개가 시작할 때 사용하는 최대 RSS(VmHWM)를 구성별로 측정하고,
+예산(DEFAULT_BUDGETS_MB)을 넘거나 기준(baseline) 결과보다 늘어나면 종료 코드 1을 반환합니다.
+
+구성 (각각 새 하위 프로세스에서 서버 lifespan을 실제로 실행한 뒤 측정, CPU 풀은 끔):
+- weather_search : TOOLS_ENABLED=weather,search (torch를 import 하면 실패)
+- query_local    : 모든 도구 + 현재 프로세스에 임베딩 모델 로드 후 한 번 encode (EMBEDDING_BACKEND=local)
+- query_sidecar  : 모든 도구 + 임베딩 사이드카로 한 번 encode (EMBEDDING_BACKEND=sidecar, torch를 import 하면 실패)
+- sidecar        : 임베딩 사이드카 프로세스 (query_sidecar 측정 시 함께 실행)
+
+query_* 구성은 lifespan에서 Oracle/Milvus 연결을 만들므로 DB가 실행 중이어야 합니다.
+구성 요소별 RSS 증가량(lifespan의 memory_report)도 결과에 기록하고 COMPONENT_BUDGETS_MB와 비교합니다.
+기준 결과는 기준 장비에서 --save-baseline 으로 만들며, 있으면 --baseline 없이도 비교합니다.
+
+`--workers N`이면 워커 N개 기준 합계(local: query_local x N, sidecar: query_sidecar x N + sidecar)도 출력합니다.
+
+실행 예:
+    python -m benchmarks.memory_bench --save-baseline
+    python -m benchmarks.memory_bench --baseline benchmarks/results/memory_baseline.json
+    python -m benchmarks.memory_bench --scenarios weather_search --budget weather_search=250
+"""
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BASELINE_PATH = RESULTS_DIR / "memory_baseline.json"
+# 워커 RSS를 따로 재기 위해 CPU 풀은 끄고 측정합니다. (query_local은 임베딩 모델을 현재 프로세스에 로드)
+SCENARIOS = {
+    "weather_search": {"TOOLS_ENABLED": "weather,search", "CPU_POOL_ENABLED": "false"},
+    "query_local": {"TOOLS_ENABLED": "*", "EMBEDDING_BACKEND": "local", "CPU_POOL_ENABLED": "false"},
+    "query_sidecar": {"TOOLS_ENABLED": "*", "EMBEDDING_BACKEND": "sidecar", "CPU_POOL_ENABLED": "false"},
+}
+# torch를 import 하면 안 되는 구성
+NO_TORCH = {"weather_search", "query_sidecar"}
+# 구성별 최대 RSS 예산 (MB). --budget 으로 구성별로 덮어씁니다.
+DEFAULT_BUDGETS_MB = {
+    "weather_search": 250,
+    "query_sidecar": 350,
+    "query_local": 1200,
+    "sidecar": 1200,
+}
+# lifespan 구성 요소별 RSS 증가량 예산 (MB, memory_report.components_mb)
+COMPONENT_BUDGETS_MB = {
+    "oracle": 64,
+    "milvus": 128,
+    "embedding": 900,
+}
+
+
+async def start_server(scenario: str) -> Dict:
+    """
+    서버 lifespan을 실행하고 (query_* 구성은 임베딩 한 번 실행) 구성 요소별 메모리 사용량을 반환합니다.
+    """
+
+    import mcp_server
+    from mcp_servers.routes.debug import memory_report
+
+    async with mcp_server.lifespan(mcp_server.mcp) as app_context:
+        if scenario == "query_local":
+            app_context.embedder.encode("memory benchmark")
+        elif scenario == "query_sidecar":
+            await app_context.embedder.aencode(["memory benchmark"])
+        return memory_report.snapshot()["components_mb"]
+
+
+def run_child(scenario: str) -> Dict:
+    """
+    (하위 프로세스) 구성에 맞게 서버를 시작하고 메모리 사용량을 반환합니다.
+    """
+
+    from utils.memory import peak_rss_bytes, rss_bytes, to_mb
+
+    start = time.perf_counter()
+    components = asyncio.run(start_server(scenario))
+    return {
+        "rss_mb": to_mb(rss_bytes()),
+        "peak_rss_mb": to_mb(peak_rss_bytes()),
+        "startup_s": round(time.perf_counter() - start, 2),
+        "torch_loaded": "torch" in sys.modules,
+        "modules": len(sys.modules),
+        "components_mb": components,
+    }
+
+
+def measure(scenario: str, env: Dict[str, str]) -> Dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.memory_bench", "--child", scenario],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if output.returncode != 0:
+        raise RuntimeError(f"{scenario} 측정 실패:\n{output.stderr[-2000:]}")
+    # 도구 등록 로그 등이 함께 출력되므로 마지막 줄만 읽습니다.
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def start_sidecar(socket_path: str, timeout: float = 180.0) -> subprocess.Popen:
+    sidecar = subprocess.Popen(
+        [sys.executable, "-m", "mcp_servers.embedding_sidecar", "--socket", socket_path],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + timeout
+    while not os.path.exists(socket_path):
+        if sidecar.poll() is not None:
+            raise RuntimeError("임베딩 사이드카가 시작되지 않았습니다.")
+        if time.time() > deadline:
+            sidecar.terminate()
+            raise TimeoutError(f"임베딩 사이드카가 {timeout}초 내에 준비되지 않았습니다.")
+        time.sleep(0.2)
+    return sidecar
+
+
+def sidecar_stats(socket_path: str) -> Dict:
+    stats = SidecarEmbedder(socket_path).request_sync({"op": "stats"})
+    return {"rss_mb": stats["rss_mb"], "peak_rss_mb": stats["peak_rss_mb"], "torch_loaded": True}
+
+
+def check(results: Dict[str, Dict], baseline: Optional[Dict], threshold: float, budget: Dict[str, float]) -> list:
+    """
+    torch import, 구성/구성 요소별 예산 초과, 기준 대비 최대 RSS 증가율이 threshold를 넘는 구성을 반환합니다.
+    """
+
+    failures = []
+    for name, current in results.items():
+        if name in NO_TORCH and current["torch_loaded"]:
+            print(f"  {name:<16} torch가 import 되었습니다.")
+            failures.append(name)
+        if name in budget and current["peak_rss_mb"] > budget[name]:
+            print(f"  {name:<16} 최대 RSS {current['peak_rss_mb']}MB > 예산 {budget[name]}MB")
+            failures.append(name)
+        for component, used in current.get("components_mb", {}).items():
+            if component in COMPONENT_BUDGETS_MB and used > COMPONENT_BUDGETS_MB[component]:
+                print(f"  {name:<16} {component} {used}MB > 예산 {COMPONENT_BUDGETS_MB[component]}MB")
+                failures.append(name)
+        before = (baseline or {}).get("results", {}).get(name, {}).get("peak_rss_mb")
+        if before:
+            change = (current["peak_rss_mb"] - before) / before
+            print(f"  {name:<16} {before:>8.1f} → {current['peak_rss_mb']:>8.1f} MB ({change:+.1%})")
+            if change > threshold:
+                failures.append(name)
+    return sorted(set(failures))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MCP 서버 워커 최대 RSS 회귀 확인")
+    parser.add_argument("--child", choices=sorted(SCENARIOS), help=argparse.SUPPRESS)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="측정할 구성 (쉼표 구분)")
+    parser.add_argument("--workers", type=int, default=4, help="워커 수 기준 합계 계산용")
+    parser.add_argument("--budget", default="", help="구성별 최대 RSS 예산 MB, 기본 예산을 덮어씀 (예: weather_search=250,query_sidecar=300)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/memory_<commit>.json)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로 (기본값: benchmarks/results/memory_baseline.json, 있으면)")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 benchmarks/results/memory_baseline.json 으로도 저장")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="허용 최대 RSS 증가율 (기본값 10%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(run_child(args.child)))
+        return 0
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip() in SCENARIOS]
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "embedding.sock")
+        sidecar = start_sidecar(socket_path) if "query_sidecar" in scenarios else None
+        try:
+            for scenario in scenarios:
+                results[scenario] = measure(scenario, {**SCENARIOS[scenario], "EMBEDDING_SOCKET": socket_path})
+            if sidecar is not None:
+                results["sidecar"] = sidecar_stats(socket_path)
+        finally:
+            if sidecar is not None:
+                sidecar.terminate()
+                sidecar.wait(timeout=10)
+
+    for name, result in results.items():
+        print(f"  {name:<16} peak {result['peak_rss_mb']:>8} MB  rss {result['rss_mb']:>8} MB"
+              f"{'  (torch)' if result['torch_loaded'] else ''}")
+    totals = {}
+    if "query_local" in results:
+        totals["local"] = round(results["query_local"]["peak_rss_mb"] * args.workers, 1)
+    if "query_sidecar" in results and "sidecar" in results:
+        totals["sidecar"] = round(results["query_sidecar"]["peak_rss_mb"] * args.workers + results["sidecar"]["peak_rss_mb"], 1)
+    for name, total in totals.items():
+        print(f"  워커 {args.workers}개 합계 ({name}): {total} MB")
+
+    commit = git_commit()
+    report = {
+        "meta": {"commit": commit, "timestamp": datetime.now(timezone.utc).isoformat(), "workers": args.workers},
+        "results": results,
+        "totals_mb": totals,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"memory_{commit}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[memory_bench] 결과 저장 → {output}")
+
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_PATH
+    baseline = None
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    elif args.baseline:
+        raise FileNotFoundError(f"기준 결과가 없습니다: {baseline_path}")
+    budget = {**DEFAULT_BUDGETS_MB, **parse_limits(args.budget)}
+    failures = check(results, baseline, args.max_regression, budget)
+    if failures:
+        print(f"[memory_bench] ❌ 메모리 회귀 감지: {', '.join(failures)}")
+        return 1
+    print("[memory_bench] ✅ 메모리 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
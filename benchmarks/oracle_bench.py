@@ -0,0 +1,236 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+import time
+
+import oracledb
+
+from benchmarks.load_test import RESULTS_DIR, git_commit, summarize
+from db.oracle_schema import create_oracle_tables, insert_loans
+from utils.oracle_pool import AsyncOraclePool, pipeline_supported, run_batch
+
+"""
+==================================================
+벤치마크 모듈: Oracle DRCP / 파이프라이닝 (oracle_bench)
+==================================================
+이 파일은 로컬 Oracle Free 컨테이너를 대상으로 두 가지를 측정합니다.
+
+1. burst: 레플리카 여러 개(--replicas, 레플리카마다 독립된 연결 풀)가 동시에 조회할 때
+   dedicated 세션과 DRCP(pooled server)의 처리량, 지연 시간, DB 세션 수를 비교합니다.
+2. pipeline: 서로 독립적인 조회 k개(oracle_query의 inputs.batch)를 순서대로 실행할 때와
+   파이프라인으로 한 번에 보낼 때의 배치 지연 시간을 비교합니다. (Oracle 23ai 이상)
+
+준비 (docker-compose의 oracle-free 서비스):
+    docker compose --profile bench up -d oracle-free
+    # DRCP 시작 (CDB root에서 한 번)
+    docker exec -i oracle-free sqlplus -s / as sysdba <<< "EXEC DBMS_CONNECTION_POOL.START_POOL();"
+    # 세션 수 측정용 권한 (선택, 없으면 세션 수는 null로 기록)
+    docker exec -i oracle-free sqlplus -s sys/oracleadmin@FREEPDB1 as sysdba <<< 'GRANT SELECT ON v_$session TO oracleadmin;'
+
+실행 예:
+    python -m benchmarks.oracle_bench --dsn localhost:1522/FREEPDB1 --replicas 4 --pool-max 10 --concurrency 64
+    python -m benchmarks.oracle_bench --dsn localhost:1522/FREEPDB1 --skip-burst --batch-sizes 1,4,8,16
+"""
+
+LOOKUP_SQL = "SELECT money FROM loan WHERE borrower = :borrower"
+BORROWERS = [f"bench_{index}" for index in range(64)]
+CCLASS = "ORACLE_BENCH"
+
+
+def make_pool(args, drcp: bool, name: str) -> AsyncOraclePool:
+    return AsyncOraclePool(
+        user=args.user,
+        password=args.password,
+        dsn=args.dsn,
+        min_size=1,
+        max_size=args.pool_max,
+        name=name,
+        drcp=drcp,
+        cclass=CCLASS,
+        purity="self",
+    )
+
+
+async def prepare(args):
+    """
+    측정용 테이블과 데이터를 준비합니다. (db_server와 같은 스키마)
+    """
+
+    pool = await make_pool(args, drcp=False, name="oracle_bench").connect()
+    try:
+        await create_oracle_tables(pool)
+        await insert_loans(pool, [(borrower, (index + 1) * 1000) for index, borrower in enumerate(BORROWERS)])
+    finally:
+        await pool.close()
+
+
+async def count_sessions(pool: AsyncOraclePool) -> Optional[int]:
+    # v$session 조회 권한이 없으면 None
+    try:
+        async with pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute("SELECT COUNT(*) FROM v$session WHERE username = USER")
+                return (await cursor.fetchone())[0]
+    except oracledb.Error:
+        return None
+
+
+async def burst(args, drcp: bool) -> Dict:
+    """
+    레플리카별 연결 풀을 만들고 concurrency개 작업이 duration초 동안 조회를 반복합니다.
+    """
+
+    pools = [await make_pool(args, drcp, f"replica-{index}").connect() for index in range(args.replicas)]
+    latencies: List[float] = []
+    errors = 0
+    peak_sessions: Optional[int] = None
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(index: int):
+        nonlocal errors
+        pool = pools[index % len(pools)]
+        count = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                async with pool.connection() as connection:
+                    async with connection.cursor() as cursor:
+                        await cursor.execute(LOOKUP_SQL, borrower=BORROWERS[(index + count) % len(BORROWERS)])
+                        await cursor.fetchall()
+                latencies.append((time.perf_counter() - start) * 1000)
+            except oracledb.Error as e:
+                errors += 1
+                if errors == 1:
+                    print(f"  [burst] 첫 오류: {e}")
+            count += 1
+
+    async def sample_sessions():
+        nonlocal peak_sessions
+        monitor = await make_pool(args, drcp=False, name="monitor").connect()
+        try:
+            while time.perf_counter() < deadline:
+                sessions = await count_sessions(monitor)
+                if sessions is not None:
+                    peak_sessions = max(peak_sessions or 0, sessions - 1)  # 측정용 세션 제외
+                await asyncio.sleep(0.5)
+        finally:
+            await monitor.close()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(sample_sessions(), *(worker(index) for index in range(args.concurrency)))
+    wall = time.perf_counter() - start_time
+    for pool in pools:
+        await pool.close()
+
+    return {
+        "mode": "drcp" if drcp else "dedicated",
+        "replicas": args.replicas,
+        "pool_max": args.pool_max,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "qps": round(len(latencies) / wall, 1),
+        "latency_ms": summarize(latencies),
+        "peak_sessions": peak_sessions,
+    }
+
+
+async def pipeline(args, batch_size: int) -> List[Dict]:
+    """
+    조회 batch_size개를 순서대로 실행할 때와 파이프라인으로 실행할 때의 배치 지연 시간을 비교합니다.
+    """
+
+    pool = await make_pool(args, drcp=False, name="pipeline").connect()
+    statements = [(LOOKUP_SQL, {"borrower": BORROWERS[index % len(BORROWERS)]}) for index in range(batch_size)]
+    results = []
+    try:
+        async with pool.connection() as connection:
+            for use_pipeline in (False, True):
+                if use_pipeline and not pipeline_supported():
+                    print("  [pipeline] python-oracledb 2.4 이상이 필요합니다. (건너뜀)")
+                    continue
+                await run_batch(connection, statements, 10, pipeline=use_pipeline)  # 워밍업
+                latencies = []
+                for _ in range(args.iterations):
+                    start = time.perf_counter()
+                    await run_batch(connection, statements, 10, pipeline=use_pipeline)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                results.append({
+                    "batch_size": batch_size,
+                    "mode": "pipeline" if use_pipeline else "sequential",
+                    "latency_ms": summarize(latencies),
+                })
+    finally:
+        await pool.close()
+    return results
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Oracle DRCP / 파이프라이닝 벤치마크 (Oracle Free 컨테이너)")
+    parser.add_argument("--dsn", default="localhost:1522/FREEPDB1")
+    parser.add_argument("--user", default="oracleadmin")
+    parser.add_argument("--password", default="oracleadmin")
+    parser.add_argument("--replicas", type=int, default=4, help="레플리카 수 (레플리카마다 독립된 연결 풀)")
+    parser.add_argument("--pool-max", type=int, default=10, help="레플리카별 풀 최대 크기")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 조회 작업 수")
+    parser.add_argument("--duration", type=float, default=15.0, help="burst 측정 시간(초)")
+    parser.add_argument("--batch-sizes", type=parse_ints, default=parse_ints("1,4,8,16"), help="파이프라인 배치 크기 목록")
+    parser.add_argument("--iterations", type=int, default=200, help="배치 크기별 반복 횟수")
+    parser.add_argument("--skip-burst", action="store_true")
+    parser.add_argument("--skip-drcp", action="store_true", help="DRCP가 시작되지 않은 DB에서 dedicated만 측정")
+    parser.add_argument("--skip-pipeline", action="store_true")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/oracle_<commit>.json)")
+    return parser.parse_args(argv)
+
+
+async def run(args) -> Dict:
+    await prepare(args)
+    results = {"burst": [], "pipeline": []}
+
+    if not args.skip_burst:
+        for drcp in ([False] if args.skip_drcp else [False, True]):
+            measured = await burst(args, drcp)
+            results["burst"].append(measured)
+            print(f"[oracle_bench] burst {measured['mode']:<9} qps {measured['qps']:>8}  "
+                  f"p50 {measured['latency_ms']['p50']:>7} ms  p99 {measured['latency_ms']['p99']:>7} ms  "
+                  f"errors {measured['errors']}  sessions {measured['peak_sessions']}")
+
+    if not args.skip_pipeline:
+        for batch_size in args.batch_sizes:
+            for measured in await pipeline(args, batch_size):
+                results["pipeline"].append(measured)
+                print(f"[oracle_bench] batch {batch_size:>3} {measured['mode']:<10} "
+                      f"p50 {measured['latency_ms']['p50']:>7} ms  p99 {measured['latency_ms']['p99']:>7} ms")
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "dsn": args.dsn,
+            "oracledb": oracledb.__version__,
+        },
+        **results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"oracle_{commit}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[oracle_bench] 결과 저장 → {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+import argparse
+import gc
+import json
+import subprocess
+import time
+import tracemalloc
+
+from utils.result_encoding import dumps, encode_rows, orjson
+from utils.rowset import RowSet
+
+"""
+==================================================
+벤치마크 모듈: 쿼리 결과 표현별 메모리 / 직렬화 시간 (rowset_bench)
+==================================================
+이 파일은 oracle_query 결과를 보관/직렬화하는 방식별로 행당 메모리와 직렬화 시간을 비교합니다.
+(DB 없이 합성 행으로 측정합니다)
+
+비교 대상:
+- dicts  : 행마다 dict(zip(columns, row)) 목록 → dumps
+- tuples : cursor 결과(tuple 목록) → encode_rows(list of list) → dumps
+- rowset : RowSet(컬럼별 저장, 숫자 컬럼은 array) → to_json
+
+실행 예:
+    python -m benchmarks.rowset_bench --rows 1000,10000,100000
+    python -m benchmarks.rowset_bench --rows 200 --max-bytes 32768   # oracle_query 기본 예산
+"""
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+COLUMNS = ["ID", "ACCOUNT_HOLDER", "BALANCE", "RATE"]
+
+
+def make_rows(count: int) -> List[tuple]:
+    # deposit/loan 조회 결과와 비슷한 행 (정수 id, 이름, 정수 금액, 실수 이율)
+    return [(index, f"holder_{index}", (index % 1000) * 1500, (index % 7) / 100 + 0.015) for index in range(count)]
+
+
+def build_dicts(rows, max_bytes):
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+
+def build_tuples(rows, max_bytes):
+    return rows
+
+
+def build_rowset(rows, max_bytes):
+    return RowSet(COLUMNS, rows, max_bytes=max_bytes, extra={"isSuccess": True})
+
+
+def serialize_dicts(value, max_bytes):
+    return dumps({"isSuccess": True, "rows": value})
+
+
+def serialize_tuples(value, max_bytes):
+    return dumps({"isSuccess": True, **encode_rows(COLUMNS, value, max_bytes=max_bytes)})
+
+
+def serialize_rowset(value, max_bytes):
+    value._encoded = None  # 반복 측정 시 캐시를 사용하지 않도록
+    return value.to_json()
+
+
+REPRESENTATIONS: Dict[str, tuple] = {
+    "dicts": (build_dicts, serialize_dicts),
+    "tuples": (build_tuples, serialize_tuples),
+    "rowset": (build_rowset, serialize_rowset),
+}
+
+
+def measure_memory(build: Callable, count: int, max_bytes) -> float:
+    """
+    표현을 만든 뒤 남아 있는 메모리를 행당 바이트로 반환합니다. (원본 tuple 목록은 해제)
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    value = build(make_rows(count), max_bytes)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return retained / count
+
+
+def measure_serialize(build: Callable, serialize: Callable, count: int, max_bytes, repeat: int) -> Dict:
+    value = build(make_rows(count), max_bytes)
+    timings = []
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = serialize(value, max_bytes)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"serialize_ms": round(min(timings), 3), "output_bytes": len(output.encode("utf-8"))}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="쿼리 결과 표현별 메모리/직렬화 시간 벤치마크")
+    parser.add_argument("--rows", default="1000,10000,100000", help="행 수 목록 (쉼표 구분)")
+    parser.add_argument("--max-bytes", type=int, default=0, help="직렬화 바이트 예산 (0이면 제한 없음, dicts는 미적용)")
+    parser.add_argument("--repeat", type=int, default=5, help="직렬화 반복 횟수 (최솟값 기록)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/rowset_<commit>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    max_bytes = args.max_bytes or None
+    results = []
+    print(f"[rowset_bench] serializer: {'orjson' if orjson is not None else 'json'}")
+
+    for count in [int(item) for item in args.rows.split(",") if item.strip()]:
+        for name, (build, serialize) in REPRESENTATIONS.items():
+            measured = {
+                "rows": count,
+                "representation": name,
+                "bytes_per_row": round(measure_memory(build, count, max_bytes), 1),
+                **measure_serialize(build, serialize, count, max_bytes, args.repeat),
+            }
+            results.append(measured)
+            print(f"  rows {count:>7}  {name:<7} {measured['bytes_per_row']:>8} B/row  "
+                  f"serialize {measured['serialize_ms']:>9} ms  output {measured['output_bytes']:>10} B")
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "serializer": "orjson" if orjson is not None else "json",
+            "max_bytes": max_bytes,
+        },
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"rowset_{commit}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[rowset_bench] 결과 저장 → {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from benchmarks.faults import Fault
+import json
+import threading
+import time
+
+"""
+==================================================
+벤치마크 모듈: 외부 API 로컬 스텁 (UpstreamStub)
+==================================================
+이 파일은 Google Custom Search, OpenWeatherMap, DuckDuckGo HTML 검색을 대체하는
+프로세스 내 HTTP 스텁 서버를 정의합니다.
+
+주요 역할:
+1. 별도 스레드에서 ThreadingHTTPServer를 실행하여 MCP 서버의 이벤트 루프와 독립적으로 응답합니다.
+2. 엔드포인트별 응답 지연(latency)을 설정하여 실제 외부 API의 응답 시간을 재현합니다.
+3. 엔드포인트별 장애(Fault)를 주입하여 503 응답, 지연 증가, 응답 정지를 재현합니다.
+
+엔드포인트:
+- GET  /google      : Google Custom Search JSON 응답
+- GET  /weather     : OpenWeatherMap 현재 날씨 JSON 응답
+- POST /duckduckgo  : DuckDuckGo HTML 검색 결과 페이지
+"""
+
+DUCKDUCKGO_RESULT_HTML = """
+<div class="result results_links results_links_deep web-result">
+  <div class="links_main links_deep result__body">
+    <h2 class="result__title">
+      <a rel="nofollow" class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fexample.com%2F{index}&amp;rut=abc">Example result {index}</a>
+    </h2>
+    <a class="result__snippet" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fexample.com%2F{index}">Snippet for result {index} about {query}</a>
+  </div>
+</div>
+"""
+
+
+def render_duckduckgo_page(query: str, count: int = 10) -> str:
+    results = "".join(
+        DUCKDUCKGO_RESULT_HTML.format(index=index, query=query) for index in range(count)
+    )
+    return f"<html><body><div class=\"results\">{results}</div></body></html>"
+
+
+class UpstreamStub:
+    """
+    외부 API를 대체하는 로컬 HTTP 스텁 서버입니다.
+
+    Args:
+        latency (dict): 엔드포인트별 응답 지연(초). 예: {"google": 0.05, "weather": 0.03}
+        faults (dict): 엔드포인트별 장애 설정. 예: {"weather": Fault(error_rate=0.5)}
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: dict | None = None, faults: dict | None = None):
+        self.latency = {"google": 0.05, "weather": 0.03, "duckduckgo": 0.08, **(latency or {})}
+        self.faults = {"google": Fault(), "weather": Fault(), "duckduckgo": Fault(), **(faults or {})}
+        self.requests = {"google": 0, "weather": 0, "duckduckgo": 0}
+        self.injected_errors = {"google": 0, "weather": 0, "duckduckgo": 0}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "UpstreamStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                # 요청마다 로그를 출력하지 않습니다. (벤치마크 측정 방해 방지)
+                pass
+
+            def _inject_fault(self, name: str) -> bool:
+                # 장애 설정에 따라 지연/정지를 적용하고, 오류를 주입한 경우 503을 응답합니다.
+                if stub.faults[name].apply():
+                    stub.injected_errors[name] += 1
+                    self._send(503, json.dumps({"message": "injected fault"}), "application/json")
+                    return True
+                return False
+
+            def _send(self, status: int, body: str, content_type: str):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+                if url.path == "/google":
+                    stub.requests["google"] += 1
+                    time.sleep(stub.latency["google"])
+                    if self._inject_fault("google"):
+                        return
+                    query = params.get("q", "")
+                    body = {
+                        "items": [
+                            {
+                                "title": f"Result for {query}",
+                                "link": "https://example.com/google",
+                                "snippet": f"Snippet about {query}",
+                            }
+                        ]
+                    }
+                    self._send(200, json.dumps(body), "application/json")
+                elif url.path == "/weather":
+                    stub.requests["weather"] += 1
+                    time.sleep(stub.latency["weather"])
+                    if self._inject_fault("weather"):
+                        return
+                    body = {
+                        "name": params.get("q", "Seoul"),
+                        "main": {"temp": 21.5},
+                        "weather": [{"description": "맑음"}],
+                    }
+                    self._send(200, json.dumps(body, ensure_ascii=False), "application/json")
+                else:
+                    self._send(404, json.dumps({"message": "not found"}), "application/json")
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+
+                if url.path == "/duckduckgo":
+                    stub.requests["duckduckgo"] += 1
+                    time.sleep(stub.latency["duckduckgo"])
+                    if self._inject_fault("duckduckgo"):
+                        return
+                    query = form.get("q", [""])[0]
+                    self._send(200, render_duckduckgo_page(query), "text/html; charset=utf-8")
+                else:
+                    self._send(404, json.dumps({"message": "not found"}), "application/json")
+
+        return Handler
@@ -12,3 +12,29 @@ MILVUS_URI=os.getenv('MILVUS_URI')
 ORACLE_USER = os.getenv('ORACLE_USER')
 ORACLE_PASSWORD = os.getenv('ORACLE_PASSWORD')
 ORACLE_DSN = os.getenv('ORACLE_DSN')
+ORACLE_POOL_MIN = int(os.getenv('ORACLE_POOL_MIN', '2'))
+ORACLE_POOL_MAX = int(os.getenv('ORACLE_POOL_MAX', '10'))
+
+# [Embedding] MCP 서버(milvus_search)와 같은 모델을 사용해야 합니다.
+# - EMBEDDING_BACKEND=sidecar: 모델을 로드하지 않고 MCP 서버와 같은 임베딩 사이드카(EMBEDDING_SOCKET)를 사용합니다.
+EMBEDDING_MODEL_NAME = os.getenv('EMBEDDING_MODEL_NAME', 'sentence-transformers/all-MiniLM-L6-v2')
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'local').lower()
+EMBEDDING_SOCKET = os.getenv('EMBEDDING_SOCKET', '/tmp/mcp-embedding.sock')
+EMBEDDING_TIMEOUT = float(os.getenv('EMBEDDING_TIMEOUT', '5'))
+
+# [Index] 템플릿 컬렉션 벡터 인덱스 (utils/ann_index.py, 변경 시 shadow 컬렉션으로 재구축)
+# - MILVUS_INDEX_TYPE: AUTOINDEX | FLAT | HNSW | IVF_FLAT | IVF_SQ8
+MILVUS_INDEX_TYPE = os.getenv('MILVUS_INDEX_TYPE', 'AUTOINDEX')
+MILVUS_HNSW_M = int(os.getenv('MILVUS_HNSW_M', '16'))
+MILVUS_HNSW_EF_CONSTRUCTION = int(os.getenv('MILVUS_HNSW_EF_CONSTRUCTION', '200'))
+MILVUS_IVF_NLIST = int(os.getenv('MILVUS_IVF_NLIST', '128'))
+
+# [Partition] 템플릿 컬렉션의 partition key(domain) 파티션 수 (변경 시 shadow 컬렉션으로 재구축)
+MILVUS_NUM_PARTITIONS = int(os.getenv('MILVUS_NUM_PARTITIONS', '16'))
+
+# [Catalog] 템플릿 카탈로그 변경 시 갱신 알림을 보낼 MCP 서버 주소 (쉼표 구분)
+# 예: http://localhost:9092 → POST http://localhost:9092/admin/catalog/refresh
+# ADMIN_TOKEN: MCP 서버의 ADMIN_TOKEN과 같은 값 (알림 요청의 Authorization 헤더)
+MCP_CATALOG_NOTIFY_URLS = [url.strip() for url in os.getenv('MCP_CATALOG_NOTIFY_URLS', '').split(',') if url.strip()]
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+CATALOG_FORCE_REBUILD = os.getenv('CATALOG_FORCE_REBUILD', 'false').lower() == 'true'
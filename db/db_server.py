@@ -1,9 +1,28 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+import asyncio
+import httpx
 
-from db.milvus_init import create_milvus_client, initialize_milvus_collection, insert_data
-from db.oracle_init import initialize_oracle_pool
-from db.oracle_schema import create_oracle_tables, insert_deposit, insert_loan
+from db.config.settings import ADMIN_TOKEN, CATALOG_FORCE_REBUILD, MCP_CATALOG_NOTIFY_URLS
+from db.milvus_init import create_milvus_client, sync_template_catalog
+from db.oracle_init import close_oracle_pool, initialize_oracle_pool
+from db.oracle_schema import create_oracle_tables, insert_deposits, insert_loans
+from db.templates import TEMPLATES
+
+async def notify_catalog_refresh(result: dict):
+    """
+    실행 중인 MCP 서버에 템플릿 카탈로그 변경을 알립니다. (검색 결과 캐시 무효화)
+    알림이 실패해도 MCP 서버는 주기적으로 카탈로그 버전을 확인하므로 시작을 중단하지 않습니다.
+    """
+
+    headers = {"Authorization": f"Bearer {ADMIN_TOKEN}"} if ADMIN_TOKEN else {}
+    async with httpx.AsyncClient(timeout=3, headers=headers) as client:
+        for url in MCP_CATALOG_NOTIFY_URLS:
+            try:
+                response = await client.post(f"{url.rstrip('/')}/admin/catalog/refresh", json={"version": result["version"]})
+                print(f"[Catalog] 갱신 알림 전송: {url} ({response.status_code})")
+            except httpx.HTTPError as e:
+                print(f"[Catalog] 갱신 알림 실패: {url} ({e!r})")
 
 # Lifespan 함수 정의
 @asynccontextmanager
@@ -11,7 +30,7 @@ async def lifespan(app: FastAPI):
     # ------------------ Startup 로직 (서버 시작 시) ------------------
     print("----- [STARTUP] Oracle Pool 초기화 시작 -----")
     try:
-        initialize_oracle_pool()
+        oracle_pool = await initialize_oracle_pool()
     except Exception as e:
         print(f"❌ [STARTUP] Oracle DB 초기화 실패: {e}")
         raise
@@ -19,45 +38,31 @@ async def lifespan(app: FastAPI):
 
     print("----- [STARTUP] Milvus 리소스 초기화 시작 -----")
     try:
-        # 1. 클라이언트 객체 생성
-        client = create_milvus_client()
+        # 1. 클라이언트 객체 생성 (연결은 동기 작업이므로 스레드에서 실행)
+        client = await asyncio.to_thread(create_milvus_client)
     
         # 2. 클라이언트 객체를 앱의 상태(state)에 저장 (전역 변수 역할)
         # 각 워커 프로세스가 독립적으로 이 객체를 저장하고 사용합니다.
         app.state.milvus_client = client
 
-        # 3. 컬렉션 초기화 실행
-        initialize_milvus_collection(client)
-
         print("----- [STARTUP] Milvus 준비 완료 -----")
 
-        # 4. Oracle 예시 데이터 입력
+        # 3. Oracle 예시 데이터 입력 (비동기 DDL/입력, 테이블별 왕복 1회)
         print("----- [STARTUP] Oracle 데이터 입력 시작 -----")
-        create_oracle_tables()
-        insert_deposit("Alice", 1000)
-        insert_deposit("Bob", 1500)
-        insert_deposit("Charlie", 2000)
-        insert_loan("Kim", 100000)
-        insert_loan("Lee", 150000)
-        insert_loan("Park", 300000)
+        await create_oracle_tables(oracle_pool)
+        await asyncio.gather(
+            insert_deposits(oracle_pool, [("Alice", 1000), ("Bob", 1500), ("Charlie", 2000)]),
+            insert_loans(oracle_pool, [("Kim", 100000), ("Lee", 150000), ("Park", 300000)]),
+        )
         print("----- [STARTUP] Oracle 데이터 입력 완료 -----")
         
-        # 5. Milvus 예시 데이터 입력
-        print("----- [STARTUP] Milvus 데이터 입력 시작 -----")
-
-        # 의도 설명과 SQL 템플릿을 명확히 구분하여 저장
-        insert_data(
-            client,
-            intent_description="계좌 잔액 조회: 특정 계좌 소유자의 예금 잔액을 확인합니다",
-            sql_template="SELECT balance FROM deposit WHERE account_holder = :account_holder"
-        )
-        insert_data(
-            client,
-            intent_description="대출 금액 조회: 특정 채무자가 빌린 대출 금액을 확인합니다",
-            sql_template="SELECT money FROM loan WHERE borrower = :borrower"
-        )
-
-        print("----- [STARTUP] Milvus 데이터 입력 완료 -----")
+        # 4. Milvus 템플릿 카탈로그 동기화 (db/templates.py 기준, 변경된 템플릿만 반영)
+        #    임베딩 계산과 Milvus 호출은 동기 작업이므로 스레드에서 실행합니다.
+        print("----- [STARTUP] Milvus 템플릿 카탈로그 동기화 시작 -----")
+        result = await asyncio.to_thread(sync_template_catalog, client, TEMPLATES, CATALOG_FORCE_REBUILD)
+        if result["mode"] != "unchanged":
+            await notify_catalog_refresh(result)
+        print(f"----- [STARTUP] Milvus 템플릿 카탈로그 동기화 완료: {result} -----")
 
     except Exception as e:
         print(f'----- [STARTUP] Milvus 초기화 실패: {e} -----')
@@ -67,6 +72,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # 서버 종료 시 정리 로직
+    await close_oracle_pool()
+
     print("----- [SHUTDOWN] Milvus 리소스 정리 시작 -----")
     client_to_close = app.state.milvus_client
     if client_to_close:
@@ -77,4 +84,20 @@ async def lifespan(app: FastAPI):
     del app.state.milvus_client
     print("----- [SHUTDOWN] Milvus 정리 완료 -----")
 
-app = FastAPI(lifespan=lifespan)
\ No newline at end of file
+app = FastAPI(lifespan=lifespan)
+
+# 동시에 들어온 동기화 요청이 같은 컬렉션/별칭을 함께 변경하지 않도록 한 번에 하나씩 실행합니다.
+sync_lock = asyncio.Lock()
+
+@app.post("/catalog/sync")
+async def sync_catalog(force_rebuild: bool = False):
+    """
+    서버 재시작 없이 템플릿 카탈로그를 다시 동기화합니다.
+    (임베딩 계산과 Milvus 호출은 동기 작업이므로 스레드에서 실행합니다)
+    """
+
+    async with sync_lock:
+        result = await asyncio.to_thread(sync_template_catalog, app.state.milvus_client, TEMPLATES, force_rebuild)
+        if result["mode"] != "unchanged":
+            await notify_catalog_refresh(result)
+    return result
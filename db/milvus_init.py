@@ -1,10 +1,70 @@
-from pymilvus import DataType, MilvusClient
-from sentence_transformers import SentenceTransformer
-from db.config.settings import MILVUS_URI
+from typing import Any, Dict, List, Optional
+from pymilvus import DataType, MilvusClient, MilvusException
+from db.config.settings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_SOCKET,
+    EMBEDDING_TIMEOUT,
+    MILVUS_HNSW_EF_CONSTRUCTION,
+    MILVUS_HNSW_M,
+    MILVUS_INDEX_TYPE,
+    MILVUS_IVF_NLIST,
+    MILVUS_NUM_PARTITIONS,
+    MILVUS_URI,
+)
+from db.templates import catalog_version, content_hash
+from utils.ann_index import build_params
+from utils.embedding_sidecar import SidecarEmbedder
 
-# 컬렉션 이름 지정
+"""
+==================================================
+모듈: Milvus 템플릿 카탈로그 동기화
+==================================================
+이 파일은 SQL 템플릿 카탈로그(db/templates.py)를 Milvus 컬렉션에 동기화합니다.
+
+- 검색은 항상 별칭(alias) `my_collection`으로 합니다. 실제 컬렉션은 `my_collection_<버전>` 입니다.
+- 증분 동기화: 저장된 템플릿의 content_hash와 원하는 목록을 비교하여 추가/변경된 템플릿만 upsert,
+  사라진 템플릿만 delete 합니다. (컬렉션 삭제/재생성, 인덱스 재구축 없음)
+- 전체 재구축(최초 실행, 스키마/인덱스 설정 변경, force_rebuild): 새 컬렉션(shadow)을 만들고 데이터 입력/인덱스 생성/로드가
+  끝난 뒤 별칭을 새 컬렉션으로 바꿉니다. 교체 전까지 기존 컬렉션으로 검색이 계속 가능합니다.
+- 컬렉션 TTL은 사용하지 않습니다. (템플릿이 24시간 후 사라지던 문제)
+- 카탈로그 버전은 컬렉션 속성 `catalog.version`에 기록되며, MCP 서버가 이 값으로 변경 여부를 확인합니다.
+- 업무 도메인(domain)을 partition key로 사용합니다. MCP 서버는 요청 도메인으로 필터링하여 해당 파티션만 검색하고,
+  locale/allowed_roles는 스칼라 인덱스(INVERTED)로 필터링합니다.
+- 임베딩 모델은 첫 동기화 시 로드합니다. EMBEDDING_BACKEND=sidecar이면 MCP 서버와 같은 임베딩 사이드카를 사용합니다.
+"""
+
+# 검색용 별칭 (MCP 서버의 milvus_search가 사용하는 이름)
 COLLECTION_NAME = 'my_collection'
-model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+VERSION_PROPERTY = 'catalog.version'
+INSERT_BATCH_SIZE = 1000
+# 검색 범위 필터에 사용하는 스칼라 필드 (INVERTED 인덱스)
+SCOPE_FIELDS = ('domain', 'locale', 'allowed_roles')
+
+model = None
+
+# 벡터 인덱스 설정 (MILVUS_INDEX_TYPE 등, utils/ann_index.py)
+VECTOR_INDEX = build_params(
+    MILVUS_INDEX_TYPE,
+    hnsw_m=MILVUS_HNSW_M,
+    hnsw_ef_construction=MILVUS_HNSW_EF_CONSTRUCTION,
+    ivf_nlist=MILVUS_IVF_NLIST,
+)
+
+def embedding_model():
+    """
+    임베딩 모델(또는 사이드카 클라이언트)을 반환합니다. 처음 호출할 때 생성합니다.
+    """
+
+    global model
+
+    if model is None:
+        if EMBEDDING_BACKEND == "sidecar":
+            model = SidecarEmbedder(EMBEDDING_SOCKET, EMBEDDING_TIMEOUT)
+        else:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return model
 
 def create_milvus_client() -> MilvusClient:
     """
@@ -17,106 +77,184 @@ def create_milvus_client() -> MilvusClient:
         timeout=1000
     )
 
-def initialize_milvus_collection(client: MilvusClient):
+def create_template_collection(client: MilvusClient, collection_name: str, vector_index: Dict = VECTOR_INDEX):
     """
-    Milvus 컬렉션이 없으면 생성하고 로드합니다.
-    컬렉션이 존재하는 경우 기존 컬렉션을 삭제하고 재생성합니다.
-    Args:
-        client (MilvusClient): MilvusClient 객체.
+    템플릿 컬렉션을 생성합니다. (스키마 + 인덱스, 생성 시 자동 로드)
     """
-    if client.has_collection(COLLECTION_NAME):
-        print(f'[DB - Milvus] {COLLECTION_NAME} 컬렉션이 이미 존재합니다. 기존 컬렉션 삭제 후 재생성합니다.')
-        client.drop_collection(COLLECTION_NAME)
 
-    # 2. 스키마 생성
+    # 1. 스키마 생성
+    # - template_key를 기본 키로 사용하여 upsert/delete를 템플릿 단위로 수행합니다.
     schema = MilvusClient.create_schema(
-        auto_id=True,
-        enable_dynamic_field=True   
+        auto_id=False,
+        enable_dynamic_field=True
     )
 
-    # 3. 필드 추가
-    schema.add_field('id', DataType.INT64, is_primary=True, auto_id=True)
-    schema.add_field('vector', DataType.FLOAT_VECTOR, dim=384)
+    # 2. 필드 추가
+    schema.add_field('template_key', DataType.VARCHAR, max_length=128, is_primary=True)
+    schema.add_field('vector', DataType.FLOAT_VECTOR, dim=embedding_model().get_sentence_embedding_dimension())
     schema.add_field('intent_description', DataType.VARCHAR, max_length=512)  # 검색용 의도 설명
     schema.add_field('sql_template', DataType.VARCHAR, max_length=512)  # 실제 SQL 템플릿
+    schema.add_field('content_hash', DataType.VARCHAR, max_length=64)  # 변경 감지용 해시
+    schema.add_field('domain', DataType.VARCHAR, max_length=64, is_partition_key=True)  # 업무 도메인 (partition key)
+    schema.add_field('locale', DataType.VARCHAR, max_length=16)
+    schema.add_field('allowed_roles', DataType.ARRAY, element_type=DataType.VARCHAR, max_capacity=32, max_length=64)
 
-    # 4. 인덱스 설정
+    # 3. 인덱스 설정
     # - AUTOINDEX: 자동 인덱스 설정, Milvus가 데이터 기반으로 최적 타입 자동 선택
     # - HNSW, IVF_FLAT: 수동 인덱스 설정 (HNSW: 그래프 기반, IVF_FLAT: 클러스터링 기반)
-    # 스칼라 필드는 인덱스 유형만 설정하면 된다.
+    # 벡터 필드는 인덱스 유형과 메트릭 유형(COSINE)을 모두 설정해야 한다. (MILVUS_INDEX_TYPE, utils/ann_index.py)
     index_params = client.prepare_index_params()
-    index_params.add_index(
-        field_name='id',
-        index_type='AUTOINDEX'
-    )
-    # 벡터 필드는 인덱스 유형과 메트릭 유형을 모두 설정해야 한다.
-    index_params.add_index(
-        field_name='vector',
-        index_type='AUTOINDEX',
-        metric_type='COSINE' # 벡터 유사성 측정 방식 (코사인 유사도 사용)
-    )
+    index_params.add_index(field_name='vector', index_name='vector', **vector_index)
+    # 범위 필터용 스칼라 인덱스 (domain == / locale == / ARRAY_CONTAINS_ANY(allowed_roles, ...))
+    for field in SCOPE_FIELDS:
+        index_params.add_index(field_name=field, index_name=field, index_type='INVERTED')
 
-    # 5. 컬렉션 생성
+    # 4. 컬렉션 생성
     # - 인덱스 매개변수를 사용하여 컬렉션을 생성한 경우, Milvus는 컬렉션 생성 시 자동으로 해당 컬렉션을 로드한다.
-    # - 인덱스 매개변수 없이 컬렉션을 생성한 경우, Milvus는 컬렉션 생성 시 해당 컬렉션을 로드하지 않습니다.
-    # - shard: 컬렉션을 수평으로 분할한 것, 각 샤드는 데이터 입력 채널에 해당한다.
-    ## - 기본적으로 모든 컬렉션에는 하나의 샤드가 있다. 샤드 수를 늘리면 데이터 삽입 속도와 처리량이 좋아진다.
+    # - 컬렉션 TTL(collection.ttl.seconds)은 설정하지 않는다. 템플릿은 카탈로그 동기화로만 삭제된다.
+    # - num_partitions: partition key 값(domain)을 해시하여 나눌 파티션 수
     client.create_collection(
-        collection_name=COLLECTION_NAME,
+        collection_name=collection_name,
         schema=schema,
         index_params=index_params,
-        # num_shards=1 # 기본값 1개
-        # enable_mmap=True # 기본값 true, mmap 활성화시 필요한 부분만 메모리에 로드, 비활성화시 전체 파일 메모리에 로드
-        properties={
-            'collection.ttl.seconds': 86400 # 데이터 삽입 후 삭제되기까지 시간(초)
-        }
-        # consistency_level='Bounded' # 일관성 수준: 최신 데이터 보장 옵션
-        # - Strong: 최신 데이터가 반드시 모든 노드에 반영된 후 검색
-        # - Session: 동일한 세션에서 삽입한 데이터는 반드시 반영 (특정 사용자 기준으로 일관성 유지)
-        # - Bounded: 기본값, 일정 시간 이내의 최신성만 보장
-        # - Eventually: 최신 데이터는 일정 시간이 지나면 반영
+        num_partitions=MILVUS_NUM_PARTITIONS,
     )
 
-    # 6. 로드 상태 확인 (데이터 검색 전 메모리에 로드되었는 지 확인)
-    res = client.get_load_state(
-        collection_name=COLLECTION_NAME
+def _embed_rows(templates: List[Dict[str, Any]], hashes: Dict[str, str]) -> List[Dict]:
+    # 의도 설명으로 벡터 임베딩 생성 (배치 단위)
+    vectors = embedding_model().encode([template['intent_description'] for template in templates], batch_size=64)
+    return [
+        {
+            'template_key': template['key'],
+            # SentenceTransformer는 numpy 배열, 사이드카는 list를 반환합니다.
+            'vector': [float(value) for value in vector],
+            'intent_description': template['intent_description'],
+            'sql_template': template['sql_template'],
+            'content_hash': hashes[template['key']],
+            'domain': template['domain'],
+            'locale': template['locale'],
+            'allowed_roles': template['allowed_roles'],
+        }
+        for template, vector in zip(templates, vectors)
+    ]
+
+def current_collection(client: MilvusClient) -> Optional[str]:
+    """
+    별칭이 가리키는 실제 컬렉션 이름을 반환합니다. 별칭이 없으면 None.
+    """
+
+    try:
+        return client.describe_alias(alias=COLLECTION_NAME)['collection_name']
+    except MilvusException:
+        return None
+
+def _stored_hashes(client: MilvusClient, collection_name: str) -> Dict[str, str]:
+    iterator = client.query_iterator(
+        collection_name=collection_name,
+        batch_size=INSERT_BATCH_SIZE,
+        filter='template_key != ""',
+        output_fields=['template_key', 'content_hash'],
     )
+    stored = {}
+    while True:
+        batch = iterator.next()
+        if not batch:
+            iterator.close()
+            return stored
+        for row in batch:
+            stored[row['template_key']] = row['content_hash']
+
+def _has_catalog_schema(client: MilvusClient, collection_name: str) -> bool:
+    description = client.describe_collection(collection_name)
+    fields = {field['name'] for field in description['fields']}
+    if not {'template_key', 'content_hash', *SCOPE_FIELDS} <= fields:
+        return False
+    # partition key 파티션 수는 컬렉션 생성 후 바꿀 수 없으므로 다르면 재구축합니다.
+    return description.get('num_partitions', MILVUS_NUM_PARTITIONS) == MILVUS_NUM_PARTITIONS
+
+def _index_matches(client: MilvusClient, collection_name: str) -> bool:
+    # 저장된 인덱스 유형/파라미터가 현재 설정과 같은지 확인합니다. (describe_index는 값을 문자열로 반환할 수 있음)
+    description = client.describe_index(collection_name=collection_name, index_name='vector')
+    if str(description.get('index_type', '')).upper() != VECTOR_INDEX['index_type']:
+        return False
+    return all(str(description.get(key)) == str(value) for key, value in VECTOR_INDEX['params'].items())
+
+def _set_version(client: MilvusClient, collection_name: str, version: str):
+    client.alter_collection_properties(collection_name=collection_name, properties={VERSION_PROPERTY: version})
+
+def _rebuild(client: MilvusClient, templates: List[Dict[str, Any]], hashes: Dict[str, str], version: str, previous: Optional[str]) -> Dict:
+    shadow = f'{COLLECTION_NAME}_{version}'
+    if shadow == previous:
+        # 같은 버전으로 강제 재구축하는 경우 별칭이 가리키는 컬렉션을 덮어쓰지 않도록 이름을 구분합니다.
+        shadow = f'{shadow}_rebuild'
+    if client.has_collection(shadow):
+        # 이전 재구축이 중간에 실패하고 남은 컬렉션
+        client.drop_collection(shadow)
 
-    print(f'[DB] Milvus load state: {res}')
+    print(f'[DB - Milvus] shadow 컬렉션 생성: {shadow} (템플릿 {len(templates)}개)')
+    create_template_collection(client, shadow)
+    for start in range(0, len(templates), INSERT_BATCH_SIZE):
+        client.insert(collection_name=shadow, data=_embed_rows(templates[start:start + INSERT_BATCH_SIZE], hashes))
+    client.flush(collection_name=shadow)
+    client.load_collection(collection_name=shadow)
+    _set_version(client, shadow, version)
+    print(f'[DB - Milvus] load state: {client.get_load_state(collection_name=shadow)}')
 
+    # 별칭 교체: 이 시점까지 기존 컬렉션으로 검색이 계속 가능합니다.
+    if previous is not None:
+        client.alter_alias(collection_name=shadow, alias=COLLECTION_NAME)
+    else:
+        if client.has_collection(COLLECTION_NAME):
+            # 별칭 도입 전 버전의 실제 컬렉션(my_collection)은 별칭과 이름이 겹치므로 한 번만 삭제합니다.
+            print(f'[DB - Milvus] 기존 {COLLECTION_NAME} 컬렉션을 별칭으로 전환합니다.')
+            client.drop_collection(COLLECTION_NAME)
+        client.create_alias(collection_name=shadow, alias=COLLECTION_NAME)
 
-def insert_data(client: MilvusClient, intent_description: str, sql_template: str):
+    if previous is not None and previous != shadow:
+        client.drop_collection(previous)
+
+    return {'mode': 'rebuild', 'version': version, 'collection': shadow, 'upserted': len(templates), 'deleted': 0}
+
+def sync_template_catalog(client: MilvusClient, templates: List[Dict[str, Any]], force_rebuild: bool = False) -> Dict:
     """
-    Milvus 컬렉션에 벡터 데이터를 삽입합니다.
-    이미 존재하는 데이터의 경우는 삽입하지 않습니다.
+    원하는 템플릿 목록을 Milvus에 동기화합니다.
+
     Args:
         client (MilvusClient): MilvusClient 객체.
-        intent_description (str): 사용자 의도 설명 (예: "계좌 잔액 조회", "대출 금액 조회")
-        sql_template (str): 실행할 SQL 템플릿.
-    """
+        templates (List[Dict]): 템플릿 목록 (db/templates.py의 TEMPLATES 형식).
+        force_rebuild (bool): True이면 변경 여부와 관계없이 shadow 컬렉션으로 재구축합니다.
 
-    existing = client.query(
-        collection_name=COLLECTION_NAME,
-        filter=f'sql_template == "{sql_template}"',
-        output_fields=['id']
-    )
+    Returns:
+        Dict: {"mode": "incremental" | "rebuild" | "unchanged", "version", "upserted", "deleted"}
+    """
 
-    if len(existing) > 0:
-        print(f'[DB - Milvus] 이미 존재하는 쿼리입니다: {existing[0]["id"]} {sql_template}')
-        return
+    desired = {template['key']: template for template in templates}
+    hashes = {key: content_hash(template, EMBEDDING_MODEL_NAME) for key, template in desired.items()}
+    version = catalog_version(hashes)
 
-    # 의도 설명으로 벡터 임베딩 생성 (이게 핵심!)
-    vector = model.encode(intent_description).tolist()
+    previous = current_collection(client)
+    if (
+        previous is None
+        or force_rebuild
+        or not _has_catalog_schema(client, previous)
+        or not _index_matches(client, previous)
+    ):
+        return _rebuild(client, list(desired.values()), hashes, version, previous)
 
-    data = [{
-        'vector': vector,
-        'intent_description': intent_description,
-        'sql_template': sql_template
-    }]
+    stored = _stored_hashes(client, previous)
+    changed = [key for key in desired if stored.get(key) != hashes[key]]
+    removed = [key for key in stored if key not in desired]
+    if not changed and not removed:
+        print(f'[DB - Milvus] 템플릿 카탈로그 변경 없음 (version={version})')
+        return {'mode': 'unchanged', 'version': version, 'upserted': 0, 'deleted': 0}
 
-    insert_result = client.insert(
-        collection_name=COLLECTION_NAME,
-        data=data
-    )
+    # 변경된 템플릿만 임베딩하여 upsert (기존 인덱스에 증분 반영)
+    changed_templates = [desired[key] for key in changed]
+    for start in range(0, len(changed_templates), INSERT_BATCH_SIZE):
+        client.upsert(collection_name=previous, data=_embed_rows(changed_templates[start:start + INSERT_BATCH_SIZE], hashes))
+    if removed:
+        client.delete(collection_name=previous, ids=removed)
+    _set_version(client, previous, version)
 
-    print(f'[DB - Milvus] 삽입 완료 - 의도: "{intent_description}" | SQL: "{sql_template}"')
\ No newline at end of file
+    print(f'[DB - Milvus] 템플릿 카탈로그 증분 동기화 - upsert {len(changed)}개, delete {len(removed)}개 (version={version})')
+    return {'mode': 'incremental', 'version': version, 'upserted': len(changed), 'deleted': len(removed)}
@@ -1,49 +1,28 @@
-from mcp_servers.config.settings import ORACLE_DSN, ORACLE_PASSWORD, ORACLE_USER
-import oracledb
+from db.config.settings import ORACLE_DSN, ORACLE_PASSWORD, ORACLE_POOL_MAX, ORACLE_POOL_MIN, ORACLE_USER
+from utils.oracle_pool import AsyncOraclePool
 
-# 파일 최상단에 선언된 변수는 해당 파일(모듈) 전체를 범위로 하는 전역 변수로 간주
-db_pool = None
+# db_server용 Oracle 연결 풀 (MCP 서버의 OracleManager와 같은 AsyncOraclePool, utils/oracle_pool.py)
+oracle_pool = AsyncOraclePool(
+  user=ORACLE_USER,
+  password=ORACLE_PASSWORD,
+  dsn=ORACLE_DSN,
+  min_size=ORACLE_POOL_MIN,
+  max_size=ORACLE_POOL_MAX,
+  name="db_server",
+)
 
-def initialize_oracle_pool():
+async def initialize_oracle_pool() -> AsyncOraclePool:
   """
-  FastMCP 서버 시작 시 Oracle DB 연결 풀을 초기화합니다.
+  db_server 시작 시 Oracle DB 연결 풀을 초기화합니다.
   """
 
-  global db_pool # 기존의 전역 변수 이용
-  
-  if db_pool is not None:
-    return db_pool
-  
-  try:
-    # DB 연결 풀 생성
-    db_pool = oracledb.create_pool(
-      user=ORACLE_USER,
-      password=ORACLE_PASSWORD,
-      dsn=ORACLE_DSN,
-      min=2,
-      max=10,
-      increment=1
-    )
-    print("🎉 database >> DB connection pool 초기화 성공.")
-    return db_pool
-  except oracledb.Error as e:
-    print(f"❌ database >> DB pool 초기화 에러. >> {e}")
-    return None
+  await oracle_pool.connect()
+  print("🎉 database >> DB connection pool 초기화 성공.")
+  return oracle_pool
 
-def get_db_connection():
+async def close_oracle_pool():
   """
-  DB 연결 풀에서 Connection 객체를 획득합니다.
+  db_server 종료 시 Oracle DB 연결 풀을 닫습니다.
   """
 
-  global db_pool # 기존의 전역 변수 이용
-
-  if db_pool is None:
-    print('db_pool이 null 입니다.')
-    db_pool = initialize_oracle_pool()
-    print('db_pool이 초기화되었습니다. db_pool >> ', db_pool)
-
-    if db_pool is None:
-      raise Exception("❌ database >> DB pool 사용 불가.")
-    
-  # DB pool에서 연결 획득 (반납 필수)
-  return db_pool.acquire()
\ No newline at end of file
+  await oracle_pool.close()
@@ -1,6 +1,25 @@
-from .oracle_init import get_db_connection
+from typing import Iterable, Tuple
+from utils.oracle_pool import AsyncOraclePool
+
+# 테이블명 → 생성 DDL
+TABLE_DDL = {
+    "DEPOSIT": """
+        CREATE TABLE deposit (
+            id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+            account_holder VARCHAR2(100) NOT NULL,
+            balance NUMBER DEFAULT 0 NOT NULL
+        )
+    """,
+    "LOAN": """
+        CREATE TABLE loan (
+            id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+            borrower VARCHAR2(100) NOT NULL,
+            money NUMBER DEFAULT 0 NOT NULL
+        )
+    """,
+}
 
-def create_oracle_tables():
+async def create_oracle_tables(pool: AsyncOraclePool):
     """
     Oracle DB에 필요한 테이블을 생성합니다.
     테이블명: DEPOSIT
@@ -11,133 +30,72 @@ def create_oracle_tables():
     id: 아이디
     borrower: 대출자
     money: 대출금
-    """
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        # deposit 테이블 생성
-        cursor.execute("""
-            SELECT table_name
-            FROM user_tables
-            WHERE table_name = 'DEPOSIT'
-        """)
-
-        result = cursor.fetchone()
-        if result:
-            print("🎉 oracle_schema >> 'deposit' 테이블이 이미 존재합니다.")
-        else:   
-            cursor.execute("""
-                CREATE TABLE deposit (
-                    id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
-                    account_holder VARCHAR2(100) NOT NULL,
-                    balance NUMBER DEFAULT 0 NOT NULL 
-                )
-            """)
-            
-            print("🎉 oracle_schema >> 'deposit' 테이블 생성 성공.")
 
-        # loan 테이블 생성
-        cursor.execute("""
-            SELECT table_name
-            FROM user_tables
-            WHERE table_name = 'LOAN'
-        """)
-
-        result = cursor.fetchone()
-        if result:
-            print("🎉 oracle_schema >> 'loan' 테이블이 이미 존재합니다.")
-        else:
-            cursor.execute("""
-                CREATE TABLE loan (
-                    id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
-                    borrower VARCHAR2(100) NOT NULL,
-                    money NUMBER DEFAULT 0 NOT NULL 
-                )
-            """)
-            
-            print("🎉 oracle_schema >> 'loan' 테이블 생성 성공.")
-            
-    except Exception as e:
-        print(f"❌ oracle_schema >> 테이블 생성 에러: {e}")
-
-    finally:
-        cursor.close()
-        conn.close()
+    존재 여부는 한 번의 조회(user_tables)로 확인하고, 없는 테이블만 생성합니다.
+    """
 
-def insert_deposit(account_holder: str, balance: int):
+    async with pool.connection() as conn:
+        async with conn.cursor() as cursor:
+            try:
+                names = list(TABLE_DDL)
+                binds = ", ".join(f":{index + 1}" for index in range(len(names)))
+                await cursor.execute(f"SELECT table_name FROM user_tables WHERE table_name IN ({binds})", names)
+                existing = {row[0] for row in await cursor.fetchall()}
+
+                for name, ddl in TABLE_DDL.items():
+                    if name in existing:
+                        print(f"🎉 oracle_schema >> '{name.lower()}' 테이블이 이미 존재합니다.")
+                        continue
+                    await cursor.execute(ddl)
+                    print(f"🎉 oracle_schema >> '{name.lower()}' 테이블 생성 성공.")
+
+            except Exception as e:
+                print(f"❌ oracle_schema >> 테이블 생성 에러: {e}")
+
+async def insert_deposits(pool: AsyncOraclePool, rows: Iterable[Tuple[str, int]]):
     """
     Oracle DB에 예시 데이터를 삽입합니다.
-    DEPOSIT 테이블에 예금주가 중복되지 않는다면 데이터를 삽입합니다.
+    DEPOSIT 테이블에 예금주가 중복되지 않는 데이터만 삽입합니다. (MERGE + executemany, 왕복 1회)
     """
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
-            SELECT id 
-            FROM deposit 
-            WHERE account_holder = :account_holder
-            """, account_holder=account_holder
-        )
-
-        result = cursor.fetchone()
-        if result:
-            print(f"🎉 oracle_schema >> 해당 예금주의 데이터 이미 존재: {result[0]}")
-            return
-        
-        cursor.execute("""
-            INSERT INTO deposit (account_holder, balance)
-            VALUES (:account_holder, :balance)
-            """, account_holder=account_holder, balance=balance
-        )
-
-        conn.commit()
-        print(f"🎉 oracle_schema >> 데이터 삽입 성공: {account_holder}, {balance}")
-
-    except Exception as e:
-        print(f"❌ oracle_schema >> 데이터 조회 에러: {e}")
+    rows = [{"account_holder": account_holder, "balance": balance} for account_holder, balance in rows]
+    async with pool.connection() as conn:
+        async with conn.cursor() as cursor:
+            try:
+                await cursor.executemany("""
+                    MERGE INTO deposit d
+                    USING (SELECT :account_holder AS account_holder, :balance AS balance FROM dual) s
+                    ON (d.account_holder = s.account_holder)
+                    WHEN NOT MATCHED THEN
+                        INSERT (account_holder, balance) VALUES (s.account_holder, s.balance)
+                    """, rows
+                )
+                await conn.commit()
+                print(f"🎉 oracle_schema >> 예금 데이터 삽입 성공: {cursor.rowcount}건 (중복 {len(rows) - cursor.rowcount}건 제외)")
 
-    finally:
-        cursor.close()
-        conn.close()
+            except Exception as e:
+                print(f"❌ oracle_schema >> 예금 데이터 삽입 에러: {e}")
 
-def insert_loan(borrower: str, money: int):
+async def insert_loans(pool: AsyncOraclePool, rows: Iterable[Tuple[str, int]]):
     """
     Oracle DB에 예시 데이터를 삽입합니다.
-    LOAN 테이블에 대출자가 중복되지 않는다면 데이터를 삽입합니다.
+    LOAN 테이블에 대출자가 중복되지 않는 데이터만 삽입합니다. (MERGE + executemany, 왕복 1회)
     """
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
-            SELECT id 
-            FROM loan 
-            WHERE borrower = :borrower
-            """, borrower=borrower
-        )
-
-        result = cursor.fetchone()
-        if result:
-            print(f"🎉 oracle_schema >> 해당 대출자의 데이터 이미 존재: {result[0]}")
-            return
-        
-        cursor.execute("""
-            INSERT INTO loan (borrower, money)
-            VALUES (:borrower, :money)
-            """, borrower=borrower, money=money
-        )
-
-        conn.commit()
-        print(f"🎉 oracle_schema >> 데이터 삽입 성공: {borrower}, {money}")
-
-    except Exception as e:
-        print(f"❌ oracle_schema >> 데이터 조회 에러: {e}")
+    rows = [{"borrower": borrower, "money": money} for borrower, money in rows]
+    async with pool.connection() as conn:
+        async with conn.cursor() as cursor:
+            try:
+                await cursor.executemany("""
+                    MERGE INTO loan l
+                    USING (SELECT :borrower AS borrower, :money AS money FROM dual) s
+                    ON (l.borrower = s.borrower)
+                    WHEN NOT MATCHED THEN
+                        INSERT (borrower, money) VALUES (s.borrower, s.money)
+                    """, rows
+                )
+                await conn.commit()
+                print(f"🎉 oracle_schema >> 대출 데이터 삽입 성공: {cursor.rowcount}건 (중복 {len(rows) - cursor.rowcount}건 제외)")
 
-    finally:
-        cursor.close()
-        conn.close()
\ No newline at end of file
+            except Exception as e:
+                print(f"❌ oracle_schema >> 대출 데이터 삽입 에러: {e}")
@@ -0,0 +1,64 @@
+from typing import Any, Dict, List
+import hashlib
+import json
+
+"""
+==================================================
+모듈: SQL 템플릿 카탈로그 (TEMPLATES)
+==================================================
+이 파일은 Milvus 템플릿 컬렉션에 저장할 SQL 템플릿 목록(원하는 상태)을 정의합니다.
+db_server 시작 시 이 목록과 Milvus에 저장된 내용을 비교하여 변경된 항목만 반영합니다. (milvus_init.sync_template_catalog)
+
+- key: 템플릿 식별자. 변경하지 않습니다. (key가 바뀌면 삭제 후 추가로 처리됩니다)
+- intent_description: 검색용 의도 설명 (임베딩 대상)
+- sql_template: 실행할 SQL 템플릿
+- domain: 업무 도메인 (컬렉션의 partition key, 요청 도메인의 파티션만 검색)
+- locale: 의도 설명 언어
+- allowed_roles: 템플릿을 사용할 수 있는 역할 목록 ("*": 모든 역할)
+
+content_hash는 의도 설명, SQL 템플릿, 범위(domain, locale, allowed_roles), 임베딩 모델 이름으로 계산합니다.
+(모델이 바뀌면 모든 템플릿을 다시 임베딩해야 하므로 해시에 포함합니다)
+"""
+
+TEMPLATES: List[Dict[str, Any]] = [
+    {
+        "key": "deposit_balance",
+        "intent_description": "계좌 잔액 조회: 특정 계좌 소유자의 예금 잔액을 확인합니다",
+        "sql_template": "SELECT balance FROM deposit WHERE account_holder = :account_holder",
+        "domain": "banking",
+        "locale": "ko",
+        "allowed_roles": ["*"],
+    },
+    {
+        "key": "loan_amount",
+        "intent_description": "대출 금액 조회: 특정 채무자가 빌린 대출 금액을 확인합니다",
+        "sql_template": "SELECT money FROM loan WHERE borrower = :borrower",
+        "domain": "banking",
+        "locale": "ko",
+        "allowed_roles": ["*"],
+    },
+]
+
+
+def content_hash(template: Dict[str, Any], model_name: str) -> str:
+    payload = json.dumps(
+        [
+            template["intent_description"],
+            template["sql_template"],
+            template["domain"],
+            template["locale"],
+            sorted(template["allowed_roles"]),
+            model_name,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def catalog_version(hashes: Dict[str, str]) -> str:
+    """
+    {key: content_hash}로 카탈로그 전체 버전을 계산합니다. (순서와 무관)
+    """
+
+    lines = sorted(f"{key}:{value}" for key, value in hashes.items())
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:16]
@@ -1,19 +1,58 @@
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastmcp import FastMCP
-from mcp_servers.config.settings import CORS_ORIGINS
+from mcp_servers.catalog import template_catalog
+from mcp_servers.config.settings import (
+    ADMISSION_ENABLED,
+    CATALOG_POLL_INTERVAL,
+    CORS_ORIGINS,
+    CPU_POOL_ENABLED,
+    CPU_POOL_MAX_QUEUE,
+    CPU_POOL_MAX_TASKS_PER_CHILD,
+    CPU_POOL_TASK_TIMEOUT,
+    CPU_POOL_WORKERS,
+    EMBEDDING_BACKEND,
+    EMBEDDING_SOCKET,
+    EMBEDDING_TIMEOUT,
+    LOOP_MONITOR_ASYNCIO_DEBUG,
+    LOOP_MONITOR_ENABLED,
+    LOOP_MONITOR_THRESHOLD_MS,
+    MILVUS_URI,
+    REFRESH_ENABLED,
+    REQUEST_DEFAULT_TIMEOUT_MS,
+    TRACING_ENABLED,
+    TRACING_EXPORTER,
+    TRACING_FILE_PATH,
+    TRACING_SERVICE_NAME,
+)
+from mcp_servers.cpu_tasks import init_worker
 from mcp_servers.db.oracle import OracleManager
-from mcp_servers.resources.characters import register_characters_resource
+from mcp_servers.jobs import job_manager
+from mcp_servers.registry import ToolSessionMiddleware, tool_registry
+from mcp_servers.middleware.admission import AdmissionMiddleware
+from mcp_servers.middleware.deadline import DeadlineMiddleware
+from mcp_servers.middleware.loop_monitor import LoopMonitorMiddleware
+from mcp_servers.middleware.resilience import ResilienceMiddleware
+from mcp_servers.middleware.tracing import TracingMiddleware
+from mcp_servers.refresh import refresh_scheduler
+from mcp_servers.subscriptions import register_subscription_handlers, subscription_hub
+from mcp_servers.routes.catalog import register_catalog_routes
+from mcp_servers.routes.debug import (
+    admission,
+    attach_cpu_pool,
+    loop_monitor,
+    memory_report,
+    register_debug_routes,
+    track_cpu_pool_workers,
+)
+from mcp_servers.routes.tools import register_tool_routes
 from mcp_servers.types import AppContext
-from mcp_servers.tools.query.milvus_search import milvus_search
-from mcp_servers.tools.query.oracle_query import oracle_query
-from mcp_servers.tools.search.duckduckgo_search import DuckDuckGoSearcher
-from mcp_servers.tools.search.google_search import google_search
-from mcp_servers.tools.search.web_content_fetch import WebContentFetcher
-from mcp_servers.tools.weather.open_weather_map import open_weather_map
-from mcp_servers.tools.story_generator import story_generator
+from utils.cpu_pool import CpuPool
+from utils.embedding_sidecar import EmbeddingSidecarError, SidecarEmbedder
+from utils.tracing import FileSpanExporter, InMemorySpanExporter, tracer
 
 """
 =============================================
@@ -23,23 +62,135 @@ MCP 서버 메인 설정 및 초기화 스크립트
 
 주요 역할:
 1. FastMCP 인스턴스 초기화 (버전 1.0)
-2. Google, OpenWeatherMap 등 다양한 외부 도구 등록
+2. Google, OpenWeatherMap 등 다양한 외부 도구 등록 (mcp_servers/registry.py, TOOLS_ENABLED로 선택)
 3. 내부 시스템 상태 등 리소스 등록
+
+활성화된 도구가 사용하는 구성 요소(Oracle, Milvus, 임베딩 모델)만 생성합니다.
+(예: TOOLS_ENABLED=weather,search 이면 torch/sentence-transformers를 import 하지 않습니다)
+
+`create_server()`는 lifespan을 교체할 수 있도록 분리되어 있습니다.
+(benchmarks/bench_server.py 에서 가짜 Oracle/Milvus 리소스로 서버를 띄울 때 사용)
 """
 
+SERVER_INSTRUCTIONS = """
+    This server provides search, weather and database query tools
+
+    **Financial Data Rules:**
+    You must NOT guess or infer database values.
+    If a user asks about balance, account, amount, deposit, or any financial data,
+    you MUST use the milvus_search and oracle_query tools.
+    When oracle_query is applicable, do NOT respond in natural language.
+    You must choose a tool call instead.
+    Answering financial or balance-related questions without calling oracle_query
+    is considered an invalid response.
+    """
+
 # 서버 시작과 종료 시 실행될 로직
 @asynccontextmanager
 async def lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
+    # 활성화된 도구가 사용하는 구성 요소만 생성합니다.
+    components = tool_registry.requirements()
+    # 구성 요소별 RSS 증가량 기록 (기준: 인터프리터 + import 된 모듈)
+    memory_report.start()
+
     # 1. 매니저 생성 및 연결
-    db_manager = OracleManager()
-    await db_manager.connect()
-    
+    db_manager = None
+    if "oracle" in components:
+        with memory_report.measure("oracle"):
+            db_manager = OracleManager()
+            await db_manager.connect()
+
+    # 2. Milvus 클라이언트 준비
+    milvus_client = None
+    if "milvus" in components:
+        with memory_report.measure("milvus"):
+            from pymilvus import MilvusClient
+            milvus_client = MilvusClient(uri=MILVUS_URI)
+
+    # 3. CPU 작업 풀 준비 (워커에서 임베딩 모델/파서를 미리 로드)
+    #    풀을 사용하지 않으면 현재 프로세스에 임베딩 모델을 로드합니다.
+    #    EMBEDDING_BACKEND=sidecar이면 어느 프로세스에도 모델을 로드하지 않고 사이드카를 사용합니다.
+    local_embedding = "embedding" in components and EMBEDDING_BACKEND != "sidecar"
+    cpu_pool = None
+    embedder = None
+    if CPU_POOL_ENABLED:
+        with memory_report.measure("cpu_pool"):
+            cpu_pool = await CpuPool(
+                max_workers=CPU_POOL_WORKERS,
+                max_queue=CPU_POOL_MAX_QUEUE,
+                task_timeout=CPU_POOL_TASK_TIMEOUT,
+                max_tasks_per_child=CPU_POOL_MAX_TASKS_PER_CHILD,
+                initializer=init_worker,
+                initargs=(local_embedding,),
+            ).start()
+        attach_cpu_pool(cpu_pool)
+        track_cpu_pool_workers()
+    elif local_embedding:
+        with memory_report.measure("embedding"):
+            from mcp_servers.tools.query.milvus_search import load_embedding_model
+            embedder = load_embedding_model()
+    if "embedding" in components and EMBEDDING_BACKEND == "sidecar":
+        embedder = SidecarEmbedder(EMBEDDING_SOCKET, EMBEDDING_TIMEOUT)
+        try:
+            memory_report.track_process("embedding_sidecar", (await embedder.stats())["pid"])
+        except (OSError, EmbeddingSidecarError) as e:
+            # 사이드카가 나중에 시작되면 그때부터 사용합니다. (그 전의 milvus_search는 의존성 장애로 처리)
+            print(f"[Embedding] ⚠️ 임베딩 사이드카에 연결할 수 없습니다 ({EMBEDDING_SOCKET}): {e!r}")
+
+    # 4. 템플릿 카탈로그 버전 확인 (변경 시 milvus_search 결과 캐시 무효화)
+    catalog_watcher = None
+    if milvus_client is not None and CATALOG_POLL_INTERVAL > 0:
+        from mcp_servers.tools.query.milvus_search import COLLECTION_NAME
+        catalog_watcher = asyncio.create_task(template_catalog.watch(milvus_client, COLLECTION_NAME, CATALOG_POLL_INTERVAL))
+
+    app_context = AppContext(oracle=db_manager, milvus=milvus_client, embedder=embedder, cpu_pool=cpu_pool)
+
+    # 5. 활성화된 도구의 백그라운드 갱신 작업, 구독 피드 등록 (ToolSpec.setup)
+    tool_registry.setup(app_context, components)
+
+    # 6. 자주 요청되는 날씨/검색/템플릿 결과를 캐시 만료 전에 갱신
+    if REFRESH_ENABLED:
+        refresh_scheduler.start()
+
+    # 7. 백그라운드 작업 관리자 (job_submit 도구)
+    await job_manager.start()
+
+    # 8. 구독 중인 날씨/계좌 요약 리소스가 바뀌면 구독자에게 알림
+    subscription_hub.start()
+
+    # 시작 시 메모리 사용량 출력 (MEMORY_BUDGET_MB를 넘으면 경고)
+    memory_report.print_report()
+
     try:
-        # 2. 매니저 객체 자체를 공유
-        yield AppContext(oracle=db_manager)
+        # 9. 매니저 객체 자체를 공유
+        yield app_context
     finally:
-        # 3. 정리 로직 호출
-        await db_manager.disconnect()
+        # 10. 정리 로직 호출
+        await subscription_hub.stop()
+        await job_manager.close()
+        await refresh_scheduler.stop()
+        if catalog_watcher:
+            catalog_watcher.cancel()
+        if db_manager:
+            await db_manager.disconnect()
+        if milvus_client:
+            milvus_client.close()
+        if cpu_pool:
+            attach_cpu_pool(None)
+            await cpu_pool.close()
+
+def configure_tracing():
+    """
+    TRACING_ENABLED=true 인 경우에만 Span을 기록하도록 트레이서를 설정합니다.
+    """
+
+    if not TRACING_ENABLED:
+        return
+    if TRACING_EXPORTER == "file":
+        exporter = FileSpanExporter(TRACING_FILE_PATH)
+    else:
+        exporter = InMemorySpanExporter()
+    tracer.configure(TRACING_SERVICE_NAME, exporter)
 
 app = FastAPI()
 
@@ -51,41 +202,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )       
-        
-# MCP 서버 인스턴스 생성
-mcp = FastMCP(
-    name="MCP Mock Server",
-    version="1.0",
-    instructions="""
-    This server provides search, weather and database query tools
-
-    **Financial Data Rules:**
-    You must NOT guess or infer database values.
-    If a user asks about balance, account, amount, deposit, or any financial data,
-    you MUST use the milvus_search and oracle_query tools.
-    When oracle_query is applicable, do NOT respond in natural language.
-    You must choose a tool call instead.
-    Answering financial or balance-related questions without calling oracle_query
-    is considered an invalid response.
-    """,
-    log_level='DEBUG',
-    lifespan=lifespan
-)
 
-# 도구 인스턴스 생성 (미구현)
-# fetcher = WebContentFetcher()           # 웹 컨텐츠 추출 도구 인스턴스 생성
-# searcher = DuckDuckGoSearcher()         # 덕덕고 검색 도구 인스턴스 생성
-
-# 도구 등록
-mcp.tool(google_search)                 # 구글 검색 도구 등록
-# mcp.tool(searcher.duckduckgo_search)    # 덕덕고 검색 도구 등록 (미사용)
-# mcp.tool(fetcher.fetch_and_parse)       # 웹 컨텐츠 도구 등록 (미구현)
-mcp.tool(open_weather_map)              # 날씨 검색 도구 등록
-mcp.tool(milvus_search)                 # Milvus 검색 도구 등록
-mcp.tool(oracle_query)                  # 오라클 쿼리 도구 등록
-
-# 프롬프트 등록
-@mcp.prompt()
+# 프롬프트: 금융 데이터 조회
 def financial_advisor():
     """금융 데이터 조회를 위한 프롬프트"""
     return """당신은 금융 데이터 조회 전문가입니다.
@@ -107,6 +225,73 @@ def financial_advisor():
 모든 금융 데이터는 반드시 milvus_search 도구로 sql_template을 얻은 후 oracle_query 도구를 통해 조회해야 합니다.
 """
 
+def with_loop_monitor(server_lifespan):
+    """
+    lifespan을 감싸서 이벤트 루프 블로킹 감지기를 함께 시작/종료합니다.
+    (LOOP_MONITOR_ENABLED=true 인 경우에만 동작)
+    """
+
+    @asynccontextmanager
+    async def monitored_lifespan(server: FastMCP):
+        if LOOP_MONITOR_ASYNCIO_DEBUG:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = LOOP_MONITOR_THRESHOLD_MS / 1000
+
+        if not LOOP_MONITOR_ENABLED:
+            async with server_lifespan(server) as context:
+                yield context
+            return
+
+        async with loop_monitor.running():
+            async with server_lifespan(server) as context:
+                yield context
+
+    return monitored_lifespan
+
+def create_server(server_lifespan=lifespan) -> FastMCP:
+    """
+    MCP 서버 인스턴스를 생성하고 미들웨어, 도구, 프롬프트를 등록합니다.
+
+    Args:
+        server_lifespan: 서버 시작/종료 시 AppContext를 생성하는 lifespan 함수.
+    """
+
+    # MCP 서버 인스턴스 생성
+    mcp = FastMCP(
+        name="MCP Mock Server",
+        version="1.0",
+        instructions=SERVER_INSTRUCTIONS,
+        log_level='DEBUG',
+        lifespan=with_loop_monitor(server_lifespan)
+    )
+
+    # 미들웨어 등록
+    mcp.add_middleware(TracingMiddleware())     # 도구 호출 트레이싱
+    mcp.add_middleware(ToolSessionMiddleware(tool_registry))  # 도구 목록 변경 알림 대상 세션 기록
+    mcp.add_middleware(DeadlineMiddleware(REQUEST_DEFAULT_TIMEOUT_MS, tool_registry.timeouts))  # 요청 기한 전파 (입장 제어보다 바깥쪽)
+    if ADMISSION_ENABLED:                       # 도구별 동시 실행 한도 및 부하 차단
+        mcp.add_middleware(AdmissionMiddleware(admission))
+    mcp.add_middleware(ResilienceMiddleware())  # 회로 차단 시 구조화된 오류 응답
+    mcp.add_middleware(LoopMonitorMiddleware()) # 도구별 이벤트 루프 블로킹 추적
+
+    # 도구/리소스 등록 (TOOLS_ENABLED로 활성화된 도구의 모듈만 import, mcp_servers/registry.py 참고)
+    tool_registry.install(mcp, admission)
+    register_subscription_handlers(mcp, subscription_hub)  # 리소스 구독/변경 알림
+
+    # 프롬프트 등록
+    mcp.prompt(financial_advisor)
+
+    # 커스텀 라우트 등록
+    register_debug_routes(mcp)
+    register_catalog_routes(mcp)
+    register_tool_routes(mcp)
+
+    return mcp
+
+configure_tracing()
+mcp = create_server()
+
 # MCP 서버 실행
 if __name__ == "__main__":
     mcp.run(port=9092, transport="http")
\ No newline at end of file
@@ -0,0 +1,180 @@
+from typing import List
+import itertools
+
+import httpx
+
+from mcp_servers.routes.admin import ADMIN_PATH_PREFIXES, LOOPBACK_HOSTS
+
+"""
+==================================================
+모듈: MCP 세션 고정 라우팅 (Session Affinity)
+==================================================
+Streamable HTTP 전송의 stateful 세션은 세션을 만든 워커 프로세스의 메모리에만 존재합니다.
+여러 워커가 요청을 나눠 받으면 `Mcp-Session-Id`가 없는 워커로 요청이 전달되어 실패하므로,
+세션 ID에 워커 번호를 붙여 항상 같은 워커로 라우팅합니다.
+
+구성 요소:
+1. SessionAffinityMiddleware (워커): 응답의 세션 ID에 `w<번호>-` 접두사를 붙이고,
+   요청에서는 접두사를 제거하여 MCP 세션 매니저에 원래 ID를 전달합니다.
+2. AffinityRouter (마스터): 세션 ID 접두사로 대상 워커를 선택하고,
+   세션이 없는 요청(initialize 등)은 라운드 로빈으로 분배하는 스트리밍 리버스 프록시입니다.
+   워커는 항상 라우터의 loopback 주소에서 온 요청만 보므로, ADMIN_TOKEN이 없으면 라우터가
+   원래 클라이언트 주소로 /admin/*, /debug/* 요청을 확인합니다. (클라이언트가 보낸 X-Forwarded-* 헤더는 전달하지 않음)
+"""
+
+SESSION_HEADER = b"mcp-session-id"
+
+# 프록시에서 전달하지 않는 hop-by-hop 헤더
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length",
+}
+# 클라이언트가 보낸 주소 헤더 (워커가 원래 클라이언트 주소로 오인하지 않도록 전달하지 않음)
+FORWARDED_HEADERS = {"forwarded", "x-forwarded-for", "x-forwarded-host", "x-forwarded-proto", "x-real-ip"}
+
+
+def worker_prefix(worker_index: int) -> bytes:
+    return f"w{worker_index}-".encode()
+
+
+class SessionAffinityMiddleware:
+    """
+    워커 측 ASGI 미들웨어: 세션 ID에 워커 번호를 인코딩합니다.
+    """
+
+    def __init__(self, app, worker_index: int):
+        self.app = app
+        self.prefix = worker_prefix(worker_index)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 1. 요청 헤더의 세션 ID에서 워커 접두사 제거
+        headers = []
+        for key, value in scope["headers"]:
+            if key == SESSION_HEADER and value.startswith(self.prefix):
+                value = value[len(self.prefix):]
+            headers.append((key, value))
+        scope = dict(scope, headers=headers)
+
+        # 2. 응답 헤더의 세션 ID에 워커 접두사 추가
+        async def send_with_prefix(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    (key, self.prefix + value if key.lower() == SESSION_HEADER else value)
+                    for key, value in message.get("headers", [])
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_prefix)
+
+
+class AffinityRouter:
+    """
+    마스터 측 ASGI 앱: 세션 ID 접두사를 기준으로 워커에 요청을 전달합니다.
+    """
+
+    def __init__(self, upstreams: List[str], on_startup=None, loopback_admin_only: bool = True):
+        """
+        Args:
+            upstreams (List[str]): 워커 주소 목록 (인덱스 = 워커 번호).
+            on_startup: 라우터 시작 시 실행할 코루틴 함수 (워커 감시 작업 등록 등).
+            loopback_admin_only (bool): True이면 loopback이 아닌 클라이언트의 관리/디버그 요청을 403으로 거절합니다.
+                                        (ADMIN_TOKEN이 없을 때. 토큰이 있으면 워커가 토큰을 확인)
+        """
+
+        self.upstreams = upstreams
+        self.on_startup = on_startup
+        self.loopback_admin_only = loopback_admin_only
+        self._round_robin = itertools.cycle(range(len(upstreams)))
+        self.client = None
+
+    def pick(self, session_id: bytes | None) -> str:
+        if session_id and session_id.startswith(b"w"):
+            index, _, _ = session_id[1:].partition(b"-")
+            if index.isdigit() and int(index) < len(self.upstreams):
+                return self.upstreams[int(index)]
+        return self.upstreams[next(self._round_robin)]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        # 0. 관리/디버그 엔드포인트는 원래 클라이언트 주소로 확인합니다. (워커에는 라우터 주소만 보임)
+        client = scope.get("client")
+        if (self.loopback_admin_only and scope["path"].startswith(ADMIN_PATH_PREFIXES)
+                and (client is None or client[0] not in LOOPBACK_HOSTS)):
+            await _send_error(send, 403, "forbidden")
+            return
+
+        # 1. 요청 본문 수신
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        headers = dict(scope["headers"])
+        upstream = self.pick(headers.get(SESSION_HEADER))
+        url = upstream + scope["path"]
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode()
+
+        # 2. 워커로 전달 (SSE 응답을 위해 스트리밍)
+        request = self.client.build_request(
+            scope["method"],
+            url,
+            headers=[
+                (key, value) for key, value in scope["headers"]
+                if key.decode().lower() not in HOP_BY_HOP_HEADERS | FORWARDED_HEADERS
+            ],
+            content=body,
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            await _send_error(send, 502, f"upstream error: {e}")
+            return
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (key, value) for key, value in response.headers.raw
+                    if key.decode().lower() not in HOP_BY_HOP_HEADERS
+                ],
+            })
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await response.aclose()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.client = httpx.AsyncClient(timeout=None)
+                if self.on_startup:
+                    await self.on_startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _send_error(send, status: int, text: str):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+    })
+    await send({"type": "http.response.body", "body": text.encode()})
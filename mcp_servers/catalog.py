@@ -0,0 +1,185 @@
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from mcp_servers.config.settings import TEMPLATE_CACHE_SIZE
+from utils.lexical import BM25Index
+from utils.ttl_cache import PopularityCounter
+import asyncio
+import time
+
+"""
+==================================================
+모듈: 템플릿 카탈로그 상태 (TemplateCatalog)
+==================================================
+이 파일은 MCP 서버가 사용하는 템플릿 카탈로그의 버전과 milvus_search 결과 캐시,
+하이브리드 검색용 의도 설명 BM25 색인을 관리합니다.
+
+- 같은 의도(intent)로 반복되는 검색은 임베딩/벡터 검색 없이 캐시된 결과를 반환합니다.
+- BM25 색인은 첫 검색 시 컬렉션의 템플릿 전체를 조회하여 업무 도메인(partition key)별로 만듭니다.
+  (검색 비용이 전체 카탈로그가 아니라 요청 도메인의 템플릿 수에 비례하도록)
+- 의도별 요청 빈도를 집계합니다. 카탈로그가 바뀌어 캐시가 비워지면 자주 요청되는 의도부터
+  백그라운드에서 다시 검색하여 캐시를 채웁니다. (mcp_servers/refresh.py)
+- 카탈로그가 바뀌면(db_server의 sync_template_catalog) 캐시를 비우고 BM25 색인을 다시 만듭니다.
+  1. 알림: db_server → POST /admin/catalog/refresh (즉시 반영)
+  2. 확인: 컬렉션 속성 `catalog.version`을 CATALOG_POLL_INTERVAL초마다 확인
+     (멀티 워커 실행 시 알림은 한 워커에만 전달되므로 나머지 워커는 이 방식으로 갱신됩니다)
+
+상태 조회: GET /debug/catalog
+"""
+
+VERSION_PROPERTY = "catalog.version"
+# BM25 색인용 템플릿 조회 배치 크기 (Milvus query 한 번의 최대 행 수 16384를 넘는 카탈로그는 나누어 조회)
+LEXICAL_BATCH_SIZE = 4096
+TEMPLATE_FIELDS = ("template_key", "intent_description", "sql_template", "domain", "locale", "allowed_roles")
+
+
+def query_templates(client, collection_name: str) -> List[Dict[str, Any]]:
+    """
+    컬렉션의 템플릿 전체를 LEXICAL_BATCH_SIZE 행씩 나누어 조회합니다. (query_iterator)
+    """
+
+    iterator = client.query_iterator(
+        collection_name=collection_name,
+        batch_size=LEXICAL_BATCH_SIZE,
+        filter='template_key != ""',
+        output_fields=list(TEMPLATE_FIELDS),
+    )
+    rows = []
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                return rows
+            rows.extend(batch)
+    finally:
+        iterator.close()
+
+
+class TemplateCatalog:
+    """
+    카탈로그 버전, 검색 결과 캐시(LRU), 의도 설명 BM25 색인을 관리합니다.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self.cache_size = cache_size
+        self.version: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+        self._cache: "OrderedDict[Tuple[str, int, Hashable], Any]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0}
+        self.popularity = PopularityCounter()
+        # 하이브리드 검색용 도메인별 BM25 색인과 템플릿 내용
+        # ({template_key: {"intent_description", "sql_template", "domain", "locale", "allowed_roles"}})
+        self.lexical: Dict[str, BM25Index] = {}
+        self.templates: Dict[str, Dict[str, Any]] = {}
+        self._lexical_stale = True
+        self._lexical_lock = asyncio.Lock()
+
+    def get(self, intent: str, top_k: int, scope: Hashable = None):
+        key = (intent.strip(), top_k, scope)
+        self.popularity.record(key)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._cache[key]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, intent: str, top_k: int, results: Any, scope: Hashable = None):
+        if self.cache_size <= 0:
+            return
+        self._cache[(intent.strip(), top_k, scope)] = results
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def popular(self, n: int) -> List[Tuple[str, int, Hashable]]:
+        # 자주 요청된 (intent, top_k, scope) 목록
+        return [key for key, _ in self.popularity.top(n)]
+
+    def needs_refresh(self, key: Tuple[str, int, Hashable], ahead: float = 0) -> bool:
+        # 검색 결과는 만료 시간이 없으므로 카탈로그 변경 등으로 캐시에 없을 때만 다시 검색합니다.
+        return self.cache_size > 0 and key not in self._cache
+
+    def refresh(self, version: Optional[str] = None, reason: str = "notify"):
+        """
+        캐시를 비우고 카탈로그 버전을 갱신합니다.
+        """
+
+        self._cache.clear()
+        self._lexical_stale = True
+        self.version = version
+        self.refreshed_at = time.time()
+        self.stats["refreshes"] += 1
+        print(f"[Catalog] 템플릿 카탈로그 갱신 (version={version}, reason={reason})")
+
+    async def check_version(self, client, collection_name: str):
+        """
+        컬렉션 속성의 카탈로그 버전이 바뀌었으면 갱신합니다.
+        """
+
+        description = await asyncio.to_thread(client.describe_collection, collection_name)
+        version = (description.get("properties") or {}).get(VERSION_PROPERTY)
+        if self.version is None:
+            # 시작 직후 첫 확인: 캐시가 비어 있으므로 버전만 기록합니다.
+            self.version = version
+        elif version != self.version:
+            self.refresh(version, reason="poll")
+
+    async def ensure_lexical(self, client, collection_name: str):
+        """
+        BM25 색인이 없거나 카탈로그가 바뀐 뒤이면 템플릿 전체를 조회하여 다시 만듭니다.
+        """
+
+        if not self._lexical_stale:
+            return
+        async with self._lexical_lock:
+            if not self._lexical_stale:
+                return
+            generation = self.stats["refreshes"]
+            rows = await asyncio.to_thread(query_templates, client, collection_name)
+            templates = {row["template_key"]: {field: row.get(field) for field in TEMPLATE_FIELDS[1:]} for row in rows}
+            documents: Dict[str, Dict[str, str]] = defaultdict(dict)
+            for key, template in templates.items():
+                documents[template["domain"]][key] = template["intent_description"]
+            lexical = {}
+            for domain, domain_documents in documents.items():
+                lexical[domain] = BM25Index()
+                lexical[domain].build(domain_documents)
+            self.templates, self.lexical = templates, lexical
+            # 조회 중에 카탈로그가 다시 바뀌었으면 다음 검색에서 한 번 더 만듭니다.
+            self._lexical_stale = generation != self.stats["refreshes"]
+            print(f"[Catalog] BM25 색인 생성 (템플릿 {len(templates)}개, 도메인 {len(lexical)}개)")
+
+    def lexical_search(self, intent: str, top_k: int, domain: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        도메인의 BM25 색인으로 검색합니다. domain이 없으면 모든 도메인 결과를 점수순으로 합칩니다.
+        """
+
+        if domain:
+            index = self.lexical.get(domain)
+            return index.search(intent, top_k) if index else []
+        hits = [hit for index in self.lexical.values() for hit in index.search(intent, top_k)]
+        return sorted(hits, key=lambda hit: -hit[1])[:top_k]
+
+    async def watch(self, client, collection_name: str, interval: float):
+        """
+        interval초마다 카탈로그 버전을 확인합니다. (lifespan에서 태스크로 실행)
+        """
+
+        while True:
+            try:
+                await self.check_version(client, collection_name)
+            except Exception as e:
+                print(f"[Catalog] 카탈로그 버전 확인 실패: {e!r}")
+            await asyncio.sleep(interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "refreshed_at": self.refreshed_at,
+            "cached_intents": len(self._cache),
+            "lexical_docs": {domain: len(index) for domain, index in self.lexical.items()},
+            **self.stats,
+        }
+
+
+# 프로세스 전역 카탈로그 상태
+template_catalog = TemplateCatalog(TEMPLATE_CACHE_SIZE)
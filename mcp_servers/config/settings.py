@@ -9,17 +9,215 @@ load_dotenv('.env.local')
 
 # [Tool]
 DUCKDUCKGO_BASE_URL = os.getenv('DUCKDUCKGO_BASE_URL')
+# DuckDuckGo 결과 HTML 파서: auto | selectolax | lxml | html.parser (auto: 설치된 C 파서 우선)
+DUCKDUCKGO_PARSER = os.getenv('DUCKDUCKGO_PARSER', 'auto').lower()
 GOOGLE_SEARCH_URL = os.getenv('GOOGLE_WEB_SEARCH_URL')
 GOOGLE_SEARCH_API_KEY = os.getenv('GOOGLE_WEB_SEARCH_API_KEY')
+OPEN_WEATHER_MAP_URL = os.getenv('OPEN_WEATHER_MAP_URL', 'http://api.openweathermap.org/data/2.5/weather')
 OPEN_WEATHER_MAP_API_KEY = os.getenv('OPEN_WEATHER_MAP_API_KEY')
 
+# [Result] 도구 결과 인코딩
+# - RESULT_CONTENT_MODE: auto | text | structured | both (auto: 클라이언트 initialize 정보로 결정)
+# - RESULT_MAX_ROWS / RESULT_MAX_BYTES: 쿼리 결과 행 수 / 결과 크기(UTF-8 바이트) 상한. 초과분은 잘라내고 truncated로 표시합니다.
+RESULT_CONTENT_MODE = os.getenv('RESULT_CONTENT_MODE', 'auto')
+RESULT_MAX_ROWS = int(os.getenv('RESULT_MAX_ROWS', '200'))
+RESULT_MAX_BYTES = int(os.getenv('RESULT_MAX_BYTES', '32768'))
+
+# [Embedding]
+# - EMBEDDING_BACKEND: local (프로세스마다 모델 로드, CPU 풀 사용 시 풀 워커마다)
+#                      | sidecar (EMBEDDING_SOCKET의 임베딩 사이드카 하나를 모든 워커가 공유, python -m mcp_servers.embedding_sidecar)
+# - EMBEDDING_SOCKET / EMBEDDING_TIMEOUT: 사이드카 Unix 소켓 경로 / 요청 타임아웃(초)
+# - EMBEDDING_MAX_BATCH / EMBEDDING_BATCH_WAIT_MS: 사이드카가 동시 요청을 모아 한 번에 encode 할 최대 문장 수 / 대기 시간(ms)
+EMBEDDING_MODEL_NAME = os.getenv('EMBEDDING_MODEL_NAME', 'sentence-transformers/all-MiniLM-L6-v2')
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'local').lower()
+EMBEDDING_SOCKET = os.getenv('EMBEDDING_SOCKET', '/tmp/mcp-embedding.sock')
+EMBEDDING_TIMEOUT = float(os.getenv('EMBEDDING_TIMEOUT', '5'))
+EMBEDDING_MAX_BATCH = int(os.getenv('EMBEDDING_MAX_BATCH', '32'))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv('EMBEDDING_BATCH_WAIT_MS', '2'))
+
+# [CPU Pool] 임베딩/HTML 파싱 등 CPU 작업을 실행할 프로세스 풀
+CPU_POOL_ENABLED = os.getenv('CPU_POOL_ENABLED', 'true').lower() == 'true'
+CPU_POOL_WORKERS = int(os.getenv('CPU_POOL_WORKERS', '2'))
+CPU_POOL_MAX_QUEUE = int(os.getenv('CPU_POOL_MAX_QUEUE', '32'))
+CPU_POOL_TASK_TIMEOUT = float(os.getenv('CPU_POOL_TASK_TIMEOUT', '10'))
+CPU_POOL_MAX_TASKS_PER_CHILD = int(os.getenv('CPU_POOL_MAX_TASKS_PER_CHILD', '500'))
+
 # [DB]
 MILVUS_HOST=os.getenv('MILVUS_HOST')
-MILVUS_PORT=os.getenv
+MILVUS_PORT=os.getenv('MILVUS_PORT')
+MILVUS_URI = os.getenv('MILVUS_URI', 'http://localhost:19530')
 ORACLE_USER = os.getenv('ORACLE_USER')
 ORACLE_PASSWORD = os.getenv('ORACLE_PASSWORD')
 ORACLE_DSN = os.getenv('ORACLE_DSN')
 
+# [Index] 템플릿 검색 파라미터 (utils/ann_index.py)
+# - MILVUS_INDEX_TYPE: db_server가 만든 인덱스 유형과 같아야 합니다. (AUTOINDEX | FLAT | HNSW | IVF_FLAT | IVF_SQ8)
+# - MILVUS_HNSW_EF: HNSW 검색 후보 수 (클수록 recall↑, 지연↑)
+# - MILVUS_IVF_NPROBE: IVF 검색 클러스터 수 (MILVUS_IVF_NLIST 이하)
+MILVUS_INDEX_TYPE = os.getenv('MILVUS_INDEX_TYPE', 'AUTOINDEX')
+MILVUS_HNSW_EF = int(os.getenv('MILVUS_HNSW_EF', '64'))
+MILVUS_IVF_NLIST = int(os.getenv('MILVUS_IVF_NLIST', '128'))
+MILVUS_IVF_NPROBE = int(os.getenv('MILVUS_IVF_NPROBE', '16'))
+
+# [Hybrid] 템플릿 하이브리드 검색 (벡터 + BM25, utils/lexical.py)
+# - HYBRID_SEARCH_ENABLED: 의도 설명 BM25 순위와 벡터 검색 순위를 RRF로 결합 (false: 벡터 검색만)
+# - HYBRID_CANDIDATES: 각 검색에서 가져올 후보 수 / HYBRID_RRF_K: RRF 상수 (score = Σ 1 / (k + rank))
+# - HYBRID_RERANK: 결합된 후보를 "벡터 유사도 × RERANK_DENSE_WEIGHT + 문자 bigram 유사도 × (1 - weight)"로 재정렬
+# - TEMPLATE_MIN_SCORE: 최종 점수가 이 값보다 낮으면 "템플릿 없음" (0이면 비활성화)
+#   최종 점수: 재정렬 점수 | 재정렬을 끄면 RRF 점수 / (2 / (k + 1)) (두 검색 모두 1위 = 1.0, 한쪽만 1위 ≈ 0.5) | 하이브리드를 끄면 벡터 유사도
+HYBRID_SEARCH_ENABLED = os.getenv('HYBRID_SEARCH_ENABLED', 'true').lower() == 'true'
+HYBRID_CANDIDATES = int(os.getenv('HYBRID_CANDIDATES', '10'))
+HYBRID_RRF_K = int(os.getenv('HYBRID_RRF_K', '60'))
+HYBRID_RERANK = os.getenv('HYBRID_RERANK', 'true').lower() == 'true'
+RERANK_DENSE_WEIGHT = float(os.getenv('RERANK_DENSE_WEIGHT', '0.7'))
+TEMPLATE_MIN_SCORE = float(os.getenv('TEMPLATE_MIN_SCORE', '0'))
+
+# [Tenancy] 템플릿 검색 범위 기본값 (mcp_servers/tenancy.py)
+# - 요청 _meta(tenant_domain, locale, roles) 또는 HTTP 헤더(X-Tenant-Domain, X-Locale, X-User-Roles)가 없을 때 사용합니다.
+# - TEMPLATE_DEFAULT_DOMAIN: 비우면 모든 도메인(파티션)을 검색합니다.
+# - TEMPLATE_DEFAULT_LOCALE: 비우면 로케일 조건을 적용하지 않습니다.
+# - TEMPLATE_DEFAULT_ROLES: 쉼표 구분. allowed_roles에 "*"가 있는 템플릿은 역할과 관계없이 검색됩니다.
+TEMPLATE_DEFAULT_DOMAIN = os.getenv('TEMPLATE_DEFAULT_DOMAIN', 'banking')
+TEMPLATE_DEFAULT_LOCALE = os.getenv('TEMPLATE_DEFAULT_LOCALE', '')
+TEMPLATE_DEFAULT_ROLES = os.getenv('TEMPLATE_DEFAULT_ROLES', '')
+
+# [Catalog] 템플릿 카탈로그 (GET /debug/catalog)
+# - TEMPLATE_CACHE_SIZE: milvus_search 결과를 캐시할 최대 의도 수 (0이면 캐시 안 함)
+# - CATALOG_POLL_INTERVAL: 카탈로그 버전 확인 주기(초). 변경되면 캐시를 비웁니다. (0이면 확인 안 함)
+TEMPLATE_CACHE_SIZE = int(os.getenv('TEMPLATE_CACHE_SIZE', '1024'))
+CATALOG_POLL_INTERVAL = float(os.getenv('CATALOG_POLL_INTERVAL', '30'))
+
+# [Refresh] 외부 API 결과 캐시 및 백그라운드 갱신 (mcp_servers/refresh.py, GET /debug/refresh)
+# - WEATHER_CACHE_TTL / SEARCH_CACHE_TTL: open_weather_map / google_search 결과 유지 시간(초, 0이면 캐시 안 함)
+# - REFRESH_CACHE_SIZE: 도구별 최대 캐시 항목 수
+# - REFRESH_ENABLED: 자주 요청되는 도시/검색어/템플릿 의도를 만료 전에 미리 갱신
+# - REFRESH_INTERVAL: 갱신 대상 확인 주기(초) / REFRESH_AHEAD: 만료 몇 초 전부터 갱신할지
+# - REFRESH_TOP_N: 도구별로 갱신할 상위 요청 키 수
+# - REFRESH_BUDGET_PER_MINUTE: 백그라운드 갱신이 분당 사용할 수 있는 최대 호출 수 (모든 도구, 모든 워커 합계)
+WEATHER_CACHE_TTL = float(os.getenv('WEATHER_CACHE_TTL', '600'))
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', '3600'))
+REFRESH_CACHE_SIZE = int(os.getenv('REFRESH_CACHE_SIZE', '1024'))
+REFRESH_ENABLED = os.getenv('REFRESH_ENABLED', 'true').lower() == 'true'
+REFRESH_INTERVAL = float(os.getenv('REFRESH_INTERVAL', '30'))
+REFRESH_AHEAD = float(os.getenv('REFRESH_AHEAD', '60'))
+REFRESH_TOP_N = int(os.getenv('REFRESH_TOP_N', '20'))
+REFRESH_BUDGET_PER_MINUTE = int(os.getenv('REFRESH_BUDGET_PER_MINUTE', '30'))
+
+# [Subscriptions] 리소스 구독 및 변경 알림 (mcp_servers/subscriptions.py, GET /debug/subscriptions)
+# - ACCOUNT_CACHE_TTL: account://{holder}/summary 결과 유지 시간(초)
+# - SUBSCRIPTION_POLL_INTERVAL: 구독 중인 리소스 값 확인 주기(초). 값이 바뀐 경우에만 구독자에게 알림
+# - SUBSCRIPTION_MAX_URIS: 워커별 최대 구독 리소스 수
+ACCOUNT_CACHE_TTL = float(os.getenv('ACCOUNT_CACHE_TTL', '30'))
+SUBSCRIPTION_POLL_INTERVAL = float(os.getenv('SUBSCRIPTION_POLL_INTERVAL', '15'))
+SUBSCRIPTION_MAX_URIS = int(os.getenv('SUBSCRIPTION_MAX_URIS', '1024'))
+
+# [Jobs] 오래 걸리는 작업의 백그라운드 실행 (mcp_servers/jobs.py, GET /debug/jobs)
+# - JOB_BACKEND: memory | sqlite (JOB_SQLITE_PATH에 작업 상태/결과 저장, 서버 재시작 후에도 결과 조회 가능)
+# - JOB_MAX_WORKERS / JOB_MAX_PENDING: 동시 실행 작업 수 / 대기 작업 수 한도 (워커별)
+# - JOB_TTL: 끝난 작업을 보관할 시간(초) / JOB_TIMEOUT: 작업별 최대 실행 시간(초, 0이면 제한 없음)
+# - JOB_RESULT_MAX_BYTES: 작업 결과 크기 상한 (job_status는 RESULT_MAX_BYTES 이하인 결과만 함께 반환)
+# - JOB_EXPORT_MAX_ROWS / JOB_EXPORT_BATCH_ROWS: oracle_export 최대 행 수 / 한 번에 가져올 행 수
+# - JOB_FETCH_MAX_URLS / JOB_FETCH_CONCURRENCY: fetch_urls 최대 URL 수 / 동시 요청 수
+JOB_BACKEND = os.getenv('JOB_BACKEND', 'memory').lower()
+JOB_SQLITE_PATH = os.getenv('JOB_SQLITE_PATH', 'jobs.db')
+JOB_MAX_WORKERS = int(os.getenv('JOB_MAX_WORKERS', '2'))
+JOB_MAX_PENDING = int(os.getenv('JOB_MAX_PENDING', '16'))
+JOB_TTL = float(os.getenv('JOB_TTL', '3600'))
+JOB_TIMEOUT = float(os.getenv('JOB_TIMEOUT', '600'))
+JOB_RESULT_MAX_BYTES = int(os.getenv('JOB_RESULT_MAX_BYTES', str(4 * 1024 * 1024)))
+JOB_EXPORT_MAX_ROWS = int(os.getenv('JOB_EXPORT_MAX_ROWS', '100000'))
+JOB_EXPORT_BATCH_ROWS = int(os.getenv('JOB_EXPORT_BATCH_ROWS', '1000'))
+JOB_FETCH_MAX_URLS = int(os.getenv('JOB_FETCH_MAX_URLS', '50'))
+JOB_FETCH_CONCURRENCY = int(os.getenv('JOB_FETCH_CONCURRENCY', '4'))
+
+# [Tools] 도구 레지스트리 (mcp_servers/registry.py, GET /admin/tools)
+# - TOOLS_ENABLED: 서버 시작 시 활성화할 도구 이름 또는 그룹 (쉼표 구분, *: 기본 활성화 도구 전체)
+#   그룹이나 *에는 기본 비활성화 도구(duckduckgo_search, web_content_fetch)가 포함되지 않습니다. (이름으로 지정)
+#   그룹: search, weather, query, jobs (예: "weather,search"이면 Oracle/Milvus/임베딩 모델을 로드하지 않음)
+# - TOOLS_DISABLED: 비활성화할 도구 이름 또는 그룹 (TOOLS_ENABLED보다 우선)
+# - TOOL_TIMEOUTS: 요청에 기한이 없을 때 적용할 도구별 기한(ms) (예: "google_search=5000,milvus_search=3000")
+# - TOOL_ENTRY_POINT_GROUP: 외부 패키지 도구를 찾을 entry point 그룹
+TOOLS_ENABLED = os.getenv('TOOLS_ENABLED', '*')
+TOOLS_DISABLED = os.getenv('TOOLS_DISABLED', '')
+TOOL_TIMEOUTS = os.getenv('TOOL_TIMEOUTS', '')
+TOOL_ENTRY_POINT_GROUP = os.getenv('TOOL_ENTRY_POINT_GROUP', 'mcp_mock_server.tools')
+
+# [Workers] 멀티 워커 실행 시 Oracle 풀 예산을 워커 수로 나눕니다. (mcp_servers/prefork.py)
+# - ORACLE_POOL_MIN/MAX 는 서버 전체(모든 워커 합계) 기준 값입니다.
+MCP_WORKER_COUNT = max(1, int(os.getenv('MCP_WORKER_COUNT', '1')))
+ORACLE_POOL_MIN = int(os.getenv('ORACLE_POOL_MIN', '2'))
+ORACLE_POOL_MAX = int(os.getenv('ORACLE_POOL_MAX', '10'))
+ORACLE_POOL_MIN_PER_WORKER = max(1, ORACLE_POOL_MIN // MCP_WORKER_COUNT)
+ORACLE_POOL_MAX_PER_WORKER = max(1, ORACLE_POOL_MAX // MCP_WORKER_COUNT)
+
+# [DRCP / Pipeline] Oracle 서버 측 연결 풀 및 파이프라이닝 (utils/oracle_pool.py)
+# - ORACLE_DRCP_ENABLED: DRCP pooled server 사용 (DB에서 DBMS_CONNECTION_POOL.START_POOL() 필요)
+# - ORACLE_DRCP_CCLASS: 연결 클래스 / ORACLE_DRCP_PURITY: self | new | default
+# - ORACLE_PIPELINE_ENABLED: oracle_query 배치(inputs.batch)를 파이프라인으로 한 번에 전송 (Oracle 23ai 이상에서 효과)
+ORACLE_DRCP_ENABLED = os.getenv('ORACLE_DRCP_ENABLED', 'false').lower() == 'true'
+ORACLE_DRCP_CCLASS = os.getenv('ORACLE_DRCP_CCLASS', 'MCP_SERVER')
+ORACLE_DRCP_PURITY = os.getenv('ORACLE_DRCP_PURITY', 'self').lower()
+ORACLE_PIPELINE_ENABLED = os.getenv('ORACLE_PIPELINE_ENABLED', 'true').lower() == 'true'
+ORACLE_BATCH_MAX_STATEMENTS = int(os.getenv('ORACLE_BATCH_MAX_STATEMENTS', '20'))
+
+# [Deadline] 요청 기한 전파 (mcp_servers/middleware/deadline.py)
+# - REQUEST_DEFAULT_TIMEOUT_MS: 요청에 기한(_meta.timeout_ms, X-Request-Timeout-Ms)이 없을 때 적용할 기한 (0 이하이면 기한 없음)
+#   (이전 이름 ADMISSION_DEFAULT_TIMEOUT_MS도 읽습니다)
+REQUEST_DEFAULT_TIMEOUT_MS = float(
+    os.getenv('REQUEST_DEFAULT_TIMEOUT_MS', os.getenv('ADMISSION_DEFAULT_TIMEOUT_MS', '30000'))
+)
+
+# [Admission] 도구별 동시 실행 한도 및 부하 차단 (GET /debug/admission)
+# - ADMISSION_LIMITS: 도구별 동시 실행 한도 (예: "oracle_query=8,milvus_search=4")
+#   지정하지 않은 oracle_query/milvus_search는 워커당 Oracle 풀 크기 / CPU 풀 크기 기준으로 설정됩니다.
+# - ADMISSION_DEFAULT_LIMIT: 그 외 도구의 동시 실행 한도 (0 이하이면 제한 없음)
+# - ADMISSION_ADAPTIVE: 지연 시간 기반 AIMD 한도 조정 (ADMISSION_TOLERANCE: 최소 지연 대비 허용 배수)
+ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+ADMISSION_LIMITS = os.getenv('ADMISSION_LIMITS', '')
+ADMISSION_DEFAULT_LIMIT = int(os.getenv('ADMISSION_DEFAULT_LIMIT', '32'))
+ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', '32'))
+ADMISSION_ADAPTIVE = os.getenv('ADMISSION_ADAPTIVE', 'false').lower() == 'true'
+ADMISSION_TOLERANCE = float(os.getenv('ADMISSION_TOLERANCE', '2.0'))
+
+# [Resilience] 의존성별 타임아웃, 회로 차단기, 재시도, 헤징 (GET /debug/resilience)
+# - 타임아웃은 시도 1회 기준(초), RETRY_MAX_ATTEMPTS는 멱등 호출의 추가 재시도 횟수입니다.
+# - HEDGE_AFTER_MS: 읽기 호출이 이 시간(또는 최근 p95) 안에 끝나지 않으면 헤지 요청을 보냅니다. (0이면 비활성화)
+#   스레드에서 실행하는 동기 클라이언트 호출(Milvus)은 헤징하지 않습니다.
+# - BLOCKING_MAX_THREADS: 동기 클라이언트 호출용 의존성별 스레드 수. 타임아웃 후에도 끝나지 않은 호출이
+#   스레드를 점유하므로, 느린 의존성이 기본 스레드 풀을 모두 차지하지 않도록 의존성별로 제한합니다.
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3'))
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+MILVUS_TIMEOUT = float(os.getenv('MILVUS_TIMEOUT', '5'))
+ORACLE_CALL_TIMEOUT = float(os.getenv('ORACLE_CALL_TIMEOUT', '10'))
+RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '2'))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.getenv('BREAKER_RESET_TIMEOUT', '30'))
+HEDGE_AFTER_MS = float(os.getenv('HEDGE_AFTER_MS', '300'))
+BLOCKING_MAX_THREADS = int(os.getenv('BLOCKING_MAX_THREADS', '4'))
+
+# [Tracing]
+# - TRACING_EXPORTER: memory (GET /debug/traces 로 조회) | file (OTLP JSON Lines)
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', 'memory')
+TRACING_FILE_PATH = os.getenv('TRACING_FILE_PATH', 'traces.jsonl')
+TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'mcp-mock-server')
+
+# [Loop Monitor] 이벤트 루프 블로킹 감지 (GET /debug/loop)
+# - LOOP_MONITOR_ASYNCIO_DEBUG: asyncio debug 모드로 느린 콜백을 로그로 출력 (개발 환경 전용)
+LOOP_MONITOR_ENABLED = os.getenv('LOOP_MONITOR_ENABLED', 'false').lower() == 'true'
+LOOP_MONITOR_THRESHOLD_MS = float(os.getenv('LOOP_MONITOR_THRESHOLD_MS', '100'))
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv('LOOP_MONITOR_INTERVAL_MS', '20'))
+LOOP_MONITOR_ASYNCIO_DEBUG = os.getenv('LOOP_MONITOR_ASYNCIO_DEBUG', 'false').lower() == 'true'
+
+# [Memory] 메모리 사용량 (utils/memory.py, GET /debug/memory)
+# - MEMORY_BUDGET_MB: 워커 프로세스 RSS 예산. 시작 시 구성 요소별 RSS를 출력하고, 초과하면 경고합니다. (0이면 확인 안 함)
+MEMORY_BUDGET_MB = float(os.getenv('MEMORY_BUDGET_MB', '0'))
+
+# [Admin] 관리 엔드포인트 (/admin/*) 접근 제한 (mcp_servers/routes/admin.py)
+# - ADMIN_TOKEN: 설정하면 `Authorization: Bearer <ADMIN_TOKEN>` 헤더가 있는 요청만 허용합니다.
+#                비어 있으면 같은 호스트(loopback)에서 온 요청만 허용합니다. 그 외에는 403
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
 # [CORS]
 CORS_ORIGINS = [
     'http://localhost:3000',
@@ -0,0 +1,219 @@
+from typing import Callable, Dict, List, Optional
+from bs4 import BeautifulSoup
+from mcp_servers.config.settings import DUCKDUCKGO_PARSER, EMBEDDING_MODEL_NAME
+import re
+import urllib.parse
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax 미설치 시 lxml 또는 html.parser 사용
+    LexborHTMLParser = None
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+
+"""
+==================================================
+모듈: 프로세스 풀에서 실행되는 CPU 작업 (cpu_tasks)
+==================================================
+이 파일의 함수들은 CpuPool 워커 프로세스에서 실행됩니다.
+(pickle 가능하도록 모두 모듈 최상위 함수로 정의합니다)
+
+주요 역할:
+1. init_worker: 워커 시작 시 임베딩 모델과 HTML 파서를 미리 로드합니다.
+2. encode_text: 의도(intent) 문자열을 임베딩 벡터로 변환합니다.
+3. extract_page_text: 웹 페이지 HTML에서 LLM에 전달할 본문 텍스트를 추출합니다.
+4. parse_duckduckgo_results: DuckDuckGo 검색 결과 HTML을 파싱합니다.
+   설치된 C 기반 파서(selectolax > lxml)를 우선 사용하고, 없으면 bs4 html.parser를 사용합니다.
+   (selectolax/lxml은 선택 의존성: pip install .[fast])
+
+CpuPool이 비활성화된 경우에도 같은 함수를 이벤트 루프에서 직접 호출할 수 있습니다.
+"""
+
+# 워커 프로세스 전역 모델
+worker_model = None
+
+
+def init_worker(preload_model: bool = True):
+    """
+    워커 프로세스 초기화 함수. 첫 요청에서 모델 로딩 비용이 발생하지 않도록 미리 로드합니다.
+    """
+
+    global worker_model
+
+    # HTML 파서 워밍업 (bs4 내부 모듈 import, DuckDuckGo 결과 파서 준비)
+    BeautifulSoup("<html></html>", "html.parser")
+    parse_duckduckgo_results("<html></html>")
+
+    if preload_model and worker_model is None:
+        from sentence_transformers import SentenceTransformer
+        worker_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+
+def encode_text(text: str) -> List[float]:
+    if worker_model is None:
+        init_worker(preload_model=True)
+    return worker_model.encode(text).tolist()
+
+
+def extract_page_text(html: str, max_chars: int = 8000) -> str:
+    """
+    HTML에서 스크립트, 스타일, 네비게이션 요소 등을 제거하고 정제된 텍스트를 반환합니다.
+    """
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 스크립트, 스타일, 네비게이션 등 LLM에게 불필요한 태그 제거 (Decomposition)
+    for element in soup(["script", "style", "nav", "header", "footer"]):
+        element.decompose()
+
+    # 텍스트 추출 및 정제
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = " ".join(chunk for chunk in chunks if chunk)
+    # 정규 표현식을 사용하여 남아있는 과도한 공백 제거
+    text = re.sub(r"\s+", " ", text).strip()
+
+    # 길이 제한 (LLM 토큰 수 제한 고려)
+    if len(text) > max_chars:
+        text = text[:max_chars] + "... [content truncated]"
+    return text
+
+
+def _duckduckgo_link(link) -> Optional[str]:
+    # 유효하지 않거나 광고 링크는 None, DuckDuckGo 리디렉션 URL은 원래 URL로 정리합니다.
+    if not link or not isinstance(link, str) or "y.js" in link:
+        return None
+    if link.startswith("//duckduckgo.com/l/?uddg="):
+        link = urllib.parse.unquote(link.split("uddg=")[1].split("&")[0])
+    return link
+
+
+def _duckduckgo_result(title: str, link: str, snippet: str) -> Dict[str, str]:
+    return {
+        "toolId": "duckduckgo_search",
+        "title": title,
+        "link": link,
+        "snippet": snippet
+    }
+
+
+def _parse_selectolax(html: str, max_results: Optional[int]) -> List[Dict[str, str]]:
+    results = []
+    for result in LexborHTMLParser(html).css(".result"):
+        link_elem = result.css_first(".result__title a")
+        if link_elem is None:
+            continue
+        link = _duckduckgo_link(link_elem.attributes.get("href"))
+        if link is None:
+            continue
+        snippet_elem = result.css_first(".result__snippet")
+        snippet = snippet_elem.text(strip=True) if snippet_elem is not None else ""
+        results.append(_duckduckgo_result(link_elem.text(strip=True), link, snippet))
+        if max_results and len(results) >= max_results:
+            break
+    return results
+
+
+def _has_class(name: str) -> str:
+    # CSS 클래스 선택자(.name)와 같은 XPath 조건
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+if etree is not None:
+    # 결과마다 다시 해석하지 않도록 XPath를 미리 컴파일합니다.
+    _LXML_RESULTS = etree.XPath(f"//*[{_has_class('result')}]")
+    _LXML_TITLE_LINK = etree.XPath(f"(.//*[{_has_class('result__title')}]//a)[1]")
+    _LXML_SNIPPET = etree.XPath(f"(.//*[{_has_class('result__snippet')}])[1]")
+
+
+def _lxml_text(element) -> str:
+    # bs4 get_text(strip=True)와 같은 결과 (텍스트 조각별 strip 후 이어 붙임)
+    return "".join(text.strip() for text in element.itertext())
+
+
+def _parse_lxml(html: str, max_results: Optional[int]) -> List[Dict[str, str]]:
+    if not html.strip():
+        return []
+    results = []
+    for result in _LXML_RESULTS(lxml_html.document_fromstring(html)):
+        link_elems = _LXML_TITLE_LINK(result)
+        if not link_elems:
+            continue
+        link = _duckduckgo_link(link_elems[0].get("href"))
+        if link is None:
+            continue
+        snippet_elems = _LXML_SNIPPET(result)
+        snippet = _lxml_text(snippet_elems[0]) if snippet_elems else ""
+        results.append(_duckduckgo_result(_lxml_text(link_elems[0]), link, snippet))
+        if max_results and len(results) >= max_results:
+            break
+    return results
+
+
+def _parse_html_parser(html: str, max_results: Optional[int]) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
+
+    results = []
+    for result in soup.select(".result"):
+        title_elem = result.select_one(".result__title")
+        if not title_elem:
+            continue
+
+        link_elem = title_elem.find("a")
+        if not link_elem:
+            continue
+
+        # 유효하지 않거나 광고 링크 스킵
+        link = _duckduckgo_link(link_elem.get("href", ""))
+        if link is None:
+            continue
+
+        # 요약(Snippet) 추출
+        snippet_elem = result.select_one(".result__snippet")
+        snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+
+        results.append(_duckduckgo_result(link_elem.get_text(strip=True), link, snippet))
+        if max_results and len(results) >= max_results:
+            break
+    return results
+
+
+DUCKDUCKGO_PARSERS: Dict[str, Callable[[str, Optional[int]], List[Dict[str, str]]]] = {
+    "selectolax": _parse_selectolax,
+    "lxml": _parse_lxml,
+    "html.parser": _parse_html_parser,
+}
+
+
+def available_duckduckgo_parsers() -> List[str]:
+    available = {"selectolax": LexborHTMLParser is not None, "lxml": lxml_html is not None, "html.parser": True}
+    return [name for name in DUCKDUCKGO_PARSERS if available[name]]
+
+
+def duckduckgo_parser_name(preferred: str = DUCKDUCKGO_PARSER) -> str:
+    """
+    사용할 파서 이름을 반환합니다. 지정한 파서가 설치되어 있지 않으면 설치된 파서 중 가장 빠른 것을 사용합니다.
+    """
+
+    available = available_duckduckgo_parsers()
+    return preferred if preferred in available else available[0]
+
+
+def parse_duckduckgo_results(
+    html: str, max_results: Optional[int] = None, parser: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """
+    DuckDuckGo HTML 검색 결과 페이지에서 제목, 링크, 요약을 추출합니다.
+    유효한 결과가 max_results개 모이면 나머지 결과는 처리하지 않습니다.
+
+    Args:
+        html (str): 검색 결과 페이지 HTML.
+        max_results (int): 최대 결과 수. None이면 전체.
+        parser (str): selectolax | lxml | html.parser (기본값: DUCKDUCKGO_PARSER)
+    """
+
+    return DUCKDUCKGO_PARSERS[duckduckgo_parser_name(parser or DUCKDUCKGO_PARSER)](html, max_results)
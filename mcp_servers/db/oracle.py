@@ -1,35 +1,37 @@
-from mcp_servers.config.settings import ORACLE_DSN, ORACLE_PASSWORD, ORACLE_USER
-import oracledb
+from mcp_servers.config.settings import (
+    ORACLE_DRCP_CCLASS,
+    ORACLE_DRCP_ENABLED,
+    ORACLE_DRCP_PURITY,
+    ORACLE_DSN,
+    ORACLE_PASSWORD,
+    ORACLE_POOL_MAX_PER_WORKER,
+    ORACLE_POOL_MIN_PER_WORKER,
+    ORACLE_USER,
+)
+from utils.oracle_pool import AsyncOraclePool
 
 
-class OracleManager:
+class OracleManager(AsyncOraclePool):
     def __init__(self):
-        self.pool = None
-
-    async def connect(self):
         """
-        Oracle Connection Pool 생성
+        MCP 서버용 Oracle Connection Pool (utils/oracle_pool.py)
+        멀티 워커 실행 시 전체 풀 예산(ORACLE_POOL_MAX)을 워커 수로 나눈 크기로 생성합니다.
+        ORACLE_DRCP_ENABLED=true이면 DRCP pooled server를 사용합니다. (ORACLE_DRCP_CCLASS, ORACLE_DRCP_PURITY)
         """
-        print(f"Connecting to Oracle ({ORACLE_DSN})...")
-        self.pool = oracledb.create_pool_async(
+        super().__init__(
             user=ORACLE_USER,
             password=ORACLE_PASSWORD,
             dsn=ORACLE_DSN,
-            min=2,
-            max=10,
-            increment=1
+            min_size=ORACLE_POOL_MIN_PER_WORKER,
+            max_size=ORACLE_POOL_MAX_PER_WORKER,
+            name="mcp_server",
+            drcp=ORACLE_DRCP_ENABLED,
+            cclass=ORACLE_DRCP_CCLASS,
+            purity=ORACLE_DRCP_PURITY,
         )
-        return self
-    
+
     async def disconnect(self):
         """
         Oracle Connection Pool 해제
         """
-        if self.pool:
-            print("[mcp_server] Closing Oracle Connection Pool...")
-            await self.pool.close()
-    
-    async def get_pool(self):
-        if not self.pool:
-            await self.connect()
-        return self.pool
\ No newline at end of file
+        await self.close()
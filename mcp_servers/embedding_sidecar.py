@@ -0,0 +1,67 @@
+from mcp_servers.config.settings import (
+    EMBEDDING_BATCH_WAIT_MS,
+    EMBEDDING_MAX_BATCH,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_SOCKET,
+)
+from utils.embedding_sidecar import EmbeddingSidecar
+from utils.memory import MemoryReport
+import argparse
+import asyncio
+
+"""
+==================================================
+모듈: 임베딩 사이드카 실행기
+==================================================
+임베딩 모델(MiniLM)과 torch 런타임을 이 프로세스 하나에만 로드하고, Unix 소켓(EMBEDDING_SOCKET)으로
+MCP 서버 워커, CPU 풀 워커, db_server가 공유하도록 합니다. (utils/embedding_sidecar.py)
+
+MCP 서버와 db_server는 EMBEDDING_BACKEND=sidecar로 실행합니다.
+(멀티 워커 실행 시 워커 수와 관계없이 모델 메모리는 사이드카 하나 분량입니다)
+
+실행:
+    python -m mcp_servers.embedding_sidecar
+    python -m mcp_servers.embedding_sidecar --socket /tmp/mcp-embedding.sock --max-batch 64
+"""
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="임베딩 사이드카 (Unix 소켓)")
+    parser.add_argument("--socket", default=EMBEDDING_SOCKET, help="Unix 소켓 경로")
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME, help="SentenceTransformer 모델 이름")
+    parser.add_argument("--max-batch", type=int, default=EMBEDDING_MAX_BATCH, help="한 번에 encode 할 최대 문장 수")
+    parser.add_argument("--batch-wait-ms", type=float, default=EMBEDDING_BATCH_WAIT_MS, help="배치를 모으기 위해 기다릴 시간(ms)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 1. 모델 로드 (구성 요소별 RSS 출력)
+    report = MemoryReport()
+    report.start()
+    with report.measure("torch"):
+        import torch  # noqa: F401
+    with report.measure("model"):
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(args.model)
+        # 첫 요청에서 지연이 생기지 않도록 한 번 실행합니다.
+        model.encode(["warmup"])
+    report.print_report("EmbeddingSidecar")
+
+    # 2. 요청 처리
+    sidecar = EmbeddingSidecar(
+        model,
+        args.socket,
+        model_name=args.model,
+        max_batch=args.max_batch,
+        batch_wait_ms=args.batch_wait_ms,
+    )
+    try:
+        asyncio.run(sidecar.serve())
+    except KeyboardInterrupt:
+        print("[EmbeddingSidecar] 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from mcp_servers.config.settings import (
+    JOB_BACKEND,
+    JOB_MAX_PENDING,
+    JOB_MAX_WORKERS,
+    JOB_SQLITE_PATH,
+    JOB_TIMEOUT,
+    JOB_TTL,
+)
+from mcp_servers.registry import load_target
+from mcp_servers.subscriptions import subscription_hub
+from utils.jobs import Job, JobManager, MemoryJobStore, SqliteJobStore
+
+"""
+==================================================
+모듈: 백그라운드 작업 종류 및 관리자 (job_manager)
+==================================================
+이 파일은 job_submit 도구로 실행할 수 있는 작업 종류(JOB_KINDS)와 프로세스 전역 작업 관리자를 정의합니다.
+MCP 서버 lifespan에서 시작하고 종료합니다.
+
+작업 종류:
+- oracle_export   : RESULT_MAX_ROWS를 넘는 Oracle 조회 결과 전체 내보내기
+- fetch_urls      : 여러 웹 페이지 내용 수집
+- catalog_reindex : 템플릿 캐시 초기화 및 BM25 색인 재생성
+
+- JOB_BACKEND=sqlite이면 작업 상태/결과를 JOB_SQLITE_PATH에 저장합니다.
+  멀티 워커 실행 시에도 다른 워커가 시작한 작업을 조회할 수 있습니다. (취소는 작업을 실행 중인 워커에서만 가능)
+- 진행 상황은 job://{job_id} 리소스 구독자에게 notifications/resources/updated로 알립니다.
+  (job_submit 요청은 바로 끝나므로 그 요청의 progressToken으로는 알릴 수 없습니다. 구독하지 않으면 job_status로 조회)
+- 작업 함수는 "모듈:속성"으로 선언하고 처음 등록될 때 import 합니다. (catalog_reindex가 임베딩 모델을 로드하지 않도록)
+"""
+
+
+@dataclass
+class JobKind:
+    # "모듈:속성" - (app_context, inputs, progress) -> 결과 JSON 문자열
+    run: str
+    # "모듈:속성" - inputs 검증. 오류 메시지 또는 None
+    validate: Optional[str] = None
+    # 작업이 사용하는 lifespan 구성 요소 (도구 레지스트리 참고)
+    requires: Tuple[str, ...] = ()
+
+    def load(self) -> Tuple[Callable[..., Awaitable[str]], Optional[Callable[[Dict[str, Any]], Optional[str]]]]:
+        return load_target(self.run), load_target(self.validate) if self.validate else None
+
+
+JOB_KINDS: Dict[str, JobKind] = {
+    "oracle_export": JobKind(
+        "mcp_servers.tools.query.oracle_export:oracle_export",
+        "mcp_servers.tools.query.oracle_export:validate_export",
+        requires=("oracle",),
+    ),
+    "fetch_urls": JobKind(
+        "mcp_servers.tools.search.fetch_urls:fetch_urls",
+        "mcp_servers.tools.search.fetch_urls:validate_fetch",
+    ),
+    "catalog_reindex": JobKind("mcp_servers.tools.query.reindex_catalog:reindex_catalog", requires=("milvus",)),
+}
+
+
+def job_uri(job_id: str) -> str:
+    return f"job://{job_id}"
+
+
+async def notify_job_subscribers(job: Job):
+    """
+    작업 진행/종료 시 job://{job_id} 리소스를 구독한 세션에 변경을 알립니다. (구독자가 없으면 아무것도 하지 않음)
+    """
+
+    await subscription_hub.check(job_uri(job.id))
+
+
+# 프로세스 전역 작업 관리자
+job_manager = JobManager(
+    store=SqliteJobStore(JOB_SQLITE_PATH) if JOB_BACKEND == "sqlite" else MemoryJobStore(),
+    max_workers=JOB_MAX_WORKERS,
+    max_pending=JOB_MAX_PENDING,
+    ttl=JOB_TTL,
+    timeout=JOB_TIMEOUT,
+)
@@ -0,0 +1,71 @@
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from utils.admission import AdmissionController, Overloaded
+from utils.deadline import current_deadline
+import json
+import time
+
+"""
+==================================================
+미들웨어 모듈: 도구별 입장 제어 (AdmissionMiddleware)
+==================================================
+이 파일은 도구 호출마다 AdmissionController의 동시 실행 슬롯을 획득하는 미들웨어를 정의합니다.
+
+동작 방식:
+1. 요청 기한(deadline)은 DeadlineMiddleware가 설정한 값을 사용합니다. (mcp_servers/middleware/deadline.py)
+2. 슬롯을 얻지 못하면(대기열 가득 참 / 기한 내 실행 불가) 도구를 실행하지 않고
+   즉시 구조화된 "overloaded" ToolResult를 반환합니다.
+3. 실행 후 측정한 지연 시간을 전달하여 적응형 한도를 조정합니다.
+"""
+
+class AdmissionMiddleware(Middleware):
+
+    def __init__(self, controller: AdmissionController):
+        """
+        Args:
+            controller (AdmissionController): 도구별 한도/대기열 관리 객체.
+        """
+
+        self.controller = controller
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool_name = context.message.name
+        limiter = self.controller.limiter(tool_name)
+        if limiter is None:
+            return await call_next(context)
+
+        # 1. 슬롯 획득 (실패 시 도구를 실행하지 않고 즉시 반환)
+        try:
+            await limiter.acquire(current_deadline())
+        except Overloaded as e:
+            print(f"[Admission] {tool_name} 거절: {e.reason} (retry after {e.retry_after_ms}ms)")
+            return overloaded_result(tool_name, e)
+
+        # 2. 도구 실행 및 지연 시간 기록
+        start = time.monotonic()
+        ok = False
+        try:
+            result = await call_next(context)
+            ok = True
+            return result
+        finally:
+            limiter.release(time.monotonic() - start, ok)
+
+
+def overloaded_result(tool_name: str, error: Overloaded) -> ToolResult:
+    """
+    과부하로 요청을 거절했음을 나타내는 ToolResult를 생성합니다.
+    에이전트가 재시도 여부를 판단할 수 있도록 사유와 재시도 대기 시간을 함께 전달합니다.
+    """
+
+    payload = {
+        "error": "overloaded",
+        "tool": tool_name,
+        "reason": error.reason,
+        "retry_after_ms": error.retry_after_ms,
+    }
+    return ToolResult(
+        content=[TextContent(type="text", text=json.dumps(payload, ensure_ascii=False))],
+        meta={"overloaded": True, "retry_after_ms": error.retry_after_ms},
+    )
@@ -0,0 +1,81 @@
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from typing import Dict, Optional
+from utils.deadline import DeadlineExceeded, deadline_scope
+import json
+import time
+
+"""
+==================================================
+미들웨어 모듈: 요청 기한 전파 (DeadlineMiddleware)
+==================================================
+이 파일은 도구 호출마다 요청 기한(deadline)을 구해 contextvar(utils/deadline.py)에 설정하는 미들웨어를 정의합니다.
+도구 안의 하위 호출(HTTP, Oracle 풀/쿼리, Milvus 검색, CPU 작업, RateLimiter 대기)은 남은 시간으로 타임아웃을 정합니다.
+
+동작 방식:
+1. 요청 기한을 구합니다.
+   - 요청 `_meta.timeout_ms` (에이전트가 남은 시간을 전달하는 경우)
+   - HTTP `X-Request-Timeout-Ms` 헤더
+   - 둘 다 없으면 도구별 기본 기한 (도구 레지스트리 timeout_ms / TOOL_TIMEOUTS), 그다음 REQUEST_DEFAULT_TIMEOUT_MS
+2. 입장 제어(AdmissionMiddleware)는 같은 기한으로 대기/거절을 판단합니다. (이 미들웨어가 바깥쪽에 있어야 합니다)
+3. 기한 안에 끝낼 수 없는 작업은 DeadlineExceeded로 중단되고,
+   일반 도구 오류 대신 구조화된 "deadline_exceeded" ToolResult를 반환합니다.
+"""
+
+class DeadlineMiddleware(Middleware):
+
+    def __init__(self, default_timeout_ms: float = 0, tool_timeouts: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            default_timeout_ms (float): 요청에 기한이 없을 때 적용할 기본 기한(ms). 0 이하이면 기한 없음.
+            tool_timeouts (Dict[str, float]): 도구별 기본 기한(ms). 실행 중 변경이 반영되도록 같은 dict를 참조합니다.
+        """
+
+        self.default_timeout_ms = default_timeout_ms
+        self.tool_timeouts = tool_timeouts if tool_timeouts is not None else {}
+
+    def _deadline(self, context: MiddlewareContext) -> Optional[float]:
+        meta = context.message.meta
+        timeout_ms = getattr(meta, "timeout_ms", None) if meta else None
+        if timeout_ms is None:
+            timeout_ms = get_http_headers().get("x-request-timeout-ms")
+        if timeout_ms is None:
+            timeout_ms = self.tool_timeouts.get(context.message.name, self.default_timeout_ms)
+
+        try:
+            timeout_ms = float(timeout_ms)
+        except (TypeError, ValueError):
+            return None
+        return time.monotonic() + timeout_ms / 1000 if timeout_ms > 0 else None
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        with deadline_scope(self._deadline(context)):
+            try:
+                return await call_next(context)
+            except DeadlineExceeded as e:
+                return deadline_exceeded_result(context.message.name, e)
+            except ToolError as e:
+                # FastMCP는 도구에서 발생한 예외를 ToolError로 감싸므로 `__cause__`에서 찾습니다.
+                if not isinstance(e.__cause__, DeadlineExceeded):
+                    raise
+                return deadline_exceeded_result(context.message.name, e.__cause__)
+
+
+def deadline_exceeded_result(tool_name: str, error: DeadlineExceeded) -> ToolResult:
+    """
+    요청 기한 안에 끝낼 수 없어 작업을 중단했음을 나타내는 ToolResult를 생성합니다.
+    """
+
+    print(f"[Deadline] {tool_name} 중단: {error}")
+    payload = {
+        "error": "deadline_exceeded",
+        "tool": tool_name,
+        "operation": error.operation,
+    }
+    return ToolResult(
+        content=[TextContent(type="text", text=json.dumps(payload, ensure_ascii=False))],
+        meta={"deadline_exceeded": True, "operation": error.operation},
+    )
@@ -0,0 +1,32 @@
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+"""
+==================================================
+미들웨어 모듈: 도구별 이벤트 루프 블로킹 추적 (LoopMonitorMiddleware)
+==================================================
+이 파일은 LoopMonitor가 캡처한 스택을 도구 이름으로 귀속시키기 위한 미들웨어를 정의합니다.
+
+동작 방식:
+- 도구 실행 중에는 이 미들웨어의 `on_call_tool` frame이 호출 스택에 남아 있습니다.
+- 워치독 스레드가 블로킹을 감지하면 `tool_name_from_frame()`이 스택을 거슬러 올라가
+  해당 frame의 `tool_name` 지역 변수를 읽어 어떤 도구가 루프를 점유했는지 판별합니다.
+"""
+
+class LoopMonitorMiddleware(Middleware):
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool_name = context.message.name    # tool_name_from_frame()에서 참조하는 지역 변수
+        return await call_next(context)
+
+
+def tool_name_from_frame(frame):
+    """
+    캡처한 frame에서 실행 중인 도구 이름을 찾습니다. 도구 실행 중이 아니면 None을 반환합니다.
+    """
+
+    target = LoopMonitorMiddleware.on_call_tool.__code__
+    while frame is not None:
+        if frame.f_code is target:
+            return frame.f_locals.get("tool_name")
+        frame = frame.f_back
+    return None
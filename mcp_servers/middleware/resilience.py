@@ -0,0 +1,42 @@
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from utils.resilience import CircuitOpen
+import json
+
+"""
+==================================================
+미들웨어 모듈: 의존성 장애 응답 (ResilienceMiddleware)
+==================================================
+이 파일은 도구 실행 중 회로 차단기가 열려 호출이 거절된 경우(CircuitOpen),
+일반 도구 오류 대신 구조화된 "dependency_unavailable" ToolResult를 반환하는 미들웨어를 정의합니다.
+
+동작 방식:
+- FastMCP는 도구에서 발생한 예외를 ToolError로 감싸므로 `__cause__`에서 CircuitOpen을 찾습니다.
+- 에이전트는 `retry_after_ms`를 보고 재시도 시점을 판단하거나 다른 도구로 대체할 수 있습니다.
+"""
+
+class ResilienceMiddleware(Middleware):
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        try:
+            return await call_next(context)
+        except ToolError as e:
+            if not isinstance(e.__cause__, CircuitOpen):
+                raise
+            return unavailable_result(context.message.name, e.__cause__)
+
+
+def unavailable_result(tool_name: str, error: CircuitOpen) -> ToolResult:
+    retry_after_ms = int(error.retry_after * 1000)
+    payload = {
+        "error": "dependency_unavailable",
+        "tool": tool_name,
+        "dependency": error.name,
+        "retry_after_ms": retry_after_ms,
+    }
+    return ToolResult(
+        content=[TextContent(type="text", text=json.dumps(payload, ensure_ascii=False))],
+        meta={"dependency_unavailable": True, "retry_after_ms": retry_after_ms},
+    )
@@ -0,0 +1,37 @@
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from utils.tracing import parse_traceparent, tracer
+
+"""
+==================================================
+미들웨어 모듈: 도구 호출 트레이싱 (TracingMiddleware)
+==================================================
+이 파일은 MCP 도구 호출마다 SERVER Span을 생성하는 FastMCP 미들웨어를 정의합니다.
+
+주요 역할:
+1. 에이전트(FastAgent)가 전달한 trace context를 이어받습니다.
+   - 요청 `_meta.traceparent` (opentelemetry-instrumentation-mcp 방식)
+   - HTTP `traceparent` 헤더
+2. 도구 실행 구간을 `tool <이름>` Span으로 기록합니다.
+   도구 내부의 임베딩, 벡터 검색, 풀 획득, SQL 실행, 외부 HTTP 호출은 자식 Span이 됩니다.
+"""
+
+class TracingMiddleware(Middleware):
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool_name = context.message.name
+
+        # 1. 원격 부모 Span 추출 (_meta 우선, 없으면 HTTP 헤더)
+        meta = context.message.meta
+        traceparent = getattr(meta, "traceparent", None) if meta else None
+        if traceparent is None:
+            traceparent = get_http_headers().get("traceparent")
+
+        # 2. 도구 호출 Span 생성
+        with tracer.start_span(
+            f"tool {tool_name}",
+            attributes={"mcp.tool.name": tool_name},
+            kind="SERVER",
+            parent=parse_traceparent(traceparent),
+        ):
+            return await call_next(context)
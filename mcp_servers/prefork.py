@@ -0,0 +1,226 @@
+from typing import Dict, List
+import argparse
+import asyncio
+import gc
+import os
+import signal
+import socket
+import sys
+
+"""
+==================================================
+모듈: 멀티 워커(pre-fork) MCP 서버 실행기
+==================================================
+`mcp_server.py`는 단일 프로세스로 실행되므로 MiniLM 임베딩, HTML 파싱, 결과 직렬화 같은
+CPU 작업이 코어 1개로 제한됩니다. 이 모듈은 여러 워커 프로세스로 MCP 서버를 실행합니다.
+
+동작 방식:
+1. 마스터가 도구 모듈과 임베딩 모델을 먼저 로드한 뒤 `gc.freeze()` 후 fork 합니다.
+   → 모델 가중치는 워커 간 copy-on-write로 공유됩니다.
+2. 각 워커는 자신의 이벤트 루프에서 lifespan을 실행하여 Oracle 풀과 Milvus 클라이언트를 생성합니다.
+   → Oracle 풀 크기는 ORACLE_POOL_MAX(전체 예산)를 워커 수로 나눈 값입니다.
+3. 세션 처리 방식
+   - stateless (기본값): 요청마다 독립적으로 처리하므로 어느 워커가 받아도 됩니다.
+     모든 워커가 하나의 리스닝 소켓을 공유합니다.
+   - stateful (--stateful): 워커마다 내부 포트를 열고, 마스터의 AffinityRouter가
+     `Mcp-Session-Id`의 워커 접두사로 같은 워커에 요청을 고정합니다.
+     (진행 알림, 리소스 구독 등 세션 기반 기능이 필요한 경우)
+4. 마스터는 종료된 워커를 감지하여 다시 실행합니다.
+
+실행:
+    python -m mcp_servers.prefork --workers 4 --port 9092
+    python -m mcp_servers.prefork --workers 4 --port 9092 --stateful
+"""
+
+class WorkerSupervisor:
+    """
+    워커 프로세스를 fork하고 종료된 워커를 다시 실행하는 감독자입니다.
+    """
+
+    def __init__(self, server, sockets: List[socket.socket], stateful: bool, log_level: str):
+        """
+        Args:
+            server (FastMCP): 워커에서 실행할 MCP 서버 인스턴스.
+            sockets (List[socket.socket]): 워커별 리스닝 소켓 (stateless 모드에서는 같은 소켓 공유).
+            stateful (bool): stateful 세션 모드 여부.
+        """
+
+        self.server = server
+        self.sockets = sockets
+        self.stateful = stateful
+        self.log_level = log_level
+        self.workers: Dict[int, int] = {}   # pid -> 워커 번호
+        self.stopping = False
+
+    def spawn(self, index: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker(index)
+            except BaseException as e:
+                print(f"[prefork] worker {index} 비정상 종료: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                os._exit(code)
+
+        self.workers[pid] = index
+        print(f"[prefork] worker {index} 시작 (pid={pid})")
+
+    def spawn_all(self):
+        for index in range(len(self.sockets)):
+            self.spawn(index)
+
+    def _run_worker(self, index: int):
+        import uvicorn
+        from mcp_servers.affinity import SessionAffinityMiddleware
+
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.environ["MCP_WORKER_INDEX"] = str(index)
+
+        app = self.server.http_app(transport="http", stateless_http=not self.stateful)
+        if self.stateful:
+            app = SessionAffinityMiddleware(app, worker_index=index)
+
+        # 워커는 X-Forwarded-* 헤더를 클라이언트 주소로 사용하지 않습니다. (관리 엔드포인트 loopback 확인)
+        config = uvicorn.Config(app, lifespan="on", log_level=self.log_level, proxy_headers=False)
+        uvicorn.Server(config).run(sockets=[self.sockets[index]])
+
+    def reap(self, block: bool) -> bool:
+        """
+        종료된 워커를 회수하고, 서버가 종료 중이 아니면 다시 실행합니다.
+        Returns:
+            bool: 살아있는 워커가 남아있는지 여부.
+        """
+
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                break
+            if pid == 0:
+                break
+
+            index = self.workers.pop(pid, None)
+            if index is None:
+                continue
+            print(f"[prefork] worker {index} 종료 (pid={pid}, status={status})")
+            if not self.stopping:
+                self.spawn(index)
+            if block:
+                break
+        return bool(self.workers)
+
+    def stop(self, *_):
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def serve_forever(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        while self.reap(block=True):
+            pass
+
+    async def watch(self, interval: float = 1.0):
+        # stateful 모드: 라우터 이벤트 루프에서 주기적으로 워커 상태를 확인합니다.
+        while not self.stopping:
+            await asyncio.sleep(interval)
+            self.reap(block=False)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="멀티 워커(pre-fork) MCP 서버 실행기")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9092)
+    parser.add_argument("--stateful", action="store_true", help="세션 고정 라우팅을 사용하는 stateful 모드")
+    parser.add_argument("--no-preload", action="store_true", help="마스터에서 임베딩 모델을 미리 로드하지 않음")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 0. settings 로딩 전에 워커 수를 지정 (Oracle 풀 예산 분할에 사용)
+    os.environ["MCP_WORKER_COUNT"] = str(args.workers)
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    import mcp_server
+    from mcp_servers.config.settings import CPU_POOL_ENABLED, EMBEDDING_BACKEND, ORACLE_POOL_MAX, ORACLE_POOL_MAX_PER_WORKER
+    from mcp_servers.registry import tool_registry
+
+    if ORACLE_POOL_MAX_PER_WORKER * args.workers > ORACLE_POOL_MAX:
+        print(f"[prefork] ⚠️ 워커 수({args.workers})가 Oracle 풀 예산({ORACLE_POOL_MAX})보다 많아 "
+              f"워커당 {ORACLE_POOL_MAX_PER_WORKER}개로 실행합니다.")
+
+    # 1. 공유 리소스 preload (fork 이후 copy-on-write로 공유)
+    #    CPU 풀을 사용하거나 임베딩을 사용하는 도구가 비활성화되어 있으면 마스터에서 로드하지 않습니다.
+    #    (EMBEDDING_BACKEND=sidecar이면 모든 워커가 임베딩 사이드카 하나를 공유합니다)
+    if (not args.no_preload and not CPU_POOL_ENABLED and EMBEDDING_BACKEND != "sidecar"
+            and "embedding" in tool_registry.requirements()):
+        from mcp_servers.tools.query.milvus_search import load_embedding_model
+        print("[prefork] 임베딩 모델 로드 중...")
+        load_embedding_model()
+
+    # 2. 지금까지 생성된 객체를 GC 대상에서 제외 (GC가 참조 카운트를 건드려 페이지가 복사되는 것 방지)
+    gc.collect()
+    gc.freeze()
+
+    # 3. 소켓 준비 및 워커 실행
+    if args.stateful:
+        sockets = [bind_socket("127.0.0.1", args.port + 1 + index) for index in range(args.workers)]
+    else:
+        shared = bind_socket(args.host, args.port)
+        sockets = [shared] * args.workers
+
+    supervisor = WorkerSupervisor(mcp_server.mcp, sockets, args.stateful, args.log_level)
+    supervisor.spawn_all()
+    print(f"[prefork] {args.workers} workers, pool max/worker={ORACLE_POOL_MAX_PER_WORKER}, "
+          f"mode={'stateful' if args.stateful else 'stateless'}")
+
+    if not args.stateful:
+        supervisor.serve_forever()
+        return
+
+    # 4. stateful 모드: 마스터에서 세션 고정 라우터 실행
+    import uvicorn
+    from mcp_servers.affinity import AffinityRouter
+    from mcp_servers.config.settings import ADMIN_TOKEN
+
+    if not ADMIN_TOKEN:
+        print("[prefork] ADMIN_TOKEN이 없으므로 /admin/*, /debug/* 는 마스터에 loopback으로 접속한 클라이언트만 허용합니다.")
+
+    async def start_watch():
+        asyncio.get_running_loop().create_task(supervisor.watch())
+
+    router = AffinityRouter(
+        [f"http://127.0.0.1:{args.port + 1 + index}" for index in range(args.workers)],
+        on_startup=start_watch,
+        loopback_admin_only=not ADMIN_TOKEN,
+    )
+    try:
+        uvicorn.run(router, host=args.host, port=args.port, log_level=args.log_level)
+    finally:
+        supervisor.stop()
+        while supervisor.reap(block=True):
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+from dataclasses import dataclass, field
+from itertools import chain, zip_longest
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from mcp_servers.config.settings import (
+    MCP_WORKER_COUNT,
+    REFRESH_AHEAD,
+    REFRESH_BUDGET_PER_MINUTE,
+    REFRESH_INTERVAL,
+    REFRESH_TOP_N,
+)
+from utils.rate_limiter import RateLimiter
+import asyncio
+import time
+
+"""
+==================================================
+모듈: 백그라운드 캐시 갱신 스케줄러 (RefreshScheduler)
+==================================================
+이 파일은 자주 요청되는 데이터를 캐시가 만료되기 전에 미리 갱신하는 스케줄러를 정의합니다.
+MCP 서버 lifespan에서 시작하고 종료합니다. (REFRESH_ENABLED=true)
+
+- 작업(RefreshJob)마다 캐시와 갱신 함수를 등록합니다. 캐시는 popular(n), needs_refresh(key, ahead)를 제공합니다.
+  - weather: open_weather_map의 자주 요청되는 도시 (TTL 만료 REFRESH_AHEAD초 전)
+  - google_search: 자주 요청되는 검색어 (TTL 만료 REFRESH_AHEAD초 전)
+  - templates: 자주 요청되는 milvus_search 의도 (카탈로그 변경으로 캐시가 비워진 뒤 다시 검색, 임베딩 포함)
+- REFRESH_INTERVAL초마다 작업별 상위 REFRESH_TOP_N개 키 중 갱신이 필요한 키를 갱신합니다.
+  작업 간에 번갈아 갱신하므로 한 작업이 예산을 모두 쓰지 않습니다.
+- 백그라운드 갱신 호출 수는 RateLimiter(REFRESH_BUDGET_PER_MINUTE)로 제한합니다.
+  한도를 넘으면 기다리지 않고 다음 주기로 미룹니다. (사용자 요청의 외부 API 한도를 소모하지 않도록)
+- 갱신이 실패하면 기존 캐시 항목을 그대로 두고, 만료되면 다음 사용자 요청에서 다시 가져옵니다.
+
+상태 조회: GET /debug/refresh
+"""
+
+
+@dataclass
+class RefreshJob:
+    name: str
+    # popular(n) -> List[key], needs_refresh(key, ahead) -> bool 을 제공하는 캐시
+    cache: Any
+    # 키 하나를 갱신하는 코루틴 함수 (실패 시 예외)
+    refresh: Callable[[Hashable], Awaitable[Any]]
+    stats: Dict[str, int] = field(default_factory=lambda: {"refreshed": 0, "failed": 0, "deferred": 0})
+
+
+class RefreshScheduler:
+    """
+    자주 요청되는 캐시 항목을 만료 전에 갱신하는 asyncio 스케줄러입니다.
+    """
+
+    def __init__(
+        self,
+        interval: float = 30,
+        ahead: float = 60,
+        top_n: int = 20,
+        budget_per_minute: int = 30,
+    ):
+        """
+        Args:
+            interval (float): 갱신 대상 확인 주기(초).
+            ahead (float): 만료 몇 초 전부터 갱신할지.
+            top_n (int): 작업별로 확인할 상위 요청 키 수.
+            budget_per_minute (int): 분당 최대 갱신 호출 수 (모든 작업 합계).
+        """
+
+        self.interval = interval
+        self.ahead = ahead
+        self.top_n = top_n
+        self.budget = RateLimiter(budget_per_minute)
+        self.jobs: Dict[str, RefreshJob] = {}
+        self.last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, job: RefreshJob):
+        self.jobs[job.name] = job
+
+    def candidates(self) -> List[Tuple[RefreshJob, Hashable]]:
+        """
+        작업별 상위 키 중 갱신이 필요한 키를 작업 간에 번갈아 나열합니다.
+        """
+
+        per_job = [
+            [(job, key) for key in job.cache.popular(self.top_n) if job.cache.needs_refresh(key, self.ahead)]
+            for job in self.jobs.values()
+        ]
+        return [item for item in chain.from_iterable(zip_longest(*per_job)) if item is not None]
+
+    async def run_once(self) -> int:
+        """
+        갱신이 필요한 키를 예산 안에서 갱신하고 갱신한 키 수를 반환합니다.
+        """
+
+        refreshed = 0
+        pending = self.candidates()
+        for index, (job, key) in enumerate(pending):
+            if not self.budget.try_acquire():
+                # 예산을 모두 쓴 경우 남은 키는 다음 주기로 미룹니다.
+                for deferred_job, _ in pending[index:]:
+                    deferred_job.stats["deferred"] += 1
+                break
+            try:
+                await job.refresh(key)
+                job.stats["refreshed"] += 1
+                refreshed += 1
+            except Exception as e:
+                job.stats["failed"] += 1
+                print(f"[Refresh] {job.name} 갱신 실패 ({key!r}): {e!r}")
+        self.last_run = time.time()
+        return refreshed
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"[Refresh] 갱신 주기 실패: {e!r}")
+
+    def start(self):
+        if self._task is None:
+            print(f"[Refresh] 백그라운드 갱신 시작 (작업: {', '.join(self.jobs)}, "
+                  f"주기 {self.interval}s, 분당 예산 {self.budget.requests_per_minute})")
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.jobs.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "ahead": self.ahead,
+            "top_n": self.top_n,
+            "budget_per_minute": self.budget.requests_per_minute,
+            "budget_remaining": self.budget.remaining(),
+            "last_run": self.last_run,
+            "jobs": {
+                name: {
+                    **job.stats,
+                    "cache": job.cache.snapshot() if hasattr(job.cache, "snapshot") else None,
+                    "top": [repr(key) for key in job.cache.popular(5)],
+                }
+                for name, job in self.jobs.items()
+            },
+        }
+
+
+# 프로세스 전역 스케줄러
+# 멀티 워커 실행 시 워커마다 자체 캐시를 가지므로 서버 전체 예산을 워커 수로 나눕니다.
+refresh_scheduler = RefreshScheduler(
+    interval=REFRESH_INTERVAL,
+    ahead=REFRESH_AHEAD,
+    top_n=REFRESH_TOP_N,
+    budget_per_minute=max(1, REFRESH_BUDGET_PER_MINUTE // MCP_WORKER_COUNT),
+)
@@ -0,0 +1,351 @@
+from dataclasses import dataclass, field
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional, Set, Tuple
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from mcp_servers.config.settings import (
+    CPU_POOL_WORKERS,
+    ORACLE_POOL_MAX_PER_WORKER,
+    TOOL_ENTRY_POINT_GROUP,
+    TOOL_TIMEOUTS,
+    TOOLS_DISABLED,
+    TOOLS_ENABLED,
+)
+from utils.admission import parse_limits
+import asyncio
+import weakref
+
+"""
+==================================================
+모듈: 도구 레지스트리 (ToolRegistry)
+==================================================
+이 파일은 MCP 서버에 등록할 도구를 선언(ToolSpec)하고, 설정에 따라 활성화된 도구의 모듈만 import 하는 레지스트리를 정의합니다.
+
+- 도구는 "모듈:속성" 문자열(target)로 선언하므로 비활성화된 도구의 모듈은 import 하지 않습니다.
+  (예: milvus_search를 끄면 torch/sentence-transformers와 Milvus 클라이언트를 로드하지 않음)
+- 활성화: TOOLS_ENABLED (도구 이름 또는 그룹, *: 기본 활성화 도구 전체), TOOLS_DISABLED
+  (duckduckgo_search, web_content_fetch는 기본 비활성화, 이름으로 지정하면 활성화)
+- 외부 패키지는 entry point(TOOL_ENTRY_POINT_GROUP)로 도구를 추가할 수 있습니다. (이름 = "모듈:속성")
+- 도구별 제한:
+  - max_concurrency: 입장 제어 동시 실행 한도 (ADMISSION_LIMITS가 우선)
+  - timeout_ms: 요청에 기한이 없을 때 적용할 기본 기한 (TOOL_TIMEOUTS가 우선)
+- requires: 도구가 사용하는 lifespan 구성 요소 (oracle, milvus, embedding). 활성화된 도구가 필요로 하는 것만 생성합니다.
+- setup: 도구 활성화 시 호출할 함수 (백그라운드 갱신 작업, 구독 피드 등록 등)
+- 실행 중 활성화/비활성화: POST /admin/tools/{name}/enable, /admin/tools/{name}/disable
+  연결된 세션에 notifications/tools/list_changed를 보냅니다.
+  (리소스는 서버 시작 시 활성화된 도구 기준으로 등록, 멀티 워커 실행 시 요청을 받은 워커에만 적용)
+"""
+
+
+@dataclass
+class ToolSpec:
+    name: str
+    # "모듈:속성" (속성 경로 중간의 클래스는 인스턴스를 생성합니다. 예: "모듈:Class.method")
+    target: str
+    group: str = "plugin"
+    # TOOLS_ENABLED에 그룹이나 *로 지정되었을 때 활성화 여부 (False이면 이름으로 지정해야 활성화)
+    enabled: bool = True
+    max_concurrency: Optional[int] = None
+    timeout_ms: Optional[float] = None
+    requires: Tuple[str, ...] = ()
+    # (URI 템플릿, "모듈:속성") 목록
+    resources: Tuple[Tuple[str, str], ...] = ()
+    # 활성화 시 app_context를 인자로 호출할 "모듈:속성" 목록
+    setup: Tuple[str, ...] = ()
+
+
+class ToolUnavailable(Exception):
+    """
+    도구를 활성화할 수 없는 경우 발생하는 예외입니다. (알 수 없는 도구, 구성 요소 없음)
+    """
+
+
+def load_target(target: str) -> Any:
+    """
+    "모듈:속성" 문자열이 가리키는 객체를 반환합니다.
+    """
+
+    module_name, _, path = target.partition(":")
+    value = import_module(module_name)
+    for part in path.split(".") if path else ():
+        if isinstance(value, type):
+            value = value()
+        value = getattr(value, part)
+    return value
+
+
+DEFAULT_TOOLS: List[ToolSpec] = [
+    ToolSpec(
+        "google_search",
+        "mcp_servers.tools.search.google_search:google_search",
+        group="search",
+        setup=("mcp_servers.tools.search.google_search:setup_search",),
+    ),
+    ToolSpec(
+        "duckduckgo_search",
+        "mcp_servers.tools.search.duckduckgo_search:DuckDuckGoSearcher.duckduckgo_search",
+        group="search",
+        enabled=False,
+    ),
+    ToolSpec(
+        "web_content_fetch",
+        "mcp_servers.tools.search.web_content_fetch:WebContentFetcher.fetch_and_parse",
+        group="search",
+        enabled=False,
+    ),
+    ToolSpec(
+        "open_weather_map",
+        "mcp_servers.tools.weather.open_weather_map:open_weather_map",
+        group="weather",
+        resources=(("weather://{city}", "mcp_servers.tools.weather.open_weather_map:weather_resource"),),
+        setup=("mcp_servers.tools.weather.open_weather_map:setup_weather",),
+    ),
+    ToolSpec(
+        "milvus_search",
+        "mcp_servers.tools.query.milvus_search:milvus_search",
+        group="query",
+        # 기본 한도: CPU 풀 처리량을 넘는 동시 실행은 대기만 늘립니다.
+        max_concurrency=CPU_POOL_WORKERS * 2,
+        requires=("milvus", "embedding"),
+        setup=("mcp_servers.tools.query.milvus_search:setup_templates",),
+    ),
+    ToolSpec(
+        "oracle_query",
+        "mcp_servers.tools.query.oracle_query:oracle_query",
+        group="query",
+        # 기본 한도: Oracle 풀 크기를 넘는 동시 실행은 대기만 늘립니다.
+        max_concurrency=ORACLE_POOL_MAX_PER_WORKER,
+        requires=("oracle",),
+        resources=(("account://{holder}/summary", "mcp_servers.tools.query.account_summary:account_summary_resource"),),
+        setup=("mcp_servers.tools.query.account_summary:setup_account_feed",),
+    ),
+    ToolSpec("job_submit", "mcp_servers.tools.jobs.job_tools:job_submit", group="jobs"),
+    ToolSpec(
+        "job_status",
+        "mcp_servers.tools.jobs.job_tools:job_status",
+        group="jobs",
+        resources=(
+            ("job://{job_id}", "mcp_servers.tools.jobs.job_tools:job_resource"),
+            ("job://{job_id}/result", "mcp_servers.tools.jobs.job_tools:job_result_resource"),
+        ),
+        setup=("mcp_servers.tools.jobs.job_tools:setup_job_feed",),
+    ),
+    ToolSpec("job_cancel", "mcp_servers.tools.jobs.job_tools:job_cancel", group="jobs"),
+]
+
+
+def _names(value: str) -> Set[str]:
+    return {item.strip() for item in (value or "").split(",") if item.strip()}
+
+
+class ToolRegistry:
+    """
+    선언된 도구의 활성화 상태, import, 등록/해제를 관리합니다.
+    """
+
+    def __init__(self, specs: List[ToolSpec], enabled: str = "*", disabled: str = "", timeouts: str = ""):
+        """
+        Args:
+            specs (List[ToolSpec]): 도구 선언 목록.
+            enabled (str): 활성화할 도구/그룹 목록 (쉼표 구분, *: 기본 활성화 도구 전체).
+            disabled (str): 비활성화할 도구/그룹 목록.
+            timeouts (str): 도구별 기본 기한(ms) (예: "milvus_search=5000").
+        """
+
+        self.specs: Dict[str, ToolSpec] = {}
+        self._enabled_names = _names(enabled)
+        self._disabled_names = _names(disabled)
+        self._timeout_overrides = parse_limits(timeouts)
+        # DeadlineMiddleware가 참조하는 도구별 기본 기한(ms)
+        self.timeouts: Dict[str, float] = {}
+        self.active: Set[str] = set()
+        # 서버 시작 시 생성된 lifespan 구성 요소
+        self.components: Optional[Set[str]] = None
+        self.stats = {"enabled": 0, "disabled": 0, "notifications": 0}
+        self._mcp = None
+        self._admission = None
+        self._app_context = None
+        self._setup_done: Set[str] = set()
+        self._loaded: Dict[str, Any] = {}
+        self._sessions: "weakref.WeakSet" = weakref.WeakSet()
+        self._lock = asyncio.Lock()
+        for spec in specs:
+            self.add(spec)
+
+    def add(self, spec: ToolSpec):
+        self.specs[spec.name] = spec
+
+    def load_entry_points(self, group: str) -> int:
+        """
+        entry point로 선언된 외부 도구를 추가합니다. (이름 = 도구 이름, 값 = "모듈:속성", 모듈은 활성화 시 import)
+        """
+
+        added = 0
+        for entry_point in entry_points(group=group):
+            if entry_point.name not in self.specs:
+                self.add(ToolSpec(entry_point.name, entry_point.value))
+                added += 1
+        return added
+
+    def configured(self, name: str) -> bool:
+        """
+        설정(TOOLS_ENABLED/TOOLS_DISABLED)상 서버 시작 시 활성화할 도구인지 확인합니다.
+        """
+
+        spec = self.specs[name]
+        if {spec.name, spec.group} & self._disabled_names:
+            return False
+        if spec.name in self._enabled_names:
+            return True
+        # 그룹/전체 지정 시에는 기본 활성화 도구만 (미구현/미사용 도구는 이름으로 지정)
+        return bool({spec.group, "*"} & self._enabled_names) and spec.enabled
+
+    def requirements(self) -> Set[str]:
+        """
+        시작 시 활성화할 도구가 필요로 하는 lifespan 구성 요소 목록을 반환합니다.
+        """
+
+        return {component for name, spec in self.specs.items() if self.configured(name) for component in spec.requires}
+
+    def _register(self, spec: ToolSpec):
+        fn = self._loaded.get(spec.name)
+        if fn is None:
+            fn = self._loaded[spec.name] = load_target(spec.target)
+        self._mcp.tool(fn, name=spec.name)
+        timeout_ms = self._timeout_overrides.get(spec.name, spec.timeout_ms)
+        if timeout_ms:
+            self.timeouts[spec.name] = timeout_ms
+        if spec.max_concurrency and self._admission is not None:
+            # ADMISSION_LIMITS에 지정된 한도가 우선합니다.
+            self._admission.limits.setdefault(spec.name, spec.max_concurrency)
+        self.active.add(spec.name)
+
+    def install(self, mcp, admission=None):
+        """
+        설정상 활성화된 도구와 리소스를 서버에 등록합니다. (create_server에서 호출)
+        """
+
+        self._mcp = mcp
+        self._admission = admission
+        for name, spec in self.specs.items():
+            if not self.configured(name):
+                continue
+            self._register(spec)
+            for uri, target in spec.resources:
+                mcp.resource(uri, mime_type="application/json")(load_target(target))
+        print(f"[Tools] 활성화된 도구: {', '.join(sorted(self.active)) or '-'}")
+
+    def setup(self, app_context, components: Set[str]):
+        """
+        lifespan에서 생성한 구성 요소를 기록하고, 활성화된 도구의 setup 함수를 호출합니다.
+        """
+
+        self._app_context = app_context
+        self.components = set(components)
+        for name in sorted(self.active):
+            self._setup(self.specs[name])
+
+    def _setup(self, spec: ToolSpec):
+        if self._app_context is None or spec.name in self._setup_done:
+            return
+        for target in spec.setup:
+            load_target(target)(self._app_context)
+        self._setup_done.add(spec.name)
+
+    async def enable(self, name: str) -> bool:
+        """
+        실행 중에 도구를 활성화합니다. 이미 활성화되어 있으면 False.
+
+        Raises:
+            ToolUnavailable: 알 수 없는 도구이거나 필요한 구성 요소가 서버 시작 시 생성되지 않은 경우.
+        """
+
+        spec = self.specs.get(name)
+        if spec is None:
+            raise ToolUnavailable(f"알 수 없는 도구입니다: {name}")
+        missing = set(spec.requires) - (self.components if self.components is not None else self.requirements())
+        if missing:
+            raise ToolUnavailable(f"{name}에 필요한 구성 요소가 없습니다 ({', '.join(sorted(missing))}). "
+                                  f"TOOLS_ENABLED에 추가하고 서버를 다시 시작하세요.")
+        async with self._lock:
+            if name in self.active:
+                return False
+            # 모듈 import는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+            if name not in self._loaded:
+                self._loaded[name] = await asyncio.to_thread(load_target, spec.target)
+            self._register(spec)
+            self._setup(spec)
+            self.stats["enabled"] += 1
+        await self.notify_list_changed()
+        return True
+
+    async def disable(self, name: str) -> bool:
+        """
+        실행 중에 도구를 비활성화합니다. (모듈은 메모리에 남고, 실행 중인 호출은 끝까지 실행) 이미 비활성화되어 있으면 False.
+        """
+
+        if name not in self.specs:
+            raise ToolUnavailable(f"알 수 없는 도구입니다: {name}")
+        async with self._lock:
+            if name not in self.active:
+                return False
+            self._mcp.remove_tool(name)
+            self.active.discard(name)
+            self.timeouts.pop(name, None)
+            self.stats["disabled"] += 1
+        await self.notify_list_changed()
+        return True
+
+    def track(self, session):
+        self._sessions.add(session)
+
+    async def notify_list_changed(self):
+        sessions = list(self._sessions)
+        results = await asyncio.gather(*(session.send_tool_list_changed() for session in sessions), return_exceptions=True)
+        for session, result in zip(sessions, results):
+            if isinstance(result, Exception):
+                self._sessions.discard(session)
+            else:
+                self.stats["notifications"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "components": sorted(self.components) if self.components is not None else None,
+            "sessions": len(self._sessions),
+            "tools": {
+                name: {
+                    "group": spec.group,
+                    "active": name in self.active,
+                    "loaded": name in self._loaded,
+                    "requires": list(spec.requires),
+                    "max_concurrency": (self._admission.limits.get(name) if self._admission else spec.max_concurrency),
+                    "timeout_ms": self.timeouts.get(name),
+                }
+                for name, spec in self.specs.items()
+            },
+            **self.stats,
+        }
+
+
+class ToolSessionMiddleware(Middleware):
+    """
+    요청을 보낸 세션을 기록하여 도구 목록이 바뀌면 notifications/tools/list_changed를 보낼 수 있도록 합니다.
+    """
+
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+
+    async def on_request(self, context: MiddlewareContext, call_next):
+        fastmcp_context = context.fastmcp_context
+        if fastmcp_context is not None:
+            try:
+                self.registry.track(fastmcp_context.session)
+            except RuntimeError:
+                # 세션이 없는 요청 (stateless 초기화 전 등)
+                pass
+        return await call_next(context)
+
+
+# 프로세스 전역 도구 레지스트리
+tool_registry = ToolRegistry(DEFAULT_TOOLS, enabled=TOOLS_ENABLED, disabled=TOOLS_DISABLED, timeouts=TOOL_TIMEOUTS)
+tool_registry.load_entry_points(TOOL_ENTRY_POINT_GROUP)
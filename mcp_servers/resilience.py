@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+from mcp_servers.config.settings import (
+    BLOCKING_MAX_THREADS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    EMBEDDING_TIMEOUT,
+    HEDGE_AFTER_MS,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_TIMEOUT,
+    MILVUS_TIMEOUT,
+    ORACLE_CALL_TIMEOUT,
+    RETRY_MAX_ATTEMPTS,
+)
+from utils.deadline import timeout_for
+from utils.resilience import Dependency, DependencyRegistry
+from utils.tracing import tracer
+import asyncio
+import httpx
+import oracledb
+
+"""
+==================================================
+모듈: 의존성별 복원력 설정 (dependencies)
+==================================================
+이 파일은 MCP 도구가 사용하는 외부 의존성(Oracle, Milvus, 외부 HTTP API)별
+타임아웃, 회로 차단기, 재시도, 헤징 설정과 장애 판별 규칙을 정의합니다.
+
+장애 판별:
+- HTTP: 연결/타임아웃 오류, 5xx, 429 → 장애 (회로 차단/재시도 대상), 그 외 4xx → 요청 오류
+- Oracle: 연결 끊김/네트워크 오류(recoverable) → 장애, SQL 오류(ORA-00942 등) → 요청 오류
+- Milvus, 임베딩 사이드카: 모든 예외 → 장애
+- 요청 기한(utils/deadline.py)이 있으면 모든 타임아웃은 남은 시간 이내로 줄어들고,
+  기한이 지나 중단된 호출은 장애로 집계하지 않습니다.
+- 동기 클라이언트 호출(run_blocking)은 의존성별 스레드 풀(BLOCKING_MAX_THREADS)에서 실행하고 헤징하지 않습니다.
+  타임아웃으로 기다림을 멈춰도 스레드는 호출이 끝날 때까지 점유되므로, 헤지 요청이 스레드를 더 늘리지 않도록 합니다.
+  (호출 자체의 타임아웃은 클라이언트 인자로 함께 전달합니다. 예: MilvusClient.search(timeout=...))
+
+상태 조회: GET /debug/resilience
+"""
+
+# 연결/네트워크 계열 Oracle 오류 코드 (재시도 및 회로 차단 대상)
+ORACLE_CONNECTION_ERRORS = {
+    "ORA-03113", "ORA-03114", "ORA-03135", "ORA-12170", "ORA-12514", "ORA-12541",
+    "DPY-4011", "DPY-6005",
+}
+
+
+class UpstreamError(Exception):
+    """
+    외부 HTTP API가 재시도 대상 상태 코드(5xx, 429)를 반환한 경우 발생하는 예외입니다.
+    """
+
+    def __init__(self, status_code: int):
+        super().__init__(f"upstream returned HTTP {status_code}")
+        self.status_code = status_code
+
+
+def http_is_failure(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, (httpx.TransportError, UpstreamError))
+
+
+def oracle_is_failure(error: BaseException) -> bool:
+    if not isinstance(error, oracledb.Error) or not error.args:
+        return False
+    detail = error.args[0]
+    return getattr(detail, "isrecoverable", False) or getattr(detail, "full_code", "") in ORACLE_CONNECTION_ERRORS
+
+
+def milvus_is_failure(error: BaseException) -> bool:
+    return True
+
+
+def embedding_is_failure(error: BaseException) -> bool:
+    return True
+
+
+def _dependency(name: str, timeout: float, is_failure, hedge: bool) -> Dependency:
+    return Dependency(
+        name=name,
+        timeout=timeout,
+        retries=RETRY_MAX_ATTEMPTS,
+        hedge_after=HEDGE_AFTER_MS / 1000 if hedge and HEDGE_AFTER_MS > 0 else None,
+        failure_threshold=BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=BREAKER_RESET_TIMEOUT,
+        is_failure=is_failure,
+    )
+
+
+# 프로세스 전역 의존성 목록
+# - 헤징은 읽기 전용이면서 추가 요청 비용이 작은 의존성에만 적용합니다. (Oracle은 풀 연결을 추가로 점유하므로 제외)
+# - Milvus는 동기 클라이언트를 스레드에서 실행하므로 헤징하지 않습니다. (run_blocking)
+dependencies = DependencyRegistry()
+dependencies.register(_dependency("oracle", ORACLE_CALL_TIMEOUT, oracle_is_failure, hedge=False))
+dependencies.register(_dependency("milvus", MILVUS_TIMEOUT, milvus_is_failure, hedge=False))
+# 사이드카는 동시 요청을 배치로 처리하므로 헤지 요청은 같은 CPU에서 중복 계산만 늘립니다.
+dependencies.register(_dependency("embedding", EMBEDDING_TIMEOUT, embedding_is_failure, hedge=False))
+dependencies.register(_dependency("google", HTTP_TIMEOUT, http_is_failure, hedge=True))
+dependencies.register(_dependency("weather", HTTP_TIMEOUT, http_is_failure, hedge=True))
+dependencies.register(_dependency("duckduckgo", HTTP_TIMEOUT, http_is_failure, hedge=False))
+# web_content_fetch는 임의의 URL을 호출하므로 회로 차단기를 공유하지 않고 http_timeout()만 적용합니다.
+
+
+def http_timeout() -> httpx.Timeout:
+    # 요청 기한이 있으면 남은 시간 이내 (남은 시간이 없으면 DeadlineExceeded)
+    timeout = timeout_for(HTTP_TIMEOUT, "http")
+    return httpx.Timeout(timeout, connect=min(HTTP_CONNECT_TIMEOUT, timeout))
+
+
+async def http_get(
+    dependency: str,
+    url: str,
+    params: Optional[Dict] = None,
+    headers: Optional[Dict] = None,
+    hedge: bool = True,
+) -> httpx.Response:
+    """
+    외부 API GET 요청을 의존성 설정(타임아웃, 회로 차단기, 재시도, 헤징)을 적용하여 실행합니다.
+    5xx/429 이외의 응답은 상태 코드와 관계없이 그대로 반환합니다. (도구에서 처리)
+    """
+
+    async def attempt() -> httpx.Response:
+        with tracer.start_span(
+            f"http GET {dependency}",
+            attributes={"http.method": "GET", "http.url": url},
+            kind="CLIENT",
+        ) as span:
+            async with httpx.AsyncClient(timeout=http_timeout()) as client:
+                response = await client.get(url, params=params, headers=tracer.inject(dict(headers or {})))
+            span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 500 or response.status_code == 429:
+            raise UpstreamError(response.status_code)
+        return response
+
+    # GET 요청은 멱등이므로 재시도/헤징 대상입니다.
+    return await dependencies.get(dependency).call(attempt, idempotent=True, hedge=hedge)
+
+
+# 의존성별 동기 호출 스레드 풀 (처음 사용할 때 생성)
+blocking_executors: Dict[str, ThreadPoolExecutor] = {}
+
+
+def blocking_executor(dependency: str) -> ThreadPoolExecutor:
+    if dependency not in blocking_executors:
+        blocking_executors[dependency] = ThreadPoolExecutor(
+            max_workers=BLOCKING_MAX_THREADS,
+            thread_name_prefix=f"blocking-{dependency}",
+        )
+    return blocking_executors[dependency]
+
+
+async def run_blocking(dependency: str, fn, *args, idempotent: bool = True, **kwargs):
+    """
+    동기 클라이언트 호출(MilvusClient 등)을 의존성별 스레드 풀에서 실행하고 의존성 설정을 적용합니다.
+    스레드 풀이 가득 차면 호출은 대기열에서 기다리며, 대기 시간도 타임아웃에 포함됩니다. (헤징하지 않음)
+    """
+
+    executor = blocking_executor(dependency)
+    return await dependencies.get(dependency).call(
+        lambda: asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args, **kwargs)),
+        idempotent=idempotent,
+        hedge=False,
+    )
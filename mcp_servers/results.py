@@ -0,0 +1,82 @@
+from typing import Any, Dict, Optional, Union
+from fastmcp.server.dependencies import get_context
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from mcp_servers.config.settings import RESULT_CONTENT_MODE, RESULT_MAX_BYTES
+from utils.result_encoding import dumps, truncate_text
+from utils.rowset import RowSet
+
+"""
+==================================================
+모듈: 도구 결과 생성 (tool_result)
+==================================================
+이 파일은 모든 도구가 공통으로 사용하는 ToolResult 생성 함수를 정의합니다.
+
+결과 형식(content mode):
+- text       : TextContent만 반환 (structuredContent 미지원 클라이언트)
+- structured : structuredContent만 반환 (JSON을 직접 처리하는 클라이언트)
+- both       : 둘 다 반환 (TextContent는 structuredContent와 같은 내용의 compact JSON)
+
+RESULT_CONTENT_MODE=auto 인 경우 클라이언트 initialize 정보로 결정합니다.
+1. capabilities.experimental.resultEncoding.mode 가 있으면 해당 값
+2. 프로토콜 버전이 2025-06-18 이전이면 text (structuredContent 미지원)
+3. 그 외 both
+"""
+
+CONTENT_MODES = ("text", "structured", "both")
+STRUCTURED_CONTENT_PROTOCOL = "2025-06-18"
+
+
+def content_mode() -> str:
+    if RESULT_CONTENT_MODE in CONTENT_MODES:
+        return RESULT_CONTENT_MODE
+
+    try:
+        client_params = get_context().session.client_params
+    except (RuntimeError, AttributeError):
+        client_params = None
+    if client_params is None:
+        # stateless HTTP 등 initialize 정보가 없는 경우
+        return "both"
+
+    experimental = client_params.capabilities.experimental or {}
+    requested = (experimental.get("resultEncoding") or {}).get("mode")
+    if requested in CONTENT_MODES:
+        return requested
+    if str(client_params.protocolVersion) < STRUCTURED_CONTENT_PROTOCOL:
+        return "text"
+    return "both"
+
+
+def tool_result(
+    structured: Union[Dict[str, Any], RowSet],
+    text: Optional[str] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> ToolResult:
+    """
+    클라이언트에 맞는 형식으로 ToolResult를 생성합니다.
+
+    Args:
+        structured (Dict | RowSet): 구조화된 결과.
+            RowSet은 텍스트를 행 목록 없이 바로 직렬화하고, structuredContent가 필요할 때만 dict로 변환합니다.
+        text (str): LLM에 전달할 텍스트. 지정하지 않으면 structured의 compact JSON을 사용합니다.
+        meta (Dict): 결과 메타데이터.
+    """
+
+    mode = content_mode()
+    is_rowset = isinstance(structured, RowSet)
+    content = []
+    if mode in ("text", "both"):
+        if text is None:
+            text = structured.to_json() if is_rowset else dumps(structured)
+        content = [TextContent(type="text", text=truncate_text(text, RESULT_MAX_BYTES))]
+
+    structured_content = None
+    if mode in ("structured", "both"):
+        structured_content = structured.to_dict() if is_rowset else structured
+
+    return ToolResult(
+        content=content,
+        structured_content=structured_content,
+        meta=meta,
+    )
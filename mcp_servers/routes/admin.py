@@ -0,0 +1,47 @@
+from functools import wraps
+from typing import Awaitable, Callable
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from mcp_servers.config.settings import ADMIN_TOKEN
+import hmac
+
+"""
+==================================================
+라우트 모듈: 관리 엔드포인트 접근 제한 (admin_only)
+==================================================
+이 파일은 /admin/* 엔드포인트(도구 활성화/비활성화, 카탈로그 갱신)와 /debug/* 엔드포인트에 적용하는 접근 제한 데코레이터를 정의합니다.
+관리 엔드포인트는 MCP와 같은 HTTP 포트에 노출되므로 인증 없이 호출할 수 없도록 합니다.
+
+- ADMIN_TOKEN이 설정된 경우: `Authorization: Bearer <ADMIN_TOKEN>` 헤더가 일치해야 합니다.
+- ADMIN_TOKEN이 비어 있는 경우: loopback(127.0.0.1, ::1)에서 온 요청만 허용합니다.
+- 그 외 요청은 403을 반환합니다.
+- prefork --stateful 실행 시 워커는 마스터 라우터(127.0.0.1)를 거친 요청만 받으므로 워커에서는 원래 클라이언트를 알 수 없습니다.
+  ADMIN_TOKEN이 비어 있으면 라우터(mcp_servers/affinity.py)가 loopback이 아닌 클라이언트의 ADMIN_PATH_PREFIXES 요청을 막습니다.
+"""
+
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+# admin_only가 적용된 경로 (/admin/*, /debug/*)
+ADMIN_PATH_PREFIXES = ("/admin/", "/debug/")
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+def is_admin(request: Request) -> bool:
+    if ADMIN_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token.strip(), ADMIN_TOKEN)
+    return request.client is not None and request.client.host in LOOPBACK_HOSTS
+
+
+def admin_only(handler: Handler) -> Handler:
+    """
+    관리자 요청이 아니면 403을 반환하는 데코레이터입니다.
+    """
+
+    @wraps(handler)
+    async def guarded(request: Request) -> Response:
+        if not is_admin(request):
+            return JSONResponse({"error": "forbidden"}, status_code=403)
+        return await handler(request)
+
+    return guarded
@@ -0,0 +1,41 @@
+from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from mcp_servers.catalog import template_catalog
+from mcp_servers.routes.admin import admin_only
+
+"""
+==================================================
+라우트 모듈: 템플릿 카탈로그 (/admin/catalog/*)
+==================================================
+이 파일은 템플릿 카탈로그 변경 알림을 받는 HTTP 엔드포인트를 정의합니다.
+
+엔드포인트:
+- POST /admin/catalog/refresh : 카탈로그 변경 알림 ({"version": "..."}), 검색 결과 캐시를 비웁니다.
+                                관리자 요청만 허용합니다. (ADMIN_TOKEN 또는 loopback, mcp_servers/routes/admin.py)
+- GET  /debug/catalog         : 카탈로그 버전, 캐시 적중/갱신 횟수
+"""
+
+@admin_only
+async def catalog_refresh(request: Request) -> JSONResponse:
+    try:
+        body = await request.json()
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        return JSONResponse({"error": "body must be a JSON object"}, status_code=400)
+    template_catalog.refresh(body.get("version"), reason="notify")
+    return JSONResponse(template_catalog.snapshot())
+
+
+async def debug_catalog(request: Request) -> JSONResponse:
+    return JSONResponse(template_catalog.snapshot())
+
+
+def register_catalog_routes(mcp: FastMCP):
+    """
+    카탈로그 엔드포인트를 MCP 서버에 등록합니다.
+    """
+
+    mcp.custom_route("/admin/catalog/refresh", methods=["POST"])(catalog_refresh)
+    mcp.custom_route("/debug/catalog", methods=["GET"])(admin_only(debug_catalog))
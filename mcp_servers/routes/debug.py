@@ -0,0 +1,170 @@
+from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from mcp_servers.config.settings import (
+    ADMISSION_ADAPTIVE,
+    ADMISSION_DEFAULT_LIMIT,
+    ADMISSION_LIMITS,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_TOLERANCE,
+    LOOP_MONITOR_INTERVAL_MS,
+    LOOP_MONITOR_THRESHOLD_MS,
+    MEMORY_BUDGET_MB,
+)
+from mcp_servers.middleware.loop_monitor import tool_name_from_frame
+from mcp_servers.routes.admin import admin_only
+from mcp_servers.jobs import job_manager
+from mcp_servers.refresh import refresh_scheduler
+from mcp_servers.resilience import dependencies
+from mcp_servers.subscriptions import subscription_hub
+from utils.admission import AdmissionController, parse_limits
+from utils.loop_monitor import LoopMonitor, SamplingProfiler
+from utils.memory import MemoryReport
+from utils.tracing import tracer
+import asyncio
+import threading
+
+"""
+==================================================
+라우트 모듈: 디버그 엔드포인트 (/debug/*)
+==================================================
+이 파일은 MCP 서버의 성능 진단용 HTTP 엔드포인트를 정의합니다.
+
+엔드포인트:
+- GET  /debug/traces            : 기록된 Span 조회 (trace_id 필터 지원)
+- GET  /debug/loop              : 이벤트 루프 지연 및 도구별 블로킹 집계 (stacks=0 이면 스택 생략)
+- POST /debug/loop/reset        : 블로킹 집계 초기화
+- GET  /debug/profile?seconds=5 : 이벤트 루프 스레드 샘플링 프로파일 (collapsed stack 텍스트)
+- GET  /debug/cpu_pool          : CPU 작업 풀 통계 (대기/거절/타임아웃/재생성 수)
+- GET  /debug/admission         : 도구별 동시 실행 한도, 대기열, 거절 수
+- GET  /debug/resilience        : 의존성별 회로 차단기 상태, 재시도/타임아웃/헤징 횟수
+- GET  /debug/refresh           : 백그라운드 캐시 갱신 작업별 갱신/실패/연기 수, 캐시 적중 수, 남은 예산
+- GET  /debug/jobs              : 백그라운드 작업 수(실행/대기/완료/실패/취소/거절), 실행 중인 작업 목록
+- GET  /debug/subscriptions     : 구독 중인 리소스별 세션 수, 값 확인/변경/알림/제외 수
+- GET  /debug/memory            : 현재/최대 RSS, 시작 단계별(구성 요소별) RSS 증가량, CPU 풀 워커/임베딩 사이드카 RSS
+
+모든 엔드포인트는 관리 엔드포인트와 같은 접근 제한(admin_only, ADMIN_TOKEN 또는 loopback)을 적용합니다.
+(스택/SQL/URL 노출, 프로파일러 실행, 집계 초기화를 외부에서 할 수 없도록)
+"""
+
+# 프로세스 전역 진단 객체
+loop_monitor = LoopMonitor(
+    threshold_ms=LOOP_MONITOR_THRESHOLD_MS,
+    interval_ms=LOOP_MONITOR_INTERVAL_MS,
+    resolve_label=tool_name_from_frame,
+)
+profiler = SamplingProfiler()
+memory_report = MemoryReport(budget_mb=MEMORY_BUDGET_MB)
+admission = AdmissionController(
+    # 도구별 기본 한도는 도구 레지스트리(ToolSpec.max_concurrency)에서 채웁니다.
+    limits=parse_limits(ADMISSION_LIMITS),
+    default_limit=ADMISSION_DEFAULT_LIMIT,
+    max_queue=ADMISSION_MAX_QUEUE,
+    adaptive=ADMISSION_ADAPTIVE,
+    tolerance=ADMISSION_TOLERANCE,
+)
+# lifespan에서 생성된 CPU 작업 풀 (attach_cpu_pool로 등록)
+cpu_pool = None
+
+
+def attach_cpu_pool(pool):
+    global cpu_pool
+    cpu_pool = pool
+
+
+def track_cpu_pool_workers():
+    """
+    CPU 풀 워커 pid를 메모리 보고 대상에 등록합니다. (워커가 재생성되면 pid가 바뀝니다)
+    """
+
+    for name in [name for name in memory_report.processes if name.startswith("cpu_pool_worker_")]:
+        memory_report.track_process(name, None)
+    for index, pid in enumerate(cpu_pool.pids() if cpu_pool else []):
+        memory_report.track_process(f"cpu_pool_worker_{index}", pid)
+
+
+async def debug_traces(request: Request) -> JSONResponse:
+    if not tracer.enabled:
+        return JSONResponse({"enabled": False, "spans": []})
+    # 파일 Exporter는 파일을 읽으므로 이벤트 루프 밖에서 조회합니다.
+    spans = await asyncio.to_thread(tracer.exporter.get_finished_spans)
+    trace_id = request.query_params.get("trace_id")
+    if trace_id:
+        spans = [span for span in spans if span["traceId"] == trace_id]
+    return JSONResponse({"enabled": True, "spans": spans})
+
+
+async def debug_loop(request: Request) -> JSONResponse:
+    include_stacks = request.query_params.get("stacks", "1") != "0"
+    return JSONResponse(loop_monitor.snapshot(include_stacks=include_stacks))
+
+
+async def debug_loop_reset(request: Request) -> JSONResponse:
+    loop_monitor.reset()
+    return JSONResponse({"reset": True})
+
+
+async def debug_profile(request: Request) -> PlainTextResponse:
+    try:
+        seconds = float(request.query_params.get("seconds", "5"))
+    except ValueError:
+        return PlainTextResponse("seconds must be a number", status_code=400)
+
+    # 이 핸들러는 이벤트 루프 스레드에서 실행되므로 현재 스레드가 샘플링 대상입니다.
+    loop_thread_id = threading.get_ident()
+    try:
+        counts = await asyncio.to_thread(profiler.sample, loop_thread_id, seconds)
+    except RuntimeError as e:
+        return PlainTextResponse(str(e), status_code=409)
+
+    lines = [f"{stack} {count}" for stack, count in sorted(counts.items(), key=lambda item: -item[1])]
+    return PlainTextResponse("\n".join(lines))
+
+
+async def debug_cpu_pool(request: Request) -> JSONResponse:
+    if cpu_pool is None:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **cpu_pool.snapshot()})
+
+
+async def debug_admission(request: Request) -> JSONResponse:
+    return JSONResponse(admission.snapshot())
+
+
+async def debug_resilience(request: Request) -> JSONResponse:
+    return JSONResponse(dependencies.snapshot())
+
+
+async def debug_refresh(request: Request) -> JSONResponse:
+    return JSONResponse(refresh_scheduler.snapshot())
+
+
+async def debug_jobs(request: Request) -> JSONResponse:
+    return JSONResponse(job_manager.snapshot())
+
+
+async def debug_subscriptions(request: Request) -> JSONResponse:
+    return JSONResponse(subscription_hub.snapshot())
+
+
+async def debug_memory(request: Request) -> JSONResponse:
+    track_cpu_pool_workers()
+    return JSONResponse(memory_report.snapshot())
+
+
+def register_debug_routes(mcp: FastMCP):
+    """
+    디버그 엔드포인트를 MCP 서버에 등록합니다.
+    """
+
+    mcp.custom_route("/debug/traces", methods=["GET"])(admin_only(debug_traces))
+    mcp.custom_route("/debug/loop", methods=["GET"])(admin_only(debug_loop))
+    mcp.custom_route("/debug/loop/reset", methods=["POST"])(admin_only(debug_loop_reset))
+    mcp.custom_route("/debug/profile", methods=["GET"])(admin_only(debug_profile))
+    mcp.custom_route("/debug/cpu_pool", methods=["GET"])(admin_only(debug_cpu_pool))
+    mcp.custom_route("/debug/admission", methods=["GET"])(admin_only(debug_admission))
+    mcp.custom_route("/debug/resilience", methods=["GET"])(admin_only(debug_resilience))
+    mcp.custom_route("/debug/refresh", methods=["GET"])(admin_only(debug_refresh))
+    mcp.custom_route("/debug/jobs", methods=["GET"])(admin_only(debug_jobs))
+    mcp.custom_route("/debug/subscriptions", methods=["GET"])(admin_only(debug_subscriptions))
+    mcp.custom_route("/debug/memory", methods=["GET"])(admin_only(debug_memory))
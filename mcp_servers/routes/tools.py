@@ -0,0 +1,53 @@
+from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from mcp_servers.registry import ToolUnavailable, tool_registry
+from mcp_servers.routes.admin import admin_only
+
+"""
+==================================================
+라우트 모듈: 도구 레지스트리 (/admin/tools/*)
+==================================================
+이 파일은 실행 중에 도구를 조회하고 활성화/비활성화하는 HTTP 엔드포인트를 정의합니다.
+(멀티 워커 실행 시 요청을 받은 워커에만 적용됩니다)
+모든 엔드포인트는 관리자 요청만 허용합니다. (ADMIN_TOKEN 또는 loopback, mcp_servers/routes/admin.py)
+
+엔드포인트:
+- GET  /admin/tools                : 도구별 그룹, 활성화/import 여부, 동시 실행 한도, 기본 기한, 생성된 구성 요소
+- POST /admin/tools/{name}/enable  : 도구 활성화 (모듈 import 후 등록, 연결된 세션에 tools/list_changed 알림)
+- POST /admin/tools/{name}/disable : 도구 비활성화 (목록에서 제거, 실행 중인 호출은 끝까지 실행)
+"""
+
+@admin_only
+async def list_tools(request: Request) -> JSONResponse:
+    return JSONResponse(tool_registry.snapshot())
+
+
+@admin_only
+async def enable_tool(request: Request) -> JSONResponse:
+    name = request.path_params["name"]
+    try:
+        changed = await tool_registry.enable(name)
+    except ToolUnavailable as e:
+        return JSONResponse({"error": str(e)}, status_code=409 if name in tool_registry.specs else 404)
+    return JSONResponse({"tool": name, "active": True, "changed": changed})
+
+
+@admin_only
+async def disable_tool(request: Request) -> JSONResponse:
+    name = request.path_params["name"]
+    try:
+        changed = await tool_registry.disable(name)
+    except ToolUnavailable as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+    return JSONResponse({"tool": name, "active": False, "changed": changed})
+
+
+def register_tool_routes(mcp: FastMCP):
+    """
+    도구 레지스트리 엔드포인트를 MCP 서버에 등록합니다.
+    """
+
+    mcp.custom_route("/admin/tools", methods=["GET"])(list_tools)
+    mcp.custom_route("/admin/tools/{name}/enable", methods=["POST"])(enable_tool)
+    mcp.custom_route("/admin/tools/{name}/disable", methods=["POST"])(disable_tool)
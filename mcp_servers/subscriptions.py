@@ -0,0 +1,261 @@
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import unquote
+from mcp_servers.config.settings import SUBSCRIPTION_MAX_URIS, SUBSCRIPTION_POLL_INTERVAL
+from utils.result_encoding import dumps
+import asyncio
+import hashlib
+import re
+import time
+import weakref
+
+"""
+==================================================
+모듈: 리소스 구독 및 변경 알림 (SubscriptionHub)
+==================================================
+이 파일은 MCP resources/subscribe, resources/unsubscribe 요청을 처리하고,
+구독 중인 리소스 값이 바뀌었을 때만 구독한 세션에 notifications/resources/updated를 보내는 허브를 정의합니다.
+에이전트가 같은 도구를 반복 호출(polling)하지 않고 변경 알림을 받은 뒤 리소스를 다시 읽도록 합니다.
+
+구독 가능한 리소스 (ResourceFeed):
+- weather://{city}            : 도시별 현재 날씨 (open_weather_map 캐시)
+- account://{holder}/summary  : 예금주별 예금 잔액/대출 금액 요약 (계좌 요약 캐시)
+- job://{job_id}              : 백그라운드 작업 상태/진행률 (작업 진행 시 check()로 바로 확인)
+
+동작 방식:
+1. 구독 시 현재 값의 해시를 기록합니다. (구독 직후 불필요한 알림을 보내지 않도록)
+2. SUBSCRIPTION_POLL_INTERVAL초마다 구독 중인 URI별로 값을 한 번만 읽습니다. (구독 세션 수와 관계없이)
+   값은 각 도구의 캐시를 거쳐 읽으므로 외부 API/DB는 캐시 TTL마다 최대 한 번 호출합니다.
+   자주 구독되는 도시는 백그라운드 갱신(mcp_servers/refresh.py)으로 캐시 만료 전에 갱신됩니다.
+3. 해시가 바뀐 URI만 모든 구독 세션에 동시에 알립니다. 알림에 실패한 세션은 구독에서 제외합니다.
+4. 세션은 약한 참조로 보관하므로 구독 해제 없이 끊긴 세션은 자동으로 정리됩니다.
+
+멀티 워커 실행 시 구독은 세션이 연결된 워커에만 있으므로 세션 고정(prefork --stateful)이 필요합니다.
+상태 조회: GET /debug/subscriptions
+"""
+
+
+class SubscriptionError(Exception):
+    """
+    구독할 수 없는 URI이거나 구독 한도를 넘은 경우 발생하는 예외입니다.
+    """
+
+
+@dataclass
+class ResourceFeed:
+    name: str
+    # URI 패턴 (예: weather://(?P<city>[^/]+)), 이름 있는 그룹이 load 인자가 됩니다.
+    pattern: str
+    # 리소스 값을 읽는 코루틴 함수 (JSON으로 직렬화할 수 있는 값, 실패 시 예외)
+    load: Callable[..., Awaitable[Any]]
+
+    def match(self, uri: str) -> Optional[Dict[str, str]]:
+        matched = re.fullmatch(self.pattern, uri)
+        return {key: unquote(value) for key, value in matched.groupdict().items()} if matched else None
+
+
+@dataclass
+class Subscription:
+    feed: ResourceFeed
+    params: Dict[str, str]
+    sessions: "weakref.WeakSet" = field(default_factory=weakref.WeakSet)
+    digest: Optional[str] = None
+    checked_at: Optional[float] = None
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(dumps(value).encode("utf-8")).hexdigest()
+
+
+class SubscriptionHub:
+    """
+    리소스 URI별 구독 세션과 마지막 값을 관리하고 변경 시 알림을 보냅니다.
+    """
+
+    def __init__(self, interval: float = 15, max_uris: int = 1024):
+        """
+        Args:
+            interval (float): 구독 중인 리소스 값 확인 주기(초).
+            max_uris (int): 최대 구독 URI 수.
+        """
+
+        self.interval = interval
+        self.max_uris = max_uris
+        self.feeds: Dict[str, ResourceFeed] = {}
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"subscribed": 0, "unsubscribed": 0, "checks": 0, "changes": 0,
+                      "notifications": 0, "dropped": 0, "failed": 0}
+
+    def register(self, feed: ResourceFeed):
+        self.feeds[feed.name] = feed
+
+    def _match(self, uri: str) -> Optional[Subscription]:
+        for feed in self.feeds.values():
+            params = feed.match(uri)
+            if params is not None:
+                return Subscription(feed, params)
+        return None
+
+    async def subscribe(self, uri: str, session):
+        """
+        세션을 URI 구독자로 등록합니다.
+
+        Raises:
+            SubscriptionError: 구독할 수 없는 URI이거나 구독 URI 수가 한도를 넘은 경우.
+        """
+
+        subscription = self.subscriptions.get(uri)
+        if subscription is None:
+            if len(self.subscriptions) >= self.max_uris:
+                raise SubscriptionError(f"구독 리소스가 너무 많습니다 ({self.max_uris})")
+            subscription = self._match(uri)
+            if subscription is None:
+                raise SubscriptionError(f"구독할 수 없는 리소스입니다: {uri}")
+            self.subscriptions[uri] = subscription
+            await self._check(uri, subscription, notify=False)
+        subscription.sessions.add(session)
+        self.stats["subscribed"] += 1
+
+    async def unsubscribe(self, uri: str, session):
+        subscription = self.subscriptions.get(uri)
+        if subscription is None:
+            return
+        subscription.sessions.discard(session)
+        self.stats["unsubscribed"] += 1
+        if not subscription.sessions:
+            del self.subscriptions[uri]
+
+    async def _check(self, uri: str, subscription: Subscription, notify: bool = True) -> bool:
+        """
+        리소스 값을 읽고 이전 값과 다르면 구독자에게 알립니다. 알림을 보냈으면 True.
+        """
+
+        self.stats["checks"] += 1
+        try:
+            value = await subscription.feed.load(**subscription.params)
+        except Exception as e:
+            # 읽기에 실패하면 이전 값을 유지하고 다음 주기에 다시 확인합니다.
+            self.stats["failed"] += 1
+            print(f"[Subscriptions] {uri} 확인 실패: {e!r}")
+            return False
+
+        subscription.checked_at = time.time()
+        digest = _digest(value)
+        if digest == subscription.digest:
+            return False
+        changed = subscription.digest is not None
+        subscription.digest = digest
+        if not (notify and changed):
+            return False
+        self.stats["changes"] += 1
+        await self._fan_out(uri, subscription)
+        return True
+
+    async def check(self, uri: str) -> bool:
+        """
+        구독 중인 URI면 주기를 기다리지 않고 바로 값을 확인합니다. (값이 바뀐 쪽에서 호출, 알림을 보냈으면 True)
+        """
+
+        subscription = self.subscriptions.get(uri)
+        if subscription is None or not subscription.sessions:
+            return False
+        return await self._check(uri, subscription)
+
+    async def _fan_out(self, uri: str, subscription: Subscription):
+        sessions = list(subscription.sessions)
+        results = await asyncio.gather(
+            *(session.send_resource_updated(uri) for session in sessions),
+            return_exceptions=True,
+        )
+        for session, result in zip(sessions, results):
+            if isinstance(result, Exception):
+                # 끊긴 세션은 구독에서 제외합니다.
+                subscription.sessions.discard(session)
+                self.stats["dropped"] += 1
+            else:
+                self.stats["notifications"] += 1
+        if not subscription.sessions:
+            self.subscriptions.pop(uri, None)
+
+    async def run_once(self) -> int:
+        """
+        구독 중인 모든 URI를 확인하고 알림을 보낸 URI 수를 반환합니다.
+        """
+
+        # 끊긴 세션만 남은 구독은 확인하지 않고 정리합니다.
+        for uri in [uri for uri, subscription in self.subscriptions.items() if not subscription.sessions]:
+            del self.subscriptions[uri]
+
+        items = list(self.subscriptions.items())
+        results = await asyncio.gather(*(self._check(uri, subscription) for uri, subscription in items))
+        self.last_run = time.time()
+        return sum(results)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"[Subscriptions] 확인 주기 실패: {e!r}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.subscriptions.clear()
+        self.feeds.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "feeds": list(self.feeds),
+            "last_run": self.last_run,
+            "uris": {
+                uri: {"sessions": len(subscription.sessions), "checked_at": subscription.checked_at}
+                for uri, subscription in self.subscriptions.items()
+            },
+            **self.stats,
+        }
+
+
+def register_subscription_handlers(mcp, hub: "SubscriptionHub"):
+    """
+    FastMCP 서버에 resources/subscribe, resources/unsubscribe 핸들러를 등록합니다.
+    """
+
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri):
+        await hub.subscribe(str(uri), server.request_context.session)
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri):
+        await hub.unsubscribe(str(uri), server.request_context.session)
+
+    # 저수준 서버는 핸들러가 있어도 resources.subscribe 기능을 false로 알리므로 initialize 응답을 보정합니다.
+    get_capabilities = server.get_capabilities
+
+    def get_capabilities_with_subscribe(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities_with_subscribe
+
+
+# 프로세스 전역 구독 허브
+subscription_hub = SubscriptionHub(interval=SUBSCRIPTION_POLL_INTERVAL, max_uris=SUBSCRIPTION_MAX_URIS)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from fastmcp.server.dependencies import get_http_headers
+from mcp_servers.config.settings import TEMPLATE_DEFAULT_DOMAIN, TEMPLATE_DEFAULT_LOCALE, TEMPLATE_DEFAULT_ROLES
+
+"""
+==================================================
+모듈: 템플릿 검색 범위 (TemplateScope)
+==================================================
+이 파일은 요청 컨텍스트에서 템플릿 검색 범위(업무 도메인, 로케일, 역할)를 구하고
+Milvus 스칼라 필터 식으로 변환합니다.
+
+범위 결정 순서 (항목별):
+1. 요청 `_meta` (tenant_domain, locale, roles)
+2. HTTP 헤더 (X-Tenant-Domain, X-Locale, X-User-Roles: 쉼표 구분)
+3. 설정 기본값 (TEMPLATE_DEFAULT_DOMAIN, TEMPLATE_DEFAULT_LOCALE, TEMPLATE_DEFAULT_ROLES)
+
+- domain은 템플릿 컬렉션의 partition key이므로 domain 조건이 있으면 Milvus가 해당 파티션만 검색합니다.
+- locale이 비어 있으면 로케일 조건을 적용하지 않습니다.
+- 역할 조건은 항상 적용합니다. allowed_roles에 요청 역할 또는 "*"(모든 역할)가 있는 템플릿만 검색됩니다.
+"""
+
+ANY_ROLE = "*"
+
+
+@dataclass(frozen=True)
+class TemplateScope:
+    domain: Optional[str] = None
+    locale: Optional[str] = None
+    roles: Tuple[str, ...] = ()
+
+    @property
+    def allowed_roles(self) -> list:
+        return [*self.roles, ANY_ROLE]
+
+    def key(self) -> Tuple:
+        # 검색 결과 캐시 키 (범위가 다르면 결과도 다릅니다)
+        return (self.domain, self.locale, self.roles)
+
+    def milvus_filter(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Milvus 검색 필터 식과 파라미터를 반환합니다. (client.search(filter=..., filter_params=...))
+        값은 filter_params로 전달하여 식에 직접 넣지 않습니다.
+        """
+
+        clauses = ["ARRAY_CONTAINS_ANY(allowed_roles, {allowed_roles})"]
+        params: Dict[str, Any] = {"allowed_roles": self.allowed_roles}
+        if self.domain:
+            clauses.insert(0, "domain == {domain}")
+            params["domain"] = self.domain
+        if self.locale:
+            clauses.append("locale == {locale}")
+            params["locale"] = self.locale
+        return " and ".join(clauses), params
+
+    def allows(self, template: Dict[str, Any]) -> bool:
+        """
+        템플릿(domain, locale, allowed_roles 포함)이 범위 안에 있는지 확인합니다. (BM25 후보 필터)
+        """
+
+        if self.domain and template.get("domain") != self.domain:
+            return False
+        if self.locale and template.get("locale") != self.locale:
+            return False
+        return bool(set(template.get("allowed_roles") or ()) & set(self.allowed_roles))
+
+
+def _split(value: Any) -> Tuple[str, ...]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(sorted({str(item).strip() for item in value if str(item).strip()}))
+
+
+def current_scope(ctx) -> TemplateScope:
+    """
+    도구 호출 컨텍스트에서 템플릿 검색 범위를 구합니다.
+    """
+
+    meta = ctx.request_context.meta
+    headers = get_http_headers()
+
+    def pick(meta_key: str, header: str, default: str):
+        value = getattr(meta, meta_key, None) if meta else None
+        if value is None:
+            value = headers.get(header)
+        return value if value is not None else default
+
+    return TemplateScope(
+        domain=pick("tenant_domain", "x-tenant-domain", TEMPLATE_DEFAULT_DOMAIN) or None,
+        locale=pick("locale", "x-locale", TEMPLATE_DEFAULT_LOCALE) or None,
+        roles=_split(pick("roles", "x-user-roles", TEMPLATE_DEFAULT_ROLES)),
+    )
@@ -0,0 +1,150 @@
+from typing import Any, Dict, Optional
+from fastmcp.dependencies import CurrentContext
+from fastmcp.exceptions import ResourceError
+from fastmcp.tools.tool import ToolResult
+from mcp.server.fastmcp import Context
+from mcp_servers.config.settings import RESULT_MAX_BYTES
+from mcp_servers.jobs import JOB_KINDS, job_manager, job_uri, notify_job_subscribers
+from mcp_servers.registry import tool_registry
+from mcp_servers.results import tool_result
+from mcp_servers.subscriptions import ResourceFeed, subscription_hub
+from utils.jobs import Job, JobQueueFull, SUCCEEDED
+from utils.result_encoding import dumps
+import json
+
+"""
+==================================================
+도구 모듈: 백그라운드 작업 (job_submit, job_status, job_cancel)
+==================================================
+이 파일은 오래 걸리는 작업을 요청과 분리하여 실행하는 FastMCP 도구와 리소스를 정의합니다.
+
+사용 흐름:
+1. job_submit(kind, inputs)  : 작업을 등록하고 바로 job_id를 반환합니다.
+   job://{job_id} 리소스를 구독하면 진행률이 바뀔 때마다 notifications/resources/updated를 받습니다.
+2. job_status(job_id)        : 상태/진행률을 조회합니다. 끝난 작업은 결과를 함께 반환합니다.
+   결과가 RESULT_MAX_BYTES보다 크면 result_uri(job://{job_id}/result) 리소스로 읽습니다.
+3. job_cancel(job_id)        : 대기/실행 중인 작업을 취소합니다.
+
+리소스:
+- job://{job_id}        : 작업 상태 (JSON, 구독 가능)
+- job://{job_id}/result : 작업 결과 (JSON, 크기 제한 없음)
+"""
+
+
+def job_error(error: str, message: str, **extra: Any) -> ToolResult:
+    return tool_result({"error": error, "message": message, **extra}, text=message, meta={"status": "ERROR"})
+
+
+def job_payload(job: Job, include_result: bool) -> Dict[str, Any]:
+    payload = job.to_dict()
+    if job.status == SUCCEEDED and job.result is not None:
+        if include_result and len(job.result.encode("utf-8")) <= RESULT_MAX_BYTES:
+            try:
+                payload["result"] = json.loads(job.result)
+            except ValueError:
+                # JSON이 아닌 결과는 문자열 그대로 반환합니다.
+                payload["result"] = job.result
+        else:
+            payload["result_uri"] = f"job://{job.id}/result"
+    return payload
+
+
+async def job_submit(kind: str, inputs: Optional[Dict[str, Any]] = None, ctx: Context = CurrentContext()) -> ToolResult:
+    """
+    오래 걸리는 작업을 백그라운드에서 실행하고 바로 job_id를 반환합니다. 결과는 job_status로 조회합니다.
+
+    Args:
+        kind (str): 작업 종류.
+            - oracle_export  : {"sql_template": ..., "params": {...}} 대용량 조회 결과 전체 내보내기
+            - fetch_urls     : {"urls": [...]} 여러 웹 페이지 내용 수집
+            - catalog_reindex: {} 템플릿 캐시 초기화 및 BM25 색인 재생성
+        inputs (dict): 작업 입력.
+    """
+
+    job_kind = JOB_KINDS.get(kind)
+    if job_kind is None:
+        return job_error("unknown_kind", f"알 수 없는 작업 종류입니다: {kind}", kinds=list(JOB_KINDS))
+
+    # 이 서버에서 생성하지 않은 구성 요소(예: 날씨/검색 전용 서버의 Oracle)가 필요한 작업은 거절합니다.
+    missing = set(job_kind.requires) - tool_registry.components if tool_registry.components is not None else set()
+    if missing:
+        return job_error("unavailable", f"이 서버에서 실행할 수 없는 작업입니다: {kind}", missing=sorted(missing))
+
+    run, validate = job_kind.load()
+    inputs = inputs or {}
+    if validate is not None:
+        message = validate(inputs)
+        if message:
+            return job_error("invalid_inputs", message, kind=kind)
+
+    app_context = ctx.request_context.lifespan_context
+    try:
+        job = await job_manager.submit(
+            kind,
+            lambda progress: run(app_context, inputs, progress),
+            on_progress=notify_job_subscribers,
+        )
+    except JobQueueFull as e:
+        return job_error("queue_full", str(e), kind=kind)
+
+    print(f"[Tool] job_submit: {kind} ({job.id})")
+    return tool_result({"job_id": job.id, "status": job.status, "kind": kind, "status_uri": job_uri(job.id)})
+
+
+async def job_status(job_id: str, include_result: bool = True) -> ToolResult:
+    """
+    백그라운드 작업의 상태, 진행률, 결과를 조회합니다.
+
+    Args:
+        job_id (str): job_submit이 반환한 작업 ID.
+        include_result (bool): 끝난 작업의 결과를 함께 반환할지 여부.
+    """
+
+    job = await job_manager.get(job_id)
+    if job is None:
+        return job_error("not_found", f"작업을 찾을 수 없습니다: {job_id}")
+    return tool_result(job_payload(job, include_result))
+
+
+async def job_cancel(job_id: str) -> ToolResult:
+    """
+    대기/실행 중인 백그라운드 작업을 취소합니다.
+
+    Args:
+        job_id (str): job_submit이 반환한 작업 ID.
+    """
+
+    job = await job_manager.cancel(job_id)
+    if job is None:
+        return job_error("not_found", f"작업을 찾을 수 없습니다: {job_id}")
+    return tool_result(job_payload(job, include_result=False))
+
+
+async def load_job_state(job_id: str) -> Dict[str, Any]:
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise ResourceError(f"작업을 찾을 수 없습니다: {job_id}")
+    return job_payload(job, include_result=False)
+
+
+def setup_job_feed(app_context):
+    """
+    job://{job_id} 구독 피드를 등록합니다. (도구 레지스트리에서 job_status 활성화 시 호출)
+    """
+
+    subscription_hub.register(ResourceFeed("job", r"job://(?P<job_id>[^/]+)", load_job_state))
+
+
+async def job_resource(job_id: str) -> str:
+    """백그라운드 작업 상태 (구독 시 진행률/상태가 바뀌면 notifications/resources/updated)"""
+    return dumps(await load_job_state(job_id))
+
+
+async def job_result_resource(job_id: str) -> str:
+    """백그라운드 작업 결과"""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise ResourceError(f"작업을 찾을 수 없습니다: {job_id}")
+    if job.status != SUCCEEDED or job.result is None:
+        raise ResourceError(f"작업 결과가 없습니다: {job_id} ({job.status})")
+    return job.result
@@ -0,0 +1,91 @@
+from typing import Dict
+from urllib.parse import unquote
+from fastmcp.exceptions import ResourceError
+from fastmcp.server.dependencies import get_context
+from mcp_servers.config.settings import ACCOUNT_CACHE_TTL, ORACLE_CALL_TIMEOUT, REFRESH_CACHE_SIZE
+from mcp_servers.resilience import dependencies
+from mcp_servers.subscriptions import ResourceFeed, subscription_hub
+from utils.result_encoding import dumps
+from utils.tracing import tracer
+from utils.ttl_cache import TTLCache
+
+"""
+==================================================
+리소스 모듈: 계좌 요약 (account://{holder}/summary)
+==================================================
+이 파일은 예금주별 예금 잔액/대출 금액 요약을 MCP 리소스로 제공합니다.
+
+- 요약은 ACCOUNT_CACHE_TTL초 동안 캐시합니다. (리소스 읽기와 구독 확인이 같은 캐시를 사용)
+- 구독 중인 요약은 SUBSCRIPTION_POLL_INTERVAL초마다 확인하고, 값이 바뀐 경우에만 알립니다. (mcp_servers/subscriptions.py)
+- Oracle 호출에는 oracle 의존성의 회로 차단기/타임아웃/재시도를 적용합니다.
+"""
+
+SUMMARY_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM deposit WHERE account_holder = :holder),
+        (SELECT NVL(SUM(balance), 0) FROM deposit WHERE account_holder = :holder),
+        (SELECT COUNT(*) FROM loan WHERE borrower = :holder),
+        (SELECT NVL(SUM(money), 0) FROM loan WHERE borrower = :holder)
+    FROM dual
+"""
+
+# 예금주별 계좌 요약 캐시
+account_cache = TTLCache(ACCOUNT_CACHE_TTL, max_entries=REFRESH_CACHE_SIZE)
+
+async def fetch_account_summary(oracle, holder: str) -> Dict:
+    """
+    예금주의 예금/대출 건수와 합계를 조회합니다.
+    """
+
+    async def run_query():
+        async with oracle.connection(call_timeout=ORACLE_CALL_TIMEOUT) as connection:
+            async with connection.cursor() as cursor:
+                with tracer.start_span(
+                    "oracle.execute",
+                    attributes={"db.system": "oracle", "db.statement": "account_summary"},
+                    kind="CLIENT",
+                ):
+                    await cursor.execute(SUMMARY_SQL, {"holder": holder})
+                    return await cursor.fetchone()
+
+    # 조회 전용이므로 연결 오류 시 재시도합니다.
+    deposits, balance, loans, loan_amount = await dependencies.get("oracle").call(run_query, idempotent=True)
+    return {
+        "holder": holder,
+        "deposit_count": deposits,
+        "balance": balance,
+        "loan_count": loans,
+        "loan_amount": loan_amount,
+    }
+
+async def get_account_summary(oracle, holder: str) -> Dict:
+    """
+    캐시된 요약이 있으면 반환하고, 없으면 조회하여 캐시합니다.
+    """
+
+    summary = account_cache.get(holder)
+    if summary is None:
+        summary = await fetch_account_summary(oracle, holder)
+        account_cache.put(holder, summary)
+    return summary
+
+def setup_account_feed(app_context):
+    """
+    account://{holder}/summary 구독 피드를 등록합니다. (도구 레지스트리에서 oracle_query 활성화 시 호출)
+    """
+
+    subscription_hub.register(
+        ResourceFeed(
+            "account",
+            r"account://(?P<holder>[^/]+)/summary",
+            lambda holder: get_account_summary(app_context.oracle, holder),
+        )
+    )
+
+async def account_summary_resource(holder: str) -> str:
+    """예금주별 예금 잔액/대출 금액 요약 (구독 시 값이 바뀌면 notifications/resources/updated)"""
+    holder = unquote(holder).strip()
+    if not holder:
+        raise ResourceError("예금주 이름이 필요합니다.")
+    oracle = get_context().request_context.lifespan_context.oracle
+    return dumps(await get_account_summary(oracle, holder))
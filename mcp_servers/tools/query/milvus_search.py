@@ -1,68 +1,256 @@
-from pymilvus import MilvusClient
-from sentence_transformers import SentenceTransformer
+from typing import Any, Dict, List, Tuple
 from fastmcp.tools.tool import ToolResult
-from mcp.types import TextContent
+from fastmcp.dependencies import CurrentContext
+from mcp.server.fastmcp import Context
+from mcp_servers.catalog import template_catalog
+from mcp_servers.config.settings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    HYBRID_CANDIDATES,
+    HYBRID_RERANK,
+    HYBRID_RRF_K,
+    HYBRID_SEARCH_ENABLED,
+    MILVUS_HNSW_EF,
+    MILVUS_INDEX_TYPE,
+    MILVUS_IVF_NLIST,
+    MILVUS_IVF_NPROBE,
+    MILVUS_TIMEOUT,
+    RERANK_DENSE_WEIGHT,
+    TEMPLATE_MIN_SCORE,
+)
+from mcp_servers.cpu_tasks import encode_text
+from mcp_servers.refresh import RefreshJob, refresh_scheduler
+from mcp_servers.resilience import dependencies, run_blocking
+from mcp_servers.tenancy import TemplateScope, current_scope
+from mcp_servers.results import tool_result
+from utils.ann_index import search_params
+from utils.deadline import timeout_for
+from utils.lexical import bigram_dice, reciprocal_rank_fusion
+from utils.tracing import tracer
 
-# 컬렉션 이름 지정
+# 컬렉션 이름 지정 (db_server가 관리하는 카탈로그 별칭, 실제 컬렉션은 my_collection_<버전>)
 COLLECTION_NAME = 'my_collection'
-model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
 
-client = MilvusClient(
-    uri = "http://localhost:19530"
-)
-def milvus_search(intent: str, top_k: int = 1) -> ToolResult: 
+# 프로세스 전역 모델 (pre-fork 실행 시 마스터에서 로드한 모델을 워커가 copy-on-write로 공유)
+embedding_model = None
+
+def load_embedding_model() -> Any:
+    """
+    템플릿 검색에 사용하는 임베딩 모델(SentenceTransformer)을 로드합니다. 이미 로드된 경우 재사용합니다.
+    (torch는 이 함수에서 처음 import 합니다. EMBEDDING_BACKEND=sidecar이면 호출하지 않습니다)
+    """
+
+    global embedding_model
+
+    if embedding_model is None:
+        from sentence_transformers import SentenceTransformer
+        embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return embedding_model
+
+def rank_templates(intent: str, dense_hits: List[Dict], scope: TemplateScope = TemplateScope()) -> List[Dict]:
+    """
+    벡터 검색 결과와 BM25 결과를 RRF로 결합하고, 설정에 따라 재정렬합니다.
+    BM25 후보는 요청 범위(scope) 안의 템플릿만 사용합니다. (벡터 검색은 Milvus 필터로 이미 제한됨)
+
+    Returns:
+        List[Dict]: 순위순 후보 목록
+            {"template_key", "intent_description", "sql_template", "similarity_score", "score"}
+            - similarity_score: 벡터 유사도 (벡터 검색 후보에 없으면 None)
+            - score: 최종 점수 (0~1, 순위순). 재정렬 점수, 재정렬을 끄면 정규화한 RRF 점수, BM25 결합이 없으면 벡터 유사도
+              (정규화한 RRF 점수: 두 검색 모두 1위면 1.0, 한 검색에서만 1위면 약 0.5)
+    """
+
+    candidates = {
+        hit["id"]: {
+            "template_key": hit["id"],
+            "intent_description": hit["entity"]["intent_description"],
+            "sql_template": hit["entity"]["sql_template"],
+            "similarity_score": hit["distance"],
+        }
+        for hit in dense_hits
+    }
+    fused_scores: Dict[str, float] = {}
+    if not HYBRID_SEARCH_ENABLED or not template_catalog.lexical:
+        ranking = list(candidates)
+    else:
+        with tracer.start_span("lexical.search", attributes={"lexical.domain": scope.domain or "*"}):
+            lexical_hits = [
+                (key, score)
+                for key, score in template_catalog.lexical_search(intent, HYBRID_CANDIDATES, scope.domain)
+                if key in template_catalog.templates and scope.allows(template_catalog.templates[key])
+            ]
+        for key, _ in lexical_hits:
+            if key not in candidates:
+                template = template_catalog.templates[key]
+                candidates[key] = {
+                    "template_key": key,
+                    "intent_description": template["intent_description"],
+                    "sql_template": template["sql_template"],
+                    "similarity_score": None,
+                }
+        fused = reciprocal_rank_fusion([list(candidates)[:len(dense_hits)], [key for key, _ in lexical_hits]], k=HYBRID_RRF_K)
+        ranking = [key for key, _ in fused if key in candidates]
+        # 두 검색 모두 1위일 때의 RRF 점수로 나누어 0~1로 정규화합니다. (TEMPLATE_MIN_SCORE와 비교하는 점수)
+        best_possible = 2.0 / (HYBRID_RRF_K + 1)
+        fused_scores = {key: score / best_possible for key, score in fused}
+
+    ranked = []
+    for key in ranking:
+        candidate = candidates[key]
+        dense = candidate["similarity_score"] or 0.0
+        if HYBRID_RERANK:
+            # 벡터 검색 후보에 없던 템플릿은 벡터 유사도 0으로 계산합니다.
+            lexical = bigram_dice(intent, candidate["intent_description"])
+            candidate["score"] = RERANK_DENSE_WEIGHT * dense + (1 - RERANK_DENSE_WEIGHT) * lexical
+        elif fused_scores:
+            # 재정렬을 끄면 순위(RRF)와 같은 기준의 점수를 사용합니다. (BM25로만 찾은 템플릿도 같은 척도)
+            candidate["score"] = fused_scores[key]
+        else:
+            candidate["score"] = dense
+        ranked.append(candidate)
+    if HYBRID_RERANK:
+        ranked.sort(key=lambda candidate: candidate["score"], reverse=True)
+    return ranked
+
+async def search_templates(app_context, intent: str, top_k: int, scope: TemplateScope) -> List[Dict]:
+    """
+    요청 범위(scope) 안에서 의도와 가장 가까운 템플릿을 검색하고 결과를 캐시에 저장합니다.
+    (milvus_search 도구와 백그라운드 캐시 갱신(mcp_servers/refresh.py)에서 사용)
+
+    Returns:
+        List[Dict]: 순위순 후보 목록 (rank_templates 참고)
+    """
+
+    client = app_context.milvus
+    scope_filter, scope_params = scope.milvus_filter()
+
+    if HYBRID_SEARCH_ENABLED:
+        # BM25 색인은 첫 검색 시(카탈로그 변경 후 포함) 한 번 만듭니다. 실패하면 벡터 검색만 사용합니다.
+        try:
+            await template_catalog.ensure_lexical(client, COLLECTION_NAME)
+        except Exception as e:
+            print(f"[Tool] [milvus_search] BM25 색인 생성 실패, 벡터 검색만 사용: {e!r}")
+
+    # 임베딩은 CPU 작업이므로 프로세스 풀에서 실행합니다. (풀이 없으면 현재 프로세스에서 실행)
+    # EMBEDDING_BACKEND=sidecar이면 모든 워커가 공유하는 임베딩 사이드카에 요청합니다.
+    with tracer.start_span(
+        "embedding.encode",
+        attributes={"embedding.model": EMBEDDING_MODEL_NAME, "embedding.backend": EMBEDDING_BACKEND},
+    ):
+        if EMBEDDING_BACKEND == "sidecar":
+            vectors = await dependencies.get("embedding").call(
+                lambda: app_context.embedder.aencode([intent]),
+                idempotent=True,
+            )
+            vector = vectors[0]
+        elif app_context.cpu_pool is not None:
+            vector = await app_context.cpu_pool.run_cpu(encode_text, intent)
+        else:
+            vector = app_context.embedder.encode(intent).tolist()
+
+    # 하이브리드 검색 시 결합/재정렬할 후보를 충분히 가져옵니다.
+    limit = max(top_k, HYBRID_CANDIDATES) if HYBRID_SEARCH_ENABLED else top_k
+    with tracer.start_span(
+        "milvus.search",
+        attributes={
+            "db.system": "milvus",
+            "db.collection": COLLECTION_NAME,
+            "milvus.top_k": limit,
+            "milvus.index_type": MILVUS_INDEX_TYPE,
+            "milvus.partition_key": scope.domain or "*",
+        },
+        kind="CLIENT",
+    ):
+        # MilvusClient는 동기 클라이언트이므로 스레드에서 실행합니다. (타임아웃, 회로 차단기, 재시도, 헤징 적용)
+        results = await run_blocking(
+            "milvus",
+            client.search,
+            collection_name=COLLECTION_NAME,
+            data=[vector],
+            anns_field="vector",
+            limit=limit,
+            # 인덱스 유형에 맞는 검색 파라미터 (HNSW: ef, IVF: nprobe)
+            search_params=search_params(
+                MILVUS_INDEX_TYPE,
+                top_k=limit,
+                hnsw_ef=MILVUS_HNSW_EF,
+                ivf_nprobe=MILVUS_IVF_NPROBE,
+                ivf_nlist=MILVUS_IVF_NLIST,
+            ),
+            # 범위 필터 (domain 조건이 있으면 해당 파티션만 검색)
+            filter=scope_filter,
+            filter_params=scope_params,
+            output_fields=['intent_description', 'sql_template'],
+            # 요청 기한이 있으면 남은 시간 이내
+            timeout=timeout_for(MILVUS_TIMEOUT, "milvus.search"),
+        )
+    ranked = rank_templates(intent, results[0] if results else [], scope)[:top_k]
+    if ranked:
+        template_catalog.put(intent, top_k, ranked, scope.key())
+    return ranked
+
+async def refresh_template(app_context, key: Tuple[str, int, Tuple]):
+    """
+    캐시에서 비워진 자주 요청되는 의도를 다시 검색합니다. (백그라운드 갱신, key는 template_catalog.popular 참고)
+    """
+
+    intent, top_k, scope_key = key
+    await search_templates(app_context, intent, top_k, TemplateScope(*scope_key))
+
+def setup_templates(app_context):
+    """
+    자주 요청되는 의도의 템플릿 검색 결과 갱신 작업을 등록합니다. (도구 레지스트리에서 호출)
+    """
+
+    refresh_scheduler.register(
+        RefreshJob("templates", template_catalog, lambda key: refresh_template(app_context, key))
+    )
+
+async def milvus_search(intent: str, top_k: int = 1, ctx: Context = CurrentContext()) -> ToolResult: 
     """
     Milvus에서 쿼리와 유사한 SQL 템플릿을 검색합니다.
     Args:
-        client (MilvusClient): MilvusClient 객체.
         intent (str): 검색할 쿼리 문자열.
         top_k (int): 검색할 상위 K개 결과 수.
     Returns:
-        List[Dict]: 유사한 SQL 템플릿 목록.
+        ToolResult: 최종 점수가 가장 높은 SQL 템플릿 (벡터 + BM25 하이브리드 검색, rank_templates 참고).
     """
 
-    print(f"[Tool] [milvus_search] intent: {intent}")
+    # 요청 컨텍스트의 업무 도메인/로케일/역할로 검색 범위를 정합니다. (domain은 partition key)
+    scope = current_scope(ctx)
 
-    vector = model.encode(intent).tolist()
+    print(f"[Tool] [milvus_search] intent: {intent}, scope: {scope}")
 
-    results = client.search(
-        collection_name=COLLECTION_NAME,
-        data=[vector],
-        anns_field="vector",
-        limit=top_k,
-        search_params={
-            "metric_type": "COSINE",
-            "params": {"nprobe": 10}
-        },
-        output_fields=['intent_description', 'sql_template']
-    )
+    # 같은 의도의 반복 검색은 캐시된 결과를 사용합니다. (카탈로그 변경 시 무효화)
+    ranked = template_catalog.get(intent, top_k, scope.key())
+    if ranked is None:
+        # lifespan에서 관리되는 Milvus 클라이언트와 CPU 작업 풀로 검색합니다.
+        ranked = await search_templates(ctx.request_context.lifespan_context, intent, top_k, scope)
 
-    print(f"results: {results}")
+    print(f"results: {ranked}")
 
-    if not results or not results[0]:
-        return ToolResult(
-            content=[TextContent(type="text", text="No SQL template found")],
-            structured_content=None
-        )
+    # 최종 점수가 기준보다 낮으면 잘못된 템플릿으로 oracle_query를 실행하지 않도록 "템플릿 없음"으로 응답합니다.
+    if not ranked or ranked[0]["score"] < TEMPLATE_MIN_SCORE:
+        return tool_result({"sql_template": None}, text="No SQL template found")
 
-    hit = results[0][0]
+    best = ranked[0]
+    intent_description = best["intent_description"]
+    sql_template = best["sql_template"]
 
-    intent_description = hit["entity"]["intent_description"]
-    sql_template = hit["entity"]["sql_template"]
-    score = hit["distance"]
+    print(f"[Tool] [milvus_search] 검색 결과 - 템플릿: {best['template_key']}, 의도: '{intent_description}', "
+          f"유사도: {best['similarity_score']}, 점수: {best['score']:.4f}")
 
-    print(f"[Tool] [milvus_search] 검색 결과 - 의도: '{intent_description}', 유사도: {score}")
-
-    return ToolResult(
-        content=[
-            TextContent(
-                type="text",
-                text=sql_template
-            )
-        ],
-        structured_content={
+    return tool_result(
+        {
             "intent_description": intent_description,
             "sql_template": sql_template,
-            "similarity_score": score
-        }
-    )
\ No newline at end of file
+            "similarity_score": best["similarity_score"],
+            "score": best["score"],
+            # top_k > 1이면 나머지 후보도 함께 반환합니다.
+            "candidates": [
+                {key: candidate[key] for key in ("template_key", "intent_description", "score")}
+                for candidate in ranked[1:]
+            ],
+        },
+        text=sql_template,
+    )
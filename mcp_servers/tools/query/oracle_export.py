@@ -0,0 +1,62 @@
+from typing import Any, Dict, Optional
+from mcp_servers.config.settings import JOB_EXPORT_BATCH_ROWS, JOB_EXPORT_MAX_ROWS, JOB_RESULT_MAX_BYTES
+from mcp_servers.types import AppContext
+from utils.jobs import JobProgress
+from utils.rowset import RowSet
+from utils.tracing import tracer
+
+"""
+==================================================
+작업 모듈: Oracle 대용량 조회 내보내기 (oracle_export)
+==================================================
+이 파일은 job_submit(kind="oracle_export")로 실행되는 백그라운드 작업을 정의합니다.
+
+- oracle_query는 RESULT_MAX_ROWS행까지만 반환합니다. 그보다 큰 조회 결과는 이 작업으로 내보냅니다.
+- JOB_EXPORT_BATCH_ROWS행씩 가져오며 가져온 행 수를 진행 상황으로 알립니다.
+- 최대 JOB_EXPORT_MAX_ROWS행, JOB_RESULT_MAX_BYTES 바이트까지 RowSet JSON으로 저장합니다. (초과분은 truncated 표시)
+- 연결 획득과 DB 왕복은 작업 기한(JOB_TIMEOUT)까지만 기다립니다.
+"""
+
+def validate_export(inputs: Dict[str, Any]) -> Optional[str]:
+    sql_template = (inputs.get("sql_template") or "").strip()
+    if not sql_template:
+        return "실행할 SQL 템플릿이 없습니다."
+    if not sql_template.upper().startswith(("SELECT", "WITH")):
+        return "oracle_export는 조회(SELECT) 문만 실행할 수 있습니다."
+    return None
+
+async def oracle_export(app_context: AppContext, inputs: Dict[str, Any], progress: JobProgress) -> str:
+    """
+    SQL 템플릿을 실행하고 결과 행 전체를 RowSet JSON으로 반환합니다.
+
+    Args:
+        inputs (dict): {"sql_template": ..., "params": {...}}
+    """
+
+    sql_template = inputs["sql_template"].strip()
+    parameters = inputs.get("params") or inputs.get("parameters", {})
+    rows = []
+
+    async with app_context.oracle.connection() as connection:
+        async with connection.cursor() as cursor:
+            cursor.arraysize = JOB_EXPORT_BATCH_ROWS
+            with tracer.start_span(
+                "oracle.execute",
+                attributes={"db.system": "oracle", "db.statement": sql_template},
+                kind="CLIENT",
+            ):
+                await cursor.execute(sql_template, parameters)
+            columns = [col[0] for col in cursor.description]
+
+            # 최대 행 수보다 1행 더 가져와서 잘림 여부만 판단합니다.
+            while len(rows) <= JOB_EXPORT_MAX_ROWS:
+                batch = await cursor.fetchmany(min(JOB_EXPORT_BATCH_ROWS, JOB_EXPORT_MAX_ROWS + 1 - len(rows)))
+                if not batch:
+                    break
+                rows.extend(batch)
+                await progress.report(len(rows), message=f"{len(rows)} rows fetched")
+
+    rowset = RowSet(columns, rows, max_rows=JOB_EXPORT_MAX_ROWS, max_bytes=JOB_RESULT_MAX_BYTES, extra={"isSuccess": True})
+    del rows
+    await progress.report(rowset.returned, total=rowset.returned, message="completed")
+    return rowset.to_json()
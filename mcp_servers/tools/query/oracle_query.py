@@ -1,20 +1,35 @@
 from mcp.server.fastmcp import Context
 from mcp import ServerSession
-from db.oracle_init import get_db_connection
 from fastmcp.tools.tool import ToolResult
 from mcp.types import TextContent
 import oracledb
 from fastmcp.dependencies import CurrentContext
 
+from mcp_servers.config.settings import (
+    ORACLE_BATCH_MAX_STATEMENTS,
+    ORACLE_CALL_TIMEOUT,
+    ORACLE_PIPELINE_ENABLED,
+    RESULT_MAX_BYTES,
+    RESULT_MAX_ROWS,
+)
+from mcp_servers.resilience import dependencies
+from mcp_servers.results import tool_result
+from utils.oracle_pool import AsyncOraclePool, run_batch
+from utils.rowset import RowSet
 from mcp_servers.types import AppContext
+from utils.tracing import tracer
 
 async def oracle_query(inputs: dict, ctx: Context = CurrentContext()) -> ToolResult: 
     """
     Milvus에서 선택된 Prepared SQL 템플릿을 실행하는 Oracle 전용 실행 도구
+    서로 독립적인 여러 조회는 inputs.batch = [{"sql_template": ..., "params": {...}}, ...]로 한 번에 실행할 수 있습니다.
     """
     # 1. lifespan에서 관리되는 pool 가져오기
-    pool = ctx.request_context.lifespan_context.oracle.pool
+    oracle = ctx.request_context.lifespan_context.oracle
     original_query = inputs.get("original_query", "")
+    if inputs.get("batch"):
+        return await oracle_batch_query(oracle, inputs["batch"])
+
     sql_template = inputs.get("sql_template", "").strip()
     print('[Tool] oracle_query: sql_template >> ', sql_template)
     # 에이전트가 'params' 또는 'parameters' 둘 다 보낼 수 있으므로 양쪽 모두 처리
@@ -29,72 +44,134 @@ async def oracle_query(inputs: dict, ctx: Context = CurrentContext()) -> ToolRes
     #     )
 
     if not sql_template:
-        return ToolResult(
-            content=[TextContent(type="text", text="실행할 SQL 템플릿이 없습니다.")],
-            meta={"status": "ERROR"}
+        return tool_result(
+            {"isSuccess": False, "error": "실행할 SQL 템플릿이 없습니다."},
+            text="실행할 SQL 템플릿이 없습니다.",
+            meta={"status": "ERROR"},
         )
     
-    query_results = []
-
-    try:
-        # 2. 수동 connection 생성 대신 pool에서 빌려오기 (async with 사용)
-        async with pool.acquire() as connection:
+    async def run_query():
+        # 2. pool에서 연결을 빌려오고 블록이 끝나면 반납합니다. (요청 기한까지만 대기)
+        #    DB 왕복 1회당 타임아웃은 ORACLE_CALL_TIMEOUT (서버 측에서 호출을 중단, 요청 기한이 있으면 남은 시간 이내)
+        async with oracle.connection(call_timeout=ORACLE_CALL_TIMEOUT) as connection:
             print(f"[Tool] oracle_query: Acquired connection from pool: {connection}")
 
             # 3. cursor 역시 async with로 생성
             async with connection.cursor() as cursor:
                 # 비동기 SQL 실행
-                await cursor.execute(sql_template, parameters)
+                with tracer.start_span(
+                    "oracle.execute",
+                    attributes={"db.system": "oracle", "db.statement": sql_template},
+                    kind="CLIENT",
+                ):
+                    await cursor.execute(sql_template, parameters)
 
                 columns = [col[0] for col in cursor.description]
-                rows = await cursor.fetchall()
+                # 행 예산보다 1행 더 가져와서 잘림 여부만 판단합니다. (전체 결과를 가져오지 않음)
+                with tracer.start_span("oracle.fetch", attributes={"db.system": "oracle"}) as span:
+                    rows = await cursor.fetchmany(RESULT_MAX_ROWS + 1)
+                    span.set_attribute("db.row_count", len(rows))
+                return columns, rows
 
-                for row in rows:
-                    query_results.append(dict(zip(columns, row)))
+    try:
+        # 회로 차단기/타임아웃 적용. SELECT 문만 멱등으로 간주하여 연결 오류 시 재시도합니다.
+        is_select = sql_template.lstrip().upper().startswith("SELECT")
+        columns, rows = await dependencies.get("oracle").call(run_query, idempotent=is_select)
 
     except oracledb.Error as e:
         error_message = f"Oracle DB 쿼리 실행 에러: {e}"
         print(f"[Tool] oracle_query: ❌ 쿼리 실행 에러 → {error_message}")
-        return ToolResult(
-            content=[TextContent(type="text", text="쿼리 실행 중 오류가 발생했습니다.")],
-            structured_content={
-                "isSuccess": False,
-                "error": error_message
-            },
-            meta={
-                "isSuccess": False,
-                "status": "ERROR"
-            }
-        )
-    # async with가 끝나면 connection은 자동으로 pool에 반납됩니다.
-        
-    if query_results:
-        return ToolResult(
-            content=[TextContent(type="text", text=str(query_results))],
-            structured_content={
-                "isSuccess": True,
-                "query_result": query_results,
-                "sql_template": sql_template,
-                "parameters": parameters
-            },
-            meta={
-                "isSuccess": True,
-                "row_count": len(query_results),
-                "status": "SUCCESS"
-            }
+        return tool_result(
+            {"isSuccess": False, "error": error_message},
+            text="쿼리 실행 중 오류가 발생했습니다.",
+            meta={"isSuccess": False, "status": "ERROR"},
         )
-    else:
+
+    if not rows:
         print(f'[DB - Oracle] 쿼리 결과가 없습니다: {original_query}')
-        return  ToolResult(
-            content=[TextContent(type="text", text=f"쿼리 '{original_query}'에 대한 결과가 없습니다.")],
-            structured_content={
-                "isSuccess": True,
-                "query_result": [],
-                "message": "No matching records found"
-            },
-            meta={
-                "isSuccess": True,
-                "row_count": 0,
-                "status": "SUCCESS_NO_DATA"
-            }
+        return tool_result(
+            {"isSuccess": True, "columns": columns, "rows": [], "row_count": 0},
+            text=f"쿼리 '{original_query}'에 대한 결과가 없습니다.",
+            meta={"isSuccess": True, "row_count": 0, "status": "SUCCESS_NO_DATA"},
+        )
+
+    # 4. 결과 인코딩 (columnar JSON, 행/바이트 예산 초과 시 잘라냄)
+    #    RESULT_MAX_ROWS + 1 행을 가져왔으므로 이를 넘으면 전체 행 수 대신 has_more로 표시합니다.
+    #    RowSet은 컬럼별로 값을 보관하고 행 dict/list를 만들지 않고 바로 JSON으로 직렬화합니다.
+    rowset = RowSet(columns, rows, max_rows=RESULT_MAX_ROWS, max_bytes=RESULT_MAX_BYTES, extra={"isSuccess": True})
+    del rows
+
+    return tool_result(
+        rowset,
+        meta={
+            "isSuccess": True,
+            "row_count": rowset.returned,
+            "truncated": rowset.truncated,
+            "status": "SUCCESS",
+        },
+    )
+
+
+async def oracle_batch_query(oracle: AsyncOraclePool, batch: list) -> ToolResult:
+    """
+    서로 독립적인 SQL 템플릿 목록을 연결 하나로 실행합니다.
+    ORACLE_PIPELINE_ENABLED=true이면 파이프라인으로 한 번의 네트워크 왕복에 보냅니다. (utils/oracle_pool.run_batch)
+    """
+
+    if len(batch) > ORACLE_BATCH_MAX_STATEMENTS:
+        message = f"배치는 최대 {ORACLE_BATCH_MAX_STATEMENTS}개까지 실행할 수 있습니다. (요청: {len(batch)}개)"
+        return tool_result({"isSuccess": False, "error": message}, text=message, meta={"status": "ERROR"})
+
+    statements = [
+        (item.get("sql_template", "").strip(), item.get("params") or item.get("parameters", {}))
+        for item in batch
+    ]
+    if not all(sql for sql, _ in statements):
+        return tool_result(
+            {"isSuccess": False, "error": "실행할 SQL 템플릿이 없는 항목이 있습니다."},
+            text="실행할 SQL 템플릿이 없는 항목이 있습니다.",
+            meta={"status": "ERROR"},
         )
+    print(f"[Tool] oracle_query: batch {len(statements)}개 (pipeline={ORACLE_PIPELINE_ENABLED})")
+
+    async def run_statements():
+        async with oracle.connection(call_timeout=ORACLE_CALL_TIMEOUT) as connection:
+            with tracer.start_span(
+                "oracle.pipeline" if ORACLE_PIPELINE_ENABLED else "oracle.execute",
+                attributes={"db.system": "oracle", "db.statement_count": len(statements)},
+                kind="CLIENT",
+            ):
+                return await run_batch(connection, statements, RESULT_MAX_ROWS + 1, pipeline=ORACLE_PIPELINE_ENABLED)
+
+    try:
+        is_select = all(sql.lstrip().upper().startswith("SELECT") for sql, _ in statements)
+        outcomes = await dependencies.get("oracle").call(run_statements, idempotent=is_select)
+    except oracledb.Error as e:
+        error_message = f"Oracle DB 배치 실행 에러: {e}"
+        print(f"[Tool] oracle_query: ❌ 배치 실행 에러 → {error_message}")
+        return tool_result(
+            {"isSuccess": False, "error": error_message},
+            text="쿼리 실행 중 오류가 발생했습니다.",
+            meta={"isSuccess": False, "status": "ERROR"},
+        )
+
+    # 문장별 결과 인코딩 (바이트 예산은 문장 수로 나누어 적용)
+    results = []
+    for columns, rows, error in outcomes:
+        if error is not None:
+            results.append({"isSuccess": False, "error": f"Oracle DB 쿼리 실행 에러: {error}"})
+            continue
+        rowset = RowSet(columns, rows, max_rows=RESULT_MAX_ROWS, max_bytes=RESULT_MAX_BYTES // len(outcomes),
+                        extra={"isSuccess": True})
+        results.append(rowset.to_dict())
+
+    succeeded = sum(result["isSuccess"] for result in results)
+    return tool_result(
+        {"isSuccess": succeeded == len(results), "results": results},
+        meta={
+            "isSuccess": succeeded == len(results),
+            "statement_count": len(results),
+            "failed": len(results) - succeeded,
+            "status": "SUCCESS" if succeeded == len(results) else "PARTIAL",
+        },
+    )
@@ -0,0 +1,28 @@
+from typing import Any, Dict
+from mcp_servers.catalog import template_catalog
+from mcp_servers.tools.query.milvus_search import COLLECTION_NAME
+from mcp_servers.types import AppContext
+from utils.jobs import JobProgress
+from utils.result_encoding import dumps
+
+"""
+==================================================
+작업 모듈: 템플릿 카탈로그 재색인 (catalog_reindex)
+==================================================
+이 파일은 job_submit(kind="catalog_reindex")로 실행되는 백그라운드 작업을 정의합니다.
+
+- milvus_search 결과 캐시를 비우고 BM25 색인을 다시 만듭니다.
+- 임베딩 재생성과 컬렉션 교체는 db_server(POST /catalog/sync)에서 수행합니다.
+"""
+
+
+async def reindex_catalog(app_context: AppContext, inputs: Dict[str, Any], progress: JobProgress) -> str:
+    """
+    템플릿 캐시를 비우고 BM25 색인을 다시 만든 뒤 카탈로그 버전과 템플릿 수를 반환합니다.
+    """
+
+    template_catalog.refresh(template_catalog.version, reason="job")
+    await progress.report(1, 2, "cache cleared")
+    await template_catalog.ensure_lexical(app_context.milvus, COLLECTION_NAME)
+    await progress.report(2, 2, "lexical index rebuilt")
+    return dumps({"version": template_catalog.version, "templates": len(template_catalog.templates)})
@@ -1,15 +1,17 @@
-import json
-from bs4 import BeautifulSoup
+from fastmcp.dependencies import CurrentContext
+from fastmcp.tools.tool import ToolResult
+from mcp.server.fastmcp import Context
 from mcp_servers.config.settings import DUCKDUCKGO_BASE_URL
-from dataclasses import dataclass
-from typing import List
+from mcp_servers.cpu_tasks import duckduckgo_parser_name, parse_duckduckgo_results
+from mcp_servers.resilience import dependencies, http_timeout
+from mcp_servers.results import tool_result
+from utils.deadline import DeadlineExceeded
+from utils.resilience import CircuitOpen
 from utils.rate_limiter import RateLimiter
 import httpx
 import sys
 import traceback
-import urllib.parse
-from mcp.types import TextContent
-from fastmcp.tools.tool import ToolResult
+from utils.tracing import tracer
 
 """
 ==================================================
@@ -23,13 +25,9 @@ from fastmcp.tools.tool import ToolResult
 3. 검색 결과를 LLM이 처리하기 쉬운 문자열 형태로 변환하는 기능을 제공합니다.
 """
 
-@dataclass
-class SearchResult:
-    # 단일 검색 결과를 저장하는 데이터 클래스.
-    title: str
-    link: str
-    snippet: str
-    position: int
+def no_results() -> ToolResult:
+    # 검색 결과가 없거나 검색에 실패한 경우의 결과 (결과가 있을 때와 같은 형식)
+    return tool_result({"results": [], "count": 0})
 
 
 class DuckDuckGoSearcher:
@@ -47,17 +45,19 @@ class DuckDuckGoSearcher:
         self.rate_limiter = RateLimiter()
 
     async def duckduckgo_search(
-        self, query: str, max_results: int = 1
-    ) -> List[SearchResult]:
+        self, query: str, max_results: int = 1, ctx: Context = CurrentContext()
+    ) -> ToolResult:
         """
         DuckDuckGo 검색을 실행하고 HTML을 파싱하여 결과를 반환합니다.
         
         Args:
             query (str): 검색할 쿼리 문자열.
             max_results (int): 반환할 최대 결과 수 (기본값 1).
+            ctx (Context): FastMCP 컨텍스트 (lifespan의 CPU 작업 풀 사용).
 
         Returns:
-            List[SearchResult]: 파싱된 검색 결과 객체 리스트.
+            ToolResult: {"results": [{"toolId", "title", "link", "snippet"}, ...], "count": 결과 수}
+                        결과가 없거나 검색에 실패하면 빈 results를 반환합니다.
         """
 
         try:
@@ -74,79 +74,55 @@ class DuckDuckGoSearcher:
             # ctx 객체를 제거했으므로 로깅 기능을 임시 주석 처리.
             # await ctx.info(f"Searching DuckDuckGo for: {query}")
             
-            # 3. 비동기 HTTP 요청 실행
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.BASE_URL, data=data, headers=self.HEADERS, timeout=30.0
-                )
-                response.raise_for_status()
-
-            # 4. HTML 파싱
-            soup = BeautifulSoup(response.text, "html.parser")
-            if not soup:
-                # ctx 객체를 제거했으므로 로깅 기능을 임시 주석 처리.
-                # await ctx.error("Failed to parse HTML response")
-                return []
-
-            # 5. 검색 결과 추출
-            results = []
-            for result in soup.select(".result"):
-                title_elem = result.select_one(".result__title")
-                if not title_elem:
-                    continue
-
-                link_elem = title_elem.find("a")
-                if not link_elem:
-                    continue
-
-                # 제목 및 링크 요소 추출
-                title = link_elem.get_text(strip=True)
-                link = link_elem.get("href", "")
-
-                # 유효하지 않거나 광고 링크 스킵
-                if not link or not isinstance(link, str) or "y.js" in link:
-                    continue
-
-                # DuckDuckGo 리디렉션 URL 정리
-                if link.startswith("//duckduckgo.com/l/?uddg="):
-                    link = urllib.parse.unquote(link.split("uddg=")[1].split("&")[0])
-
-                # 요약(Snippet) 추출
-                snippet_elem = result.select_one(".result__snippet")
-                snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-
-                result = {
-                    "toolId": "duckduckgo_search",
-                    "title": title,
-                    "link": link,
-                    "snippet": snippet 
-                }
-
-                result_str = json.dumps(result, ensure_ascii=False)
-
-                # if len(results) >= max_results:
-                #     break
+            # 3. 비동기 HTTP 요청 실행 (회로 차단기/타임아웃 적용, POST 요청이므로 재시도하지 않음)
+            async def post() -> httpx.Response:
+                with tracer.start_span(
+                    "http POST duckduckgo_search",
+                    attributes={"http.method": "POST", "http.url": self.BASE_URL},
+                    kind="CLIENT",
+                ) as span:
+                    async with httpx.AsyncClient(timeout=http_timeout()) as client:
+                        response = await client.post(
+                            self.BASE_URL, data=data, headers=tracer.inject(dict(self.HEADERS))
+                        )
+                    span.set_attribute("http.status_code", response.status_code)
+                    response.raise_for_status()
+                return response
+
+            response = await dependencies.get("duckduckgo").call(post)
+
+            # 4. HTML 파싱 및 검색 결과 추출 (CPU 작업이므로 프로세스 풀에서 실행)
+            #    유효한 결과가 max_results개 모이면 나머지 결과는 처리하지 않습니다.
+            with tracer.start_span("html.parse", attributes={"html.parser": duckduckgo_parser_name()}):
+                cpu_pool = ctx.request_context.lifespan_context.cpu_pool
+                if cpu_pool is not None:
+                    results = await cpu_pool.run_cpu(parse_duckduckgo_results, response.text, max_results)
+                else:
+                    results = parse_duckduckgo_results(response.text, max_results)
+
             # ctx 객체를 제거했으므로 로깅 기능을 임시 주석 처리.
             # await ctx.info(f"Successfully found {len(results)} results")
-            if result:
-                return ToolResult(
-                    content=[TextContent(type="text", text=result_str)],
-                    structured_content={"data": "value", "count": 42},
-                    meta={"execution_time_ms": 145}
-                )
-            # return results
-
-        # 6. 예외 처리
+            if results:
+                return tool_result({"results": results, "count": len(results)})
+            return no_results()
+
+        # 5. 예외 처리
+        except CircuitOpen:
+            # DuckDuckGo 장애로 회로가 열린 상태: 요청을 보내지 않고 즉시 빈 결과를 반환합니다.
+            return no_results()
+        except DeadlineExceeded:
+            # 요청 기한 안에 속도 제한이 풀리지 않거나 응답을 받을 수 없는 경우: 기다리지 않고 빈 결과를 반환합니다.
+            return no_results()
         except httpx.TimeoutException:
             # ctx 객체를 제거했으므로 로깅 기능을 임시 주석 처리.
             # await ctx.error("Search request timed out")
-            return []
+            return no_results()
         except httpx.HTTPError as e:
             # ctx 객체를 제거했으므로 로깅 기능을 임시 주석 처리.
             # await ctx.error(f"HTTP error occurred: {str(e)}")
-            return []
+            return no_results()
         except Exception as e:
             # ctx 객체를 제거했으므로 로깅 기능을 임시 주석 처리.
             # await ctx.error(f"Unexpected error during search: {str(e)}")
             traceback.print_exc(file=sys.stderr)
-            return []
\ No newline at end of file
+            return no_results()
\ No newline at end of file
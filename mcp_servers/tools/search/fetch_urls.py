@@ -0,0 +1,103 @@
+from typing import Any, Dict, List, Optional
+from mcp_servers.config.settings import JOB_FETCH_CONCURRENCY, JOB_FETCH_MAX_URLS, JOB_RESULT_MAX_BYTES
+from mcp_servers.cpu_tasks import extract_page_text
+from mcp_servers.resilience import http_timeout
+from mcp_servers.types import AppContext
+from utils.cpu_pool import CpuPoolBusy, CpuTaskTimeout
+from utils.deadline import DeadlineExceeded
+from utils.jobs import JobProgress
+from utils.result_encoding import byte_size, dumps, truncate_text
+from utils.tracing import tracer
+import asyncio
+import httpx
+
+"""
+==================================================
+작업 모듈: 여러 웹 페이지 내용 수집 (fetch_urls)
+==================================================
+이 파일은 job_submit(kind="fetch_urls")로 실행되는 백그라운드 작업을 정의합니다.
+
+- 최대 JOB_FETCH_MAX_URLS개 URL을 JOB_FETCH_CONCURRENCY개씩 동시에 가져옵니다.
+- HTML 정제(extract_page_text)는 CPU 작업 풀에서 실행합니다. (풀이 없으면 현재 프로세스에서 실행)
+- URL별로 성공/실패를 기록하고, 끝난 URL 수를 진행 상황으로 알립니다. (한 URL의 실패로 작업 전체가 실패하지 않음)
+- 결과가 JOB_RESULT_MAX_BYTES를 넘으면 페이지별 text를 나누어 자릅니다. (결과는 항상 올바른 JSON)
+"""
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+# 페이지별 text 예산의 최소값 (바이트)
+MIN_PAGE_BYTES = 256
+
+def validate_fetch(inputs: Dict[str, Any]) -> Optional[str]:
+    urls = inputs.get("urls")
+    if not isinstance(urls, list) or not urls:
+        return "가져올 URL 목록(urls)이 없습니다."
+    if len(urls) > JOB_FETCH_MAX_URLS:
+        return f"URL은 최대 {JOB_FETCH_MAX_URLS}개까지 가져올 수 있습니다. (요청: {len(urls)}개)"
+    if not all(isinstance(url, str) and url.startswith(("http://", "https://")) for url in urls):
+        return "URL은 http:// 또는 https:// 로 시작해야 합니다."
+    return None
+
+async def fetch_urls(app_context: AppContext, inputs: Dict[str, Any], progress: JobProgress) -> str:
+    """
+    URL 목록의 웹 페이지 내용을 가져와 정제된 텍스트 목록을 반환합니다.
+
+    Args:
+        inputs (dict): {"urls": [...]}
+    """
+
+    urls: List[str] = inputs["urls"]
+    results: List[Dict[str, Any]] = [{} for _ in urls]
+    semaphore = asyncio.Semaphore(JOB_FETCH_CONCURRENCY)
+    done = 0
+
+    async def fetch(client: httpx.AsyncClient, index: int, url: str):
+        nonlocal done
+        async with semaphore:
+            try:
+                with tracer.start_span(
+                    "http GET fetch_urls",
+                    attributes={"http.method": "GET", "http.url": url},
+                    kind="CLIENT",
+                ) as span:
+                    response = await client.get(url, headers=tracer.inject({"User-Agent": USER_AGENT}), timeout=http_timeout())
+                    span.set_attribute("http.status_code", response.status_code)
+                    response.raise_for_status()
+                if app_context.cpu_pool is not None:
+                    text = await app_context.cpu_pool.run_cpu(extract_page_text, response.text)
+                else:
+                    text = extract_page_text(response.text)
+                results[index] = {"url": url, "text": text}
+            except (httpx.HTTPError, DeadlineExceeded, CpuPoolBusy, CpuTaskTimeout) as e:
+                results[index] = {"url": url, "error": f"{type(e).__name__}: {e}"}
+            done += 1
+            await progress.report(done, len(urls), url)
+
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        await asyncio.gather(*(fetch(client, index, url) for index, url in enumerate(urls)))
+
+    succeeded = sum(1 for result in results if "text" in result)
+    return dumps(fit_results({"results": results, "succeeded": succeeded, "failed": len(urls) - succeeded}))
+
+
+def fit_results(document: Dict[str, Any], max_bytes: int = JOB_RESULT_MAX_BYTES) -> Dict[str, Any]:
+    """
+    결과 문서가 max_bytes를 넘으면 페이지별 text를 같은 예산으로 잘라냅니다.
+    JSON 문자열이 아니라 text 필드를 자르므로 결과는 항상 올바른 JSON입니다.
+    """
+
+    if not max_bytes or byte_size(document) <= max_bytes:
+        return document
+    pages = [result for result in document["results"] if "text" in result]
+    texts = [page["text"] for page in pages]
+    # text를 제외한 부분(URL, 오류 메시지)을 뺀 나머지를 페이지 수로 나눕니다.
+    overhead = byte_size({**document, "results": [{**result, "text": ""} for result in document["results"]]})
+    budget = max(MIN_PAGE_BYTES, (max_bytes - overhead) // max(1, len(pages)))
+    while True:
+        for page, text in zip(pages, texts):
+            page["text"] = truncate_text(text, budget)
+            if page["text"] != text:
+                page["truncated"] = True
+        # JSON 이스케이프로 늘어난 만큼 넘으면 예산을 줄여 다시 자릅니다.
+        if byte_size(document) <= max_bytes or budget <= MIN_PAGE_BYTES:
+            return document
+        budget = max(MIN_PAGE_BYTES, budget * 3 // 4)
@@ -1,8 +1,14 @@
-import json
-from mcp_servers.config.settings import GOOGLE_SEARCH_URL, GOOGLE_SEARCH_API_KEY
-import requests
-from fastmcp.tools.tool import ToolResult
-from mcp.types import TextContent
+from typing import Dict, Tuple
+from mcp_servers.config.settings import (
+    GOOGLE_SEARCH_API_KEY,
+    GOOGLE_SEARCH_URL,
+    REFRESH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
+)
+from mcp_servers.refresh import RefreshJob, refresh_scheduler
+from mcp_servers.resilience import http_get
+from mcp_servers.results import tool_result
+from utils.ttl_cache import TTLCache
 
 """
 ==================================================
@@ -13,8 +19,64 @@ from mcp.types import TextContent
 주요 역할:
 1. Google Custom Search API를 호출하여 웹 검색 결과를 가져옵니다.
 2. 검색 결과를 `main_handler`를 통해 LLM에게 전달하여 최종 답변을 생성하도록 위임합니다.
+3. (검색어, 결과 수)별 결과를 SEARCH_CACHE_TTL초 동안 캐시합니다.
+   자주 요청되는 검색어는 만료 전에 백그라운드에서 갱신합니다. (mcp_servers/refresh.py)
 """
 
+# 검색 결과 캐시 (키: (검색어, 결과 수))
+search_cache = TTLCache(SEARCH_CACHE_TTL, max_entries=REFRESH_CACHE_SIZE)
+
+async def fetch_search(query: str, max_results: int) -> Dict:
+    """
+    Google Custom Search API를 호출하여 첫 번째 검색 결과를 가져옵니다.
+
+    Returns:
+        dict: {"title", "link", "snippet"} 또는 {"error", "message"}
+    """
+
+    # Google Custom Search API 호출
+    # - 웹 검색 요청을 생성하고, API 키와 쿼리 매개변수를 함께 전달합니다.
+    # - 타임아웃, 회로 차단기, 재시도, 헤징은 http_get에서 적용됩니다.
+    response = await http_get(
+        "google",
+        GOOGLE_SEARCH_URL,
+        params={"key": GOOGLE_SEARCH_API_KEY, "cx": "47cbc5d656f2b4732", "q": query},
+    )
+
+    # 응답 처리 및 데이터 추출
+    data = response.json()
+    items = data.get("items", [])[:max_results]
+
+    if items:
+        return {
+            "title": items[0]['title'],
+            "link": items[0]['link'],
+            "snippet": items[0]['snippet']
+        }
+
+    # 검색 실패 처리
+    return {
+        "error": "Google Search API Call Failed",
+        "message": f"검색 실패 → {data.get('message')}"
+    }
+
+async def refresh_search(key: Tuple[str, int]):
+    """
+    캐시된 검색어의 결과를 다시 가져옵니다. (백그라운드 갱신, 실패하면 기존 항목 유지)
+    """
+
+    result = await fetch_search(*key)
+    if "error" in result:
+        raise RuntimeError(result["message"])
+    search_cache.put(key, result, refreshed=True)
+
+def setup_search(app_context):
+    """
+    자주 요청되는 검색어의 결과 갱신 작업을 등록합니다. (도구 레지스트리에서 호출)
+    """
+
+    refresh_scheduler.register(RefreshJob("google_search", search_cache, refresh_search))
+
 async def google_search(inputs: dict):
     """
     Google Custom Search API를 사용하여 웹 검색을 수행하고, 
@@ -32,35 +94,19 @@ async def google_search(inputs: dict):
     query = inputs.get("query", "") # 사용자 질문 추출
     max_results = inputs.get("maxResults", 1) # 응답은 1개만 추출
 
-    # 2. Google Custom Search API 호출
-    # - 웹 검색 요청을 생성하고, API 키와 쿼리 매개변수를 함께 전달합니다.
-    response = requests.get(
-        GOOGLE_SEARCH_URL,
-        params={"key": GOOGLE_SEARCH_API_KEY, "cx": "47cbc5d656f2b4732", "q": query}
-    )
-
-    # 3. 응답 처리 및 데이터 추출
-    data = response.json()
-    items = data.get("items", [])[:max_results]
+    # 2. 캐시 확인 후 Google Custom Search API 호출
+    key = (query.strip(), max_results)
+    item = search_cache.get(key)
+    if item is None:
+        item = await fetch_search(query, max_results)
+        if "error" in item:
+            return item
+        search_cache.put(key, item)
 
-    # 4. 결과 반환
-    if items:
-        result = (
-            f"title:{items[0]['title']}, "
-            f"link:{items[0]['link']}, "
-            f"snippet:{items[0]['snippet']}"
-        )
-        return ToolResult(
-            content=[TextContent(type="text", text=result)],
-            structured_content={
-                "title": items[0]['title'],
-                "link":{items[0]['link']},
-                "snippet":{items[0]['snippet']}
-            }
-        )
-
-    # 5. 검색 실패 처리
-    return {
-        "error": "Google Search API Call Failed",
-        "message": f"검색 실패 → {data.get('message')}"
-    }
+    # 3. 결과 반환
+    result = (
+        f"title:{item['title']}, "
+        f"link:{item['link']}, "
+        f"snippet:{item['snippet']}"
+    )
+    return tool_result(item, text=result)
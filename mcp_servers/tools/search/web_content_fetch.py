@@ -1,8 +1,10 @@
-from bs4 import BeautifulSoup  
 from mcp.server.fastmcp import Context 
+from mcp_servers.cpu_tasks import extract_page_text
+from mcp_servers.resilience import http_timeout
+from utils.deadline import DeadlineExceeded
 from utils.rate_limiter import RateLimiter
+from utils.tracing import tracer
 import httpx                     
-import re                       
 
 """
 ==================================================
@@ -44,36 +46,30 @@ class WebContentFetcher:
             await ctx.info(f"Fetching content from: {url}")
             
             # 2. 비동기 HTTP 요청 실행
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    },
-                    follow_redirects=True,
-                    timeout=30.0,
-                )
-                response.raise_for_status() # 4xx/5xx 에러 시 예외 발생
+            with tracer.start_span(
+                "http GET web_content_fetch",
+                attributes={"http.method": "GET", "http.url": url},
+                kind="CLIENT",
+            ) as span:
+                async with httpx.AsyncClient(timeout=http_timeout()) as client:
+                    response = await client.get(
+                        url,
+                        headers=tracer.inject({
+                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+                        }),
+                        follow_redirects=True,
+                    )
+                    span.set_attribute("http.status_code", response.status_code)
+                    response.raise_for_status() # 4xx/5xx 에러 시 예외 발생
 
-            # 3. HTML 파싱
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # 스크립트, 스타일, 네비게이션 등 LLM에게 불필요한 태그 제거 (Decomposition)
-            for element in soup(["script", "style", "nav", "header", "footer"]):
-                element.decompose()
-
-            # 4. 텍스트 추출 및 정제
-            text = soup.get_text()
-            # 텍스트 정제
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = " ".join(chunk for chunk in chunks if chunk)
-            # 정규 표현식을 사용하여 남아있는 과도한 공백 제거
-            text = re.sub(r"\s+", " ", text).strip()
-
-            # 5. 길이 제한 (LLM 토큰 수 제한 고려)
-            if len(text) > 8000:
-                text = text[:8000] + "... [content truncated]"
+            # 3. HTML 파싱 및 텍스트 정제 (CPU 작업이므로 프로세스 풀에서 실행)
+            #    불필요한 태그 제거, 공백 정리, 길이 제한(8000자)은 extract_page_text에서 처리합니다.
+            with tracer.start_span("html.parse"):
+                cpu_pool = ctx.request_context.lifespan_context.cpu_pool
+                if cpu_pool is not None:
+                    text = await cpu_pool.run_cpu(extract_page_text, response.text)
+                else:
+                    text = extract_page_text(response.text)
 
             await ctx.info(
                 f"Successfully fetched and parsed content ({len(text)} characters)"
@@ -82,6 +78,9 @@ class WebContentFetcher:
             return text
 
         # 6. 예외 처리
+        except DeadlineExceeded as e:
+            await ctx.error(f"Request deadline exceeded for URL: {url} ({e.operation})")
+            return "Error: Not enough time left in the request to fetch the webpage."
         except httpx.TimeoutException:
             await ctx.error(f"Request timed out for URL: {url}")
             return "Error: The request timed out while trying to fetch the webpage."
@@ -1,7 +1,18 @@
-from fastmcp.tools.tool import ToolResult
-from mcp.types import TextContent
-from mcp_servers.config.settings import OPEN_WEATHER_MAP_API_KEY
-import requests
+from typing import Dict
+from urllib.parse import unquote
+from fastmcp.exceptions import ResourceError
+from mcp_servers.config.settings import (
+    OPEN_WEATHER_MAP_API_KEY,
+    OPEN_WEATHER_MAP_URL,
+    REFRESH_CACHE_SIZE,
+    WEATHER_CACHE_TTL,
+)
+from mcp_servers.refresh import RefreshJob, refresh_scheduler
+from mcp_servers.resilience import http_get
+from mcp_servers.subscriptions import ResourceFeed, subscription_hub
+from mcp_servers.results import tool_result
+from utils.result_encoding import dumps
+from utils.ttl_cache import TTLCache
 
 
 """
@@ -13,17 +24,23 @@ import requests
 주요 역할:
 1. OpenWeatherMap API를 호출하여 특정 도시의 현재 날씨 정보를 가져옵니다.
 2. 검색 결과를 'main_handler'를 통해 LLM에게 전달하여 최종 자연어 답변을 생성하도록 위임합니다.
+3. 도시별 결과를 WEATHER_CACHE_TTL초 동안 캐시합니다.
+   자주 요청되는 도시는 만료 전에 백그라운드에서 갱신합니다. (mcp_servers/refresh.py)
+4. 같은 캐시로 weather://{city} 리소스를 제공합니다. (구독 시 값이 바뀌면 알림, mcp_servers/subscriptions.py)
 """
 
-async def open_weather_map(city: str):
-    """
-    주어진 도시의 현재 날씨 정보를 OpenWeatherMap API를 통해 가져옵니다.
+# 도시별 날씨 캐시 (키: 소문자 도시 이름)
+weather_cache = TTLCache(WEATHER_CACHE_TTL, max_entries=REFRESH_CACHE_SIZE)
 
-    Args:
-        city (str): 검색할 도시의 이름 (예: Seoul, Busan).
+def city_key(city: str) -> str:
+    return city.strip().lower()
+
+async def fetch_weather(city: str) -> Dict:
+    """
+    OpenWeatherMap API를 호출하여 날씨 정보를 가져옵니다.
 
     Returns:
-        dict: 도시 이름, 기온, 기상 상태를 포함하는 딕셔너리 또는 에러 메시지.
+        dict: {"city", "temperature", "condition"} 또는 {"error", "message"}
     """
 
     # 1. API 키 유효성 검사
@@ -38,11 +55,8 @@ async def open_weather_map(city: str):
         "appid": OPEN_WEATHER_MAP_API_KEY
     }
 
-    # 3. 날씨 API 요청 및 응답 처리 (requests는 동기 방식)
-    response = requests.get(
-        "http://api.openweathermap.org/data/2.5/weather",
-        params=params
-    )
+    # 3. 날씨 API 요청 및 응답 처리 (타임아웃, 회로 차단기, 재시도, 헤징은 http_get에서 적용)
+    response = await http_get("weather", OPEN_WEATHER_MAP_URL, params=params)
     data = response.json()
 
     # 4. HTTP 상태 코드 확인 및 에러 처리
@@ -51,22 +65,67 @@ async def open_weather_map(city: str):
 
     # 5. 응답 데이터 추출 및 반환
     main_data = data.get("main", {})
-
-    # 6. 결과 반환
-    result = f"city:{data.get("name")}, temperature:{main_data.get('temp')}°C, condition:{data["weather"][0]["description"]}"
-    
-    return ToolResult(
-        content=[TextContent(type="text", text=result)],
-        structured_content={
-            "city": data.get("name"), 
-            "temperature": data.get("temp"),
-            "condition": data["weather"][0]["description"] 
-        }
-        # meta={"execution_time_ms": 145}
-    )
-
-    # 8. 검색 실패 처리
     return {
-        "error": "Open Weather Map API Call Failed",
-        "message": f"날씨 검색 실패 → {data.get('message')}"
+        "city": data.get("name"),
+        "temperature": main_data.get("temp"),
+        "condition": data["weather"][0]["description"]
     }
+
+async def refresh_weather(key: str):
+    """
+    캐시된 도시의 날씨를 다시 가져옵니다. (백그라운드 갱신, 실패하면 기존 항목 유지)
+    """
+
+    weather = await fetch_weather(key)
+    if "error" in weather:
+        raise RuntimeError(weather["message"])
+    weather_cache.put(key, weather, refreshed=True)
+
+async def get_weather(city: str) -> Dict:
+    """
+    캐시된 날씨가 있으면 반환하고, 없으면 API로 가져와 캐시합니다. (도구, weather:// 리소스 공용)
+    """
+
+    key = city_key(city)
+    weather = weather_cache.get(key)
+    if weather is None:
+        weather = await fetch_weather(city)
+        if "error" not in weather:
+            weather_cache.put(key, weather)
+    return weather
+
+def setup_weather(app_context):
+    """
+    자주 요청되는 도시의 날씨 갱신 작업과 weather:// 구독 피드를 등록합니다. (도구 레지스트리에서 호출)
+    """
+
+    refresh_scheduler.register(RefreshJob("weather", weather_cache, refresh_weather))
+    subscription_hub.register(ResourceFeed("weather", r"weather://(?P<city>[^/]+)", get_weather))
+
+async def weather_resource(city: str) -> str:
+    """도시별 현재 날씨 (구독 시 값이 바뀌면 notifications/resources/updated)"""
+    weather = await get_weather(unquote(city))
+    if "error" in weather:
+        raise ResourceError(weather["message"])
+    return dumps(weather)
+
+async def open_weather_map(city: str):
+    """
+    주어진 도시의 현재 날씨 정보를 OpenWeatherMap API를 통해 가져옵니다.
+
+    Args:
+        city (str): 검색할 도시의 이름 (예: Seoul, Busan).
+
+    Returns:
+        dict: 도시 이름, 기온, 기상 상태를 포함하는 딕셔너리 또는 에러 메시지.
+    """
+
+    # 캐시된 결과가 있으면 API를 호출하지 않습니다.
+    weather = await get_weather(city)
+    if "error" in weather:
+        return weather
+
+    # 결과 반환
+    result = f"city:{weather['city']}, temperature:{weather['temperature']}°C, condition:{weather['condition']}"
+
+    return tool_result(weather, text=result)
@@ -1,6 +1,15 @@
 from dataclasses import dataclass
+from typing import Any, Optional
 from mcp_servers.db.oracle import OracleManager
+from utils.cpu_pool import CpuPool
 
 @dataclass
 class AppContext:
-    oracle: OracleManager
+    # 활성화된 도구가 사용하지 않는 구성 요소는 생성하지 않습니다. (None, mcp_servers/registry.py 참고)
+    oracle: Optional[OracleManager] = None
+    # MilvusClient (또는 동일한 search 인터페이스를 제공하는 객체)
+    milvus: Any = None
+    # SentenceTransformer (또는 동일한 encode 인터페이스를 제공하는 객체). CPU 풀 사용 시 None
+    embedder: Any = None
+    # CPU 작업용 프로세스 풀. 비활성화 시 None (현재 프로세스에서 실행)
+    cpu_pool: Optional[CpuPool] = None
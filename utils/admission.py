@@ -0,0 +1,250 @@
+from collections import deque
+from typing import Dict, Optional
+import asyncio
+import time
+
+"""
+==================================================
+유틸리티 모듈: 도구별 동시성 제한 및 부하 차단 (Admission Control)
+==================================================
+이 파일은 도구 호출의 동시 실행 수를 제한하고, 초과 요청을 제한된 대기열에서
+기한(deadline)까지만 기다리게 하는 입장 제어(admission control) 기능을 정의합니다.
+
+주요 역할:
+1. ConcurrencyLimiter: 동시 실행 한도 + 제한된 FIFO 대기열.
+   - 대기열이 가득 찼거나, 예상 대기 시간으로 기한을 맞출 수 없으면 즉시 Overloaded를 발생시킵니다.
+   - 대기 중 기한이 지나면 Overloaded를 발생시킵니다. (늦게 타임아웃되는 대신 빠르게 실패)
+2. 적응형 한도 (AIMD): 측정한 지연 시간이 최소 지연 시간 대비 허용 배수 이내이면 한도를 조금씩 늘리고,
+   초과하거나 실패하면 한도를 곱셈으로 줄입니다.
+3. AdmissionController: 도구 이름별 ConcurrencyLimiter를 관리하고 통계를 제공합니다.
+"""
+
+class Overloaded(Exception):
+    """
+    요청을 받아들일 수 없는 경우 발생하는 예외입니다.
+    """
+
+    def __init__(self, reason: str, retry_after_ms: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_ms = retry_after_ms
+
+
+class ConcurrencyLimiter:
+    """
+    하나의 도구에 대한 동시 실행 한도와 대기열을 관리합니다.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+    ):
+        """
+        Args:
+            limit (int): 초기 동시 실행 한도.
+            max_queue (int): 한도 초과 시 대기할 수 있는 최대 요청 수.
+            adaptive (bool): 지연 시간 기반 AIMD 한도 조정 사용 여부.
+            min_limit / max_limit (int): 적응형 한도의 하한/상한. (max_limit 기본값: 초기 한도)
+            tolerance (float): 최소 지연 시간 대비 허용 배수. 이를 넘으면 한도를 줄입니다.
+            backoff (float): 한도 감소 시 곱하는 비율.
+        """
+
+        self.limit = float(limit)
+        self.max_queue = max_queue
+        self.adaptive = adaptive
+        self.min_limit = min_limit
+        self.max_limit = max_limit or limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+
+        self.inflight = 0
+        self._waiters: deque = deque()
+        self._latencies = deque(maxlen=200)     # 최근 지연 시간 (예상 대기 시간 계산용)
+        self._min_latency = deque(maxlen=200)   # 최소 지연 시간 추적 창
+        self.stats = {"admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_deadline": 0,
+                      "expired_in_queue": 0, "errors": 0}
+
+    # ---------------- 입장 / 퇴장 ----------------
+    def _has_capacity(self) -> bool:
+        return self.inflight < int(self.limit)
+
+    def expected_latency(self) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[len(ordered) // 2]
+
+    def estimated_wait(self, position: int) -> float:
+        # 앞선 요청들이 한도만큼씩 병렬로 처리된다고 가정한 예상 대기 시간(초)
+        return (position + 1) / max(1, int(self.limit)) * self.expected_latency()
+
+    async def acquire(self, deadline: Optional[float] = None):
+        """
+        실행 슬롯을 획득합니다.
+
+        Args:
+            deadline (float): time.monotonic() 기준 요청 기한. None이면 대기열 한도만 적용합니다.
+
+        Raises:
+            Overloaded: 대기열이 가득 찼거나 기한 내에 실행할 수 없는 경우.
+        """
+
+        now = time.monotonic()
+
+        # 1. 대기 없이 실행 가능 (대기 중인 요청이 없을 때만, FIFO 보장)
+        if self._has_capacity() and not self._waiters:
+            if deadline is not None and now + self.expected_latency() > deadline:
+                self.stats["rejected_deadline"] += 1
+                raise Overloaded("deadline cannot be met", self._retry_after_ms())
+            self.inflight += 1
+            self.stats["admitted"] += 1
+            return
+
+        # 2. 대기열 한도 확인
+        if len(self._waiters) >= self.max_queue:
+            self.stats["rejected_queue_full"] += 1
+            raise Overloaded("queue full", self._retry_after_ms())
+
+        # 3. 예상 대기 + 실행 시간으로 기한을 맞출 수 없으면 대기하지 않고 거절
+        if deadline is not None:
+            expected_done = now + self.estimated_wait(len(self._waiters)) + self.expected_latency()
+            if expected_done > deadline:
+                self.stats["rejected_deadline"] += 1
+                raise Overloaded("deadline cannot be met", self._retry_after_ms())
+
+        # 4. 대기 (슬롯이 비면 release()가 future를 완료시킵니다)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats["queued"] += 1
+        try:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            self.stats["expired_in_queue"] += 1
+            self._abandon(waiter)
+            raise Overloaded("deadline expired while queued", self._retry_after_ms())
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+        self.stats["admitted"] += 1
+
+    def _abandon(self, waiter: asyncio.Future):
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+        elif waiter.done() and not waiter.cancelled():
+            # 슬롯을 넘겨받은 직후 취소된 경우, 슬롯을 다음 대기자에게 반환합니다.
+            self.release()
+        waiter.cancel()
+
+    def release(self, latency: Optional[float] = None, ok: bool = True):
+        """
+        실행 슬롯을 반환하고, 측정한 지연 시간으로 한도를 조정합니다.
+        """
+
+        if latency is not None:
+            self._record(latency, ok)
+
+        # 슬롯을 대기 중인 다음 요청에 그대로 넘깁니다. (inflight 유지)
+        while self._waiters and self.inflight <= int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.inflight -= 1
+
+    # ---------------- 적응형 한도 (AIMD) ----------------
+    def _record(self, latency: float, ok: bool):
+        self._latencies.append(latency)
+        self._min_latency.append(latency)
+        if not ok:
+            self.stats["errors"] += 1
+        if not self.adaptive:
+            return
+
+        baseline = min(self._min_latency)
+        if not ok or latency > baseline * self.tolerance:
+            # 곱셈 감소: 큐잉/과부하 신호
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self.inflight >= int(self.limit):
+            # 덧셈 증가: 한도까지 사용 중이고 지연 시간이 정상일 때만 늘립니다.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _retry_after_ms(self) -> int:
+        return int(max(self.estimated_wait(len(self._waiters)), self.expected_latency()) * 1000) or 100
+
+    def snapshot(self) -> Dict:
+        return {
+            **self.stats,
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queued_now": len(self._waiters),
+            "max_queue": self.max_queue,
+            "expected_latency_ms": round(self.expected_latency() * 1000, 2),
+        }
+
+
+class AdmissionController:
+    """
+    도구 이름별 ConcurrencyLimiter를 관리합니다.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        default_limit: int,
+        max_queue: int,
+        adaptive: bool = False,
+        tolerance: float = 2.0,
+    ):
+        """
+        Args:
+            limits (Dict[str, int]): 도구별 동시 실행 한도.
+            default_limit (int): 목록에 없는 도구의 동시 실행 한도. 0 이하이면 제한하지 않습니다.
+            max_queue (int): 도구별 최대 대기 요청 수.
+        """
+
+        self.limits = limits
+        self.default_limit = default_limit
+        self.max_queue = max_queue
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.limiters: Dict[str, ConcurrencyLimiter] = {}
+
+    def limiter(self, tool_name: str) -> Optional[ConcurrencyLimiter]:
+        if tool_name not in self.limiters:
+            limit = self.limits.get(tool_name, self.default_limit)
+            if limit <= 0:
+                return None
+            self.limiters[tool_name] = ConcurrencyLimiter(
+                limit=limit,
+                max_queue=self.max_queue,
+                adaptive=self.adaptive,
+                tolerance=self.tolerance,
+            )
+        return self.limiters[tool_name]
+
+    def snapshot(self) -> Dict:
+        return {
+            "adaptive": self.adaptive,
+            "tools": {name: limiter.snapshot() for name, limiter in self.limiters.items()},
+        }
+
+
+def parse_limits(value: str) -> Dict[str, int]:
+    """
+    "oracle_query=8,milvus_search=4" 형식의 문자열을 도구별 한도 딕셔너리로 변환합니다.
+    """
+
+    limits = {}
+    for item in (value or "").split(","):
+        name, _, limit = item.partition("=")
+        if name.strip() and limit.strip():
+            limits[name.strip()] = int(limit)
+    return limits
@@ -0,0 +1,66 @@
+from typing import Any, Dict, Optional
+
+"""
+==================================================
+유틸리티 모듈: ANN 인덱스/검색 파라미터 (ann_index)
+==================================================
+이 파일은 Milvus 벡터 인덱스 유형별 생성 파라미터와 검색 파라미터를 정의합니다.
+인덱스를 만드는 쪽(db/milvus_init.py)과 검색하는 쪽(milvus_search)이 같은 설정에서
+파라미터를 만들도록 하여, 인덱스 유형과 검색 파라미터가 어긋나지 않게 합니다.
+(예: HNSW 인덱스에 IVF 파라미터인 nprobe를 전달하는 경우)
+
+인덱스 유형:
+- FLAT      : 전수 비교 (recall 1.0, 데이터가 작을 때)
+- HNSW      : 그래프 기반. 생성: M, efConstruction / 검색: ef (ef >= top_k)
+- IVF_FLAT  : 클러스터링 기반. 생성: nlist / 검색: nprobe
+- IVF_SQ8   : IVF_FLAT + 8bit 스칼라 양자화 (메모리 1/4)
+- AUTOINDEX : Milvus가 자동 선택 (검색 파라미터 없음)
+"""
+
+INDEX_TYPES = ("FLAT", "HNSW", "IVF_FLAT", "IVF_SQ8", "AUTOINDEX")
+
+
+def build_params(
+    index_type: str,
+    metric_type: str = "COSINE",
+    hnsw_m: int = 16,
+    hnsw_ef_construction: int = 200,
+    ivf_nlist: int = 128,
+) -> Dict[str, Any]:
+    """
+    인덱스 생성 파라미터를 반환합니다. (index_params.add_index(field_name=..., **build_params(...)))
+    """
+
+    index_type = index_type.upper()
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"지원하지 않는 인덱스 유형입니다: {index_type} (지원: {', '.join(INDEX_TYPES)})")
+
+    params: Dict[str, Any] = {}
+    if index_type == "HNSW":
+        params = {"M": hnsw_m, "efConstruction": hnsw_ef_construction}
+    elif index_type.startswith("IVF"):
+        params = {"nlist": ivf_nlist}
+    return {"index_type": index_type, "metric_type": metric_type, "params": params}
+
+
+def search_params(
+    index_type: str,
+    metric_type: str = "COSINE",
+    top_k: int = 1,
+    hnsw_ef: int = 64,
+    ivf_nprobe: int = 16,
+    ivf_nlist: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    인덱스 유형에 맞는 검색 파라미터를 반환합니다. (client.search(search_params=...))
+    - HNSW: ef는 top_k보다 작을 수 없으므로 max(ef, top_k)를 사용합니다.
+    - IVF: nprobe는 nlist를 넘을 수 없습니다.
+    """
+
+    index_type = index_type.upper()
+    params: Dict[str, Any] = {}
+    if index_type == "HNSW":
+        params = {"ef": max(hnsw_ef, top_k)}
+    elif index_type.startswith("IVF"):
+        params = {"nprobe": min(ivf_nprobe, ivf_nlist) if ivf_nlist else ivf_nprobe}
+    return {"metric_type": metric_type, "params": params}
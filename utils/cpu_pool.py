@@ -0,0 +1,239 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from utils.deadline import DeadlineExceeded, timeout_for
+import asyncio
+import multiprocessing
+import time
+
+"""
+==================================================
+유틸리티 모듈: CPU 작업용 프로세스 풀 (CpuPool)
+==================================================
+이 파일은 임베딩, HTML 파싱, 대용량 직렬화 같은 CPU 작업을 별도 프로세스에서 실행하여
+asyncio 이벤트 루프와 GIL을 두고 경쟁하지 않도록 하는 프로세스 풀을 정의합니다.
+
+주요 역할:
+1. 워커 초기화 함수(initializer)로 모델/파서를 미리 로드한 "웜 워커"를 유지합니다.
+2. 실행 중 + 대기 중 작업 수를 제한하고, 한도를 넘으면 즉시 CpuPoolBusy를 발생시킵니다. (backpressure)
+3. 작업별 타임아웃을 적용하고, 타임아웃/크래시 발생 시 새 풀로 교체합니다.
+   이전 풀에서 실행 중인 다른 작업은 task_timeout까지 끝나도록 기다린 뒤 이전 풀의 워커를 종료합니다.
+   이전 풀에서 시작하지 못한 작업과 이전 풀 종료 때문에 실패한 작업(BrokenProcessPool)은
+   호출자에게 오류를 전달하지 않고 새 풀에서 한 번 다시 실행합니다.
+4. `max_tasks_per_child`로 일정 작업 수마다 워커를 교체하여 메모리 누수를 방지합니다.
+5. 요청 기한(utils/deadline.py)이 있으면 남은 시간까지만 결과를 기다립니다.
+   기한 때문에 기다림을 멈춘 작업은 워커에서 끝까지 실행되도록 두고 풀을 재생성하지 않습니다.
+"""
+
+class CpuPoolBusy(Exception):
+    # 대기열이 가득 차 작업을 받을 수 없는 경우
+    pass
+
+
+class CpuTaskTimeout(Exception):
+    # 작업이 지정된 시간 내에 끝나지 않은 경우
+    pass
+
+
+class CpuPool:
+    """
+    lifespan에서 관리되는 CPU 작업용 프로세스 풀입니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 32,
+        task_timeout: float = 10.0,
+        max_tasks_per_child: Optional[int] = 500,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = (),
+        start_method: str = "forkserver",
+    ):
+        """
+        Args:
+            max_workers (int): 워커 프로세스 수.
+            max_queue (int): 실행 중인 작업 외에 대기할 수 있는 최대 작업 수.
+            task_timeout (float): 작업별 기본 타임아웃(초).
+            max_tasks_per_child (int): 워커 교체 주기(작업 수). None이면 교체하지 않습니다.
+            initializer (Callable): 워커 시작 시 실행할 함수 (모델/파서 preload).
+            start_method (str): 프로세스 시작 방식. 이벤트 루프 스레드 상태를 복제하지 않도록 forkserver를 사용합니다.
+        """
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.task_timeout = task_timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.initializer = initializer
+        self.initargs = initargs
+        self.start_method = start_method
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight = 0
+        # 풀별 실행 중인 작업 수 (교체된 풀의 작업이 끝났는지 확인용)
+        self._executor_inflight: Dict[ProcessPoolExecutor, int] = {}
+        self._retiring: Set[asyncio.Task] = set()
+        self.stats = {"submitted": 0, "completed": 0, "rejected": 0, "timeouts": 0, "crashes": 0, "recycles": 0,
+                      "deadline_exceeded": 0, "retried": 0}
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=self.initializer,
+            initargs=self.initargs,
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+
+    async def start(self, warm: bool = True):
+        """
+        프로세스 풀을 생성하고, warm=True 이면 모든 워커가 초기화를 마칠 때까지 기다립니다.
+        """
+
+        self._executor = self._create_executor()
+        if warm:
+            loop = asyncio.get_running_loop()
+            # 워커 수만큼 짧은 작업을 제출하여 모든 워커의 initializer 실행을 유도합니다.
+            await asyncio.gather(*[
+                loop.run_in_executor(self._executor, time.sleep, 0.05)
+                for _ in range(self.max_workers)
+            ])
+        return self
+
+    async def close(self):
+        for task in list(self._retiring):
+            task.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _recycle(self, reason: str):
+        """
+        멈추거나 손상된 풀을 새 풀로 교체합니다. 이후 작업은 새 풀에서 실행됩니다.
+        ProcessPoolExecutor는 개별 작업을 중단할 수 없으므로, 이전 풀에서 실행 중인 작업이 끝나거나
+        task_timeout이 지나면 이전 풀의 워커 프로세스를 종료합니다. (_retire)
+        """
+
+        print(f"[CpuPool] 프로세스 풀 교체 ({reason})")
+        old = self._executor
+        self._executor = self._create_executor()
+        self.stats["recycles"] += 1
+
+        if old is not None:
+            task = asyncio.get_running_loop().create_task(self._retire(old))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+    async def _retire(self, executor: ProcessPoolExecutor):
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        # 아직 시작하지 않은 작업은 취소합니다. (run_cpu가 새 풀에서 다시 실행)
+        executor.shutdown(wait=False, cancel_futures=True)
+        deadline = time.monotonic() + self.task_timeout
+        try:
+            while self._executor_inflight.get(executor, 0) > 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+        finally:
+            # 멈춘 작업(타임아웃)을 실행 중인 워커와 남은 워커를 종료합니다.
+            for process in processes:
+                process.terminate()
+
+    async def run_cpu(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        CPU 작업을 프로세스 풀에서 실행하고 결과를 반환합니다.
+
+        Args:
+            fn (Callable): 실행할 함수 (pickle 가능한 모듈 최상위 함수).
+            timeout (float): 작업 타임아웃(초). 지정하지 않으면 task_timeout을 사용합니다.
+
+        Raises:
+            CpuPoolBusy: 실행 중 + 대기 중 작업 수가 한도를 넘은 경우.
+            CpuTaskTimeout: 타임아웃 내에 작업이 끝나지 않은 경우.
+            DeadlineExceeded: 요청 기한 안에 작업이 끝나지 않은 경우.
+        """
+
+        if self._executor is None:
+            raise RuntimeError("CpuPool이 시작되지 않았습니다.")
+
+        # 요청 기한이 작업 타임아웃보다 먼저 오는지 확인합니다. (남은 시간이 없으면 제출하지 않음)
+        task_timeout = timeout or self.task_timeout
+        timeout = timeout_for(task_timeout, "cpu_pool")
+        by_deadline = timeout < task_timeout
+
+        # 1. 대기열 한도 확인 (backpressure)
+        if self._inflight >= self.max_workers + self.max_queue:
+            self.stats["rejected"] += 1
+            raise CpuPoolBusy(f"CPU 작업 대기열이 가득 찼습니다 ({self._inflight})")
+
+        self._inflight += 1
+        self.stats["submitted"] += 1
+        name = getattr(fn, '__name__', fn)
+        retried = False
+        try:
+            while True:
+                executor = self._executor
+                self._executor_inflight[executor] = self._executor_inflight.get(executor, 0) + 1
+                try:
+                    # 2. 프로세스 풀에서 실행
+                    future = asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args, **kwargs))
+                    result = await asyncio.wait_for(future, timeout)
+                    self.stats["completed"] += 1
+                    return result
+
+                except asyncio.TimeoutError:
+                    if by_deadline:
+                        # 요청 기한 초과: 작업 자체는 정상이므로 풀을 교체하지 않습니다.
+                        self.stats["deadline_exceeded"] += 1
+                        raise DeadlineExceeded("cpu_pool") from None
+                    # 3. 타임아웃: 해당 작업이 워커를 계속 점유하므로 풀을 교체합니다.
+                    self.stats["timeouts"] += 1
+                    if executor is self._executor:
+                        self._recycle(f"{name} timeout")
+                    raise CpuTaskTimeout(f"CPU 작업 시간 초과: {name}")
+
+                except asyncio.CancelledError:
+                    if executor is self._executor or asyncio.current_task().cancelling() or retried:
+                        raise
+                    # 교체된 풀에서 시작하지 못하고 취소된 작업: 새 풀에서 다시 실행합니다.
+                    retried = True
+                    self.stats["retried"] += 1
+                    timeout = timeout_for(task_timeout, "cpu_pool")
+
+                except BrokenProcessPool:
+                    if executor is not self._executor and not retried:
+                        # 다른 작업 때문에 교체된 풀에서 실패한 경우: 새 풀에서 한 번 다시 실행합니다.
+                        retried = True
+                        self.stats["retried"] += 1
+                        timeout = timeout_for(task_timeout, "cpu_pool")
+                        continue
+                    # 4. 워커 크래시: 풀을 교체한 뒤 오류를 전달합니다.
+                    self.stats["crashes"] += 1
+                    if executor is self._executor:
+                        self._recycle("worker crashed")
+                    raise
+
+                finally:
+                    remaining = self._executor_inflight[executor] - 1
+                    if remaining or executor is self._executor:
+                        self._executor_inflight[executor] = remaining
+                    else:
+                        # 교체된 풀의 마지막 작업
+                        del self._executor_inflight[executor]
+
+        finally:
+            self._inflight -= 1
+
+    def pids(self) -> List[int]:
+        """
+        현재 워커 프로세스 pid 목록을 반환합니다. (메모리 사용량 보고용)
+        """
+
+        return list(getattr(self._executor, "_processes", None) or {})
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "inflight": self._inflight,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+        }
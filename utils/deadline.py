@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import time
+
+"""
+==================================================
+유틸리티 모듈: 요청 기한 전파 (deadline)
+==================================================
+이 파일은 도구 호출의 기한(deadline)을 contextvar로 전달하고,
+하위 호출(HTTP, Oracle 풀/쿼리, Milvus 검색, CPU 작업, RateLimiter 대기)이
+남은 시간 안에서 자신의 타임아웃을 정하도록 하는 함수를 정의합니다.
+
+- 기한은 time.monotonic() 기준 시각입니다. 설정되지 않았으면(None) 각 호출의 기본 타임아웃을 그대로 사용합니다.
+- contextvar이므로 같은 요청 안의 await, asyncio.to_thread, 하위 태스크에 함께 전달됩니다.
+- 남은 시간이 없으면 호출을 시작하지 않고 DeadlineExceeded를 발생시킵니다.
+  (끝낼 수 없는 작업에 연결/워커/외부 API 한도를 쓰지 않도록)
+
+사용 예:
+    with deadline_scope(time.monotonic() + 5):
+        timeout = timeout_for(HTTP_TIMEOUT, "http")   # min(HTTP_TIMEOUT, 남은 시간)
+"""
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """
+    요청 기한 안에 작업을 끝낼 수 없는 경우 발생하는 예외입니다.
+    """
+
+    def __init__(self, operation: str, remaining: float = 0.0):
+        super().__init__(f"{operation}: request deadline exceeded (remaining {max(0.0, remaining) * 1000:.0f}ms)")
+        self.operation = operation
+        self.remaining = max(0.0, remaining)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float], detach: bool = False) -> Iterator[Optional[float]]:
+    """
+    블록 안에서 사용할 기한을 설정합니다. 이미 더 이른 기한이 있으면 그 기한을 유지합니다.
+    detach=True이면 바깥 기한과 관계없이 주어진 기한을 사용합니다. (요청에서 시작된 백그라운드 작업)
+    """
+
+    current = _deadline.get()
+    if not detach and (deadline is None or (current is not None and current <= deadline)):
+        deadline = current
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """
+    남은 시간(초)을 반환합니다. 기한이 없으면 None.
+    """
+
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def timeout_for(default: Optional[float], operation: str) -> Optional[float]:
+    """
+    기본 타임아웃과 남은 시간 중 짧은 값을 반환합니다.
+
+    Raises:
+        DeadlineExceeded: 남은 시간이 없는 경우.
+    """
+
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded(operation, left)
+    return left if default is None else min(default, left)
@@ -0,0 +1,229 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+from utils.memory import peak_rss_bytes, rss_bytes, to_mb
+from utils.result_encoding import dumps
+import asyncio
+import json
+import os
+import socket
+import time
+
+"""
+==================================================
+유틸리티 모듈: 임베딩 사이드카 (EmbeddingSidecar, SidecarEmbedder)
+==================================================
+이 파일은 임베딩 모델 하나를 여러 프로세스(MCP 서버 워커, CPU 풀 워커, db_server)가 Unix 소켓으로 공유하는
+사이드카 서버와 클라이언트를 정의합니다.
+
+- 프로세스마다 모델과 torch 런타임(수백 MB)을 로드하지 않고, 사이드카 프로세스 하나에만 로드합니다.
+- 프로토콜: 줄 단위 JSON (요청 한 줄, 응답 한 줄)
+    {"texts": ["...", ...]}  → {"vectors": [[...], ...]}
+    {"op": "stats"}          → {"pid": ..., "model": ..., "dimension": ..., "rss_mb": ..., ...}
+    오류                      → {"error": "..."}
+- 동시에 들어온 요청은 max_batch개까지 batch_wait_ms 동안 모아서 model.encode를 한 번 호출합니다. (마이크로 배칭)
+- 클라이언트는 요청마다 연결합니다. (Unix 소켓 연결 비용은 수십 µs, 워커 간 연결 상태를 공유하지 않음)
+
+실행: python -m mcp_servers.embedding_sidecar
+"""
+
+# 한 줄 요청/응답 최대 크기 (db_server 카탈로그 동기화 배치 포함)
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+class EmbeddingSidecarError(Exception):
+    """
+    사이드카가 오류를 응답한 경우 발생하는 예외입니다.
+    """
+
+
+class EmbeddingSidecar:
+    """
+    임베딩 모델을 Unix 소켓으로 제공하는 asyncio 서버입니다.
+    """
+
+    def __init__(self, model, socket_path: str, model_name: str = "", max_batch: int = 32, batch_wait_ms: float = 2.0):
+        """
+        Args:
+            model: encode(texts, batch_size=...) 인터페이스를 제공하는 모델 (SentenceTransformer).
+            socket_path (str): Unix 소켓 경로.
+            model_name (str): stats 응답에 표시할 모델 이름.
+            max_batch (int): 한 번에 encode 할 최대 문장 수.
+            batch_wait_ms (float): 배치를 모으기 위해 기다릴 최대 시간(ms).
+        """
+
+        self.model = model
+        self.socket_path = socket_path
+        self.model_name = model_name
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000
+        self.stats = {"requests": 0, "texts": 0, "batches": 0, "errors": 0}
+        self._queue: Optional["asyncio.Queue[Tuple[List[str], asyncio.Future]]"] = None
+        self._started = time.time()
+
+    async def serve(self):
+        """
+        소켓을 열고 종료될 때까지 요청을 처리합니다.
+        """
+
+        if os.path.exists(self.socket_path):
+            # 이전 실행에서 남은 소켓 파일
+            os.unlink(self.socket_path)
+        self._queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=MAX_LINE_BYTES)
+        # 같은 사용자/그룹의 프로세스만 접속 가능
+        os.chmod(self.socket_path, 0o660)
+        print(f"[EmbeddingSidecar] {self.socket_path} 에서 대기 중 (pid {os.getpid()})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write((dumps(await self._respond(line)) + "\n").encode("utf-8"))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"error": "invalid JSON"}
+        if request.get("op") == "stats":
+            return self.snapshot()
+
+        texts = request.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return {"error": "texts must be a list of strings"}
+        self.stats["requests"] += 1
+        self.stats["texts"] += len(texts)
+        if not texts:
+            return {"vectors": []}
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        try:
+            return {"vectors": await future}
+        except Exception as e:
+            self.stats["errors"] += 1
+            return {"error": repr(e)}
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            count = len(batch[0][0])
+            deadline = loop.time() + self.batch_wait
+            while count < self.max_batch:
+                wait = deadline - loop.time()
+                if wait <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), wait)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                count += len(item[0])
+
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                # 모델 추론은 이벤트 루프 밖에서 실행합니다. (연결 수락/요청 수신은 계속 처리)
+                vectors = await asyncio.to_thread(self.model.encode, texts, batch_size=self.max_batch)
+                vectors = vectors.tolist()
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.stats["batches"] += 1
+
+            start = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[start:start + len(item_texts)])
+                start += len(item_texts)
+
+    def snapshot(self) -> Dict[str, Any]:
+        dimension = getattr(self.model, "get_sentence_embedding_dimension", lambda: None)()
+        return {
+            "pid": os.getpid(),
+            "model": self.model_name,
+            "dimension": dimension,
+            "uptime": round(time.time() - self._started, 1),
+            "rss_mb": to_mb(rss_bytes()),
+            "peak_rss_mb": to_mb(peak_rss_bytes()),
+            "queued": self._queue.qsize() if self._queue else 0,
+            **self.stats,
+        }
+
+
+class SidecarEmbedder:
+    """
+    임베딩 사이드카 클라이언트입니다.
+    encode는 SentenceTransformer.encode와 같은 형태(문장 하나 → 벡터, 목록 → 벡터 목록)로 반환합니다.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 10.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._dimension: Optional[int] = None
+
+    @staticmethod
+    def _parse(line: bytes) -> Dict[str, Any]:
+        if not line:
+            raise EmbeddingSidecarError("sidecar closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise EmbeddingSidecarError(response["error"])
+        return response
+
+    async def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_LINE_BYTES)
+        try:
+            writer.write((dumps(payload) + "\n").encode("utf-8"))
+            await writer.drain()
+            return self._parse(await reader.readline())
+        finally:
+            writer.close()
+
+    async def aencode(self, texts: List[str]) -> List[List[float]]:
+        """
+        문장 목록을 임베딩합니다. (이벤트 루프용, 타임아웃은 호출하는 쪽에서 적용)
+        """
+
+        return (await self.request({"texts": texts}))["vectors"]
+
+    async def stats(self) -> Dict[str, Any]:
+        return await self.request({"op": "stats"})
+
+    def request_sync(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(self.timeout)
+            connection.connect(self.socket_path)
+            connection.sendall((dumps(payload) + "\n").encode("utf-8"))
+            with connection.makefile("rb") as stream:
+                return self._parse(stream.readline(MAX_LINE_BYTES))
+
+    def encode(self, sentences: Union[str, List[str]], **kwargs) -> Union[List[float], List[List[float]]]:
+        """
+        문장(또는 문장 목록)을 임베딩합니다. (동기 호출, CPU 풀 워커/db_server용)
+        """
+
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        vectors = self.request_sync({"texts": texts})["vectors"]
+        return vectors[0] if isinstance(sentences, str) else vectors
+
+    def get_sentence_embedding_dimension(self) -> Optional[int]:
+        if self._dimension is None:
+            self._dimension = self.request_sync({"op": "stats"})["dimension"]
+        return self._dimension
@@ -0,0 +1,389 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+from utils.deadline import deadline_scope
+import asyncio
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+"""
+==================================================
+유틸리티 모듈: 비동기 작업 관리자 (JobManager)
+==================================================
+이 파일은 오래 걸리는 작업(대량 URL 수집, 대용량 Oracle 내보내기 등)을 요청과 분리하여
+백그라운드에서 실행하고, 작업 ID로 진행 상황과 결과를 조회하는 작업 관리자를 정의합니다.
+
+- submit: 작업을 등록하고 바로 Job을 반환합니다. (요청/연결/워커를 작업이 끝날 때까지 붙잡지 않음)
+- 동시 실행 작업 수(max_workers)와 대기 작업 수(max_pending)를 제한합니다. 넘으면 JobQueueFull.
+- 작업 함수는 JobProgress.report(progress, total, message)로 진행 상황을 알립니다.
+  (on_progress 콜백으로 MCP progress 알림 등을 보낼 수 있습니다)
+- cancel: 대기/실행 중인 작업을 취소합니다. (실행 중인 작업은 asyncio 태스크 취소)
+- 작업별 최대 실행 시간(timeout)은 요청 기한(utils/deadline.py)으로 하위 호출까지 전달합니다.
+- 끝난 작업은 ttl초 후 정리합니다.
+
+저장소:
+- MemoryJobStore: 프로세스 메모리 (기본값)
+- SqliteJobStore: 로컬 SQLite 파일. 서버를 다시 시작해도 끝난 작업의 결과를 조회할 수 있고,
+  이전 프로세스에서 실행 중이던 작업은 failed(interrupted)로 표시합니다.
+"""
+
+PENDING, RUNNING, SUCCEEDED, FAILED, CANCELLED = "pending", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+# 실행 중 진행 상황을 저장소에 기록하는 최소 간격(초). (메모리의 상태는 매번 갱신)
+PROGRESS_SAVE_INTERVAL = 1.0
+
+
+class JobQueueFull(Exception):
+    """
+    대기 중인 작업 수가 한도를 넘어 작업을 받을 수 없는 경우 발생하는 예외입니다.
+    """
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = PENDING
+    progress: float = 0.0
+    total: Optional[float] = None
+    message: Optional[str] = None
+    # 결과는 JSON 문자열로 보관합니다. (저장소 형식과 관계없이 그대로 응답에 사용)
+    result: Optional[str] = None
+    error: Optional[str] = None
+    owner: str = ""
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        data = asdict(self)
+        if not include_result:
+            data.pop("result")
+        return data
+
+
+class JobProgress:
+    """
+    작업 함수에 전달되는 진행 상황 보고 객체입니다.
+    """
+
+    def __init__(self, manager: "JobManager", job: Job):
+        self._manager = manager
+        self.job = job
+
+    async def report(self, progress: float, total: Optional[float] = None, message: Optional[str] = None):
+        await self._manager._report(self.job, progress, total, message)
+
+
+# 작업 함수: (JobProgress) -> 결과 JSON 문자열
+JobFunction = Callable[[JobProgress], Awaitable[str]]
+# 진행 상황 콜백: (Job) -> None
+ProgressCallback = Callable[[Job], Awaitable[None]]
+
+
+class MemoryJobStore:
+    """
+    프로세스 메모리에 작업을 보관합니다.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+
+    async def save(self, job: Job):
+        self.jobs[job.id] = job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def delete_finished_before(self, before: float) -> int:
+        expired = [job_id for job_id, job in self.jobs.items() if job.finished and (job.finished_at or 0) < before]
+        for job_id in expired:
+            del self.jobs[job_id]
+        return len(expired)
+
+    async def recover(self) -> int:
+        return 0
+
+    async def close(self):
+        pass
+
+
+class SqliteJobStore:
+    """
+    로컬 SQLite 파일에 작업을 보관합니다. (쿼리는 스레드에서 실행)
+    """
+
+    COLUMNS = ("id", "kind", "status", "progress", "total", "message", "result", "error", "owner",
+               "created_at", "updated_at", "finished_at")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        # sqlite3 연결은 한 번에 한 스레드만 사용하도록 합니다.
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT, status TEXT, progress REAL, total REAL, message TEXT, "
+                "result TEXT, error TEXT, owner TEXT, created_at REAL, updated_at REAL, finished_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at)")
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, fn, *args):
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args)
+
+    def _save(self, job: Job):
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        self._connect().execute(
+            f"INSERT OR REPLACE INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+            [getattr(job, column) for column in self.COLUMNS],
+        )
+
+    def _get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return Job(**dict(zip(self.COLUMNS, row))) if row else None
+
+    def _delete_finished_before(self, before: float) -> int:
+        return self._connect().execute(
+            "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (before,)
+        ).rowcount
+
+    def _recover(self) -> int:
+        # 실행 중이던 프로세스가 종료된 작업을 failed로 표시합니다. (같은 호스트의 다른 워커 작업은 유지)
+        connection = self._connect()
+        rows = connection.execute("SELECT id, owner FROM jobs WHERE status IN (?, ?)", (PENDING, RUNNING)).fetchall()
+        now = time.time()
+        interrupted = [job_id for job_id, owner in rows if not _owner_alive(owner)]
+        for job_id in interrupted:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                (FAILED, "interrupted (server restarted)", now, now, job_id),
+            )
+        return len(interrupted)
+
+    async def save(self, job: Job):
+        await self._run(self._save, job)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await self._run(self._get, job_id)
+
+    async def delete_finished_before(self, before: float) -> int:
+        return await self._run(self._delete_finished_before, before)
+
+    async def recover(self) -> int:
+        return await self._run(self._recover)
+
+    async def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _owner_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname():
+        # 다른 호스트의 작업은 판단할 수 없으므로 유지합니다.
+        return True
+    if not pid.isdigit() or int(pid) == os.getpid():
+        # 시작 시점에는 이 프로세스의 작업이 없으므로 같은 PID는 이전 프로세스의 작업입니다.
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobManager:
+    """
+    백그라운드 작업의 실행, 진행 상황, 취소, 정리를 관리합니다.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        ttl: float = 3600,
+        timeout: float = 0,
+    ):
+        """
+        Args:
+            store: MemoryJobStore | SqliteJobStore (기본값: MemoryJobStore)
+            max_workers (int): 동시에 실행할 최대 작업 수.
+            max_pending (int): 실행을 기다릴 수 있는 최대 작업 수.
+            ttl (float): 끝난 작업을 보관할 시간(초).
+            timeout (float): 작업별 최대 실행 시간(초). 0 이하이면 제한 없음.
+        """
+
+        self.store = store or MemoryJobStore()
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.timeout = timeout
+        self.owner = _owner_name()
+        self._slots = asyncio.Semaphore(max_workers)
+        # 이 프로세스에서 대기/실행 중인 작업 (상태 조회 시 저장소보다 우선)
+        self._live: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._callbacks: Dict[str, ProgressCallback] = {}
+        self._saved_at: Dict[str, float] = {}
+        self._cleaner: Optional[asyncio.Task] = None
+        self.stats = {"submitted": 0, "succeeded": 0, "failed": 0, "cancelled": 0, "rejected": 0, "expired": 0}
+
+    async def start(self):
+        recovered = await self.store.recover()
+        if recovered:
+            print(f"[Jobs] 이전 프로세스에서 중단된 작업 {recovered}개를 failed로 표시했습니다.")
+        if self._cleaner is None:
+            self._cleaner = asyncio.create_task(self._clean_loop())
+        return self
+
+    async def close(self):
+        if self._cleaner is not None:
+            self._cleaner.cancel()
+            self._cleaner = None
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        await self.store.close()
+
+    def pending_count(self) -> int:
+        return sum(1 for job in self._live.values() if job.status == PENDING)
+
+    async def submit(self, kind: str, fn: JobFunction, on_progress: Optional[ProgressCallback] = None) -> Job:
+        """
+        작업을 등록하고 바로 반환합니다.
+
+        Raises:
+            JobQueueFull: 대기 중인 작업 수가 max_pending 이상인 경우.
+        """
+
+        if self.pending_count() >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise JobQueueFull(f"대기 중인 작업이 너무 많습니다 ({self.max_pending})")
+
+        job = Job(id=uuid.uuid4().hex, kind=kind, owner=self.owner)
+        self._live[job.id] = job
+        if on_progress is not None:
+            self._callbacks[job.id] = on_progress
+        await self.store.save(job)
+        self.stats["submitted"] += 1
+        self._tasks[job.id] = asyncio.create_task(self._run(job, fn))
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self._live.get(job_id) or await self.store.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        작업을 취소합니다. 이미 끝났거나 다른 프로세스의 작업이면 현재 상태만 반환합니다.
+        """
+
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return await self.get(job_id)
+
+    async def _run(self, job: Job, fn: JobFunction):
+        try:
+            async with self._slots:
+                job.status, job.updated_at = RUNNING, time.time()
+                await self._save(job, force=True)
+                # 요청에서 시작된 작업이어도 요청 기한이 아니라 작업 기한을 사용합니다.
+                deadline = time.monotonic() + self.timeout if self.timeout > 0 else None
+                with deadline_scope(deadline, detach=True):
+                    job.result = await fn(JobProgress(self, job))
+                job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as e:
+            job.status, job.error = FAILED, f"{type(e).__name__}: {e}"
+            print(f"[Jobs] {job.kind} 작업 실패 ({job.id}): {e!r}")
+        finally:
+            job.updated_at = job.finished_at = time.time()
+            self.stats[job.status] += 1
+            try:
+                await self._save(job, force=True)
+                await self._notify(job)
+            finally:
+                self._live.pop(job.id, None)
+                self._tasks.pop(job.id, None)
+                self._callbacks.pop(job.id, None)
+                self._saved_at.pop(job.id, None)
+
+    async def _report(self, job: Job, progress: float, total: Optional[float], message: Optional[str]):
+        job.progress = progress
+        if total is not None:
+            job.total = total
+        if message is not None:
+            job.message = message
+        job.updated_at = time.time()
+        await self._save(job)
+        await self._notify(job)
+
+    async def _save(self, job: Job, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._saved_at.get(job.id, 0.0) >= PROGRESS_SAVE_INTERVAL:
+            self._saved_at[job.id] = now
+            await self.store.save(job)
+
+    async def _notify(self, job: Job):
+        callback = self._callbacks.get(job.id)
+        if callback is None:
+            return
+        try:
+            await callback(job)
+        except Exception as e:
+            # 알림을 받을 세션이 끊겨도 작업은 계속 실행합니다.
+            print(f"[Jobs] 진행 알림 실패 ({job.id}): {e!r}")
+            self._callbacks.pop(job.id, None)
+
+    async def cleanup(self) -> int:
+        removed = await self.store.delete_finished_before(time.time() - self.ttl)
+        self.stats["expired"] += removed
+        return removed
+
+    async def _clean_loop(self):
+        while True:
+            await asyncio.sleep(max(1.0, min(self.ttl, 60.0)))
+            try:
+                await self.cleanup()
+            except Exception as e:
+                print(f"[Jobs] 작업 정리 실패: {e!r}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "store": type(self.store).__name__,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "ttl": self.ttl,
+            "running": sum(1 for job in self._live.values() if job.status == RUNNING),
+            "pending": self.pending_count(),
+            "live": [job.to_dict() for job in self._live.values()],
+            **self.stats,
+        }
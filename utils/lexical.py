@@ -0,0 +1,100 @@
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+import math
+import re
+
+"""
+==================================================
+유틸리티 모듈: 어휘 검색 (BM25 / RRF)
+==================================================
+이 파일은 템플릿 의도 설명에 대한 메모리 내 BM25 역색인과 순위 결합 함수를 정의합니다.
+
+- tokenize: 단어(소문자) + 단어 내부 문자 bigram. 한국어 조사가 붙은 단어("잔액을", "대출금")도
+  bigram("잔액", "대출")으로 일치시킬 수 있도록 합니다.
+- BM25Index: 역색인(term → {문서: 빈도}) 기반 BM25 점수 계산
+- reciprocal_rank_fusion: 여러 순위 목록을 점수 스케일과 무관하게 결합 (score = Σ 1 / (k + rank))
+- bigram_dice: 두 문자열의 문자 bigram Dice 계수 (재정렬용 저비용 유사도)
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+def _bigrams(word: str) -> List[str]:
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > 2:
+            tokens.extend(_bigrams(word))
+    return tokens
+
+
+def bigram_dice(a: str, b: str) -> float:
+    grams_a = Counter(gram for word in _WORD.findall(a.lower()) for gram in (_bigrams(word) or [word]))
+    grams_b = Counter(gram for word in _WORD.findall(b.lower()) for gram in (_bigrams(word) or [word]))
+    total = sum(grams_a.values()) + sum(grams_b.values())
+    if not total:
+        return 0.0
+    return 2 * sum((grams_a & grams_b).values()) / total
+
+
+class BM25Index:
+    """
+    메모리 내 BM25 역색인입니다. 문서 수가 적은 템플릿 카탈로그를 대상으로 합니다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[Hashable, int]] = {}
+        self.doc_lengths: Dict[Hashable, int] = {}
+        self.avg_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def build(self, documents: Dict[Hashable, str]):
+        """
+        {문서 키: 텍스트}로 색인을 새로 만듭니다.
+        """
+
+        postings: Dict[str, Dict[Hashable, int]] = defaultdict(dict)
+        doc_lengths = {}
+        for key, text in documents.items():
+            counts = Counter(tokenize(text))
+            doc_lengths[key] = sum(counts.values())
+            for term, count in counts.items():
+                postings[term][key] = count
+        self.postings = dict(postings)
+        self.doc_lengths = doc_lengths
+        self.avg_length = (sum(doc_lengths.values()) / len(doc_lengths)) if doc_lengths else 0.0
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[Hashable, float]]:
+        if not self.doc_lengths:
+            return []
+        total = len(self.doc_lengths)
+        scores: Dict[Hashable, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[key] / self.avg_length)
+                scores[key] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: -item[1])[:top_k]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[Hashable]], k: int = 60) -> List[Tuple[Hashable, float]]:
+    """
+    여러 순위 목록(앞쪽이 상위)을 RRF로 결합합니다.
+    """
+
+    scores: Dict[Hashable, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
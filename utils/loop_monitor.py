@@ -0,0 +1,213 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+"""
+==================================================
+유틸리티 모듈: 이벤트 루프 블로킹 감지기 (LoopMonitor)
+==================================================
+이 파일은 asyncio 이벤트 루프의 지연(lag)을 지속적으로 측정하고,
+루프를 임계값 이상 점유한 작업의 스택을 캡처하는 모니터를 정의합니다.
+
+주요 역할:
+1. 하트비트 코루틴이 주기적으로 깨어나며 예정 시각 대비 지연(lag)을 기록합니다.
+2. 워치독 스레드가 하트비트가 임계값 이상 멈춘 것을 감지하면,
+   이벤트 루프 스레드의 현재 스택을 캡처합니다. (평상시 비용은 스레드 1개의 주기적 확인뿐)
+3. `resolve_label` 콜백으로 스택에서 작업 이름(예: 도구 이름)을 찾아 작업별로 집계합니다.
+"""
+
+class LoopMonitor:
+    """
+    이벤트 루프 지연 측정 및 블로킹 스택 캡처를 담당하는 클래스입니다.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 100.0,
+        interval_ms: float = 20.0,
+        resolve_label: Optional[Callable] = None,
+        max_events: int = 100,
+    ):
+        """
+        Args:
+            threshold_ms (float): 블로킹으로 판단할 루프 점유 시간(ms).
+            interval_ms (float): 하트비트 주기(ms).
+            resolve_label (Callable): 캡처한 frame을 받아 작업 이름을 반환하는 함수.
+            max_events (int): 보관할 최근 블로킹 이벤트 수.
+        """
+
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.resolve_label = resolve_label
+        self.events = deque(maxlen=max_events)
+        self.by_label: Dict[str, Dict] = {}
+
+        # 루프 지연 통계
+        self.lag_samples = deque(maxlen=1000)
+        self.max_lag = 0.0
+
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._pending_event: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task = None
+        self._watchdog = None
+
+    # ---------------- 하트비트 (이벤트 루프) ----------------
+    async def _heartbeat(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            self.lag_samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+            with self._lock:
+                self._last_beat = now
+                # 블로킹이 끝났으므로 실제 점유 시간을 확정합니다.
+                if self._pending_event is not None:
+                    self._finish_event(self._pending_event, lag)
+                    self._pending_event = None
+
+    # ---------------- 워치독 (별도 스레드) ----------------
+    def _watch(self):
+        while not self._stop.wait(self.interval / 2):
+            with self._lock:
+                stalled = time.perf_counter() - self._last_beat - self.interval
+                if stalled < self.threshold or self._pending_event is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                label = self.resolve_label(frame) if self.resolve_label else None
+                self._pending_event = {
+                    "label": label or "<unknown>",
+                    "detected_at": time.time(),
+                    "blocked_ms": round(stalled * 1000, 2),
+                    "stack": traceback.format_stack(frame),
+                }
+
+    def _finish_event(self, event: Dict, lag: float):
+        event["blocked_ms"] = round(max(event["blocked_ms"], lag * 1000), 2)
+        self.events.append(event)
+
+        stats = self.by_label.setdefault(
+            event["label"],
+            {"count": 0, "total_blocked_ms": 0.0, "max_blocked_ms": 0.0, "worst_stack": []},
+        )
+        stats["count"] += 1
+        stats["total_blocked_ms"] = round(stats["total_blocked_ms"] + event["blocked_ms"], 2)
+        if event["blocked_ms"] >= stats["max_blocked_ms"]:
+            stats["max_blocked_ms"] = event["blocked_ms"]
+            stats["worst_stack"] = event["stack"]
+
+    # ---------------- 시작 / 종료 ----------------
+    def start(self):
+        """
+        현재 실행 중인 이벤트 루프에서 모니터링을 시작합니다.
+        """
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    @asynccontextmanager
+    async def running(self):
+        self.start()
+        try:
+            yield self
+        finally:
+            await self.stop()
+
+    # ---------------- 결과 조회 ----------------
+    def snapshot(self, include_stacks: bool = True) -> Dict:
+        samples = sorted(self.lag_samples)
+
+        def pick(q: float) -> float:
+            return round(samples[int(q * (len(samples) - 1))] * 1000, 3) if samples else 0.0
+
+        by_label = {}
+        for label, stats in self.by_label.items():
+            by_label[label] = dict(stats)
+            if not include_stacks:
+                by_label[label].pop("worst_stack")
+
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "loop_lag_ms": {"p50": pick(0.50), "p99": pick(0.99), "max": round(self.max_lag * 1000, 3)},
+            "blocking_by_label": by_label,
+            "recent_events": [
+                event if include_stacks else {k: v for k, v in event.items() if k != "stack"}
+                for event in self.events
+            ],
+        }
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.by_label.clear()
+            self.lag_samples.clear()
+            self.max_lag = 0.0
+
+
+class SamplingProfiler:
+    """
+    지정한 스레드의 스택을 주기적으로 샘플링하는 경량 프로파일러입니다. (py-spy 방식)
+    결과는 flamegraph 도구에서 사용하는 collapsed stack 형식으로 반환합니다.
+    """
+
+    def __init__(self, interval_ms: float = 5.0, max_seconds: float = 30.0):
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        # 동시에 하나의 샘플링 윈도우만 허용합니다.
+        self._running = threading.Lock()
+
+    def sample(self, thread_id: int, seconds: float) -> Dict[str, int]:
+        """
+        `seconds` 동안 대상 스레드의 스택을 샘플링합니다. (블로킹 함수이므로 별도 스레드에서 호출)
+
+        Returns:
+            Dict[str, int]: "파일:함수;파일:함수" 형식의 스택별 샘플 수.
+        """
+
+        if not self._running.acquire(blocking=False):
+            raise RuntimeError("이미 프로파일링이 진행 중입니다.")
+
+        try:
+            counts: Dict[str, int] = {}
+            deadline = time.perf_counter() + min(seconds, self.max_seconds)
+            while time.perf_counter() < deadline:
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    key = ";".join(_collapse(frame))
+                    counts[key] = counts.get(key, 0) + 1
+                time.sleep(self.interval)
+            return counts
+        finally:
+            self._running.release()
+
+
+def _collapse(frame) -> List[str]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+"""
+==================================================
+유틸리티 모듈: 메모리 사용량 측정 (memory)
+==================================================
+이 파일은 프로세스 RSS(상주 메모리)를 읽는 함수와, 서버 시작 단계별(구성 요소별) RSS 증가량을 기록하는 MemoryReport를 정의합니다.
+
+- RSS / 최대 RSS(peak)는 Linux의 /proc/<pid>/status (VmRSS, VmHWM)에서 읽습니다.
+  /proc이 없으면 현재 프로세스의 최대 RSS만 resource.getrusage로 구하고, 나머지는 None을 반환합니다.
+- 구성 요소별 값은 해당 단계 전후 RSS 차이입니다. (공유 라이브러리, 할당자 캐시 때문에 대략적인 값)
+- 자식/사이드카 프로세스(CPU 풀 워커, 임베딩 사이드카)는 pid로 등록하여 RSS를 함께 보고합니다.
+
+사용 예:
+    report = MemoryReport(budget_mb=1024)
+    with report.measure("oracle"):
+        await db_manager.connect()
+    report.print_report()
+"""
+
+MB = 1024 * 1024
+
+
+def _status_kb(pid: Optional[int], field: str) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid or 'self'}/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """
+    프로세스의 현재 RSS(바이트)를 반환합니다. 읽을 수 없으면 None.
+    """
+
+    kb = _status_kb(pid, "VmRSS")
+    return None if kb is None else kb * 1024
+
+
+def peak_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """
+    프로세스의 최대 RSS(바이트)를 반환합니다. 읽을 수 없으면 None.
+    """
+
+    kb = _status_kb(pid, "VmHWM")
+    if kb is not None:
+        return kb * 1024
+    if pid is None and resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+def to_mb(value: Optional[int]) -> Optional[float]:
+    return None if value is None else round(value / MB, 1)
+
+
+class MemoryReport:
+    """
+    서버 시작 단계별 RSS 증가량과 자식/사이드카 프로세스 RSS를 기록합니다.
+    """
+
+    def __init__(self, budget_mb: float = 0):
+        """
+        Args:
+            budget_mb (float): 프로세스 RSS 예산(MB). 0 이하이면 확인하지 않습니다.
+        """
+
+        self.budget_mb = budget_mb
+        self.components: Dict[str, int] = {}
+        # 이름 → pid (CPU 풀 워커, 임베딩 사이드카 등)
+        self.processes: Dict[str, int] = {}
+        self.baseline: Optional[int] = None
+
+    def start(self):
+        """
+        기준 RSS(인터프리터 + import 된 모듈)를 기록합니다.
+        """
+
+        self.baseline = rss_bytes()
+        self.components.clear()
+
+    @contextmanager
+    def measure(self, component: str) -> Iterator[None]:
+        before = rss_bytes()
+        try:
+            yield
+        finally:
+            after = rss_bytes()
+            if before is not None and after is not None:
+                self.components[component] = self.components.get(component, 0) + after - before
+
+    def track_process(self, name: str, pid: Optional[int]):
+        if pid is None:
+            self.processes.pop(name, None)
+        else:
+            self.processes[name] = pid
+
+    def snapshot(self) -> Dict:
+        rss = rss_bytes()
+        total = rss or 0
+        processes = {}
+        for name, pid in list(self.processes.items()):
+            process_rss = rss_bytes(pid)
+            if process_rss is None:
+                # 종료된 프로세스 (CPU 풀 워커 재생성 등)
+                self.processes.pop(name, None)
+                continue
+            total += process_rss
+            processes[name] = {"pid": pid, "rss_mb": to_mb(process_rss), "peak_rss_mb": to_mb(peak_rss_bytes(pid))}
+        return {
+            "pid": os.getpid(),
+            "rss_mb": to_mb(rss),
+            "peak_rss_mb": to_mb(peak_rss_bytes()),
+            "baseline_mb": to_mb(self.baseline),
+            "components_mb": {name: to_mb(delta) for name, delta in self.components.items()},
+            "processes": processes,
+            "total_rss_mb": to_mb(total),
+            "budget_mb": self.budget_mb or None,
+            "over_budget": bool(self.budget_mb and rss and rss / MB > self.budget_mb),
+        }
+
+    def print_report(self, label: str = "Memory"):
+        snapshot = self.snapshot()
+        components = ", ".join(f"{name} {mb:+.1f}MB" for name, mb in snapshot["components_mb"].items()) or "-"
+        print(f"[{label}] RSS {snapshot['rss_mb']}MB (기준 {snapshot['baseline_mb']}MB, 최대 {snapshot['peak_rss_mb']}MB) "
+              f"구성 요소: {components}")
+        for name, process in snapshot["processes"].items():
+            print(f"[{label}]   {name} (pid {process['pid']}): RSS {process['rss_mb']}MB")
+        if snapshot["over_budget"]:
+            print(f"[{label}] ⚠️ RSS가 예산({self.budget_mb}MB)을 초과했습니다.")
@@ -0,0 +1,220 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from utils.deadline import DeadlineExceeded, timeout_for
+from utils.tracing import tracer
+import asyncio
+import oracledb
+
+"""
+==================================================
+유틸리티 모듈: 비동기 Oracle 연결 풀 (AsyncOraclePool)
+==================================================
+이 파일은 db_server(DDL/예시 데이터 입력)와 MCP 서버(oracle_query)가 함께 사용하는
+비동기 Oracle 연결 풀을 정의합니다. (python-oracledb thin 모드의 create_pool_async)
+
+- 연결 획득/반납, DDL, 쿼리가 모두 이벤트 루프를 막지 않습니다.
+- 설정 값은 호출하는 쪽에서 전달합니다. (db/config/settings.py, mcp_servers/config/settings.py)
+- DRCP(Database Resident Connection Pooling): drcp=True이면 서버 측 공유 연결 풀(pooled server)에 연결합니다.
+  여러 프로세스/레플리카의 클라이언트 풀이 DB 세션을 나눠 쓰므로 세션 한도에 덜 걸립니다.
+  (DB에서 DBMS_CONNECTION_POOL.START_POOL() 실행 필요)
+  - cclass: 연결 클래스. 같은 클래스끼리만 세션을 재사용합니다.
+  - purity: self(세션 상태 재사용) | new(항상 새 세션) | default
+- 요청 기한(utils/deadline.py)이 있으면 연결 대기(acquire)와 DB 왕복(call_timeout)을 남은 시간 이내로 제한합니다.
+- run_batch: 서로 독립적인 여러 SQL을 파이프라인으로 한 번의 네트워크 왕복에 보냅니다.
+  (Oracle 23ai 이상. 이전 버전 DB에서는 서버가 순서대로 실행하므로 이점이 없습니다)
+
+사용 예:
+    pool = await AsyncOraclePool(user, password, dsn, min_size=2, max_size=10).connect()
+    async with pool.connection() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute("SELECT 1 FROM dual")
+    await pool.close()
+"""
+
+PURITIES = {
+    "default": oracledb.PURITY_DEFAULT,
+    "new": oracledb.PURITY_NEW,
+    "self": oracledb.PURITY_SELF,
+}
+
+
+class AsyncOraclePool:
+
+    def __init__(
+        self,
+        user: Optional[str],
+        password: Optional[str],
+        dsn: Optional[str],
+        min_size: int = 2,
+        max_size: int = 10,
+        increment: int = 1,
+        name: str = "oracle",
+        drcp: bool = False,
+        cclass: Optional[str] = None,
+        purity: str = "self",
+    ):
+        """
+        Args:
+            user, password, dsn: Oracle 접속 정보.
+            min_size (int): 풀 최소 연결 수.
+            max_size (int): 풀 최대 연결 수.
+            increment (int): 연결이 부족할 때 한 번에 늘릴 연결 수.
+            name (str): 로그에 표시할 이름.
+            drcp (bool): DRCP pooled server 사용 여부.
+            cclass (str): DRCP 연결 클래스.
+            purity (str): DRCP 세션 purity (self | new | default).
+        """
+
+        if purity not in PURITIES:
+            raise ValueError(f"지원하지 않는 DRCP purity 입니다: {purity} (지원: {', '.join(PURITIES)})")
+
+        self.user = user
+        self.password = password
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.increment = increment
+        self.name = name
+        self.drcp = drcp
+        self.cclass = cclass
+        self.purity = purity
+        self.pool: Optional[oracledb.AsyncConnectionPool] = None
+
+    async def connect(self) -> "AsyncOraclePool":
+        """
+        연결 풀을 생성합니다. 이미 생성되어 있으면 그대로 사용합니다.
+        """
+
+        if self.pool is None:
+            options: Dict[str, Any] = {}
+            if self.drcp:
+                options = {"server_type": "pooled", "cclass": self.cclass, "purity": PURITIES[self.purity]}
+            print(
+                f"[{self.name}] Connecting to Oracle ({self.dsn})... pool min={self.min_size}, max={self.max_size}"
+                + (f", DRCP cclass={self.cclass}, purity={self.purity}" if self.drcp else "")
+            )
+            self.pool = oracledb.create_pool_async(
+                user=self.user,
+                password=self.password,
+                dsn=self.dsn,
+                min=self.min_size,
+                max=self.max_size,
+                increment=self.increment,
+                **options,
+            )
+        return self
+
+    async def close(self):
+        """
+        연결 풀을 닫습니다.
+        """
+
+        if self.pool is not None:
+            print(f"[{self.name}] Closing Oracle Connection Pool...")
+            await self.pool.close()
+            self.pool = None
+
+    async def get_pool(self) -> oracledb.AsyncConnectionPool:
+        if self.pool is None:
+            await self.connect()
+        return self.pool
+
+    @asynccontextmanager
+    async def connection(self, call_timeout: Optional[float] = None) -> AsyncIterator[oracledb.AsyncConnection]:
+        """
+        풀에서 연결을 빌려오고, 블록이 끝나면 반납합니다.
+        블록 안의 DB 왕복 타임아웃(call_timeout)은 항상 이 호출 기준으로 설정하고 반납 전에 되돌립니다.
+        (이전 호출의 짧은 요청 기한이 다음에 연결을 빌리는 쪽에 남지 않도록)
+
+        Args:
+            call_timeout (float): DB 왕복 1회당 타임아웃(초). None이면 제한 없음.
+                                  요청 기한이 있으면 남은 시간 이내로 줄입니다.
+        """
+
+        pool = await self.get_pool()
+        # 연결 대기 시간을 Span으로 기록합니다.
+        with tracer.start_span("oracle.pool.acquire", attributes={"db.system": "oracle"}):
+            connection = await acquire(pool)
+        previous = connection.call_timeout
+        try:
+            connection.call_timeout = call_timeout_ms(call_timeout)
+            yield connection
+        finally:
+            connection.call_timeout = previous
+            await pool.release(connection)
+
+
+async def acquire(pool: oracledb.AsyncConnectionPool) -> oracledb.AsyncConnection:
+    """
+    풀에서 연결을 빌려옵니다. 요청 기한이 있으면 남은 시간까지만 기다립니다.
+
+    Raises:
+        DeadlineExceeded: 기한 안에 연결을 얻지 못한 경우.
+    """
+
+    timeout = timeout_for(None, "oracle.acquire")
+    if timeout is None:
+        return await pool.acquire()
+    try:
+        return await asyncio.wait_for(pool.acquire(), timeout)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("oracle.acquire") from None
+
+
+def call_timeout_ms(default: Optional[float]) -> int:
+    """
+    DB 왕복 1회당 타임아웃(ms, connection.call_timeout 값)을 반환합니다.
+    요청 기한이 있으면 남은 시간 이내로 줄입니다. (0은 제한 없음이므로 최소 1ms)
+    """
+
+    timeout = timeout_for(default, "oracle.execute")
+    return 0 if timeout is None else max(1, int(timeout * 1000))
+
+
+# 배치 실행 결과: (컬럼 목록, 행 목록) 또는 실행 오류
+BatchResult = Tuple[Optional[List[str]], Optional[List[tuple]], Optional[Exception]]
+
+
+def pipeline_supported() -> bool:
+    # python-oracledb 2.4 이상에서 제공
+    return hasattr(oracledb, "create_pipeline")
+
+
+async def run_batch(
+    connection: oracledb.AsyncConnection,
+    statements: Sequence[Tuple[str, Any]],
+    max_rows: int,
+    pipeline: bool = True,
+) -> List[BatchResult]:
+    """
+    서로 독립적인 SQL 목록을 실행하고 문장별 결과를 반환합니다.
+    한 문장이 실패해도 나머지 문장의 결과는 반환합니다.
+
+    Args:
+        connection: 풀에서 빌려온 비동기 연결.
+        statements: (SQL, 바인드 파라미터) 목록.
+        max_rows (int): 문장별로 가져올 최대 행 수.
+        pipeline (bool): True이면 파이프라인으로 한 번에 보냅니다. (미지원 드라이버는 순서대로 실행)
+    """
+
+    if pipeline and pipeline_supported():
+        batch = oracledb.create_pipeline()
+        for sql, params in statements:
+            batch.add_fetchmany(sql, params, max_rows)
+        outcomes = await connection.run_pipeline(batch, continue_on_error=True)
+        return [
+            (None, None, oracledb.DatabaseError(outcome.error)) if outcome.error
+            else ([column.name for column in outcome.columns], outcome.rows, None)
+            for outcome in outcomes
+        ]
+
+    results: List[BatchResult] = []
+    async with connection.cursor() as cursor:
+        for sql, params in statements:
+            try:
+                await cursor.execute(sql, params)
+                columns = [column[0] for column in cursor.description]
+                results.append((columns, await cursor.fetchmany(max_rows), None))
+            except oracledb.Error as e:
+                results.append((None, None, e))
+    return results
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from typing import List
+from utils.deadline import DeadlineExceeded, remaining
 import asyncio
 
 """
@@ -13,6 +14,8 @@ import asyncio
 주요 역할:
 1. 1분 윈도우 내의 요청 기록을 관리합니다.
 2. 요청 횟수가 임계값을 초과하면, 가장 오래된 요청이 만료될 때까지 비동기적으로 대기합니다.
+3. 요청 기한(utils/deadline.py)보다 오래 기다려야 하면 대기하지 않고 DeadlineExceeded를 발생시킵니다.
+4. try_acquire: 대기하지 않고 남은 한도가 있을 때만 요청을 기록합니다. (백그라운드 갱신 예산, mcp_servers/refresh.py)
 """
 
 class RateLimiter:
@@ -37,6 +40,9 @@ class RateLimiter:
         """
         요청 횟수 제한을 획득(Acquire)합니다. 
         제한을 초과하면 1분 윈도우가 재설정될 때까지 비동기적으로 대기합니다.
+
+        Raises:
+            DeadlineExceeded: 대기 시간이 요청 기한까지 남은 시간보다 긴 경우. (요청 기록 없이 즉시 실패)
         """
 
         now = datetime.now()
@@ -54,6 +60,11 @@ class RateLimiter:
             # 첫 번째(가장 오래된) 요청이 발생한 시점부터 60초가 될 때까지 남은 시간을 계산합니다.
             wait_time = 60 - (now - self.requests[0]).total_seconds()
             
+            # 요청 기한 안에 한도가 풀리지 않으면 기다리지 않습니다. (예: 2초 남았는데 60초 대기)
+            left = remaining()
+            if wait_time > 0 and left is not None and wait_time >= left:
+                raise DeadlineExceeded("rate_limiter", left)
+
             # 대기 시간이 양수일 경우만 대기합니다.
             if wait_time > 0:
                 # 비동기적으로 대기하여 요청 윈도우가 재설정되기를 기다립니다.
@@ -61,4 +72,23 @@ class RateLimiter:
 
         # 3. 새로운 요청 기록 (Record New Request)
         # - 제한을 통과하거나 대기 후, 현재 요청 시간을 기록하여 요청 횟수를 1 증가시킵니다.
-        self.requests.append(datetime.now())
\ No newline at end of file
+        self.requests.append(datetime.now())
+
+    def remaining(self) -> int:
+        """
+        현재 1분 윈도우에서 남은 요청 횟수를 반환합니다.
+        """
+
+        one_minute_ago = datetime.now() - timedelta(minutes=1)
+        self.requests = [req for req in self.requests if req > one_minute_ago]
+        return max(0, self.requests_per_minute - len(self.requests))
+
+    def try_acquire(self) -> bool:
+        """
+        남은 한도가 있으면 요청을 기록하고 True를 반환합니다. 한도를 초과하면 대기하지 않고 False를 반환합니다.
+        """
+
+        if self.remaining() <= 0:
+            return False
+        self.requests.append(datetime.now())
+        return True
@@ -0,0 +1,304 @@
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+from utils.deadline import DeadlineExceeded, remaining, timeout_for
+import asyncio
+import random
+import time
+
+"""
+==================================================
+유틸리티 모듈: 외부 의존성 복원력 (Circuit Breaker / Retry / Hedging)
+==================================================
+이 파일은 Oracle, Milvus, 외부 HTTP API 같은 의존성 호출을 감싸는 복원력 계층을 정의합니다.
+
+주요 역할:
+1. CircuitBreaker: 연속 실패가 임계값을 넘으면 회로를 열어(open) 일정 시간 동안 호출을 즉시 거절합니다.
+   reset_timeout 후에는 half-open 상태에서 소수의 시험 호출만 허용하고, 성공하면 다시 닫습니다(closed).
+2. 재시도: 멱등(idempotent) 호출에 한해 지터(full jitter)가 적용된 지수 백오프로 재시도합니다.
+3. 헤징(hedging): 읽기 호출이 최근 p95 지연 시간 안에 끝나지 않으면 같은 요청을 한 번 더 보내고,
+   먼저 끝난 결과를 사용합니다. (꼬리 지연 완화)
+4. Dependency: 위 기능과 호출 타임아웃을 하나로 묶은 의존성 단위 객체입니다.
+   요청 기한(utils/deadline.py)이 있으면 시도별 타임아웃을 남은 시간 이내로 줄이고,
+   기한이 지나 끝난 시도는 장애로 집계하거나 재시도하지 않습니다. (DeadlineExceeded)
+"""
+
+class CircuitOpen(Exception):
+    """
+    회로가 열려 있어 호출을 거절한 경우 발생하는 예외입니다.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open (retry after {retry_after:.1f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    closed → open → half-open → closed 상태를 가지는 회로 차단기입니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Args:
+            name (str): 의존성 이름 (예: oracle, milvus, google).
+            failure_threshold (int): 회로를 여는 연속 실패 횟수.
+            reset_timeout (float): open 상태 유지 시간(초). 이후 half-open으로 전환합니다.
+            half_open_max_calls (int): half-open 상태에서 동시에 허용할 시험 호출 수.
+        """
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._half_open_calls = 0
+        self.stats = {"calls": 0, "successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def before_call(self):
+        """
+        호출 전 상태를 확인합니다. 호출할 수 없으면 CircuitOpen을 발생시킵니다.
+        """
+
+        if self.state == "open":
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout:
+                self.stats["rejected"] += 1
+                raise CircuitOpen(self.name, self.reset_timeout - elapsed)
+            self.state = "half_open"
+            self._half_open_calls = 0
+            print(f"[CircuitBreaker] {self.name}: half-open")
+
+        if self.state == "half_open":
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.stats["rejected"] += 1
+                raise CircuitOpen(self.name, self.reset_timeout)
+            self._half_open_calls += 1
+
+        self.stats["calls"] += 1
+
+    def on_success(self):
+        self.stats["successes"] += 1
+        self.consecutive_failures = 0
+        if self.state == "half_open":
+            self.state = "closed"
+            print(f"[CircuitBreaker] {self.name}: closed")
+
+    def on_failure(self):
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.stats["opened"] += 1
+                print(f"[CircuitBreaker] {self.name}: open (연속 실패 {self.consecutive_failures}회)")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def on_ignored(self):
+        # 의존성 장애가 아닌 오류(잘못된 요청 등): 상태를 바꾸지 않고 half-open 시험 슬롯만 반환합니다.
+        if self.state == "half_open":
+            self._half_open_calls = max(0, self._half_open_calls - 1)
+
+    def snapshot(self) -> Dict:
+        return {
+            **self.stats,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after_s": round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 2)
+            if self.state == "open" else 0.0,
+        }
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    full jitter 지수 백오프 대기 시간: uniform(0, min(max_delay, base_delay * 2^attempt))
+    """
+
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class Dependency:
+    """
+    하나의 외부 의존성에 대한 타임아웃, 회로 차단기, 재시도, 헤징을 담당합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 10.0,
+        retries: int = 2,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        hedge_after: Optional[float] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        """
+        Args:
+            name (str): 의존성 이름.
+            timeout (float): 시도 1회당 타임아웃(초).
+            retries (int): 멱등 호출의 최대 재시도 횟수.
+            base_delay / max_delay (float): 재시도 백오프 기본값/상한(초).
+            hedge_after (float): 헤지 요청을 보내기까지의 최소 대기 시간(초). None이면 헤징하지 않습니다.
+                                 최근 p95 지연 시간이 더 길면 p95를 사용합니다.
+            is_failure (Callable): 예외가 의존성 장애인지(회로 차단/재시도 대상인지) 판별하는 함수.
+                                   기본값은 모든 예외를 장애로 간주합니다.
+        """
+
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_after = hedge_after
+        self.is_failure = is_failure or (lambda error: True)
+        self.breaker = CircuitBreaker(name, failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+
+        self._latencies = deque(maxlen=200)
+        self.stats = {"retries": 0, "timeouts": 0, "hedges": 0, "hedge_wins": 0, "deadline_exceeded": 0}
+
+    # ---------------- 단일 시도 ----------------
+    async def _attempt(self, fn: Callable[[], Awaitable], timeout: float):
+        self.breaker.before_call()
+        start = time.monotonic()
+        # 시도 타임아웃이 요청 기한으로 정해졌는지 여부
+        left = remaining()
+        by_deadline = left is not None and left <= timeout
+        try:
+            result = await asyncio.wait_for(fn(), timeout)
+        except asyncio.TimeoutError:
+            if by_deadline:
+                # 요청 기한 때문에 중단된 시도: 의존성 장애가 아닙니다.
+                self.stats["deadline_exceeded"] += 1
+                self.breaker.on_ignored()
+                raise DeadlineExceeded(self.name)
+            self.stats["timeouts"] += 1
+            self.breaker.on_failure()
+            raise
+        except DeadlineExceeded:
+            self.stats["deadline_exceeded"] += 1
+            self.breaker.on_ignored()
+            raise
+        except asyncio.CancelledError:
+            # 헤징에서 진 시도가 취소된 경우: 장애로 집계하지 않습니다.
+            self.breaker.on_ignored()
+            raise
+        except Exception as e:
+            if self.is_failure(e):
+                self.breaker.on_failure()
+            else:
+                self.breaker.on_ignored()
+            raise
+        self._latencies.append(time.monotonic() - start)
+        self.breaker.on_success()
+        return result
+
+    def _hedge_delay(self) -> float:
+        if len(self._latencies) < 20:
+            return self.hedge_after
+        ordered = sorted(self._latencies)
+        return max(self.hedge_after, ordered[int(0.95 * (len(ordered) - 1))])
+
+    async def _hedged(self, fn: Callable[[], Awaitable], timeout: float):
+        """
+        첫 시도가 헤지 지연 시간 안에 끝나지 않으면 두 번째 시도를 시작하고, 먼저 성공한 결과를 반환합니다.
+        """
+
+        first = asyncio.ensure_future(self._attempt(fn, timeout))
+        pending = {first}
+        error = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self._hedge_delay())
+            if done:
+                return first.result()
+
+            # 회로가 열려 있으면 헤지 요청을 보내지 않고 첫 시도만 기다립니다.
+            if self.breaker.state != "closed":
+                return await first
+
+            self.stats["hedges"] += 1
+            second = asyncio.ensure_future(self._attempt(fn, timeout))
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # ---------------- 호출 ----------------
+    async def call(self, fn: Callable[[], Awaitable], idempotent: bool = False, hedge: bool = False, timeout: Optional[float] = None):
+        """
+        의존성 호출을 실행합니다.
+
+        Args:
+            fn (Callable): 인자 없이 호출하면 awaitable을 반환하는 함수. (재시도/헤징 시 여러 번 호출됩니다)
+            idempotent (bool): 멱등 호출 여부. True인 경우에만 재시도합니다.
+            hedge (bool): 헤지 요청 허용 여부. (멱등 읽기 호출에만 사용)
+            timeout (float): 시도 1회당 타임아웃(초). 지정하지 않으면 기본값을 사용합니다.
+                             요청 기한이 있으면 남은 시간 이내로 줄입니다.
+
+        Raises:
+            CircuitOpen: 회로가 열려 있는 경우 (재시도하지 않습니다).
+            DeadlineExceeded: 요청 기한이 지난 경우 (재시도하지 않습니다).
+        """
+
+        attempts = 1 + (self.retries if idempotent else 0)
+        use_hedge = hedge and idempotent and self.hedge_after is not None
+
+        for attempt in range(attempts):
+            try:
+                attempt_timeout = timeout_for(timeout or self.timeout, self.name)
+                if use_hedge:
+                    return await self._hedged(fn, attempt_timeout)
+                return await self._attempt(fn, attempt_timeout)
+            except (CircuitOpen, DeadlineExceeded):
+                raise
+            except Exception as e:
+                retryable = isinstance(e, asyncio.TimeoutError) or self.is_failure(e)
+                if not retryable or attempt == attempts - 1:
+                    raise
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                left = remaining()
+                if left is not None and left <= delay:
+                    # 재시도할 시간이 남지 않았으면 마지막 오류를 그대로 전달합니다.
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+
+    def snapshot(self) -> Dict:
+        ordered = sorted(self._latencies)
+        return {
+            "breaker": self.breaker.snapshot(),
+            **self.stats,
+            "latency_p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 2) if ordered else 0.0,
+        }
+
+
+class DependencyRegistry:
+    """
+    이름별 Dependency 객체를 관리하고 전체 상태를 조회합니다.
+    """
+
+    def __init__(self):
+        self.dependencies: Dict[str, Dependency] = {}
+
+    def register(self, dependency: Dependency) -> Dependency:
+        self.dependencies[dependency.name] = dependency
+        return dependency
+
+    def get(self, name: str) -> Dependency:
+        return self.dependencies[name]
+
+    def snapshot(self) -> Dict:
+        return {name: dependency.snapshot() for name, dependency in self.dependencies.items()}
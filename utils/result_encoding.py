@@ -0,0 +1,115 @@
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+"""
+==================================================
+유틸리티 모듈: 도구 결과 인코딩 (result_encoding)
+==================================================
+이 파일은 도구 결과를 MCP 응답과 LLM 입력에 적합한 작은 JSON으로 직렬화하는 함수를 정의합니다.
+
+주요 역할:
+1. dumps: orjson(설치된 경우) 또는 표준 json으로 공백 없는 JSON 문자열을 생성합니다.
+   Oracle 타입(Decimal, datetime, date, LOB/bytes 등)을 JSON 값으로 변환합니다.
+2. encode_rows: 쿼리 결과를 컬럼 목록 + 값 배열(columnar) 형식으로 인코딩합니다.
+   (행마다 컬럼 이름을 반복하는 dict 목록보다 작습니다)
+3. 행 수/바이트 예산을 넘으면 결과를 잘라내고 `truncated` 표시를 추가합니다.
+"""
+
+TRUNCATION_MARKER = "... [truncated]"
+
+
+def _default(value: Any) -> Any:
+    # JSON 기본 타입이 아닌 값의 변환 규칙
+    if isinstance(value, Decimal):
+        # 정수 값은 int, 그 외는 float (Oracle NUMBER)
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "read"):
+        # Oracle LOB (동기 LOB만 지원, 비동기 LOB은 조회 시 문자열로 가져와야 합니다)
+        return value.read()
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """
+    공백 없는 JSON 문자열로 직렬화합니다. (한글 등 비 ASCII 문자는 그대로 유지)
+    """
+
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def byte_size(value: Any) -> int:
+    return len(dumps(value).encode("utf-8"))
+
+
+def encode_rows(
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    쿼리 결과를 columnar 형식으로 인코딩합니다.
+
+    Args:
+        columns (Sequence[str]): 컬럼 이름 목록.
+        rows (Sequence[Sequence]): 행 목록 (cursor.fetchall() 결과).
+        max_rows (int): 최대 행 수. 초과분은 잘라냅니다.
+        max_bytes (int): 인코딩 결과의 최대 바이트 수. 초과하면 들어갈 수 있는 만큼만 행을 남깁니다.
+
+    Returns:
+        Dict: {"columns": [...], "rows": [[...], ...], "row_count": 전체 행 수}
+              잘린 경우 "truncated": {"reason": "max_rows" | "max_bytes", "returned": 반환한 행 수} 추가
+    """
+
+    total = len(rows)
+    kept: List[List[Any]] = [list(row) for row in (rows[:max_rows] if max_rows else rows)]
+    reason = "max_rows" if len(kept) < total else None
+
+    encoded: Dict[str, Any] = {"columns": list(columns), "rows": kept, "row_count": total}
+
+    if max_bytes and byte_size(encoded) > max_bytes:
+        # 행별 크기를 누적하여 예산 안에 들어가는 행 수를 계산합니다. (행 하나도 못 넣으면 빈 목록)
+        budget = max_bytes - byte_size({**encoded, "rows": [], "truncated": {"reason": "max_bytes", "returned": total}})
+        count = 0
+        for row in kept:
+            budget -= byte_size(row) + 1
+            if budget < 0:
+                break
+            count += 1
+        encoded["rows"] = kept[:count]
+        reason = "max_bytes"
+
+    if reason:
+        encoded["truncated"] = {"reason": reason, "returned": len(encoded["rows"])}
+    return encoded
+
+
+def truncate_text(text: str, max_bytes: Optional[int]) -> str:
+    """
+    문자열을 UTF-8 기준 max_bytes 이하로 자르고 잘림 표시를 붙입니다.
+    """
+
+    if not max_bytes:
+        return text
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    cut = data[: max(0, max_bytes - len(TRUNCATION_MARKER.encode("utf-8")))]
+    return cut.decode("utf-8", errors="ignore") + TRUNCATION_MARKER
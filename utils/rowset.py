@@ -0,0 +1,169 @@
+from array import array
+from itertools import islice
+from json.encoder import encode_basestring
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from utils.result_encoding import dumps
+import math
+
+"""
+==================================================
+유틸리티 모듈: 쿼리 결과 컨테이너 (RowSet)
+==================================================
+이 파일은 쿼리 결과를 적은 메모리로 보관하고 결과 JSON으로 바로 직렬화하는 RowSet을 정의합니다.
+
+- 컬럼 이름은 한 번만 저장하고, 값은 컬럼별로 저장합니다.
+  정수/실수만 있는 컬럼(balance, money 등)은 array('q') / array('d')로 값당 8바이트에 저장하고,
+  그 외 컬럼은 값 목록으로 저장합니다. (행마다 tuple/dict 객체를 두지 않습니다)
+- to_json: CHUNK_ROWS행씩 컬럼 단위로 값을 JSON 문자열로 바꾼 뒤 행을 이어 붙이고, 행마다 바이트 예산(max_bytes)을 확인합니다.
+  행 목록(list of dict / list of list)을 중간에 만들지 않고, 결과 크기를 반복해서 다시 계산하지 않으며,
+  예산을 넘으면 남은 행은 변환하지 않습니다. (기본 타입 외의 값은 dumps와 같은 규칙으로 변환)
+- 출력 형식은 encode_rows와 같습니다.
+    {"columns": [...], "rows": [[...], ...], "row_count": N}
+    max_rows 초과: "row_count" 대신 "has_more": true
+    잘린 경우: "truncated": {"reason": "max_rows" | "max_bytes", "returned": 반환한 행 수}
+"""
+
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+CHUNK_ROWS = 256
+
+
+def _compact(values: List[Any]):
+    # 값이 모두 int(bool 제외)이면 array('q'), 모두 float이면 array('d'), 그 외는 목록 그대로
+    if values and all(type(value) is int and INT64_MIN <= value <= INT64_MAX for value in values):
+        return array("q", values)
+    if values and all(type(value) is float for value in values):
+        return array("d", values)
+    return values
+
+
+def _encode_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if type(value) is int:
+        return str(value)
+    if type(value) is float and math.isfinite(value):
+        return repr(value)
+    if type(value) is str:
+        return encode_basestring(value)
+    return dumps(value)
+
+
+def _encode_column(values) -> List[str]:
+    # 컬럼 값 목록을 JSON 문자열 목록으로 변환합니다. (숫자 array는 값별 타입 확인 없이 변환)
+    if isinstance(values, array):
+        if values.typecode == "q":
+            return list(map(str, values))
+        if all(map(math.isfinite, values)):
+            return list(map(repr, values))
+    return [_encode_value(value) for value in values]
+
+
+class RowSet:
+    """
+    컬럼 단위로 저장하는 쿼리 결과입니다.
+    """
+
+    __slots__ = ("columns", "row_count", "has_more", "extra", "max_bytes", "_data", "_encoded")
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            columns (Sequence[str]): 컬럼 이름 목록.
+            rows (Sequence[Sequence]): 행 목록 (cursor.fetchmany(max_rows + 1) 결과).
+                max_rows보다 많으면 초과분은 버리고 has_more로 표시합니다.
+            max_rows (int): 최대 행 수.
+            max_bytes (int): 직렬화 결과의 최대 바이트 수.
+            extra (Dict): 결과 앞에 함께 직렬화할 값 (예: {"isSuccess": True}).
+        """
+
+        self.columns = list(columns)
+        self.has_more = bool(max_rows) and len(rows) > max_rows
+        kept = rows[:max_rows] if self.has_more else rows
+        self.row_count = len(kept)
+        self.max_bytes = max_bytes
+        self.extra = extra or {}
+        self._data = [_compact(list(values)) for values in zip(*kept)] if kept else [[] for _ in self.columns]
+        # (JSON 문자열, 반환한 행 수) - to_json 결과 캐시
+        self._encoded: Optional[Tuple[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def iter_rows(self, limit: Optional[int] = None) -> Iterator[tuple]:
+        rows = zip(*self._data)
+        return islice(rows, limit) if limit is not None else rows
+
+    def _tail(self, returned: int) -> Dict[str, Any]:
+        tail: Dict[str, Any] = {"has_more": True} if self.has_more else {"row_count": self.row_count}
+        if self.has_more or returned < self.row_count:
+            reason = "max_bytes" if returned < self.row_count else "max_rows"
+            tail["truncated"] = {"reason": reason, "returned": returned}
+        return tail
+
+    def _join(self, rows_json: str, returned: int) -> str:
+        parts = [dumps(self.extra)[1:-1], f'"columns":{dumps(self.columns)}', f'"rows":[{rows_json}]',
+                 dumps(self._tail(returned))[1:-1]]
+        return "{" + ",".join(part for part in parts if part) + "}"
+
+    def to_json(self) -> str:
+        """
+        결과를 compact JSON 문자열로 직렬화합니다. (max_bytes를 넘지 않도록 뒤쪽 행을 잘라냄)
+        """
+
+        if self._encoded is not None:
+            return self._encoded[0]
+
+        budget = None
+        if self.max_bytes:
+            # 행 없이 잘림 표시까지 포함한 고정 부분의 크기 (행 수 표시는 최대 자릿수 기준)
+            budget = self.max_bytes - len(self._join("", 0).encode("utf-8")) - len(str(self.row_count))
+        pieces: List[str] = []
+        for piece in self._rows_json():
+            if budget is not None:
+                budget -= len(piece.encode("utf-8")) + 1
+                if budget < 0:
+                    break
+            pieces.append(piece)
+
+        self._encoded = (self._join(",".join(pieces), len(pieces)), len(pieces))
+        return self._encoded[0]
+
+    def _rows_json(self) -> Iterator[str]:
+        for start in range(0, self.row_count, CHUNK_ROWS):
+            encoded = [_encode_column(values[start:start + CHUNK_ROWS]) for values in self._data]
+            for parts in zip(*encoded):
+                yield "[" + ",".join(parts) + "]"
+
+    @property
+    def returned(self) -> int:
+        # 직렬화 결과에 포함된 행 수
+        self.to_json()
+        return self._encoded[1]
+
+    @property
+    def truncated(self) -> bool:
+        return self.has_more or self.returned < self.row_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        structuredContent용 dict를 생성합니다. (to_json과 같은 행 수)
+        """
+
+        returned = self.returned
+        return {
+            **self.extra,
+            "columns": list(self.columns),
+            "rows": [list(row) for row in self.iter_rows(returned)],
+            **self._tail(returned),
+        }
@@ -0,0 +1,351 @@
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+import atexit
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+
+"""
+==================================================
+유틸리티 모듈: 분산 트레이싱 (Tracer)
+==================================================
+이 파일은 OpenTelemetry 스타일의 경량 트레이서를 정의합니다.
+에이전트 → MCP 도구 → Oracle/Milvus/외부 HTTP 구간 중 어디에서 시간이 소요되었는지
+Span 단위로 기록합니다.
+
+주요 역할:
+1. contextvars 기반으로 현재 Span을 추적하여 부모/자식 관계를 자동으로 연결합니다.
+2. W3C Trace Context(`traceparent`) 헤더를 파싱/생성하여 프로세스 간 추적을 이어줍니다.
+3. 메모리(InMemorySpanExporter) 또는 OTLP JSON 파일(FileSpanExporter)로 Span을 내보냅니다.
+   외부 Collector 없이도 오프라인으로 결과를 확인할 수 있습니다.
+"""
+
+@dataclass
+class SpanContext:
+    # 프로세스 경계를 넘어 전달되는 Span 식별 정보.
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+
+@dataclass
+class Span:
+    """
+    하나의 작업 구간을 나타내는 Span 객체입니다.
+    """
+
+    name: str
+    context: SpanContext
+    parent_id: Optional[str] = None
+    kind: str = "INTERNAL"
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "UNSET"
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException):
+        self.status = "ERROR"
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns or time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def to_otlp(self, service_name: str) -> Dict[str, Any]:
+        """
+        OTLP JSON 형식과 호환되는 딕셔너리로 변환합니다.
+        """
+
+        return {
+            "resource": {"service.name": service_name},
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": f"SPAN_KIND_{self.kind}",
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": f"STATUS_CODE_{self.status}", "message": self.status_message},
+        }
+
+
+class _NoopSpan:
+    # 트레이싱이 비활성화된 경우 사용하는 빈 Span. (호출 비용 최소화)
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class InMemorySpanExporter:
+    """
+    완료된 Span을 메모리에 보관하는 Exporter입니다. (테스트 및 디버그 엔드포인트용)
+    """
+
+    def __init__(self, max_spans: int = 2000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span: Span, service_name: str):
+        self.spans.append(span.to_otlp(service_name))
+
+    def get_finished_spans(self) -> List[Dict[str, Any]]:
+        return list(self.spans)
+
+    def clear(self):
+        self.spans.clear()
+
+
+class FileSpanExporter:
+    """
+    완료된 Span을 OTLP JSON Lines 형식으로 파일에 기록하는 Exporter입니다.
+    export()는 대기열에 넣기만 하고, 백그라운드 스레드가 batch_size개 또는 flush_interval초 단위로 모아서 기록합니다.
+    (이벤트 루프 스레드에서 파일 I/O를 하지 않습니다. 대기열이 가득 차면 Span을 버리고 dropped에 셉니다)
+    기록 스레드는 첫 export() 때 시작합니다. fork 된 자식 프로세스(prefork 워커)는 부모의 스레드를 물려받지 못하므로
+    fork 직후 상태를 비우고 자식에서 새로 시작합니다.
+    """
+
+    def __init__(self, path: str, max_queue: int = 4096, batch_size: int = 256, flush_interval: float = 1.0):
+        self.path = path
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+        # 프로세스 종료 시 남은 Span을 기록합니다.
+        atexit.register(self.shutdown)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._queue: Optional["queue.Queue[Any]"] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def _start(self) -> Optional["queue.Queue[Any]"]:
+        with self._lock:
+            if self._thread is None and not self._stopped:
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name="span-file-exporter", daemon=True)
+                self._thread.start()
+            return None if self._stopped else self._queue
+
+    def export(self, span: Span, service_name: str):
+        spans = self._queue or self._start()
+        try:
+            if spans is None:
+                raise queue.Full
+            spans.put_nowait(span.to_otlp(service_name))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, spans: "queue.Queue[Any]"):
+        while True:
+            batch, waiters = [], []
+            item = spans.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None or isinstance(item, threading.Event):
+                    # None: 종료 요청, Event: flush() 요청 (지금까지 모은 Span을 기록한 뒤 알림)
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = spans.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                if waiter is None:
+                    return
+                waiter.set()
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        lines = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in batch)
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"[Tracing] Span 파일 기록 실패 ({len(batch)}개): {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        대기열의 Span을 모두 기록할 때까지 기다립니다. (이벤트 루프에서는 asyncio.to_thread로 호출)
+        """
+
+        if self._stopped or self._queue is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        if self._stopped:
+            return
+        if self._thread is None:
+            self._stopped = True
+            return
+        self.flush(timeout)
+        self._stopped = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def get_finished_spans(self) -> List[Dict[str, Any]]:
+        self.flush()
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """
+    W3C `traceparent` 헤더(00-<trace_id>-<span_id>-<flags>)를 SpanContext로 변환합니다.
+    형식이 올바르지 않으면 None을 반환합니다.
+    """
+
+    if not header:
+        return None
+
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+
+    return SpanContext(trace_id=parts[1], span_id=parts[2], sampled=bool(flags & 0x01))
+
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+# 현재 실행 중인 Span (asyncio Task 별로 독립적으로 관리됩니다)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Tracer:
+    """
+    Span을 생성하고 Exporter로 내보내는 트레이서입니다.
+    기본값은 비활성화 상태이며, `configure()` 호출 시 활성화됩니다.
+    """
+
+    def __init__(self, service_name: str = "mcp-mock-server"):
+        self.service_name = service_name
+        self.exporter = None
+        self.enabled = False
+
+    def configure(self, service_name: str, exporter):
+        """
+        트레이서를 활성화하고 Exporter를 지정합니다.
+        """
+
+        self.service_name = service_name
+        self.exporter = exporter
+        self.enabled = exporter is not None
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: str = "INTERNAL",
+        parent: Optional[SpanContext] = None,
+    ) -> Iterator[Span]:
+        """
+        새 Span을 시작합니다. `with` 블록이 끝나면 Span이 종료되고 Exporter로 전달됩니다.
+
+        Args:
+            name (str): Span 이름 (예: "milvus.search").
+            attributes (dict): Span 속성.
+            kind (str): INTERNAL | SERVER | CLIENT.
+            parent (SpanContext): 원격 부모 Span. 지정하지 않으면 현재 Span을 부모로 사용합니다.
+        """
+
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        # 1. 부모 Span 결정 (원격 traceparent > 현재 Task의 Span)
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current else None
+
+        trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        span = Span(
+            name=name,
+            context=SpanContext(trace_id=trace_id, span_id=os.urandom(8).hex()),
+            parent_id=parent.span_id if parent else None,
+            kind=kind,
+            attributes=dict(attributes or {}),
+        )
+
+        # 2. 현재 Span으로 등록 후 작업 실행
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            # 3. Span 종료 및 내보내기
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            if span.status == "UNSET":
+                span.status = "OK"
+            try:
+                self.exporter.export(span, self.service_name)
+            except Exception as e:
+                print(f"[Tracing] Span 내보내기 실패: {e}")
+
+    def inject(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """
+        현재 Span의 trace context를 외부 HTTP 요청 헤더에 추가합니다.
+        """
+
+        current = _current_span.get()
+        if self.enabled and current is not None:
+            headers["traceparent"] = format_traceparent(current.context)
+        return headers
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+# 프로세스 전역 트레이서
+tracer = Tracer()
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import time
+
+"""
+==================================================
+유틸리티 모듈: TTL 캐시 / 요청 빈도 집계 (TTLCache, PopularityCounter)
+==================================================
+이 파일은 외부 API 결과(날씨, 검색)를 일정 시간 보관하는 캐시와
+키별 요청 빈도를 집계하는 카운터를 정의합니다.
+
+- TTLCache: 항목별 만료 시간이 있는 LRU 캐시입니다. get 호출마다 요청 빈도를 함께 집계합니다.
+  needs_refresh로 만료가 가까운(또는 이미 만료된) 항목을 확인하여 백그라운드에서 미리 갱신할 수 있습니다.
+- PopularityCounter: 키별 요청 횟수를 세고 half_life초마다 절반으로 줄입니다.
+  (최근에 많이 요청된 키가 상위에 오도록)
+"""
+
+
+class PopularityCounter:
+    """
+    시간에 따라 감소하는 키별 요청 횟수입니다.
+    """
+
+    def __init__(self, half_life: float = 600, max_keys: int = 4096):
+        """
+        Args:
+            half_life (float): 요청 횟수를 절반으로 줄이는 주기(초).
+            max_keys (int): 집계할 최대 키 수. 넘으면 횟수가 적은 키부터 버립니다.
+        """
+
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self.counts: Dict[Hashable, float] = {}
+        self._decayed_at = time.monotonic()
+
+    def _decay(self):
+        now = time.monotonic()
+        if now - self._decayed_at < self.half_life:
+            return
+        factor = 0.5 ** ((now - self._decayed_at) // self.half_life)
+        self.counts = {key: count * factor for key, count in self.counts.items() if count * factor >= 0.5}
+        self._decayed_at = now
+
+    def record(self, key: Hashable):
+        self._decay()
+        self.counts[key] = self.counts.get(key, 0.0) + 1
+        if len(self.counts) > self.max_keys:
+            # 횟수가 적은 절반을 버립니다. (요청마다 정렬하지 않도록 한 번에 정리)
+            kept = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:self.max_keys // 2]
+            self.counts = dict(kept)
+
+    def top(self, n: int) -> List[Tuple[Hashable, float]]:
+        self._decay()
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class TTLCache:
+    """
+    항목별 만료 시간이 있는 LRU 캐시입니다.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024, half_life: float = 600):
+        """
+        Args:
+            ttl (float): 항목 유지 시간(초). 0 이하이면 캐시하지 않습니다. (요청 빈도는 집계)
+            max_entries (int): 최대 항목 수. 넘으면 가장 오래 사용하지 않은 항목부터 버립니다.
+            half_life (float): 요청 빈도 감소 주기(초).
+        """
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.popularity = PopularityCounter(half_life)
+        # {key: (만료 시각(monotonic), 값)}
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        만료되지 않은 값을 반환합니다. 없으면 None. (요청 빈도 집계)
+        """
+
+        self.popularity.record(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: Hashable, value: Any, refreshed: bool = False):
+        """
+        값을 저장합니다. refreshed=True이면 백그라운드 갱신으로 집계합니다.
+        """
+
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if refreshed:
+            self.stats["refreshes"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def needs_refresh(self, key: Hashable, ahead: float) -> bool:
+        """
+        저장된 항목이 ahead초 안에 만료되면(이미 만료된 경우 포함) True를 반환합니다.
+        저장된 적이 없는 키(조회 실패한 도시 등)는 갱신 대상이 아닙니다.
+        """
+
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] - time.monotonic() <= ahead
+
+    def popular(self, n: int) -> List[Hashable]:
+        return [key for key, _ in self.popularity.top(n)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"ttl": self.ttl, "entries": len(self._entries), **self.stats}